@@ -43,6 +43,37 @@ create index if not exists idx_chunks_text_tsv on rag.chunks using gin (text_tsv
 create index if not exists idx_chunks_text_trgm on rag.chunks using gin (text_trgm gin_trgm_ops);
 create index if not exists idx_chunks_embedding on rag.chunks using ivfflat (embedding vector_cosine_ops) with (lists = 100);
 
+-- Indexes backing the structured retrieval filters (RetrievalFilters).
+create index if not exists idx_sources_document_type on rag.sources (document_type);
+create index if not exists idx_sources_source_type on rag.sources (source_type);
+create index if not exists idx_sources_last_modified on rag.sources ((metadata->>'last_modified'));
+create index if not exists idx_sources_metadata on rag.sources using gin (metadata jsonb_path_ops);
+create index if not exists idx_chunks_section_heading on rag.chunks (section_heading);
+create index if not exists idx_chunks_metadata on rag.chunks using gin (metadata jsonb_path_ops);
+
+-- Work queue for distributed ingestion (`cli coordinator` / `cli worker`).
+-- Workers lease rows with `for update skip locked`; the coordinator also
+-- creates this table on first use.
+create table if not exists rag.ingestion_queue (
+    id bigserial primary key,
+    job_id text not null,
+    location text not null,
+    payload jsonb not null,
+    status text not null default 'queued',
+    attempts integer not null default 0,
+    max_attempts integer not null default 3,
+    visible_at timestamptz not null default now(),
+    lease_token uuid,
+    leased_by text,
+    last_error text,
+    created_at timestamptz not null default now(),
+    updated_at timestamptz not null default now(),
+    unique (job_id, location)
+);
+
+create index if not exists ingestion_queue_ready_idx on rag.ingestion_queue (visible_at, id)
+    where status in ('queued', 'leased');
+
 create or replace function rag.match_chunks(
     query_embedding vector(1024),
     match_count integer = 10,
@@ -63,7 +94,7 @@ begin
         s.document_name,
         c.text,
         1 - (c.embedding <=> query_embedding) as score,
-        c.metadata
+        c.metadata || jsonb_build_object('chunk_index', c.chunk_index)
     from rag.chunks c
     join rag.sources s on s.id = c.source_id
     where 1 - (c.embedding <=> query_embedding) >= min_score
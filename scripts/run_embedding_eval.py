@@ -1,18 +1,36 @@
-"""CLI wrapper to compare baseline vs fine-tuned embeddings."""
+"""CLI wrapper to compare baseline vs fine-tuned embeddings.
+
+``--mode pairs`` (default) scores validation pairs in memory. ``--mode
+retrieval`` replays labelled queries through a live retriever against the
+ingested corpus and reports recall@k, MRR and latency percentiles.
+"""
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import importlib
 import json
 from dataclasses import asdict
 from pathlib import Path
+from typing import Callable
 
+from src.rag_pipeline.config import RagIngestionConfig, get_rag_ingestion_config
 from src.rag_pipeline.embeddings.eval import (
     EvaluationRequest,
     run_evaluation,
     write_report,
 )
-from src.shared.logging import get_logger
+from src.rag_pipeline.embeddings.onnx_client import evaluate_onnx_parity
+from src.rag_pipeline.embeddings.retrieval_eval import (
+    MATCH_FIELDS,
+    evaluate_retriever,
+    load_labeled_queries,
+)
+from src.rag_pipeline.retrieval import RetrieverProtocol
+from src.shared.logging import LoggerProtocol, get_logger
+
+RetrieverFactory = Callable[[RagIngestionConfig], RetrieverProtocol]
 
 
 def parse_args() -> argparse.Namespace:
@@ -22,16 +40,59 @@ def parse_args() -> argparse.Namespace:
         Parsed argparse namespace.
     """
     parser = argparse.ArgumentParser(description="Run embedding evaluation.")
-    parser.add_argument("--validation-path", required=True, help="Path to validation pairs JSONL.")
-    parser.add_argument("--base-model", required=True, help="Base model name or path.")
-    parser.add_argument("--tuned-model", required=True, help="Fine-tuned model path.")
+    parser.add_argument(
+        "--mode",
+        choices=("pairs", "retrieval"),
+        default="pairs",
+        help="pairs: in-memory validation pairs; retrieval: replay queries against the live index.",
+    )
+    parser.add_argument("--validation-path", required=True, help="Path to validation pairs / labelled queries JSONL.")
+    parser.add_argument("--base-model", help="Base model name or path (pairs mode).")
+    parser.add_argument("--tuned-model", help="Fine-tuned model path (pairs mode).")
     parser.add_argument("--top-k", type=int, default=5, help="Recall@k threshold (default: 5).")
     parser.add_argument(
         "--output",
         type=str,
         help="Optional path to write the evaluation report JSON.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--onnx-parity",
+        action="store_true",
+        help="Also compare the tuned model's ONNX export against PyTorch on recall@k.",
+    )
+    parser.add_argument("--onnx-quantize", action="store_true", help="Check the int8 ONNX export.")
+    parser.add_argument(
+        "--onnx-tolerance",
+        type=float,
+        default=0.01,
+        help="Maximum recall@k drop allowed for the ONNX export (default: 0.01).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="In-flight queries and database connections (retrieval mode).",
+    )
+    parser.add_argument("--min-score", type=float, default=0.0, help="Similarity floor (retrieval mode).")
+    parser.add_argument(
+        "--match-field",
+        choices=MATCH_FIELDS,
+        default="document_name",
+        help="Retrieved chunk field compared with the labels (retrieval mode).",
+    )
+    parser.add_argument(
+        "--ivfflat-probes",
+        type=int,
+        help="Set ivfflat.probes on the retrieval connections before replaying queries.",
+    )
+    parser.add_argument(
+        "--retriever-factory",
+        help="module:function returning a RetrieverProtocol for a RagIngestionConfig (default: DatabaseRetriever).",
+    )
+    args = parser.parse_args()
+    if args.mode == "pairs" and not (args.base_model and args.tuned_model):
+        parser.error("--base-model and --tuned-model are required in pairs mode.")
+    return args
 
 
 def main() -> None:
@@ -41,18 +102,110 @@ def main() -> None:
     it to disk.
     """
     args = parse_args()
+    logger = get_logger(__name__)
+    if args.mode == "retrieval":
+        _run_retrieval_mode(args, logger)
+        return
     request = EvaluationRequest(
         validation_path=Path(args.validation_path),
         base_model_path=args.base_model,
         tuned_model_path=args.tuned_model,
         top_k=args.top_k,
     )
-    logger = get_logger(__name__)
     report = run_evaluation(request, logger=logger)
     print(json.dumps(asdict(report), indent=2))
     if args.output:
         write_report(report, Path(args.output))
         logger.info("embedding_evaluation_report_written", output=args.output)
+    if args.onnx_parity:
+        parity = evaluate_onnx_parity(
+            validation_path=Path(args.validation_path),
+            model_path=Path(args.tuned_model),
+            quantized=args.onnx_quantize,
+            top_k=args.top_k,
+            tolerance=args.onnx_tolerance,
+            logger=logger,
+        )
+        print(json.dumps(asdict(parity), indent=2))
+        if not parity.within_tolerance:
+            raise SystemExit(1)
+
+
+def _run_retrieval_mode(args: argparse.Namespace, logger: LoggerProtocol) -> None:
+    """Replay labelled queries through a retriever and print the report."""
+    config = get_rag_ingestion_config()
+    queries = load_labeled_queries(Path(args.validation_path))
+    settings: dict[str, str] = {}
+    if args.retriever_factory:
+        module_name, _, attribute = args.retriever_factory.partition(":")
+        factory: RetrieverFactory = getattr(importlib.import_module(module_name), attribute)
+        retriever = factory(config)
+        label = args.retriever_factory
+    else:
+        retriever = _build_database_retriever(
+            config,
+            probes=args.ivfflat_probes,
+            pool_size=args.concurrency,
+            logger=logger,
+        )
+        label = "DatabaseRetriever"
+        settings["pool_size"] = str(args.concurrency)
+    if args.ivfflat_probes is not None:
+        settings["ivfflat.probes"] = str(args.ivfflat_probes)
+    evaluation = asyncio.run(
+        evaluate_retriever(
+            retriever,
+            queries,
+            top_k=args.top_k,
+            min_score=args.min_score,
+            concurrency=args.concurrency,
+            match_field=args.match_field,
+            label=label,
+            settings=settings,
+            logger=logger,
+        ),
+    )
+    payload = json.dumps(asdict(evaluation), indent=2)
+    print(payload)
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(payload, encoding="utf-8")
+        logger.info("retrieval_evaluation_report_written", output=args.output)
+
+
+def _build_database_retriever(
+    config: RagIngestionConfig,
+    *,
+    probes: int | None,
+    pool_size: int,
+    logger: LoggerProtocol,
+) -> RetrieverProtocol:
+    """Build the production retriever, optionally overriding ivfflat probes.
+
+    The connection pool holds one connection per in-flight query so the
+    measured latency is not that of queries queueing on a single connection.
+    Probes are passed as a connection option so every pooled connection uses
+    them, not just the first.
+    """
+    from src.rag_pipeline.embeddings.factory import create_embedding_client
+    from src.rag_pipeline.persistence import PsycopgDatabaseClient, SupabaseStore
+    from src.rag_pipeline.retrieval import DatabaseRetriever
+
+    if not config.database_url:
+        raise SystemExit("RAG_DATABASE_URL must be set for retrieval mode.")
+    dsn = config.database_url
+    if probes is not None:
+        from psycopg.conninfo import conninfo_to_dict, make_conninfo
+
+        options = conninfo_to_dict(dsn).get("options") or ""
+        dsn = make_conninfo(dsn, options=f"{options} -c ivfflat.probes={probes}".strip())
+    db_client = PsycopgDatabaseClient(dsn, pool_size=pool_size)
+    return DatabaseRetriever(
+        embedding_client=create_embedding_client(config, logger=logger),
+        store=SupabaseStore(db=db_client, config=config),
+        logger=logger,
+    )
 
 
 if __name__ == "__main__":
@@ -2,33 +2,79 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass, replace
+from datetime import datetime
+from functools import cached_property
 from pathlib import Path
+from time import perf_counter
 from uuid import uuid4
 from typing import Sequence
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from src.agent.llm_client import LLMClient, LLMConfig, LLMResult
+from src.agent.query_expansion import LLMQueryExpander
 from src.rag_pipeline.config import get_rag_ingestion_config
+from src.rag_pipeline.context_packing import pack_context
 from src.rag_pipeline.embeddings import EmbeddingClientProtocol, create_embedding_client
 from src.rag_pipeline.persistence import PsycopgDatabaseClient, SupabaseStore
+from src.rag_pipeline.query_expansion import QueryExpanderProtocol, RuleBasedQueryExpander
 from src.rag_pipeline.retrieval import DatabaseRetriever, NullRetriever, RetrievedChunk, RetrieverProtocol
+from src.rag_pipeline.schemas import RetrievalFilters
 from src.shared.device import DeviceInfo, select_device
 from src.shared.config import Settings, get_settings
+from src.shared.deadline import Deadline, check_deadline, current_deadline, deadline_scope
 from src.shared.logging import LoggerProtocol, get_logger
+from src.shared.metrics import get_metrics
+from src.shared.singleflight import SingleFlight
 from src.shared.tracing import Tracer, build_tracer, noop_tracer
 from src.tools.ingestion_skill.schemas import IngestionSkillRequest, IngestionSkillResponse
 from src.tools.ingestion_skill.tool import ingestion_skill_tool
 
 
+class ChatFilters(BaseModel):
+    """Optional scoping of the documents a chat answer may draw on.
+
+    Attributes:
+        document_types: Allowed document types (e.g. ``pdf``, ``md``).
+        source_types: Allowed source types (e.g. ``local_file``).
+        section_headings: Allowed chunk section headings.
+        modified_after: Only documents modified at or after this time.
+        modified_before: Only documents modified before this time.
+        source_metadata: Key/values the document metadata must contain.
+        chunk_metadata: Key/values the chunk metadata must contain.
+    """
+
+    document_types: list[str] = Field(default_factory=list)
+    source_types: list[str] = Field(default_factory=list)
+    section_headings: list[str] = Field(default_factory=list)
+    modified_after: datetime | None = None
+    modified_before: datetime | None = None
+    source_metadata: dict[str, str | int | float | bool] = Field(default_factory=dict)
+    chunk_metadata: dict[str, str | int | float | bool] = Field(default_factory=dict)
+
+    def to_retrieval_filters(self) -> RetrievalFilters:
+        """Convert to the retrieval layer's filter type."""
+        return RetrievalFilters(
+            document_types=tuple(self.document_types),
+            source_types=tuple(self.source_types),
+            section_headings=tuple(self.section_headings),
+            modified_after=self.modified_after,
+            modified_before=self.modified_before,
+            source_metadata=dict(self.source_metadata),
+            chunk_metadata=dict(self.chunk_metadata),
+        )
+
+
 class ChatRequest(BaseModel):
     """Request payload for chat interactions with the RAG agent.
 
     Attributes:
         query: Natural language query from the user.
+        filters: Optional constraints on which documents are searched.
     """
 
     query: str
+    filters: ChatFilters | None = None
 
 
 class Citation(BaseModel):
@@ -57,6 +103,21 @@ class ChatResponse(BaseModel):
     citations: list[Citation]
 
 
+class WarmupReport(BaseModel):
+    """Outcome of warming the agent's dependencies.
+
+    Attributes:
+        ready: True when every gating dependency warmed successfully.
+        checks: Per-dependency status (``ok``, ``skipped``, ``unreachable``,
+            ``not_ready: ...`` or ``error: ...``).
+        durations_ms: Time spent per warm-up step.
+    """
+
+    ready: bool
+    checks: dict[str, str]
+    durations_ms: dict[str, float]
+
+
 @dataclass
 class RAGAgent:
     """RAG agent facade that wires retrieval and generation together.
@@ -93,14 +154,25 @@ class RAGAgent:
         self.settings = settings if settings is not None else get_settings()
         self._logger = logger or get_logger(__name__)
         self._tracer = tracer if tracer is not None else self._build_tracer()
-        self.device: DeviceInfo = select_device(preferred_device=self.settings.gpu_device)
+        self._owns_tracer = tracer is None
         self.tools: dict[str, object] = {
             "ingestion_skill": ingestion_skill_tool,
         }
         self._db_client: PsycopgDatabaseClient | None = None
         self._embedding_client: EmbeddingClientProtocol | None = None
-        self.retriever = retriever or self._build_retriever()
+        self._retriever_error: str | None = None
+        self._retriever_injected = retriever is not None
         self.llm_client = llm_client or self._build_llm_client()
+        self.retriever = retriever or self._build_retriever()
+        self._chat_flight: SingleFlight[ChatResponse] | None = (
+            SingleFlight(
+                name="chat",
+                max_waiters=self.settings.chat_coalescing_max_waiters,
+                deadline_tolerance_seconds=self.settings.chat_coalescing_deadline_tolerance_seconds,
+            )
+            if self.settings.chat_coalescing_enabled
+            else None
+        )
         self._logger.info(
             "rag_agent_initialized",
             llm_model=self.settings.llm_model,
@@ -108,62 +180,218 @@ class RAGAgent:
             use_fine_tuned_embeddings=self.settings.use_fine_tuned_embeddings,
         )
 
-    async def chat(self, request: ChatRequest, *, correlation_id: str | None = None) -> ChatResponse:
+    @cached_property
+    def device(self) -> DeviceInfo:
+        """Device for local GPU workloads, resolved on first use.
+
+        Resolution imports torch, so it is deferred until something needs it
+        rather than paid on every API cold start.
+        """
+        return select_device(preferred_device=self.settings.gpu_device)
+
+    async def chat(
+        self,
+        request: ChatRequest,
+        *,
+        correlation_id: str | None = None,
+        deadline: Deadline | None = None,
+    ) -> ChatResponse:
         """Generate an answer for the given chat request.
 
         Retrieval and generation are orchestrated here: the retriever fetches
         relevant chunks, and the LLM client produces a grounded answer.
+        Concurrent requests with the same normalized query and a similar
+        deadline share one computation and receive the same response. Every
+        stage runs under one request deadline; a stage that would start after
+        it raises instead of queueing more work.
 
         Args:
             request: ChatRequest containing the user query.
             correlation_id: Optional identifier propagated through logs.
+            deadline: Request deadline. Defaults to the caller's current
+                deadline, else ``chat_deadline_seconds`` from now.
 
         Returns:
             ChatResponse with a grounded answer and associated citations.
+
+        Raises:
+            DeadlineExceeded: When the deadline expires before an answer is
+                produced.
         """
         resolved_correlation_id = correlation_id or uuid4().hex
+        resolved_deadline = deadline or current_deadline() or Deadline.after(self.settings.chat_deadline_seconds)
         self._logger.info(
             "chat_started",
             query_length=len(request.query),
+            deadline_seconds=resolved_deadline.remaining(),
             correlation_id=resolved_correlation_id,
         )
-        with self._tracer.span(
+        with deadline_scope(resolved_deadline), self._tracer.span(
             name="chat",
             correlation_id=resolved_correlation_id,
             attributes={"query_length": len(request.query)},
-        ):
-            retrieved_chunks = await self.retriever.retrieve(
-                request.query,
-                top_k=self.settings.retrieval_top_k,
-                min_score=self.settings.retrieval_min_score,
-                correlation_id=resolved_correlation_id,
-            )
-            context_blocks: list[str] = [self._format_context(chunk) for chunk in retrieved_chunks]
-            llm_result: LLMResult = await asyncio.to_thread(
-                self.llm_client.generate_answer,
-                system_prompt=(
-                    "You are a company assistant. Answer using only the provided context. "
-                    "Cite sources by name, keep answers concise, and avoid speculation."
-                ),
-                query=request.query,
-                context=context_blocks,
-                correlation_id=resolved_correlation_id,
-            )
-            answer_text = llm_result.content
-            citations = self._build_citations(retrieved_chunks)
-            response: ChatResponse = ChatResponse(answer=answer_text, citations=citations)
+        ) as span:
+            if self._chat_flight is None:
+                response = await self._answer(request, correlation_id=resolved_correlation_id)
+                role = "disabled"
+            else:
+                response, role = await self._chat_flight.do(
+                    self._coalescing_key(request),
+                    lambda: self._answer(request, correlation_id=resolved_correlation_id),
+                    deadline=resolved_deadline,
+                )
+            span.set_attribute("coalescing", role)
             self._logger.info(
                 "chat_completed",
                 answer_length=len(response.answer),
                 citations_count=len(response.citations),
+                coalescing=role,
                 correlation_id=resolved_correlation_id,
             )
             return response
 
+    async def _answer(self, request: ChatRequest, *, correlation_id: str) -> ChatResponse:
+        filters = request.filters.to_retrieval_filters() if request.filters is not None else None
+        check_deadline("retrieval")
+        if filters is None or filters.is_empty:
+            retrieved_chunks = await self.retriever.retrieve(
+                request.query,
+                top_k=self.settings.retrieval_top_k,
+                min_score=self.settings.retrieval_min_score,
+                correlation_id=correlation_id,
+            )
+        else:
+            retrieved_chunks = await self.retriever.retrieve(
+                request.query,
+                top_k=self.settings.retrieval_top_k,
+                min_score=self.settings.retrieval_min_score,
+                correlation_id=correlation_id,
+                filters=filters,
+            )
+        packed = pack_context(
+            retrieved_chunks,
+            token_budget=self.settings.context_token_budget,
+            format_block=self._format_context,
+        )
+        get_metrics().observe_context_packing(tokens_used=packed.tokens_used, tokens_saved=packed.tokens_saved)
+        self._logger.info(
+            "context_packed",
+            chunks_retrieved=len(retrieved_chunks),
+            blocks=len(packed.blocks),
+            tokens_retrieved=packed.tokens_retrieved,
+            tokens_used=packed.tokens_used,
+            tokens_saved=packed.tokens_saved,
+            duplicates_dropped=packed.duplicates_dropped,
+            chunks_merged=packed.chunks_merged,
+            blocks_dropped=packed.blocks_dropped,
+            correlation_id=correlation_id,
+        )
+        context_blocks: list[str] = [self._format_context(chunk) for chunk in packed.blocks]
+        check_deadline("generation")
+        llm_result: LLMResult = await asyncio.to_thread(
+            self.llm_client.generate_answer,
+            system_prompt=(
+                "You are a company assistant. Answer using only the provided context. "
+                "Cite sources by name, keep answers concise, and avoid speculation."
+            ),
+            query=request.query,
+            context=context_blocks,
+            correlation_id=correlation_id,
+        )
+        answer_text = llm_result.content
+        citations = self._build_citations(packed.included)
+        return ChatResponse(answer=answer_text, citations=citations)
+
+    async def warm_up(self) -> WarmupReport:
+        """Exercise retrieval and the LLM connection before taking traffic.
+
+        The retriever (query embedding plus a one-row database match) gates
+        readiness. When ``RAG_DATABASE_URL`` is set but the retriever could not
+        be built, the agent is serving from the empty fallback retriever; each
+        warm-up retries the build and reports ``not_ready`` until it succeeds.
+        The LLM probe only pre-opens its connection; an unreachable endpoint is
+        reported but does not block readiness because chat degrades to a
+        fallback answer.
+
+        Returns:
+            WarmupReport describing each step.
+        """
+        checks: dict[str, str] = {}
+        durations_ms: dict[str, float] = {}
+        if self._retriever_is_fallback():
+            self.retriever = await asyncio.to_thread(self._build_retriever)
+        retriever_warm_up = getattr(self.retriever, "warm_up", None)
+        if self._retriever_is_fallback():
+            checks["retriever"] = f"not_ready: {self._retriever_error or 'retriever unavailable'}"
+        elif callable(retriever_warm_up):
+            try:
+                durations_ms.update(await asyncio.to_thread(retriever_warm_up))
+                checks["retriever"] = "ok"
+            except Exception as exc:  # noqa: BLE001
+                checks["retriever"] = f"error: {exc}"
+        else:
+            checks["retriever"] = "skipped"
+        llm_warm_up = getattr(self.llm_client, "warm_up", None)
+        if callable(llm_warm_up):
+            start = perf_counter()
+            try:
+                reachable = await asyncio.to_thread(llm_warm_up)
+                checks["llm"] = "ok" if reachable else "unreachable"
+            except Exception as exc:  # noqa: BLE001
+                checks["llm"] = f"error: {exc}"
+            durations_ms["llm"] = (perf_counter() - start) * 1000.0
+        else:
+            checks["llm"] = "skipped"
+        report = WarmupReport(
+            ready=not checks["retriever"].startswith(("error", "not_ready")),
+            checks=checks,
+            durations_ms=durations_ms,
+        )
+        log = self._logger.info if report.ready else self._logger.warning
+        log("agent_warm_up_completed", ready=report.ready, checks=checks, durations_ms=durations_ms)
+        return report
+
+    def close(self) -> None:
+        """Release the retriever's threads and the clients the agent built.
+
+        Errors are logged so shutdown always runs to completion.
+        """
+        resources: list[tuple[str, object | None]] = [
+            ("retriever", self.retriever),
+            ("embedding_client", self._embedding_client),
+            ("database", self._db_client),
+        ]
+        for name, resource in resources:
+            close = getattr(resource, "close", None)
+            if not callable(close):
+                continue
+            try:
+                close()
+            except Exception as exc:  # noqa: BLE001
+                self._logger.warning("agent_close_failed", resource=name, error=str(exc))
+        if self._owns_tracer:
+            self._tracer.shutdown()
+        self._logger.info("rag_agent_closed")
+
     async def ingest_documents(self, request: IngestionSkillRequest) -> IngestionSkillResponse:
         """Expose the ingestion skill via the agent API."""
         return await ingestion_skill_tool(request)
 
+    @staticmethod
+    def _coalescing_key(request: ChatRequest) -> str:
+        key = " ".join(request.query.split()).casefold()
+        if request.filters is not None:
+            key = f"{key}\x00{request.filters.model_dump_json()}"
+        return key
+
+    def _retriever_is_fallback(self) -> bool:
+        """Whether a configured database retriever failed to build."""
+        return (
+            not self._retriever_injected
+            and bool(self.settings.rag_database_url)
+            and not isinstance(self.retriever, DatabaseRetriever)
+        )
+
     def _build_retriever(self) -> RetrieverProtocol:
         if not self.settings.rag_database_url:
             self._logger.warning("retriever_disabled_missing_database_url")
@@ -187,26 +415,48 @@ class RAGAgent:
                 logger=self._logger,
                 api_key=self.settings.qwen_api_key,
             )
-            self._db_client = PsycopgDatabaseClient(merged_config.database_url)
+            self._db_client = PsycopgDatabaseClient(
+                merged_config.database_url,
+                pool_size=self.settings.retrieval_pool_size,
+            )
             store = SupabaseStore(db=self._db_client, config=merged_config)
-            return DatabaseRetriever(
+            retriever = DatabaseRetriever(
                 embedding_client=self._embedding_client,
                 store=store,
                 logger=self._logger,
                 tracer=self._tracer,
+                query_expander=self._build_query_expander(),
+                expansion_count=self.settings.query_expansion_count,
+                expansion_deadline_seconds=self.settings.query_expansion_deadline_seconds,
             )
         except Exception as exc:  # noqa: BLE001
+            self._retriever_error = str(exc)
             self._logger.warning(
                 "retriever_initialization_failed",
                 error=str(exc),
             )
             return NullRetriever()
+        self._retriever_error = None
+        return retriever
+
+    def _build_query_expander(self) -> QueryExpanderProtocol | None:
+        mode = self.settings.query_expansion_mode
+        if mode == "rules":
+            return RuleBasedQueryExpander()
+        if mode == "llm":
+            return LLMQueryExpander(self.llm_client)
+        if mode != "off":
+            self._logger.warning("query_expansion_mode_unknown", mode=mode)
+        return None
 
     def _build_llm_client(self) -> LLMClient:
         config = LLMConfig(
             model=self.settings.llm_model,
             base_url=self.settings.llm_base_url,
             api_key=self.settings.llm_api_key,
+            circuit_failure_rate=self.settings.llm_circuit_failure_rate,
+            circuit_open_seconds=self.settings.llm_circuit_open_seconds,
+            hedge_requests=self.settings.llm_hedging_enabled,
         )
         return LLMClient(config=config, logger=self._logger, tracer=self._tracer)
 
@@ -218,6 +468,10 @@ class RAGAgent:
             host=self.settings.langfuse_host,
             public_key=self.settings.langfuse_public_key,
             secret_key=self.settings.langfuse_secret_key,
+            sample_ratio=self.settings.langfuse_sample_ratio,
+            max_queue_size=self.settings.langfuse_max_queue_size,
+            export_batch_size=self.settings.langfuse_export_batch_size,
+            export_interval_seconds=self.settings.langfuse_export_interval_seconds,
         )
 
     @staticmethod
@@ -3,11 +3,14 @@ from __future__ import annotations
 import random
 from dataclasses import dataclass
 from time import perf_counter, sleep
-from typing import Sequence
+from typing import Any, Callable, Sequence
 
 import requests
 
+from src.shared.deadline import DeadlineExceeded, bounded_timeout, current_deadline, retry_allowed
 from src.shared.logging import LoggerProtocol, get_logger
+from src.shared.metrics import get_metrics
+from src.shared.resilience import OPEN, CircuitBreaker, CircuitOpenError, Hedger
 from src.shared.tracing import Tracer, noop_tracer
 
 
@@ -23,6 +26,13 @@ class LLMConfig:
         timeout_seconds: HTTP request timeout for each attempt.
         max_retries: Number of retries for transient failures.
         retry_backoff_seconds: Base backoff used between retries.
+        circuit_failure_rate: Failure rate over recent calls that opens the
+            circuit, after which calls fall back without contacting the
+            endpoint.
+        circuit_open_seconds: How long an open circuit fails fast before
+            admitting a probe.
+        hedge_requests: Fire a duplicate request when one runs past the
+            observed p95 latency. Doubles token spend on slow calls.
     """
 
     model: str
@@ -31,17 +41,32 @@ class LLMConfig:
     timeout_seconds: int = 30
     max_retries: int = 1
     retry_backoff_seconds: float = 1.0
+    circuit_failure_rate: float = 0.5
+    circuit_open_seconds: float = 30.0
+    hedge_requests: bool = False
 
 
 @dataclass(frozen=True, slots=True)
 class LLMResult:
-    """LLM response content."""
+    """LLM response content.
+
+    Attributes:
+        content: Generated text, or a templated message when ``fallback``.
+        fallback: True when no model produced ``content`` (endpoint not
+            configured or unreachable).
+    """
 
     content: str
+    fallback: bool = False
 
 
 class LLMClient:
-    """Minimal OpenAI-compatible chat client with retry/backoff."""
+    """Minimal OpenAI-compatible chat client with retry/backoff.
+
+    Requests pass through a circuit breaker, so while the endpoint is
+    failing, callers get the fallback answer immediately instead of waiting
+    out timeouts and retries.
+    """
 
     def __init__(
         self,
@@ -55,6 +80,12 @@ class LLMClient:
         self._session = session or requests.Session()
         self._logger = logger or get_logger(__name__)
         self._tracer = tracer or noop_tracer()
+        self._breaker = CircuitBreaker(
+            name="llm",
+            failure_rate_threshold=config.circuit_failure_rate,
+            open_seconds=config.circuit_open_seconds,
+        )
+        self._hedger = Hedger(name="llm") if config.hedge_requests else None
 
     def generate_answer(
         self,
@@ -68,6 +99,9 @@ class LLMClient:
 
         Falls back to a deterministic templated response when no base URL is
         configured to keep local development working without an LLM endpoint.
+        Under a request deadline each attempt's timeout is clamped to the
+        remaining time and no retry is scheduled that could not finish. While
+        the circuit is open the fallback is returned without a request.
 
         Args:
             system_prompt: Instruction to guide the model behaviour.
@@ -76,6 +110,9 @@ class LLMClient:
 
         Returns:
             LLMResult containing the generated content.
+
+        Raises:
+            DeadlineExceeded: When the request deadline expires first.
         """
         if not self._config.base_url:
             combined_context = "\n".join(context)
@@ -83,7 +120,7 @@ class LLMClient:
                 "LLM endpoint not configured; returning summarized context. "
                 f"Query: {query}\nContext:\n{combined_context}"
             ).strip()
-            return LLMResult(content=content)
+            return LLMResult(content=content, fallback=True)
 
         url = f"{self._config.base_url.rstrip('/')}/v1/chat/completions"
         headers = {
@@ -105,17 +142,20 @@ class LLMClient:
             attributes={"model": self._config.model, "temperature": 0.2},
         ):
             while attempt <= self._config.max_retries:
+                timeout_seconds = bounded_timeout(self._config.timeout_seconds, stage="generation")
                 try:
-                    response = self._session.post(
-                        url,
-                        json={"model": self._config.model, "messages": messages, "temperature": 0.2},
-                        headers=headers,
-                        timeout=self._config.timeout_seconds,
-                    )
-                    response.raise_for_status()
-                    data = response.json()
+                    self._breaker.allow()
+                except CircuitOpenError as exc:
+                    last_error = str(exc)
+                    self._logger.warning("llm_call_rejected", error=last_error, correlation_id=correlation_id)
+                    break
+                payload = {"model": self._config.model, "messages": messages, "temperature": 0.2}
+                try:
+                    data = self._call_upstream(lambda: self._post(url, payload, headers, timeout_seconds))
                     content = data["choices"][0]["message"]["content"]
+                    self._breaker.record_success()
                     duration_ms = (perf_counter() - start) * 1000.0
+                    get_metrics().observe_llm_call(duration_seconds=duration_ms / 1000.0, retries=attempt)
                     self._logger.info(
                         "llm_call_completed",
                         duration_ms=duration_ms,
@@ -125,22 +165,81 @@ class LLMClient:
                     return LLMResult(content=str(content))
                 except Exception as exc:  # noqa: BLE001
                     last_error = str(exc)
+                    if _is_upstream_failure(exc):
+                        self._breaker.record_failure()
+                    else:
+                        self._breaker.record_success()
                     self._logger.warning(
                         "llm_call_failed",
                         attempt=attempt,
                         error=last_error,
                         correlation_id=correlation_id,
                     )
+                    deadline = current_deadline()
+                    if deadline is not None and deadline.expired:
+                        self._observe_failure(start, attempt)
+                        raise DeadlineExceeded("generation") from exc
                     attempt += 1
-                    if attempt > self._config.max_retries:
+                    if attempt > self._config.max_retries or self._breaker.state == OPEN:
                         break
                     backoff = self._config.retry_backoff_seconds * max(1, attempt) * random.uniform(0.5, 1.5)
+                    if not retry_allowed(backoff):
+                        self._observe_failure(start, attempt)
+                        raise DeadlineExceeded("generation") from exc
                     sleep(backoff)
+        self._observe_failure(start, attempt)
         fallback_content = (
             "Unable to reach the LLM endpoint at this time. "
             f"Latest error: {last_error or 'unknown'}"
         )
-        return LLMResult(content=fallback_content)
+        return LLMResult(content=fallback_content, fallback=True)
+
+    def warm_up(self, *, timeout_seconds: float = 5.0) -> bool:
+        """Open a pooled connection to the LLM endpoint without generating.
+
+        Issues ``GET /v1/models`` so DNS resolution and the TLS handshake are
+        done before the first chat request. Any HTTP status counts as success;
+        only connection failures return False.
+
+        Args:
+            timeout_seconds: Timeout for the probe request.
+
+        Returns:
+            True when the endpoint was reachable or no endpoint is configured.
+        """
+        if not self._config.base_url:
+            return True
+        headers = {"Accept": "application/json"}
+        if self._config.api_key:
+            headers["Authorization"] = f"Bearer {self._config.api_key}"
+        try:
+            self._session.get(
+                f"{self._config.base_url.rstrip('/')}/v1/models",
+                headers=headers,
+                timeout=timeout_seconds,
+            ).close()
+        except requests.RequestException as exc:
+            self._logger.warning("llm_warm_up_failed", error=str(exc))
+            return False
+        return True
+
+    def _call_upstream(self, call: Callable[[], Any]) -> Any:
+        if self._hedger is None:
+            return call()
+        return self._hedger.call(call)
+
+    def _post(self, url: str, payload: dict[str, Any], headers: dict[str, str], timeout_seconds: float) -> Any:
+        response = self._session.post(url, json=payload, headers=headers, timeout=timeout_seconds)
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _observe_failure(start: float, attempt: int) -> None:
+        get_metrics().observe_llm_call(
+            duration_seconds=perf_counter() - start,
+            retries=max(0, attempt - 1),
+            outcome="error",
+        )
 
     @staticmethod
     def _format_prompt(*, query: str, context: Sequence[str]) -> str:
@@ -151,3 +250,12 @@ class LLMClient:
             f"Context:\n{context_lines}\n\n"
             f"User query: {query}"
         )
+
+
+def _is_upstream_failure(exc: Exception) -> bool:
+    """Whether the error says the endpoint is unhealthy, not the request bad."""
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if isinstance(exc, requests.HTTPError) and isinstance(status, int):
+        return status == 429 or status >= 500
+    return True
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import re
+
+from src.agent.llm_client import LLMClient
+from src.rag_pipeline.query_expansion import unique_reformulations
+
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+_SYSTEM_PROMPT = (
+    "You rewrite questions for a document search engine. Reply with {count} alternative "
+    "search queries for the user's question, one per line, with no numbering or commentary. "
+    "Use different vocabulary and make implicit terms explicit."
+)
+
+
+class LLMQueryExpander:
+    """Query expander that asks the chat model for reformulations."""
+
+    def __init__(self, llm_client: LLMClient) -> None:
+        self._llm_client = llm_client
+
+    def expand(self, query: str, *, count: int) -> list[str]:
+        """Return up to ``count`` model-written reformulations of ``query``.
+
+        Returns an empty list when the LLM is not configured or unreachable,
+        so retrieval proceeds with the original query alone.
+        """
+        result = self._llm_client.generate_answer(
+            system_prompt=_SYSTEM_PROMPT.format(count=count),
+            query=query,
+            context=[],
+        )
+        if result.fallback:
+            return []
+        lines = [_LIST_MARKER.sub("", line).strip() for line in result.content.splitlines()]
+        return unique_reformulations(query, lines, count=count)
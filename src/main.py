@@ -1,16 +1,85 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from uuid import uuid4
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
 
-from src.agent.agent import ChatRequest, ChatResponse, RAGAgent
+from src.agent.agent import ChatRequest, ChatResponse, RAGAgent, WarmupReport
+from src.shared.concurrency import AdaptiveConcurrencyLimiter, ConcurrencyLimitExceeded
 from src.shared.config import get_settings
+from src.shared.deadline import Deadline, DeadlineExceeded
 from src.shared.logging import LoggerProtocol, get_logger
+from src.shared.metrics import get_metrics
 
 
 logger: LoggerProtocol = get_logger(__name__)
-app: FastAPI = FastAPI(title="Local RAG AI Assistant")
 _settings = get_settings()
-_agent: RAGAgent = RAGAgent(settings=_settings)
+_agent: RAGAgent | None = None
+_warmup_report: WarmupReport | None = None
+_chat_limiter = AdaptiveConcurrencyLimiter(
+    name="chat",
+    initial_limit=_settings.chat_concurrency_initial_limit,
+    min_limit=_settings.chat_concurrency_min_limit,
+    max_limit=_settings.chat_concurrency_max_limit,
+    latency_target_seconds=_settings.chat_latency_target_seconds,
+    max_queue_size=_settings.chat_queue_size,
+    queue_timeout_seconds=_settings.chat_queue_timeout_seconds,
+)
+
+
+async def _start_agent() -> None:
+    """Build the agent off the event loop, then warm it until ready.
+
+    A failed build or warm-up is logged and retried after
+    ``warmup_retry_seconds``, like a not-ready report, so a dependency that
+    is down at start-up only delays readiness.
+    """
+    global _agent, _warmup_report
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            if _agent is None:
+                _agent = await asyncio.to_thread(RAGAgent, settings=_settings)
+            _warmup_report = await _agent.warm_up()
+        except Exception:  # noqa: BLE001
+            logger.exception("api_warm_up_failed", attempt=attempt)
+        else:
+            logger.info("api_warm_up_attempted", attempt=attempt, ready=_warmup_report.ready)
+            if _warmup_report.ready:
+                return
+        await asyncio.sleep(_settings.warmup_retry_seconds)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Build and warm the agent in the background; close it on shutdown.
+
+    Nothing is constructed at import time, so importing the module (tests,
+    tooling, worker processes) never opens clients, and liveness checks answer
+    while the agent is still starting.
+    """
+    global _agent, _warmup_report
+    _warmup_report = None
+    task = asyncio.create_task(_start_agent())
+    try:
+        yield
+    finally:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        except Exception:  # noqa: BLE001
+            logger.exception("api_warm_up_task_failed")
+        if _agent is not None:
+            agent, _agent = _agent, None
+            await asyncio.to_thread(agent.close)
+
+
+app: FastAPI = FastAPI(title="Local RAG AI Assistant", lifespan=lifespan)
 
 
 @app.get("/health")
@@ -24,23 +93,94 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest) -> ChatResponse:
+@app.get("/ready")
+async def ready() -> JSONResponse:
+    """Readiness endpoint for load balancers.
+
+    Unlike ``/health`` (process liveness) this only returns 200 once warm-up
+    has embedded a query and reached the database.
+
+    Returns:
+        200 with the warm-up report when ready, otherwise 503.
+    """
+    report = _warmup_report
+    if report is None:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    status_code = 200 if report.ready else 503
+    return JSONResponse(
+        status_code=status_code,
+        content={"status": "ready" if report.ready else "not_ready", **report.model_dump()},
+    )
+
+
+@app.get("/metrics")
+async def metrics() -> Response:
+    """Prometheus scrape endpoint.
+
+    Returns:
+        Response carrying the registry in the text exposition format.
+    """
+    payload, content_type = get_metrics().render()
+    return Response(content=payload, media_type=content_type)
+
+
+@app.post(
+    "/chat",
+    response_model=ChatResponse,
+    responses={
+        503: {"description": "Overloaded or still starting; retry later"},
+        504: {"description": "Request deadline exceeded"},
+    },
+)
+async def chat(request: ChatRequest) -> ChatResponse | JSONResponse:
     """Chat endpoint that forwards queries to the RAG agent.
 
+    Requests pass through an adaptive concurrency limiter; when it is
+    saturated the endpoint sheds load with 503 and a ``Retry-After`` header.
+    The request deadline (``CHAT_DEADLINE_SECONDS``) starts on arrival, so
+    time spent queueing counts against it; a request that runs out of time
+    gets 504 naming the stage that was cut short. Until start-up has built
+    the agent the endpoint answers 503.
+
     Args:
         request: Chat request payload containing the user query.
 
     Returns:
-        ChatResponse produced by the RAG agent.
+        ChatResponse produced by the RAG agent, or a 503/504 response.
     """
+    agent = _agent
+    if agent is None:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Agent is starting, retry later.", "reason": "starting"},
+            headers={"Retry-After": str(max(1, round(_settings.warmup_retry_seconds)))},
+        )
+    deadline = Deadline.after(_settings.chat_deadline_seconds)
     correlation_id = uuid4().hex
     logger.info(
         "chat_request_received",
         query_length=len(request.query),
         correlation_id=correlation_id,
     )
-    response: ChatResponse = await _agent.chat(request=request, correlation_id=correlation_id)
+    try:
+        async with _chat_limiter.acquire():
+            response: ChatResponse = await asyncio.wait_for(
+                agent.chat(request=request, correlation_id=correlation_id, deadline=deadline),
+                timeout=deadline.remaining(),
+            )
+    except ConcurrencyLimitExceeded as exc:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Server is busy, retry later.", "reason": exc.reason},
+            headers={"Retry-After": str(exc.retry_after_seconds)},
+        )
+    except TimeoutError as exc:
+        stage = exc.stage if isinstance(exc, DeadlineExceeded) else "chat"
+        logger.warning("chat_deadline_exceeded", stage=stage, correlation_id=correlation_id)
+        return JSONResponse(
+            status_code=504,
+            content={"detail": "Request deadline exceeded.", "stage": stage},
+        )
     logger.info(
         "chat_response_sent",
         answer_length=len(response.answer),
@@ -2,16 +2,21 @@
 
 from __future__ import annotations
 
+import math
 from collections.abc import Mapping, Sequence as ABCSequence
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Sequence
+from typing import Any, Callable, Sequence
 
 from src.rag_pipeline.schemas import ChunkData, ChunkMetadata, DocumentInput, JSONValue
 from src.shared.logging import LoggerProtocol, get_logger
 
 logger: LoggerProtocol = get_logger(__name__)
 
+TokenCounter = Callable[[Sequence[str]], list[int]]
+"""Batch token counter returning one count per input text."""
+
 
 class ChunkingError(RuntimeError):
     """Raised when Docling fails to convert or chunk a document."""
@@ -25,16 +30,24 @@ class DoclingChunker:
     chunk_max_chars: int
     docling_target_tokens: int = 280
     tokenizer_id: str = "sentence-transformers/all-MiniLM-L6-v2"
+    chunk_max_tokens: int | None = None
 
     def __post_init__(self) -> None:
         if self.chunk_min_chars <= 0 or self.chunk_max_chars <= 0:
             raise ValueError("Chunk character bounds must be positive.")
         if self.chunk_min_chars >= self.chunk_max_chars:
             raise ValueError("chunk_min_chars must be less than chunk_max_chars.")
+        if self.chunk_max_tokens is not None and self.chunk_max_tokens <= 0:
+            raise ValueError("chunk_max_tokens must be positive when provided.")
         self._docling_backend: _DoclingBackend | None = _DoclingBackend.try_create(
             target_tokens=self.docling_target_tokens,
             tokenizer_id=self.tokenizer_id,
         )
+        self._token_counter: TokenCounter = (
+            self._docling_backend.count_tokens
+            if self._docling_backend is not None
+            else estimate_token_counts
+        )
 
     def chunk_document(self, document: DocumentInput) -> list[ChunkData]:
         """Convert and chunk the given document."""
@@ -56,12 +69,23 @@ class DoclingChunker:
             chunks=chunks,
             min_chars=self.chunk_min_chars,
             max_chars=self.chunk_max_chars,
+            max_tokens=self.chunk_max_tokens,
+            token_counter=self.token_counter(),
         )
-    
+
     def uses_docling(self) -> bool:
         """Return True when the Docling backend is active."""
         return self._docling_backend is not None
 
+    def token_counter(self) -> TokenCounter:
+        """Return the batch token counter used for chunk sizing.
+
+        Uses the Docling backend tokenizer when it loaded successfully (kept
+        even if Docling later fails on a document) and falls back to the
+        heuristic estimator otherwise.
+        """
+        return self._token_counter
+
     def _fallback_chunks(self, document: DocumentInput) -> list[ChunkData]:
         """Simple paragraph splitter used when Docling is unavailable."""
         path: Path = document.metadata.location
@@ -97,13 +121,12 @@ class _DoclingBackend:
     def __init__(self, target_tokens: int, tokenizer_id: str) -> None:
         from docling.chunking import HybridChunker
         from docling.document_converter import DocumentConverter
-        from transformers import AutoTokenizer
 
         self._converter = DocumentConverter()
         self._hybrid_chunker_cls = HybridChunker
-        self._tokenizer = AutoTokenizer.from_pretrained(tokenizer_id)
-        self._tokenizer.model_max_length = target_tokens
+        self._tokenizer = _load_tokenizer(tokenizer_id, target_tokens)
         self._target_tokens = target_tokens
+        self._token_counter: TokenCounter = build_tokenizer_counter(self._tokenizer)
 
     @classmethod
     def try_create(cls, target_tokens: int, tokenizer_id: str) -> "_DoclingBackend | None":
@@ -119,6 +142,10 @@ class _DoclingBackend:
             )
             return None
 
+    def count_tokens(self, texts: Sequence[str]) -> list[int]:
+        """Count tokens for a batch of texts with the loaded tokenizer."""
+        return self._token_counter(texts)
+
     def chunk(self, document: DocumentInput) -> list[ChunkData]:
         try:
             result = self._converter.convert(str(document.metadata.location))
@@ -126,7 +153,7 @@ class _DoclingBackend:
                 tokenizer=self._tokenizer,
                 merge_peers=True,
             )
-            chunks: list[ChunkData] = []
+            pending: list[tuple[str, ChunkMetadata]] = []
             for index, chunk in enumerate(hybrid_chunker.chunk(dl_doc=result.document)):
                 text = getattr(chunk, "text", "").strip()
                 if not text:
@@ -139,15 +166,17 @@ class _DoclingBackend:
                     structural_type=_safe_str(meta.get("block_type")),
                     extra=_coerce_dict(meta),
                 )
-                chunks.append(
-                    ChunkData(
-                        text=text,
-                        metadata=metadata,
-                        character_count=len(text),
-                        token_estimate=_estimate_tokens(text),
-                    ),
+                pending.append((text, metadata))
+            token_counts = self.count_tokens([text for text, _ in pending])
+            return [
+                ChunkData(
+                    text=text,
+                    metadata=metadata,
+                    character_count=len(text),
+                    token_estimate=token_count,
                 )
-            return chunks
+                for (text, metadata), token_count in zip(pending, token_counts)
+            ]
         except Exception as exc:  # pragma: no cover - optional dependency
             raise ChunkingError(f"Docling chunking failed: {exc}") from exc
 
@@ -156,18 +185,45 @@ def enforce_character_bounds(
     chunks: Sequence[ChunkData],
     min_chars: int,
     max_chars: int,
+    *,
+    max_tokens: int | None = None,
+    token_counter: TokenCounter | None = None,
 ) -> list[ChunkData]:
-    """Merge and split chunks so every entry respects configured bounds."""
+    """Merge and split chunks so every entry respects configured bounds.
+
+    When ``max_tokens`` is provided, segments are additionally split so that no
+    chunk exceeds the token budget, and merges never cross it. Token counts are
+    computed in batches per document via ``token_counter`` (defaults to the
+    heuristic estimator).
+    """
     if min_chars <= 0 or max_chars <= 0:
         raise ValueError("Chunk bounds must be positive.")
     if min_chars >= max_chars:
         raise ValueError("min_chars must be smaller than max_chars.")
+    if max_tokens is not None and max_tokens <= 0:
+        raise ValueError("max_tokens must be positive when provided.")
+    counter = token_counter or estimate_token_counts
+    segments: list[tuple[str, ChunkMetadata]] = [
+        (segment, chunk.metadata)
+        for chunk in chunks
+        for segment in _split_text(chunk.text.strip(), max_chars=max_chars)
+        if segment
+    ]
+    if max_tokens is None:
+        segment_tokens: list[int] = [0] * len(segments)
+    else:
+        segments, segment_tokens = _split_segments_by_tokens(
+            segments=segments,
+            max_tokens=max_tokens,
+            token_counter=counter,
+        )
     normalized: list[tuple[str, ChunkMetadata]] = []
     buffer_text: str = ""
+    buffer_tokens: int = 0
     buffer_metadata: ChunkMetadata | None = None
 
     def flush_buffer(force: bool = False) -> None:
-        nonlocal buffer_text, buffer_metadata
+        nonlocal buffer_text, buffer_tokens, buffer_metadata
         if not buffer_text:
             return
         if len(buffer_text) < min_chars and not force:
@@ -180,29 +236,32 @@ def enforce_character_bounds(
         )
         normalized.append((buffer_text, metadata))
         buffer_text = ""
+        buffer_tokens = 0
         buffer_metadata = None
 
-    for chunk in chunks:
-        for segment in _split_text(chunk.text.strip(), max_chars=max_chars):
-            if not segment:
-                continue
-            if not buffer_text:
-                buffer_text = segment
-                buffer_metadata = chunk.metadata
+    for (segment, metadata), tokens in zip(segments, segment_tokens):
+        if not buffer_text:
+            buffer_text = segment
+            buffer_tokens = tokens
+            buffer_metadata = metadata
+        else:
+            candidate = f"{buffer_text}\n\n{segment}"
+            fits_tokens = max_tokens is None or buffer_tokens + tokens <= max_tokens
+            if len(candidate) <= max_chars and fits_tokens:
+                buffer_text = candidate
+                buffer_tokens += tokens
             else:
-                candidate = f"{buffer_text}\n\n{segment}"
-                if len(candidate) <= max_chars:
-                    buffer_text = candidate
-                else:
-                    flush_buffer(force=True)
-                    buffer_text = segment
-                    buffer_metadata = chunk.metadata
-            if len(buffer_text) >= min_chars:
-                flush_buffer()
+                flush_buffer(force=True)
+                buffer_text = segment
+                buffer_tokens = tokens
+                buffer_metadata = metadata
+        if len(buffer_text) >= min_chars:
+            flush_buffer()
     flush_buffer(force=True)
 
+    token_counts = counter([text for text, _ in normalized]) if normalized else []
     result: list[ChunkData] = []
-    for new_index, (text, metadata) in enumerate(normalized):
+    for new_index, ((text, metadata), token_count) in enumerate(zip(normalized, token_counts)):
         result.append(
             ChunkData(
                 text=text,
@@ -214,7 +273,63 @@ def enforce_character_bounds(
                     extra=dict(metadata.extra),
                 ),
                 character_count=len(text),
-                token_estimate=_estimate_tokens(text),
+                token_estimate=token_count,
+            ),
+        )
+    return result
+
+
+def _split_segments_by_tokens(
+    *,
+    segments: Sequence[tuple[str, ChunkMetadata]],
+    max_tokens: int,
+    token_counter: TokenCounter,
+) -> tuple[list[tuple[str, ChunkMetadata]], list[int]]:
+    """Split segments until each one fits within ``max_tokens``.
+
+    All segments are counted in a single batch; only the rare oversized ones
+    are re-split and re-counted.
+    """
+    counts = token_counter([text for text, _ in segments]) if segments else []
+    result_segments: list[tuple[str, ChunkMetadata]] = []
+    result_counts: list[int] = []
+    for (text, metadata), count in zip(segments, counts):
+        for piece, piece_count in _split_by_tokens(
+            text=text,
+            token_count=count,
+            max_tokens=max_tokens,
+            token_counter=token_counter,
+        ):
+            result_segments.append((piece, metadata))
+            result_counts.append(piece_count)
+    return result_segments, result_counts
+
+
+def _split_by_tokens(
+    *,
+    text: str,
+    token_count: int,
+    max_tokens: int,
+    token_counter: TokenCounter,
+) -> list[tuple[str, int]]:
+    if token_count <= max_tokens:
+        return [(text, token_count)]
+    chars_per_token = len(text) / float(token_count)
+    budget_chars = max(1, int(max_tokens * chars_per_token * 0.9))
+    pieces = _split_text(text, max_chars=budget_chars)
+    if len(pieces) <= 1:
+        midpoint = len(text) // 2
+        pieces = [piece for piece in (text[:midpoint].strip(), text[midpoint:].strip()) if piece]
+    if len(pieces) <= 1:
+        return [(text, token_count)]
+    result: list[tuple[str, int]] = []
+    for piece, piece_count in zip(pieces, token_counter(pieces)):
+        result.extend(
+            _split_by_tokens(
+                text=piece,
+                token_count=piece_count,
+                max_tokens=max_tokens,
+                token_counter=token_counter,
             ),
         )
     return result
@@ -242,8 +357,44 @@ def _split_text(text: str, max_chars: int) -> list[str]:
     return segments
 
 
+def estimate_token_counts(texts: Sequence[str]) -> list[int]:
+    """Heuristic batch token counter used when no tokenizer is loaded."""
+    return [_estimate_tokens(text) for text in texts]
+
+
 def _estimate_tokens(text: str) -> int:
-    return max(1, len(text.split()))
+    # Whitespace splitting badly undercounts code, identifiers and CJK text, so
+    # take the larger of the word count and a ~4 characters/token estimate.
+    return max(1, len(text.split()), math.ceil(len(text) / 4))
+
+
+@lru_cache(maxsize=4)
+def _load_tokenizer(tokenizer_id: str, target_tokens: int) -> Any:
+    """Load and cache a Hugging Face tokenizer shared across chunkers."""
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_id)
+    tokenizer.model_max_length = target_tokens
+    return tokenizer
+
+
+def build_tokenizer_counter(tokenizer: Any) -> TokenCounter:
+    """Build a batch token counter around a Hugging Face tokenizer."""
+
+    def count(texts: Sequence[str]) -> list[int]:
+        if not texts:
+            return []
+        encoded = tokenizer(
+            list(texts),
+            add_special_tokens=False,
+            truncation=False,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+            verbose=False,
+        )
+        return [max(1, len(ids)) for ids in encoded["input_ids"]]
+
+    return count
 
 
 def _safe_int(value: object) -> int | None:
@@ -3,15 +3,29 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import os
+import signal
+import socket
 import subprocess
 import sys
+import threading
+from dataclasses import replace
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Sequence
+from uuid import uuid4
 
 from src.rag_pipeline.config import get_rag_ingestion_config
-from src.rag_pipeline.pipeline import run_ingestion_job
+from src.rag_pipeline.config import RagIngestionConfig
+from src.rag_pipeline.persistence import JobLedger, PostgresWorkQueue, PsycopgDatabaseClient
+from src.rag_pipeline.pipeline import (
+    enqueue_ingestion_job,
+    run_ingestion_job,
+    run_queue_worker,
+    wait_for_queue_job,
+)
 from src.rag_pipeline.schemas import (
     IngestionRequest,
     IngestionResult,
@@ -19,11 +33,101 @@ from src.rag_pipeline.schemas import (
 )
 from src.rag_pipeline.runtime import cleanup_runtime, create_pipeline_runtime
 from src.shared.logging import get_logger
+from src.shared.metrics import get_metrics
+from src.shared.profiling import profile_session
 
 
 def build_parser() -> argparse.ArgumentParser:
-    """Create the CLI argument parser."""
+    """Create the CLI argument parser.
+
+    Without a subcommand the CLI ingests everything in this process. The
+    ``coordinator`` and ``worker`` subcommands split a run across processes
+    or nodes through the Postgres work queue.
+    """
     parser = argparse.ArgumentParser(description="Docling ingestion pipeline CLI.")
+    _add_source_arguments(parser)
+    parser.add_argument(
+        "--output-format",
+        choices=("text", "json"),
+        default="text",
+        help="Select structured JSON output or human-readable text summary.",
+    )
+    parser.add_argument(
+        "--metrics-pushgateway",
+        help="Push run metrics to this Prometheus Pushgateway (default: RAG_METRICS_PUSHGATEWAY).",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="DIR",
+        help="Profile the run with cProfile and write a Chrome trace of per-document stages into DIR.",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="JOB_ID",
+        help="Resume an interrupted ingestion job; its original sources and options are reused.",
+    )
+    parser.add_argument(
+        "--job-ledger",
+        type=Path,
+        metavar="PATH",
+        help="SQLite file recording job progress (default: RAG_JOB_LEDGER_PATH).",
+    )
+    parser.add_argument(
+        "--version",
+        action="store_true",
+        help="Display CLI version information and exit.",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    coordinator = subparsers.add_parser(
+        "coordinator",
+        help="Discover documents and enqueue them for queue workers.",
+    )
+    _add_source_arguments(coordinator)
+    coordinator.add_argument("--job-id", help="Job identifier (default: a new random id).")
+    coordinator.add_argument(
+        "--wait",
+        action="store_true",
+        help="Block until workers have finished the job and report its outcome.",
+    )
+    coordinator.add_argument(
+        "--poll-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between progress checks with --wait (default: 5).",
+    )
+    worker = subparsers.add_parser("worker", help="Lease and ingest documents from the work queue.")
+    worker.add_argument(
+        "--config-file",
+        type=Path,
+        help="Optional KEY=VALUE file used to populate environment variables before loading config.",
+    )
+    worker.add_argument("--job-id", help="Only process documents of this job.")
+    worker.add_argument(
+        "--worker-id",
+        help="Name recorded on leased work items (default: <hostname>-<pid>).",
+    )
+    worker.add_argument(
+        "--visibility-timeout",
+        type=float,
+        help="Lease length in seconds (default: RAG_WORK_QUEUE_VISIBILITY_SECONDS).",
+    )
+    worker.add_argument(
+        "--poll-interval",
+        type=float,
+        default=2.0,
+        help="Seconds to wait when the queue is empty (default: 2).",
+    )
+    worker.add_argument(
+        "--exit-when-idle",
+        action="store_true",
+        help="Exit once no document is queued or leased instead of waiting for more work.",
+    )
+    worker.add_argument("--max-items", type=int, help="Exit after processing this many documents.")
+    return parser
+
+
+def _add_source_arguments(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "--source-dir",
         dest="source_dirs",
@@ -50,18 +154,6 @@ def build_parser() -> argparse.ArgumentParser:
         type=Path,
         help="Optional KEY=VALUE file used to populate environment variables before loading config.",
     )
-    parser.add_argument(
-        "--output-format",
-        choices=("text", "json"),
-        default="text",
-        help="Select structured JSON output or human-readable text summary.",
-    )
-    parser.add_argument(
-        "--version",
-        action="store_true",
-        help="Display CLI version information and exit.",
-    )
-    return parser
 
 
 def main(argv: Sequence[str] | None = None) -> int:
@@ -74,6 +166,8 @@ def main(argv: Sequence[str] | None = None) -> int:
 
     if args.config_file:
         _load_env_file(args.config_file)
+    if args.command == "worker":
+        return _run_worker(args)
 
     config = get_rag_ingestion_config()
     request = IngestionRequest()
@@ -93,38 +187,175 @@ def main(argv: Sequence[str] | None = None) -> int:
     if missing_dirs:
         print(f"Configured directories do not exist: {', '.join(missing_dirs)}", file=sys.stderr)
         return 2
+    if args.command == "coordinator":
+        return _run_coordinator(args, config=config, request=request)
+
+    try:
+        ledger = JobLedger(args.job_ledger or config.job_ledger_path)
+    except Exception as exc:  # noqa: BLE001
+        print(f"Failed to open job ledger: {exc}", file=sys.stderr)
+        return 2
+    if args.resume:
+        try:
+            ledger.get_job(args.resume)
+        except LookupError as exc:
+            print(str(exc), file=sys.stderr)
+            ledger.close()
+            return 2
+    job_id = args.resume or uuid4().hex
+    print(f"Ingestion job {job_id}", file=sys.stderr)
 
     try:
         services, embedding_client, db_client = create_pipeline_runtime(config)
     except Exception as exc:  # noqa: BLE001
         print(f"Failed to initialize services: {exc}", file=sys.stderr)
+        ledger.close()
         return 2
 
+    profiling = (
+        profile_session(args.profile, name=_profile_name(args.pipeline_id or config.pipeline_id))
+        if args.profile
+        else contextlib.nullcontext(None)
+    )
     try:
-        result = run_ingestion_job(
-            request=request,
-            config=config,
-            services=services,
-        )
+        with profiling as session:
+            if session is not None:
+                services = replace(services, tracer=session[0])
+            result = run_ingestion_job(
+                request=request,
+                config=config,
+                services=services,
+                ledger=ledger,
+                job_id=job_id,
+                resume=bool(args.resume),
+            )
+        if session is not None:
+            artifacts = session[1]
+            print(
+                f"Profile: {artifacts.profile_path} (summary {artifacts.summary_path}), trace: {artifacts.trace_path}",
+                file=sys.stderr,
+            )
     except FileNotFoundError as exc:
         print(str(exc), file=sys.stderr)
         cleanup_runtime(embedding_client, db_client)
+        ledger.close()
         return 2
     except Exception as exc:  # noqa: BLE001
-        get_logger(__name__).exception("cli_ingestion_failed", error=str(exc))
+        get_logger(__name__).exception("cli_ingestion_failed", error=str(exc), job_id=job_id)
+        print(f"Ingestion failed; resume with --resume {job_id}", file=sys.stderr)
         cleanup_runtime(embedding_client, db_client)
+        ledger.close()
         return 1
 
     cleanup_runtime(embedding_client, db_client)
+    ledger.close()
+    pushgateway = args.metrics_pushgateway or config.metrics_pushgateway
+    if pushgateway:
+        get_metrics().push(pushgateway, job="rag_ingestion", grouping_key={"pipeline_id": result.pipeline_id})
     _render_output(result=result, output_format=args.output_format)
     return 0 if result.stats.documents_failed == 0 else 1
 
 
+def _run_coordinator(args: argparse.Namespace, *, config: RagIngestionConfig, request: IngestionRequest) -> int:
+    if not config.database_url:
+        print("RAG_DATABASE_URL must be configured.", file=sys.stderr)
+        return 2
+    try:
+        db_client = PsycopgDatabaseClient(config.database_url)
+    except Exception as exc:  # noqa: BLE001
+        print(f"Failed to connect to the database: {exc}", file=sys.stderr)
+        return 2
+    try:
+        queue = PostgresWorkQueue(db_client, config)
+        queue.ensure_table()
+        job_id, discovered = enqueue_ingestion_job(queue, request, config=config, job_id=args.job_id)
+        print(f"Ingestion job {job_id}: {discovered} documents enqueued", file=sys.stderr)
+        if not args.wait:
+            print(job_id)
+            return 0
+        counts = wait_for_queue_job(queue, job_id, poll_interval_seconds=args.poll_interval)
+        failed = queue.failed_items(job_id)
+    except FileNotFoundError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    except Exception as exc:  # noqa: BLE001
+        get_logger(__name__).exception("cli_coordinator_failed", error=str(exc))
+        return 1
+    finally:
+        db_client.close()
+    print(f"Job: {job_id}")
+    print(
+        "Documents - enqueued: {total}, done: {done}, failed: {fail}".format(
+            total=sum(counts.values()),
+            done=counts.get("done", 0),
+            fail=counts.get("failed", 0),
+        ),
+    )
+    if failed:
+        print("Failed documents:")
+        for item in failed:
+            print(f" - {item.location} (attempts {item.attempts}): {item.error}")
+    return 0 if not failed else 1
+
+
+def _run_worker(args: argparse.Namespace) -> int:
+    config = get_rag_ingestion_config()
+    try:
+        services, embedding_client, db_client = create_pipeline_runtime(config)
+    except Exception as exc:  # noqa: BLE001
+        print(f"Failed to initialize services: {exc}", file=sys.stderr)
+        return 2
+    try:
+        # Queue calls get their own connections so lease heartbeats never
+        # wait behind a large chunk insert.
+        queue_db = PsycopgDatabaseClient(config.database_url, pool_size=2)
+    except Exception as exc:  # noqa: BLE001
+        print(f"Failed to connect to the database: {exc}", file=sys.stderr)
+        cleanup_runtime(embedding_client, db_client)
+        return 2
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_args: stop.set())
+    worker_id = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    try:
+        stats = run_queue_worker(
+            PostgresWorkQueue(queue_db, config),
+            services=services,
+            worker_id=worker_id,
+            config=config,
+            job_id=args.job_id,
+            visibility_timeout_seconds=args.visibility_timeout,
+            poll_interval_seconds=args.poll_interval,
+            exit_when_idle=args.exit_when_idle,
+            max_items=args.max_items,
+            stop_event=stop,
+        )
+    except Exception as exc:  # noqa: BLE001
+        get_logger(__name__).exception("cli_worker_failed", worker_id=worker_id, error=str(exc))
+        return 1
+    finally:
+        queue_db.close()
+        cleanup_runtime(embedding_client, db_client)
+    print(f"Worker: {worker_id}")
+    print(
+        "Documents - ingested: {ing}, skipped: {skip}, retried: {retry}, failed: {fail}, lease lost: {lost}".format(
+            ing=stats.ingested,
+            skip=stats.skipped,
+            retry=stats.retried,
+            fail=stats.failed,
+            lost=stats.lease_lost,
+        ),
+    )
+    return 0 if stats.failed == 0 else 1
+
+
 def _render_output(result: IngestionResult, output_format: str) -> None:
     if output_format == "json":
         print(json.dumps(result.model_dump(), indent=2, sort_keys=True))
         return
     print(f"Pipeline: {result.pipeline_id}")
+    if result.job_id:
+        print(f"Job: {result.job_id}")
     print(f"Duration: {result.duration_seconds:.2f}s")
     print(
         "Documents - discovered: {disc}, ingested: {ing}, failed: {fail}".format(
@@ -141,6 +372,12 @@ def _render_output(result: IngestionResult, output_format: str) -> None:
             print(f" - {doc.location}: {doc.error}")
 
 
+def _profile_name(pipeline_id: str) -> str:
+    timestamp = datetime.now(tz=timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    safe_id = "".join(char if char.isalnum() or char in "-_" else "_" for char in pipeline_id)
+    return f"ingestion-{safe_id}-{timestamp}"
+
+
 def _detect_version() -> str:
     try:
         result = subprocess.run(
@@ -7,6 +7,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable
 
+EMBEDDING_RUNTIMES: tuple[str, ...] = ("torch", "onnx")
+
 DEFAULT_SUPPORTED_EXTENSIONS: tuple[str, ...] = (
     ".pdf",
     ".docx",
@@ -32,6 +34,8 @@ class RagIngestionConfig:
         chunk_min_chars: Minimum character count per chunk before merging.
         chunk_max_chars: Maximum character count per chunk before splitting.
         chunk_overlap_chars: Desired overlap between neighbouring chunks.
+        chunk_max_tokens: Maximum tokens per chunk so embeddings are never
+            silently truncated by the model's context window.
         docling_chunk_target_tokens: Target number of tokens handed to
             Docling's HybridChunker.
         docling_language: Language hint for Docling tokenisation.
@@ -39,7 +43,20 @@ class RagIngestionConfig:
         use_fine_tuned_embeddings: Toggle enabling a fine-tuned local model.
         fine_tuned_model_path: Filesystem path to the fine-tuned model when the
             flag above is enabled.
-        embedding_batch_size: Number of chunks embedded per batch.
+        embedding_runtime: Inference runtime for the fine-tuned model,
+            ``torch`` (SentenceTransformer) or ``onnx`` (ONNX Runtime on CPU).
+        onnx_quantize: Serve the int8 dynamically quantized ONNX export.
+        onnx_intra_op_threads: ONNX Runtime intra-op threads (0 lets the
+            runtime choose).
+        embedding_sidecar_socket: Unix socket of a shared local embedding
+            sidecar; when set, clients delegate embedding to it instead of
+            loading a model per process.
+        embedding_sidecar_max_batch_items: Sidecar dynamic batching item cap.
+        embedding_sidecar_max_wait_ms: How long the sidecar holds a request
+            waiting for others to batch with.
+        embedding_batch_size: Maximum number of chunks embedded per batch.
+        embedding_batch_max_tokens: Token budget per embedding batch; batches
+            close early once the budget would be exceeded.
         embedding_retry_count: Total embedding retry attempts for transient
             failures.
         embedding_timeout_seconds: Per-request timeout for embedding calls.
@@ -53,6 +70,26 @@ class RagIngestionConfig:
         force_reingest: When true, every discovered document is re-processed
             regardless of stored content hashes.
         pipeline_id: Identifier emitted in logs/metrics to disambiguate runs.
+        metrics_pushgateway: Prometheus Pushgateway address that CLI runs push
+            their metrics to on completion; ``None`` disables pushing.
+        embedding_circuit_failure_rate: Failure rate over recent embedding
+            calls that opens the circuit.
+        embedding_circuit_open_seconds: How long an open embedding circuit
+            fails fast before admitting a probe.
+        embedding_hedging_enabled: Fire a duplicate embedding request when
+            one runs past the observed p95 latency.
+        embedding_requests_per_second: Client-side cap on embedding API
+            requests per second (0 leaves it unlimited until a 429).
+        embedding_tokens_per_minute: Client-side cap on input tokens sent to
+            the embedding API per minute (0 disables the quota).
+        job_ledger_path: SQLite file that records ingestion job progress so an
+            interrupted CLI run can be resumed with ``--resume``.
+        work_queue_table: Table in ``supabase_schema`` that holds queued
+            documents for distributed (coordinator/worker) ingestion.
+        work_queue_visibility_seconds: How long a leased document stays
+            hidden from other workers; workers extend the lease while busy.
+        work_queue_max_attempts: Leases a queued document gets before it is
+            marked failed.
     """
 
     source_directories: list[Path]
@@ -60,12 +97,20 @@ class RagIngestionConfig:
     chunk_min_chars: int
     chunk_max_chars: int
     chunk_overlap_chars: int
+    chunk_max_tokens: int
     docling_chunk_target_tokens: int
     docling_language: str
     embedding_model: str
     use_fine_tuned_embeddings: bool
     fine_tuned_model_path: Path | None
+    embedding_runtime: str
+    onnx_quantize: bool
+    onnx_intra_op_threads: int
+    embedding_sidecar_socket: Path | None
+    embedding_sidecar_max_batch_items: int
+    embedding_sidecar_max_wait_ms: float
     embedding_batch_size: int
+    embedding_batch_max_tokens: int
     embedding_retry_count: int
     embedding_timeout_seconds: int
     embedding_retry_backoff_seconds: float
@@ -76,6 +121,16 @@ class RagIngestionConfig:
     chunks_table: str
     force_reingest: bool
     pipeline_id: str
+    metrics_pushgateway: str | None = None
+    embedding_circuit_failure_rate: float = 0.5
+    embedding_circuit_open_seconds: float = 30.0
+    embedding_hedging_enabled: bool = False
+    embedding_requests_per_second: float = 0.0
+    embedding_tokens_per_minute: float = 0.0
+    job_ledger_path: Path = Path(".rag_ingestion_jobs.sqlite3")
+    work_queue_table: str = "ingestion_queue"
+    work_queue_visibility_seconds: float = 300.0
+    work_queue_max_attempts: int = 3
 
     def require_sources(self) -> None:
         """Ensure at least one source directory exists on disk."""
@@ -117,12 +172,19 @@ def get_rag_ingestion_config() -> RagIngestionConfig:
         if fine_tuned_raw
         else None
     )
+    embedding_runtime: str = os.getenv("RAG_EMBEDDING_RUNTIME", "torch").strip().lower()
+    if embedding_runtime not in EMBEDDING_RUNTIMES:
+        raise ValueError(
+            f"Invalid RAG_EMBEDDING_RUNTIME: {embedding_runtime} (expected one of {', '.join(EMBEDDING_RUNTIMES)})",
+        )
+    sidecar_raw: str | None = os.getenv("RAG_EMBEDDING_SIDECAR_SOCKET")
     return RagIngestionConfig(
         source_directories=source_directories,
         supported_extensions=supported_extensions,
         chunk_min_chars=_get_int("RAG_CHUNK_MIN_CHARS", default=400),
         chunk_max_chars=_get_int("RAG_CHUNK_MAX_CHARS", default=1000),
         chunk_overlap_chars=_get_int("RAG_CHUNK_OVERLAP_CHARS", default=60),
+        chunk_max_tokens=_get_int("RAG_CHUNK_MAX_TOKENS", default=512),
         docling_chunk_target_tokens=_get_int(
             "RAG_DOCLING_TARGET_TOKENS",
             default=280,
@@ -134,7 +196,14 @@ def get_rag_ingestion_config() -> RagIngestionConfig:
         ),
         use_fine_tuned_embeddings=use_fine_tuned_embeddings,
         fine_tuned_model_path=fine_tuned_model_path,
+        embedding_runtime=embedding_runtime,
+        onnx_quantize=_get_bool("RAG_ONNX_QUANTIZE", default=False),
+        onnx_intra_op_threads=_get_int("RAG_ONNX_INTRA_OP_THREADS", 0),
+        embedding_sidecar_socket=Path(sidecar_raw).expanduser() if sidecar_raw else None,
+        embedding_sidecar_max_batch_items=_get_int("RAG_EMBEDDING_SIDECAR_MAX_BATCH", 64),
+        embedding_sidecar_max_wait_ms=_get_float("RAG_EMBEDDING_SIDECAR_MAX_WAIT_MS", 5.0),
         embedding_batch_size=_get_int("RAG_EMBEDDING_BATCH_SIZE", 8),
+        embedding_batch_max_tokens=_get_int("RAG_EMBEDDING_BATCH_MAX_TOKENS", 4096),
         embedding_retry_count=_get_int("RAG_EMBEDDING_RETRY_COUNT", 1),
         embedding_timeout_seconds=_get_int(
             "RAG_EMBEDDING_TIMEOUT_SECONDS",
@@ -151,6 +220,16 @@ def get_rag_ingestion_config() -> RagIngestionConfig:
         chunks_table=os.getenv("RAG_CHUNKS_TABLE", "chunks"),
         force_reingest=_get_bool("RAG_FORCE_REINGEST", default=False),
         pipeline_id=os.getenv("RAG_PIPELINE_ID", "local-dev"),
+        metrics_pushgateway=os.getenv("RAG_METRICS_PUSHGATEWAY") or None,
+        embedding_circuit_failure_rate=_get_float("RAG_EMBEDDING_CIRCUIT_FAILURE_RATE", 0.5),
+        embedding_circuit_open_seconds=_get_float("RAG_EMBEDDING_CIRCUIT_OPEN_SECONDS", 30.0),
+        embedding_hedging_enabled=_get_bool("RAG_EMBEDDING_HEDGING_ENABLED", default=False),
+        embedding_requests_per_second=_get_float("RAG_EMBEDDING_REQUESTS_PER_SECOND", 0.0),
+        embedding_tokens_per_minute=_get_float("RAG_EMBEDDING_TOKENS_PER_MINUTE", 0.0),
+        job_ledger_path=Path(os.getenv("RAG_JOB_LEDGER_PATH", ".rag_ingestion_jobs.sqlite3")).expanduser(),
+        work_queue_table=os.getenv("RAG_WORK_QUEUE_TABLE", "ingestion_queue"),
+        work_queue_visibility_seconds=_get_float("RAG_WORK_QUEUE_VISIBILITY_SECONDS", 300.0),
+        work_queue_max_attempts=_get_int("RAG_WORK_QUEUE_MAX_ATTEMPTS", 3),
     )
 
 
@@ -0,0 +1,189 @@
+"""Pack retrieved chunks into an LLM prompt under a token budget.
+
+Packing runs in three passes:
+
+1. Chunks whose text is contained in a higher-scoring chunk from the same
+   source are dropped as duplicates.
+2. Chunks of the same source with consecutive ``chunk_index`` values (taken
+   from ``metadata["chunk_index"]``) are merged into one block, with any text
+   overlap between them removed.
+3. Blocks are ranked by score per token and added greedily until the budget
+   is spent.
+
+Token counts use the same heuristic as the chunker, so no tokenizer is
+loaded on the request path.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, replace
+from typing import Callable, Sequence
+
+from src.rag_pipeline.chunking.docling_chunker import TokenCounter, estimate_token_counts
+from src.rag_pipeline.retrieval import RetrievedChunk
+
+_WHITESPACE = re.compile(r"\s+")
+_MIN_OVERLAP_CHARS = 16
+_MAX_OVERLAP_CHARS = 1024
+
+
+@dataclass(frozen=True, slots=True)
+class PackedContext:
+    """Result of packing retrieved chunks for a prompt.
+
+    Attributes:
+        blocks: Context blocks to send, best score first. Merged neighbours
+            appear as one block.
+        included: Original chunks whose text made it into ``blocks``; use
+            these for citations.
+        tokens_retrieved: Tokens of every retrieved chunk rendered on its own.
+        tokens_used: Tokens of the packed blocks.
+        tokens_saved: ``tokens_retrieved - tokens_used``.
+        duplicates_dropped: Chunks removed as contained in another chunk.
+        chunks_merged: Chunks folded into a neighbouring block.
+        blocks_dropped: Blocks that did not fit in the budget.
+    """
+
+    blocks: list[RetrievedChunk]
+    included: list[RetrievedChunk]
+    tokens_retrieved: int
+    tokens_used: int
+    duplicates_dropped: int
+    chunks_merged: int
+    blocks_dropped: int
+
+    @property
+    def tokens_saved(self) -> int:
+        """Prompt tokens avoided compared to sending every chunk."""
+        return max(0, self.tokens_retrieved - self.tokens_used)
+
+
+@dataclass(slots=True)
+class _Block:
+    chunk: RetrievedChunk
+    members: list[RetrievedChunk]
+    last_index: int | None
+
+
+def pack_context(
+    chunks: Sequence[RetrievedChunk],
+    *,
+    token_budget: int,
+    format_block: Callable[[RetrievedChunk], str] = lambda chunk: chunk.content,
+    token_counter: TokenCounter = estimate_token_counts,
+) -> PackedContext:
+    """Deduplicate, merge and budget retrieved chunks.
+
+    Args:
+        chunks: Retrieved chunks in any order.
+        token_budget: Maximum prompt tokens for the rendered blocks.
+        format_block: Renders a block exactly as it will appear in the prompt;
+            token costs are measured on this text.
+        token_counter: Batch token counter.
+
+    Returns:
+        PackedContext with the selected blocks and token accounting.
+    """
+    if not chunks:
+        return PackedContext([], [], 0, 0, 0, 0, 0)
+    tokens_retrieved = sum(token_counter([format_block(chunk) for chunk in chunks]))
+    unique = _drop_contained(chunks)
+    blocks = _merge_neighbours(unique)
+    costs = token_counter([format_block(block.chunk) for block in blocks])
+    ranked = sorted(
+        zip(blocks, costs),
+        key=lambda item: item[0].chunk.score / max(1, item[1]),
+        reverse=True,
+    )
+    selected: list[tuple[_Block, int]] = []
+    remaining = token_budget
+    for block, cost in ranked:
+        if cost <= remaining:
+            selected.append((block, cost))
+            remaining -= cost
+    if not selected and token_budget > 0:
+        best, cost = max(zip(blocks, costs), key=lambda item: item[0].chunk.score)
+        truncated = _truncate(best.chunk, cost=cost, budget=token_budget)
+        selected.append((_Block(truncated, best.members, best.last_index), token_budget))
+    selected.sort(key=lambda item: item[0].chunk.score, reverse=True)
+    return PackedContext(
+        blocks=[block.chunk for block, _cost in selected],
+        included=[member for block, _cost in selected for member in block.members],
+        tokens_retrieved=tokens_retrieved,
+        tokens_used=sum(cost for _block, cost in selected),
+        duplicates_dropped=len(chunks) - len(unique),
+        chunks_merged=len(unique) - len(blocks),
+        blocks_dropped=len(blocks) - len(selected),
+    )
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip().casefold()
+
+
+def _chunk_index(chunk: RetrievedChunk) -> int | None:
+    value = chunk.metadata.get("chunk_index")
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def _drop_contained(chunks: Sequence[RetrievedChunk]) -> list[RetrievedChunk]:
+    kept: list[tuple[RetrievedChunk, str]] = []
+    seen_ids: set[str] = set()
+    for chunk in sorted(chunks, key=lambda item: (-item.score, -len(item.content))):
+        if chunk.chunk_id in seen_ids:
+            continue
+        normalized = _normalize(chunk.content)
+        if any(
+            other.source_id == chunk.source_id and normalized in other_text for other, other_text in kept
+        ):
+            continue
+        seen_ids.add(chunk.chunk_id)
+        kept.append((chunk, normalized))
+    return [chunk for chunk, _text in kept]
+
+
+def _merge_neighbours(chunks: Sequence[RetrievedChunk]) -> list[_Block]:
+    indexed = [chunk for chunk in chunks if _chunk_index(chunk) is not None]
+    blocks: list[_Block] = [_Block(chunk, [chunk], None) for chunk in chunks if _chunk_index(chunk) is None]
+    indexed.sort(key=lambda chunk: (chunk.source_id, _chunk_index(chunk)))
+    current: _Block | None = None
+    for chunk in indexed:
+        index = _chunk_index(chunk)
+        if (
+            current is not None
+            and current.chunk.source_id == chunk.source_id
+            and current.last_index is not None
+            and index == current.last_index + 1
+        ):
+            current.chunk = replace(
+                current.chunk,
+                content=_join_overlapping(current.chunk.content, chunk.content),
+                score=max(current.chunk.score, chunk.score),
+            )
+            current.members.append(chunk)
+            current.last_index = index
+            continue
+        current = _Block(chunk, [chunk], index)
+        blocks.append(current)
+    return blocks
+
+
+def _join_overlapping(first: str, second: str) -> str:
+    """Concatenate two neighbouring chunks, dropping text repeated at the seam."""
+    limit = min(len(first), len(second), _MAX_OVERLAP_CHARS)
+    for size in range(limit, _MIN_OVERLAP_CHARS - 1, -1):
+        if first.endswith(second[:size]):
+            return first + second[size:]
+    return f"{first}\n{second}"
+
+
+def _truncate(chunk: RetrievedChunk, *, cost: int, budget: int) -> RetrievedChunk:
+    keep_chars = max(1, len(chunk.content) * budget // max(1, cost))
+    return replace(chunk, content=chunk.content[:keep_chars])
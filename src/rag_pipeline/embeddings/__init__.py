@@ -1,7 +1,16 @@
-"""Embedding utilities and clients used by the ingestion pipeline."""
+"""Embedding utilities and clients used by the ingestion pipeline.
+
+Importing this package must stay cheap: backends import torch,
+sentence-transformers, transformers and onnxruntime only when they are
+constructed. ``train`` needs torch at module level, so its names are
+resolved lazily through ``__getattr__``.
+"""
 
 from __future__ import annotations
 
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from .client_types import (
     EmbeddingBatchMetrics,
     EmbeddingClientProtocol,
@@ -10,9 +19,15 @@ from .client_types import (
 )
 from .factory import create_embedding_client
 from .local_client import SentenceTransformerEmbeddingClient
+from .onnx_client import (
+    OnnxEmbeddingClient,
+    OnnxParityReport,
+    evaluate_onnx_parity,
+    export_onnx_model,
+)
 from .qwen_client import EmbeddingError, QwenEmbeddingClient
+from .sidecar_client import SidecarEmbeddingClient
 from .manifest import ArtifactManifest, load_manifest, manifest_path, save_manifest
-from .train import TrainingConfig, TrainingResult, train_model
 from .eval import (
     EvaluationReport,
     EvaluationRequest,
@@ -21,6 +36,15 @@ from .eval import (
     write_report,
 )
 
+if TYPE_CHECKING:
+    from .train import TrainingConfig, TrainingResult, train_model
+
+_LAZY_ATTRIBUTES: dict[str, str] = {
+    "TrainingConfig": ".train",
+    "TrainingResult": ".train",
+    "train_model": ".train",
+}
+
 __all__ = [
     "EmbeddingBatchMetrics",
     "EmbeddingClientProtocol",
@@ -32,8 +56,13 @@ __all__ = [
     "EvaluationReport",
     "EvaluationRequest",
     "ModelEvaluation",
+    "OnnxEmbeddingClient",
+    "OnnxParityReport",
     "SentenceTransformerEmbeddingClient",
+    "SidecarEmbeddingClient",
     "create_embedding_client",
+    "evaluate_onnx_parity",
+    "export_onnx_model",
     "TrainingConfig",
     "TrainingResult",
     "load_manifest",
@@ -43,3 +72,12 @@ __all__ = [
     "train_model",
     "write_report",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,108 @@
+"""Token-budget-aware batch planning for embedding requests."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+from src.rag_pipeline.chunking.docling_chunker import TokenCounter, estimate_token_counts
+
+
+@dataclass(frozen=True, slots=True)
+class PlannedBatch:
+    """A group of input positions embedded together in one request.
+
+    Attributes:
+        indices: Positions of the batch members in the original input.
+        token_counts: Token count for each member, aligned with ``indices``.
+    """
+
+    indices: tuple[int, ...]
+    token_counts: tuple[int, ...]
+
+    @property
+    def token_total(self) -> int:
+        """Return the number of real (non-padding) tokens in the batch."""
+        return sum(self.token_counts)
+
+    @property
+    def padded_tokens(self) -> int:
+        """Return the token slots used once every member is padded to the longest."""
+        if not self.token_counts:
+            return 0
+        return max(self.token_counts) * len(self.token_counts)
+
+    @property
+    def padding_efficiency(self) -> float:
+        """Return the share of padded token slots holding real tokens."""
+        padded = self.padded_tokens
+        return self.token_total / float(padded) if padded else 1.0
+
+
+def plan_batches(
+    texts: Sequence[str],
+    *,
+    max_items: int,
+    max_tokens: int | None = None,
+    token_counter: TokenCounter | None = None,
+    sort_by_length: bool = False,
+) -> list[PlannedBatch]:
+    """Group texts into batches bounded by item count and token budget.
+
+    A text whose own count exceeds ``max_tokens`` is placed in a batch of its
+    own rather than rejected; truncation is the chunker's concern.
+
+    Args:
+        texts: Inputs to embed.
+        max_items: Maximum number of texts per batch.
+        max_tokens: Optional token budget per batch; ``None`` batches by item
+            count only.
+        token_counter: Batch token counter (defaults to the chunker heuristic).
+        sort_by_length: Group texts of similar length together to minimise
+            padding. The budget then bounds padded tokens (what a local model
+            actually computes) rather than real tokens. Callers must scatter
+            results back using ``indices``.
+
+    Returns:
+        Planned batches covering every input position exactly once.
+    """
+    if max_items <= 0:
+        raise ValueError("max_items must be greater than zero.")
+    if max_tokens is not None and max_tokens <= 0:
+        raise ValueError("max_tokens must be greater than zero when provided.")
+    if not texts:
+        return []
+    counter = token_counter or estimate_token_counts
+    counts = counter(texts)
+    order: list[int] = list(range(len(texts)))
+    if sort_by_length:
+        order.sort(key=counts.__getitem__)
+    batches: list[PlannedBatch] = []
+    current: list[int] = []
+    current_tokens = 0
+    current_longest = 0
+    for index in order:
+        count = counts[index]
+        if sort_by_length:
+            projected = max(current_longest, count) * (len(current) + 1)
+        else:
+            projected = current_tokens + count
+        over_budget = max_tokens is not None and projected > max_tokens
+        if current and (len(current) >= max_items or over_budget):
+            batches.append(_build_batch(current, counts))
+            current = []
+            current_tokens = 0
+            current_longest = 0
+        current.append(index)
+        current_tokens += count
+        current_longest = max(current_longest, count)
+    if current:
+        batches.append(_build_batch(current, counts))
+    return batches
+
+
+def _build_batch(indices: Sequence[int], counts: Sequence[int]) -> PlannedBatch:
+    return PlannedBatch(
+        indices=tuple(indices),
+        token_counts=tuple(counts[index] for index in indices),
+    )
@@ -16,6 +16,8 @@ class EmbeddingBatchMetrics:
     item_count: int
     retry_count: int
     duration_ms: float
+    token_count: int | None = None
+    padding_efficiency: float | None = None
 
 
 @dataclass(frozen=True, slots=True)
@@ -3,13 +3,13 @@
 from __future__ import annotations
 
 import json
-import math
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Callable, Protocol, Sequence, cast
 
-from sentence_transformers import SentenceTransformer
+import numpy as np
+from numpy.typing import NDArray
 
 from src.rag_pipeline.embeddings.data_prep import (
     QueryDocumentPair,
@@ -18,6 +18,8 @@ from src.rag_pipeline.embeddings.data_prep import (
 )
 from src.shared.logging import LoggerProtocol, get_logger
 
+RECALL_CUTOFFS: tuple[int, ...] = (1, 5, 10, 50)
+
 
 class EmbeddingModel(Protocol):
     """Protocol for encoding text into fixed-size embeddings."""
@@ -29,7 +31,7 @@ class EmbeddingModel(Protocol):
         batch_size: int | None = None,
         convert_to_numpy: bool = False,
         normalize_embeddings: bool | None = None,
-    ) -> list[list[float]]:
+    ) -> list[list[float]] | NDArray[np.floating]:
         """Encode text into embeddings."""
 
     def get_sentence_embedding_dimension(self) -> int:
@@ -41,17 +43,28 @@ ModelLoader = Callable[[str], EmbeddingModel]
 
 @dataclass(frozen=True, slots=True)
 class EvaluationRequest:
-    """Parameters required to run an evaluation."""
+    """Parameters required to run an evaluation.
+
+    ``query_block_size`` bounds memory: queries are scored against the whole
+    corpus in blocks, so the score matrix never exceeds
+    ``query_block_size x len(pairs)`` floats.
+    """
 
     validation_path: Path
     base_model_path: str
     tuned_model_path: str
     top_k: int = 5
+    query_block_size: int = 1024
 
 
 @dataclass(frozen=True, slots=True)
 class ModelEvaluation:
-    """Computed metrics for a single model."""
+    """Computed metrics for a single model.
+
+    ``recall_at`` maps each cutoff in ``RECALL_CUTOFFS`` (plus ``top_k``) to
+    its recall; ``ndcg_at_k`` uses ``top_k`` with the paired document as the
+    single relevant item.
+    """
 
     model_name: str
     recall_at_k: float
@@ -60,6 +73,9 @@ class ModelEvaluation:
     top_k: int
     dataset_fingerprint: str
     embedding_dimension: int
+    mrr: float = 0.0
+    ndcg_at_k: float = 0.0
+    recall_at: dict[int, float] = field(default_factory=dict)
 
 
 @dataclass(frozen=True, slots=True)
@@ -97,6 +113,8 @@ def run_evaluation(
         raise ValueError("Validation dataset is empty; cannot compute recall@k.")
     if request.top_k <= 0:
         raise ValueError("top_k must be greater than zero.")
+    if request.query_block_size <= 0:
+        raise ValueError("query_block_size must be greater than zero.")
     dataset_fingerprint = compute_fingerprint(pairs)
     loader = model_loader or _default_model_loader
     base_model = loader(request.base_model_path)
@@ -115,6 +133,7 @@ def run_evaluation(
         model_name=request.base_model_path,
         top_k=request.top_k,
         dataset_fingerprint=dataset_fingerprint,
+        query_block_size=request.query_block_size,
     )
     tuned_metrics = _compute_metrics(
         pairs=pairs,
@@ -122,6 +141,7 @@ def run_evaluation(
         model_name=request.tuned_model_path,
         top_k=request.top_k,
         dataset_fingerprint=dataset_fingerprint,
+        query_block_size=request.query_block_size,
     )
     report = EvaluationReport(
         created_at=datetime.now(tz=timezone.utc).isoformat(),
@@ -134,6 +154,8 @@ def run_evaluation(
         dataset_fingerprint=dataset_fingerprint,
         base_recall_at_k=base_metrics.recall_at_k,
         tuned_recall_at_k=tuned_metrics.recall_at_k,
+        base_mrr=base_metrics.mrr,
+        tuned_mrr=tuned_metrics.mrr,
         top_k=request.top_k,
     )
     return report
@@ -157,54 +179,105 @@ def _compute_metrics(
     model_name: str,
     top_k: int,
     dataset_fingerprint: str,
+    query_block_size: int = 1024,
 ) -> ModelEvaluation:
-    """Compute recall@k and mean rank for a single model.
+    """Compute rank-based retrieval metrics for a single model.
+
+    Query ``i`` is paired with document ``i``. Cosine scores are computed one
+    query block at a time with a matrix multiply; the rank of the paired
+    document is the number of documents that outscore it (ties broken by
+    corpus order), so every metric comes out of the same pass.
 
     Args:
         pairs: Validation pairs used for evaluation.
         model: Model used to encode queries/documents.
         model_name: Human-readable identifier for the model.
-        top_k: Recall@k cutoff.
+        top_k: Recall@k and nDCG@k cutoff.
         dataset_fingerprint: Fingerprint shared by the evaluation dataset.
+        query_block_size: Queries scored per matrix multiply.
 
     Returns:
         ModelEvaluation populated with computed metrics.
     """
     documents = [pair.document for pair in pairs]
     queries = [pair.query for pair in pairs]
-    document_embeddings = model.encode(documents, convert_to_numpy=False, normalize_embeddings=True)
-    query_embeddings = model.encode(queries, convert_to_numpy=False, normalize_embeddings=True)
+    document_embeddings = _as_unit_matrix(
+        model.encode(documents, convert_to_numpy=True, normalize_embeddings=True),
+    )
+    query_embeddings = _as_unit_matrix(
+        model.encode(queries, convert_to_numpy=True, normalize_embeddings=True),
+    )
     _validate_dimensions(document_embeddings=document_embeddings, query_embeddings=query_embeddings)
-    recall_hits = 0
-    ranks: list[int] = []
-    for index, query_embedding in enumerate(query_embeddings):
-        scores = [
-            _cosine_similarity(query_embedding, document_embedding)
-            for document_embedding in document_embeddings
-        ]
-        sorted_indices = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
-        rank = sorted_indices.index(index) + 1
-        ranks.append(rank)
-        if rank <= top_k:
-            recall_hits += 1
-    total = len(pairs)
-    recall_at_k = recall_hits / float(total) if total > 0 else 0.0
-    mean_rank = sum(ranks) / float(total) if total > 0 else 0.0
+    ranks = _paired_ranks(query_embeddings, document_embeddings, block_size=query_block_size)
+    cutoffs = sorted({*RECALL_CUTOFFS, top_k})
+    recall_at = {cutoff: float(np.mean(ranks <= cutoff)) for cutoff in cutoffs}
+    ndcg = np.where(ranks <= top_k, 1.0 / np.log2(ranks + 1.0), 0.0)
     return ModelEvaluation(
         model_name=model_name,
-        recall_at_k=recall_at_k,
-        mean_rank=mean_rank,
-        total_queries=total,
+        recall_at_k=recall_at[top_k],
+        mean_rank=float(np.mean(ranks)),
+        total_queries=len(pairs),
         top_k=top_k,
         dataset_fingerprint=dataset_fingerprint,
-        embedding_dimension=len(document_embeddings[0]),
+        embedding_dimension=int(document_embeddings.shape[1]),
+        mrr=float(np.mean(1.0 / ranks)),
+        ndcg_at_k=float(np.mean(ndcg)),
+        recall_at=recall_at,
     )
 
 
+def _paired_ranks(
+    query_embeddings: NDArray[np.float32],
+    document_embeddings: NDArray[np.float32],
+    *,
+    block_size: int,
+) -> NDArray[np.int64]:
+    """Return the 1-based rank of document ``i`` for each query ``i``.
+
+    Args:
+        query_embeddings: Unit-normalised query matrix ``(n, dim)``.
+        document_embeddings: Unit-normalised document matrix ``(n, dim)``.
+        block_size: Queries scored per matrix multiply.
+
+    Returns:
+        Integer array of ranks.
+    """
+    total = query_embeddings.shape[0]
+    ranks = np.empty(total, dtype=np.int64)
+    for start in range(0, total, block_size):
+        stop = min(start + block_size, total)
+        scores = query_embeddings[start:stop] @ document_embeddings.T
+        rows = np.arange(stop - start)
+        targets = scores[rows, rows + start][:, None]
+        block_ranks = np.count_nonzero(scores > targets, axis=1) + 1
+        tied = np.count_nonzero(scores == targets, axis=1) > 1
+        for row in np.flatnonzero(tied):
+            position = start + row
+            block_ranks[row] += np.count_nonzero(scores[row, :position] == targets[row, 0])
+        ranks[start:stop] = block_ranks
+    return ranks
+
+
+def _as_unit_matrix(embeddings: Sequence[Sequence[float]] | NDArray[np.floating]) -> NDArray[np.float32]:
+    """Convert encoder output to a row-normalised float32 matrix.
+
+    Args:
+        embeddings: Encoder output (list of vectors or array).
+
+    Returns:
+        Matrix whose non-zero rows have unit L2 norm.
+    """
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim != 2:
+        matrix = matrix.reshape(len(matrix), -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0.0, 1.0, norms)
+
+
 def _validate_dimensions(
     *,
-    document_embeddings: Sequence[Sequence[float]],
-    query_embeddings: Sequence[Sequence[float]],
+    document_embeddings: NDArray[np.float32],
+    query_embeddings: NDArray[np.float32],
 ) -> None:
     """Ensure embeddings are non-empty and share the same dimensionality.
 
@@ -215,10 +288,10 @@ def _validate_dimensions(
     Raises:
         ValueError: If embeddings are empty or dimensions mismatch.
     """
-    if not document_embeddings or not query_embeddings:
+    if document_embeddings.shape[0] == 0 or query_embeddings.shape[0] == 0:
         raise ValueError("Embeddings must not be empty.")
-    doc_dim = len(document_embeddings[0])
-    query_dim = len(query_embeddings[0])
+    doc_dim = document_embeddings.shape[1]
+    query_dim = query_embeddings.shape[1]
     if doc_dim == 0 or query_dim == 0:
         raise ValueError("Embedding vectors must contain at least one dimension.")
     if doc_dim != query_dim:
@@ -227,28 +300,6 @@ def _validate_dimensions(
         )
 
 
-def _cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
-    """Compute cosine similarity between two vectors.
-
-    Args:
-        a: First embedding vector.
-        b: Second embedding vector.
-
-    Returns:
-        Cosine similarity value in the range [-1, 1].
-
-    Raises:
-        ValueError: If vector lengths differ.
-    """
-    if len(a) != len(b):
-        raise ValueError("Cannot compute similarity on vectors of different lengths.")
-    numerator = sum(x * y for x, y in zip(a, b))
-    denominator = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
-    if denominator == 0.0:
-        return 0.0
-    return numerator / denominator
-
-
 def _default_model_loader(model_name: str) -> EmbeddingModel:
     """Construct a SentenceTransformer model for evaluation.
 
@@ -258,4 +309,6 @@ def _default_model_loader(model_name: str) -> EmbeddingModel:
     Returns:
         Instantiated SentenceTransformer model.
     """
+    from sentence_transformers import SentenceTransformer
+
     return cast(EmbeddingModel, SentenceTransformer(model_name))
@@ -7,8 +7,10 @@ from pathlib import Path
 from src.rag_pipeline.config import RagIngestionConfig
 from src.rag_pipeline.embeddings.client_types import EmbeddingClientProtocol
 from src.rag_pipeline.embeddings.local_client import SentenceTransformerEmbeddingClient
+from src.rag_pipeline.embeddings.onnx_client import OnnxEmbeddingClient
 from src.rag_pipeline.embeddings.manifest import ArtifactManifest, load_manifest, manifest_path
 from src.rag_pipeline.embeddings.qwen_client import QwenEmbeddingClient
+from src.rag_pipeline.embeddings.sidecar_client import SidecarEmbeddingClient
 from src.shared.logging import LoggerProtocol, get_logger
 from src.shared.tracing import Tracer
 
@@ -35,14 +37,49 @@ def create_embedding_client(
         ValueError: If a fine-tuned model is requested but no path is provided.
     """
     log = logger or get_logger(__name__)
+    if config.embedding_sidecar_socket is not None:
+        sidecar_client = SidecarEmbeddingClient(
+            socket_path=config.embedding_sidecar_socket,
+            timeout_seconds=config.embedding_timeout_seconds,
+            tracer=tracer,
+            logger=log,
+        )
+        log.info(
+            "embedding_client_selected",
+            backend="sidecar",
+            socket_path=str(config.embedding_sidecar_socket),
+        )
+        return sidecar_client
     if config.use_fine_tuned_embeddings:
         model_path = config.fine_tuned_model_path
         if model_path is None:
             raise ValueError("EMBEDDING_MODEL_FINE_TUNED_PATH must be set when USE_FINE_TUNED_EMBEDDINGS is true.")
         manifest = _load_manifest_if_present(model_path)
+        if config.embedding_runtime == "onnx":
+            onnx_client = OnnxEmbeddingClient.from_checkpoint(
+                model_path=model_path,
+                quantized=config.onnx_quantize,
+                batch_size=config.embedding_batch_size,
+                max_batch_tokens=config.embedding_batch_max_tokens,
+                intra_op_threads=config.onnx_intra_op_threads,
+                model_label=config.embedding_model,
+                manifest=manifest,
+                tracer=tracer,
+                logger=log,
+            )
+            log.info(
+                "embedding_client_selected",
+                backend="onnx",
+                quantized=config.onnx_quantize,
+                model_label=onnx_client.model_info.model,
+                dataset_fingerprint=onnx_client.model_info.dataset_fingerprint,
+                artifact_version=onnx_client.model_info.artifact_version,
+            )
+            return onnx_client
         client = SentenceTransformerEmbeddingClient(
             model_path=model_path,
             batch_size=config.embedding_batch_size,
+            max_batch_tokens=config.embedding_batch_max_tokens,
             model_label=config.embedding_model,
             manifest=manifest,
             tracer=tracer,
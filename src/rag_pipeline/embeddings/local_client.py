@@ -4,11 +4,17 @@ from __future__ import annotations
 
 from time import perf_counter
 from pathlib import Path
-from typing import Callable, Iterable, Protocol, Sequence, cast
+from typing import Callable, Protocol, Sequence, cast
 from uuid import uuid4
 
-from sentence_transformers import SentenceTransformer
+import numpy as np
 
+from src.rag_pipeline.chunking.docling_chunker import (
+    TokenCounter,
+    build_tokenizer_counter,
+    estimate_token_counts,
+)
+from src.rag_pipeline.embeddings.batching import PlannedBatch, plan_batches
 from src.rag_pipeline.embeddings.client_types import (
     EmbeddingBatchMetrics,
     EmbeddingModelInfo,
@@ -17,6 +23,7 @@ from src.rag_pipeline.embeddings.client_types import (
 from src.rag_pipeline.embeddings.manifest import ArtifactManifest
 from src.rag_pipeline.schemas import ChunkData, EmbeddingRecord
 from src.shared.logging import LoggerProtocol, get_logger
+from src.shared.metrics import get_metrics
 from src.shared.tracing import Tracer, noop_tracer
 
 
@@ -48,6 +55,7 @@ class SentenceTransformerEmbeddingClient:
         *,
         model_path: Path,
         batch_size: int = 8,
+        max_batch_tokens: int | None = None,
         model_label: str | None = None,
         manifest: ArtifactManifest | None = None,
         model_loader: ModelLoader | None = None,
@@ -58,7 +66,8 @@ class SentenceTransformerEmbeddingClient:
 
         Args:
             model_path: Path to the fine-tuned model directory.
-            batch_size: Number of texts to embed per batch.
+            batch_size: Maximum number of texts to embed per batch.
+            max_batch_tokens: Optional padded-token budget per batch.
             model_label: Optional label to emit in embeddings and logs.
             manifest: Optional artifact manifest containing metadata.
             model_loader: Optional loader used to construct the model
@@ -68,10 +77,17 @@ class SentenceTransformerEmbeddingClient:
         """
         self._model_path = model_path
         self._batch_size = max(1, batch_size)
+        self._max_batch_tokens = max_batch_tokens
         self._logger = logger or get_logger(__name__)
         self._tracer = tracer or noop_tracer()
         loader = model_loader or _default_model_loader
         self._model = loader(str(model_path))
+        model_tokenizer = getattr(self._model, "tokenizer", None)
+        self._token_counter: TokenCounter = (
+            build_tokenizer_counter(model_tokenizer)
+            if model_tokenizer is not None
+            else estimate_token_counts
+        )
         self._manifest = manifest
         resolved_label = model_label
         if resolved_label is None and manifest is not None:
@@ -93,6 +109,7 @@ class SentenceTransformerEmbeddingClient:
             "local_embedding_client_initialized",
             model_label=self._model_label,
             batch_size=self._batch_size,
+            max_batch_tokens=self._max_batch_tokens,
             dataset_fingerprint=self.model_info.dataset_fingerprint,
             artifact_version=self.model_info.artifact_version,
         )
@@ -100,6 +117,9 @@ class SentenceTransformerEmbeddingClient:
     def embed_texts(self, texts: Sequence[str], *, correlation_id: str | None = None) -> EmbeddingResponse:
         """Embed the given texts, preserving order.
 
+        Texts are grouped by length before batching to minimise padding, then
+        scattered back into their original positions.
+
         Args:
             texts: Raw text inputs to embed.
             correlation_id: Optional request identifier.
@@ -109,17 +129,28 @@ class SentenceTransformerEmbeddingClient:
         """
         if not texts:
             return EmbeddingResponse(embeddings=[], metrics=[])
-        embeddings: list[EmbeddingRecord] = []
+        ordered: list[EmbeddingRecord | None] = [None] * len(texts)
         metrics: list[EmbeddingBatchMetrics] = []
-        for batch in _batched(texts, self._batch_size):
+        for batch in plan_batches(
+            texts,
+            max_items=self._batch_size,
+            max_tokens=self._max_batch_tokens,
+            token_counter=self._token_counter,
+            sort_by_length=True,
+        ):
             batch_id = uuid4().hex
             batch_embeddings, batch_metric = self._embed_batch(
                 batch_id=batch_id,
-                texts=batch,
+                texts=[texts[index] for index in batch.indices],
                 correlation_id=correlation_id,
+                plan=batch,
             )
-            embeddings.extend(batch_embeddings)
+            for index, embedding in zip(batch.indices, batch_embeddings):
+                ordered[index] = embedding
             metrics.append(batch_metric)
+        embeddings = [embedding for embedding in ordered if embedding is not None]
+        if len(embeddings) != len(texts):
+            raise ValueError("Embedding count mismatch after batch reordering.")
         return EmbeddingResponse(embeddings=embeddings, metrics=metrics)
 
     def embed_document_chunks(
@@ -159,6 +190,7 @@ class SentenceTransformerEmbeddingClient:
         batch_id: str,
         texts: Sequence[str],
         correlation_id: str | None,
+        plan: PlannedBatch | None = None,
     ) -> tuple[list[EmbeddingRecord], EmbeddingBatchMetrics]:
         """Embed a single batch of texts.
 
@@ -166,6 +198,7 @@ class SentenceTransformerEmbeddingClient:
             batch_id: Unique identifier for the batch.
             texts: Texts to embed.
             correlation_id: Optional request identifier.
+            plan: Planned batch used for token and padding metrics.
 
         Returns:
             Tuple of embeddings and batch metrics.
@@ -175,6 +208,7 @@ class SentenceTransformerEmbeddingClient:
             "local_embedding_batch_started",
             batch_id=batch_id,
             item_count=len(texts),
+            token_count=plan.token_total if plan else None,
             model=self._model_label,
             dataset_fingerprint=self.model_info.dataset_fingerprint,
             correlation_id=correlation_id,
@@ -196,18 +230,27 @@ class SentenceTransformerEmbeddingClient:
                 normalize_embeddings=False,
             )
         duration_ms = (perf_counter() - start) * 1000.0
+        get_metrics().observe_embedding_batch(
+            backend="local",
+            duration_seconds=duration_ms / 1000.0,
+            item_count=len(texts),
+        )
         converted = self._convert_vectors(vectors=vectors, sample=texts[0] if texts else "")
         metrics = EmbeddingBatchMetrics(
             batch_id=batch_id,
             item_count=len(texts),
             retry_count=0,
             duration_ms=duration_ms,
+            token_count=plan.token_total if plan else None,
+            padding_efficiency=plan.padding_efficiency if plan else None,
         )
         self._logger.info(
             "local_embedding_batch_completed",
             batch_id=batch_id,
             item_count=len(texts),
             duration_ms=duration_ms,
+            token_count=metrics.token_count,
+            padding_efficiency=metrics.padding_efficiency,
             dataset_fingerprint=self.model_info.dataset_fingerprint,
             correlation_id=correlation_id,
         )
@@ -216,6 +259,9 @@ class SentenceTransformerEmbeddingClient:
     def _convert_vectors(self, *, vectors: Sequence[Sequence[float]], sample: str) -> list[EmbeddingRecord]:
         """Convert encoded vectors into embedding records.
 
+        The model output is viewed as one contiguous float32 matrix and each
+        record holds a row view of it, so no per-value Python floats are built.
+
         Args:
             vectors: Raw vectors returned by the SentenceTransformer model.
             sample: Sample text used only for error messages.
@@ -226,25 +272,24 @@ class SentenceTransformerEmbeddingClient:
         Raises:
             ValueError: If the embedding dimension differs from expectations.
         """
-        embeddings: list[EmbeddingRecord] = []
-        for vector in vectors:
-            values = [float(value) for value in vector]
-            if len(values) != self._embedding_dimension:
-                raise ValueError(
-                    (
-                        "Embedding dimension mismatch "
-                        f"for sample {sample!r} "
-                        f"(expected {self._embedding_dimension}, received {len(values)})."
-                    ),
-                )
-            embeddings.append(
-                EmbeddingRecord(
-                    vector=tuple(values),
-                    model=self._model_label,
-                    dimensions=self._embedding_dimension,
+        matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+        received = matrix.shape[-1] if matrix.ndim == 2 else matrix.size
+        if matrix.ndim != 2 or received != self._embedding_dimension:
+            raise ValueError(
+                (
+                    "Embedding dimension mismatch "
+                    f"for sample {sample!r} "
+                    f"(expected {self._embedding_dimension}, received {received})."
                 ),
             )
-        return embeddings
+        return [
+            EmbeddingRecord(
+                vector=row,
+                model=self._model_label,
+                dimensions=self._embedding_dimension,
+            )
+            for row in matrix
+        ]
 
 
 def _default_model_loader(model_name: str) -> SentenceTransformerModel:
@@ -256,22 +301,6 @@ def _default_model_loader(model_name: str) -> SentenceTransformerModel:
     Returns:
         Loaded SentenceTransformer instance.
     """
-    return cast(SentenceTransformerModel, SentenceTransformer(model_name))
-
+    from sentence_transformers import SentenceTransformer
 
-def _batched(sequence: Sequence[str], batch_size: int) -> Iterable[Sequence[str]]:
-    """Yield consecutive batches from a sequence.
-
-    Args:
-        sequence: Input sequence to batch.
-        batch_size: Maximum batch size.
-
-    Yields:
-        Slices of the input sequence with size up to ``batch_size``.
-    """
-    start = 0
-    total = len(sequence)
-    while start < total:
-        end = min(total, start + batch_size)
-        yield sequence[start:end]
-        start = end
+    return cast(SentenceTransformerModel, SentenceTransformer(model_name))
@@ -0,0 +1,648 @@
+"""ONNX Runtime embedding client for CPU-only inference.
+
+Fine-tuned SentenceTransformer checkpoints are exported once to ONNX (with
+optional int8 dynamic quantization) under ``<checkpoint>/onnx/`` and served
+through onnxruntime. Pooling and normalisation follow the checkpoint's
+SentenceTransformer module configuration so vectors stay comparable with the
+PyTorch backend; ``evaluate_onnx_parity`` checks that with ``run_evaluation``.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Mapping, Protocol, Sequence
+from uuid import uuid4
+
+import numpy as np
+
+from src.rag_pipeline.chunking.docling_chunker import build_tokenizer_counter
+from src.rag_pipeline.embeddings.batching import PlannedBatch, plan_batches
+from src.rag_pipeline.embeddings.client_types import (
+    EmbeddingBatchMetrics,
+    EmbeddingModelInfo,
+    EmbeddingResponse,
+)
+from src.rag_pipeline.embeddings.manifest import ArtifactManifest
+from src.rag_pipeline.schemas import ChunkData, EmbeddingRecord, EmbeddingVector
+from src.shared.logging import LoggerProtocol, get_logger
+from src.shared.metrics import get_metrics
+from src.shared.tracing import Tracer, noop_tracer
+
+ONNX_SUBDIR = "onnx"
+_POOLING_MODES: tuple[str, ...] = ("cls_token", "mean_tokens", "max_tokens", "lasttoken")
+
+
+class OnnxSessionProtocol(Protocol):
+    """Subset of ``onnxruntime.InferenceSession`` used by the client."""
+
+    def run(
+        self,
+        output_names: Sequence[str] | None,
+        input_feed: Mapping[str, np.ndarray],
+    ) -> Sequence[np.ndarray]:
+        """Run inference and return the requested outputs."""
+
+
+SessionFactory = Callable[[Path, int], OnnxSessionProtocol]
+
+
+@dataclass(frozen=True, slots=True)
+class PoolingConfig:
+    """Pooling settings read from a SentenceTransformer checkpoint.
+
+    Attributes:
+        mode: One of ``cls_token``, ``mean_tokens``, ``max_tokens`` or
+            ``lasttoken``.
+        dimension: Output embedding dimension.
+        normalize: Whether the checkpoint ends with a Normalize module.
+        max_seq_length: Token limit applied during tokenisation.
+    """
+
+    mode: str
+    dimension: int
+    normalize: bool
+    max_seq_length: int | None
+
+
+def onnx_model_path(model_path: Path, *, quantized: bool) -> Path:
+    """Return the canonical ONNX file path for a checkpoint.
+
+    Args:
+        model_path: Fine-tuned SentenceTransformer directory.
+        quantized: Select the int8 dynamically quantized variant.
+
+    Returns:
+        Path to the ONNX model file.
+    """
+    name = "model_int8.onnx" if quantized else "model.onnx"
+    return model_path / ONNX_SUBDIR / name
+
+
+def load_pooling_config(model_path: Path) -> PoolingConfig:
+    """Read pooling, normalisation and sequence settings from a checkpoint.
+
+    Args:
+        model_path: Fine-tuned SentenceTransformer directory.
+
+    Returns:
+        PoolingConfig describing how token states become sentence vectors.
+
+    Raises:
+        FileNotFoundError: If the checkpoint has no pooling module.
+        ValueError: If the pooling mode is unsupported.
+    """
+    modules = _read_json(model_path / "modules.json", default=[])
+    pooling_dir = model_path / "1_Pooling"
+    normalize = False
+    for module in modules if isinstance(modules, list) else []:
+        module_type = str(module.get("type", ""))
+        if module_type.endswith("Pooling"):
+            pooling_dir = model_path / str(module.get("path", "1_Pooling"))
+        if module_type.endswith("Normalize"):
+            normalize = True
+    pooling = _read_json(pooling_dir / "config.json", default=None)
+    if not isinstance(pooling, dict):
+        raise FileNotFoundError(f"Pooling config not found under {pooling_dir}")
+    enabled = [mode for mode in _POOLING_MODES if pooling.get(f"pooling_mode_{mode}")]
+    if len(enabled) != 1:
+        raise ValueError(f"Unsupported pooling configuration: {enabled or 'none'}")
+    sentence_config = _read_json(model_path / "sentence_bert_config.json", default={})
+    max_seq_length = sentence_config.get("max_seq_length") if isinstance(sentence_config, dict) else None
+    return PoolingConfig(
+        mode=enabled[0],
+        dimension=int(pooling["word_embedding_dimension"]),
+        normalize=normalize,
+        max_seq_length=int(max_seq_length) if max_seq_length else None,
+    )
+
+
+def pool_hidden_states(
+    hidden_states: np.ndarray,
+    attention_mask: np.ndarray,
+    *,
+    mode: str,
+    normalize: bool,
+) -> EmbeddingVector:
+    """Reduce token states to sentence vectors.
+
+    Args:
+        hidden_states: Array of shape ``(batch, tokens, dim)``.
+        attention_mask: Array of shape ``(batch, tokens)``.
+        mode: Pooling mode from ``PoolingConfig``.
+        normalize: Apply L2 normalisation to the pooled vectors.
+
+    Returns:
+        Contiguous float32 matrix of shape ``(batch, dim)``.
+    """
+    mask = attention_mask.astype(np.float32)[..., None]
+    if mode == "cls_token":
+        pooled = hidden_states[:, 0, :]
+    elif mode == "mean_tokens":
+        pooled = (hidden_states * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+    elif mode == "max_tokens":
+        pooled = np.where(mask > 0, hidden_states, -np.inf).max(axis=1)
+    elif mode == "lasttoken":
+        # Qwen tokenizers pad on the left, so the last real token is not at
+        # ``mask.sum() - 1``; locate it from the mask for either padding side.
+        tokens = attention_mask.shape[1]
+        if attention_mask[:, -1].all():
+            last = np.full(attention_mask.shape[0], tokens - 1, dtype=np.int64)
+        else:
+            last = tokens - 1 - np.argmax(attention_mask[:, ::-1] > 0, axis=1)
+        pooled = hidden_states[np.arange(hidden_states.shape[0]), last, :]
+    else:
+        raise ValueError(f"Unsupported pooling mode: {mode}")
+    pooled = np.ascontiguousarray(pooled, dtype=np.float32)
+    if normalize:
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        pooled /= np.clip(norms, 1e-12, None)
+    return pooled
+
+
+def export_onnx_model(
+    model_path: Path,
+    *,
+    quantize: bool = False,
+    opset: int = 17,
+    logger: LoggerProtocol | None = None,
+) -> Path:
+    """Export a fine-tuned checkpoint to ONNX, optionally int8-quantized.
+
+    Args:
+        model_path: Fine-tuned SentenceTransformer directory (as recorded in
+            its ``ArtifactManifest``).
+        quantize: Also write an int8 dynamically quantized model.
+        opset: ONNX opset version.
+        logger: Structured logger override.
+
+    Returns:
+        Path to the exported model that should be served.
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    log = logger or get_logger(__name__)
+    start = perf_counter()
+    tokenizer = AutoTokenizer.from_pretrained(str(model_path))
+    transformer = AutoModel.from_pretrained(str(model_path))
+    transformer.config.use_cache = False
+    transformer.eval()
+
+    class _HiddenStates(torch.nn.Module):
+        def __init__(self, wrapped: Any) -> None:
+            super().__init__()
+            self.wrapped = wrapped
+
+        def forward(self, input_ids: Any, attention_mask: Any) -> Any:
+            return self.wrapped(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+
+    sample = tokenizer(["onnx export sample"], return_tensors="pt")
+    fp32_path = onnx_model_path(model_path, quantized=False)
+    fp32_path.parent.mkdir(parents=True, exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            _HiddenStates(transformer),
+            (sample["input_ids"], sample["attention_mask"]),
+            str(fp32_path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "last_hidden_state": {0: "batch", 1: "sequence"},
+            },
+            opset_version=opset,
+            dynamo=False,
+        )
+    served_path = fp32_path
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        served_path = onnx_model_path(model_path, quantized=True)
+        quantize_dynamic(str(fp32_path), str(served_path), weight_type=QuantType.QInt8)
+    log.info(
+        "onnx_export_completed",
+        model_path=str(model_path),
+        onnx_path=str(served_path),
+        quantized=quantize,
+        duration_ms=(perf_counter() - start) * 1000.0,
+    )
+    return served_path
+
+
+class OnnxEmbeddingClient:
+    """Embed texts with an ONNX export of a fine-tuned SentenceTransformer."""
+
+    def __init__(
+        self,
+        *,
+        model_path: Path,
+        quantized: bool = False,
+        batch_size: int = 8,
+        max_batch_tokens: int | None = None,
+        intra_op_threads: int = 0,
+        model_label: str | None = None,
+        manifest: ArtifactManifest | None = None,
+        pooling: PoolingConfig | None = None,
+        tokenizer: Any | None = None,
+        session_factory: SessionFactory | None = None,
+        logger: LoggerProtocol | None = None,
+        tracer: Tracer | None = None,
+    ) -> None:
+        """Initialize the ONNX embedding client.
+
+        Args:
+            model_path: Fine-tuned checkpoint directory containing ``onnx/``.
+            quantized: Serve the int8 model instead of the fp32 export.
+            batch_size: Maximum number of texts per inference call.
+            max_batch_tokens: Optional padded-token budget per batch.
+            intra_op_threads: onnxruntime intra-op threads (0 lets the runtime
+                choose).
+            model_label: Optional label to emit in embeddings and logs.
+            manifest: Optional artifact manifest containing metadata.
+            pooling: Pooling override; read from the checkpoint by default.
+            tokenizer: Hugging Face tokenizer override (for tests).
+            session_factory: Factory creating the inference session (for tests).
+            logger: Structured logger for embedding events.
+            tracer: Tracer for span reporting.
+        """
+        self._model_path = model_path
+        self._onnx_path = onnx_model_path(model_path, quantized=quantized)
+        self._batch_size = max(1, batch_size)
+        self._max_batch_tokens = max_batch_tokens
+        self._logger = logger or get_logger(__name__)
+        self._tracer = tracer or noop_tracer()
+        self._pooling = pooling or load_pooling_config(model_path)
+        self._tokenizer = tokenizer if tokenizer is not None else _default_tokenizer(model_path)
+        self._token_counter = build_tokenizer_counter(self._tokenizer)
+        factory = session_factory or _default_session_factory
+        self._session = factory(self._onnx_path, intra_op_threads)
+        resolved_label = model_label
+        if resolved_label is None and manifest is not None:
+            resolved_label = f"{manifest.base_model}-ft-{manifest.version}"
+        self._model_label = resolved_label or str(model_path)
+        self.model_info = EmbeddingModelInfo(
+            model=self._model_label,
+            dataset_fingerprint=manifest.dataset_fingerprint if manifest else None,
+            artifact_version=manifest.version if manifest else None,
+        )
+        self._logger.info(
+            "onnx_embedding_client_initialized",
+            model_label=self._model_label,
+            onnx_path=str(self._onnx_path),
+            quantized=quantized,
+            intra_op_threads=intra_op_threads,
+            batch_size=self._batch_size,
+            pooling_mode=self._pooling.mode,
+        )
+
+    @classmethod
+    def from_checkpoint(
+        cls,
+        *,
+        model_path: Path,
+        quantized: bool = False,
+        export_if_missing: bool = True,
+        **kwargs: Any,
+    ) -> "OnnxEmbeddingClient":
+        """Build a client, exporting the checkpoint first when needed.
+
+        Args:
+            model_path: Fine-tuned checkpoint directory.
+            quantized: Serve the int8 model.
+            export_if_missing: Run ``export_onnx_model`` if no export exists.
+            **kwargs: Forwarded to the constructor.
+
+        Returns:
+            Ready-to-use OnnxEmbeddingClient.
+        """
+        if export_if_missing and not onnx_model_path(model_path, quantized=quantized).exists():
+            export_onnx_model(model_path, quantize=quantized, logger=kwargs.get("logger"))
+        return cls(model_path=model_path, quantized=quantized, **kwargs)
+
+    @property
+    def embedding_dimension(self) -> int:
+        """Return the output embedding dimension."""
+        return self._pooling.dimension
+
+    def embed_texts(self, texts: Sequence[str], *, correlation_id: str | None = None) -> EmbeddingResponse:
+        """Embed the given texts, preserving order.
+
+        Args:
+            texts: Raw text inputs to embed.
+            correlation_id: Optional request identifier.
+
+        Returns:
+            EmbeddingResponse containing embeddings and batch metrics.
+        """
+        if not texts:
+            return EmbeddingResponse(embeddings=[], metrics=[])
+        ordered: list[EmbeddingRecord | None] = [None] * len(texts)
+        metrics: list[EmbeddingBatchMetrics] = []
+        for batch in plan_batches(
+            texts,
+            max_items=self._batch_size,
+            max_tokens=self._max_batch_tokens,
+            token_counter=self._token_counter,
+            sort_by_length=True,
+        ):
+            batch_embeddings, batch_metric = self._embed_batch(
+                batch_id=uuid4().hex,
+                texts=[texts[index] for index in batch.indices],
+                correlation_id=correlation_id,
+                plan=batch,
+            )
+            for index, embedding in zip(batch.indices, batch_embeddings):
+                ordered[index] = embedding
+            metrics.append(batch_metric)
+        embeddings = [embedding for embedding in ordered if embedding is not None]
+        if len(embeddings) != len(texts):
+            raise ValueError("Embedding count mismatch after batch reordering.")
+        return EmbeddingResponse(embeddings=embeddings, metrics=metrics)
+
+    def embed_document_chunks(
+        self,
+        chunks: Sequence[ChunkData],
+        *,
+        correlation_id: str | None = None,
+    ) -> list[EmbeddingRecord]:
+        """Embed chunk payloads.
+
+        Args:
+            chunks: Chunk payloads to embed.
+            correlation_id: Optional request identifier.
+
+        Returns:
+            Embeddings in the same order as the provided chunks.
+        """
+        if not chunks:
+            return []
+        response = self.embed_texts([chunk.text for chunk in chunks], correlation_id=correlation_id)
+        if len(response.embeddings) != len(chunks):
+            raise ValueError("Embedding count mismatch for document chunks.")
+        return response.embeddings
+
+    def encode_matrix(self, texts: Sequence[str]) -> EmbeddingVector:
+        """Encode texts into a ``(len(texts), dim)`` float32 matrix.
+
+        Args:
+            texts: Raw text inputs to embed.
+
+        Returns:
+            Matrix of pooled (and normalised, if configured) vectors.
+        """
+        if not texts:
+            return np.zeros((0, self._pooling.dimension), dtype=np.float32)
+        return np.stack([record.vector for record in self.embed_texts(texts).embeddings])
+
+    def close(self) -> None:
+        """No-op to mirror the remote client interface.
+
+        Returns:
+            None.
+        """
+        return None
+
+    def _embed_batch(
+        self,
+        *,
+        batch_id: str,
+        texts: Sequence[str],
+        correlation_id: str | None,
+        plan: PlannedBatch,
+    ) -> tuple[list[EmbeddingRecord], EmbeddingBatchMetrics]:
+        """Run one inference call and pool the hidden states.
+
+        Args:
+            batch_id: Unique identifier for the batch.
+            texts: Texts to embed.
+            correlation_id: Optional request identifier.
+            plan: Planned batch used for token and padding metrics.
+
+        Returns:
+            Tuple of embeddings and batch metrics.
+        """
+        start = perf_counter()
+        with self._tracer.span(
+            name="embedding_batch_onnx",
+            correlation_id=correlation_id,
+            attributes={
+                "batch_id": batch_id,
+                "item_count": len(texts),
+                "embedding_model": self._model_label,
+            },
+        ):
+            encoded = self._tokenizer(
+                list(texts),
+                padding=True,
+                truncation=self._pooling.max_seq_length is not None,
+                max_length=self._pooling.max_seq_length,
+                return_tensors="np",
+            )
+            input_ids = np.asarray(encoded["input_ids"], dtype=np.int64)
+            attention_mask = np.asarray(encoded["attention_mask"], dtype=np.int64)
+            outputs = self._session.run(
+                None,
+                {"input_ids": input_ids, "attention_mask": attention_mask},
+            )
+            matrix = pool_hidden_states(
+                np.asarray(outputs[0], dtype=np.float32),
+                attention_mask,
+                mode=self._pooling.mode,
+                normalize=self._pooling.normalize,
+            )
+        if matrix.shape[1] != self._pooling.dimension:
+            raise ValueError(
+                (
+                    "Embedding dimension mismatch "
+                    f"(expected {self._pooling.dimension}, received {matrix.shape[1]})."
+                ),
+            )
+        duration_ms = (perf_counter() - start) * 1000.0
+        get_metrics().observe_embedding_batch(
+            backend="onnx",
+            duration_seconds=duration_ms / 1000.0,
+            item_count=len(texts),
+        )
+        records = [
+            EmbeddingRecord(vector=row, model=self._model_label, dimensions=self._pooling.dimension)
+            for row in matrix
+        ]
+        metrics = EmbeddingBatchMetrics(
+            batch_id=batch_id,
+            item_count=len(texts),
+            retry_count=0,
+            duration_ms=duration_ms,
+            token_count=plan.token_total,
+            padding_efficiency=plan.padding_efficiency,
+        )
+        self._logger.info(
+            "onnx_embedding_batch_completed",
+            batch_id=batch_id,
+            item_count=len(texts),
+            duration_ms=duration_ms,
+            token_count=metrics.token_count,
+            padding_efficiency=metrics.padding_efficiency,
+            correlation_id=correlation_id,
+        )
+        return records, metrics
+
+
+class OnnxEvaluationModel:
+    """Adapter exposing an OnnxEmbeddingClient through the eval ``EmbeddingModel`` protocol."""
+
+    def __init__(self, client: OnnxEmbeddingClient, dimension: int) -> None:
+        self._client = client
+        self._dimension = dimension
+
+    def encode(
+        self,
+        sentences: Sequence[str],
+        *,
+        batch_size: int | None = None,
+        convert_to_numpy: bool = False,
+        normalize_embeddings: bool | None = None,
+    ) -> EmbeddingVector:
+        """Encode sentences into a float32 matrix."""
+        matrix = self._client.encode_matrix(sentences)
+        if normalize_embeddings:
+            matrix = matrix / np.clip(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12, None)
+        return matrix
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """Return the embedding dimension."""
+        return self._dimension
+
+
+@dataclass(frozen=True, slots=True)
+class OnnxParityReport:
+    """Recall comparison between the PyTorch and ONNX backends.
+
+    Attributes:
+        torch_recall_at_k: Recall@k of the PyTorch checkpoint.
+        onnx_recall_at_k: Recall@k of the ONNX export.
+        recall_delta: ``onnx_recall_at_k - torch_recall_at_k``.
+        tolerance: Maximum allowed recall drop.
+        within_tolerance: True when the ONNX backend keeps parity.
+        quantized: Whether the int8 model was evaluated.
+    """
+
+    torch_recall_at_k: float
+    onnx_recall_at_k: float
+    recall_delta: float
+    tolerance: float
+    within_tolerance: bool
+    quantized: bool
+
+
+def evaluate_onnx_parity(
+    *,
+    validation_path: Path,
+    model_path: Path,
+    quantized: bool = False,
+    top_k: int = 5,
+    tolerance: float = 0.01,
+    onnx_client: OnnxEmbeddingClient | None = None,
+    model_loader: Callable[[str], Any] | None = None,
+    logger: LoggerProtocol | None = None,
+) -> OnnxParityReport:
+    """Check that the ONNX backend preserves recall@k via ``run_evaluation``.
+
+    The PyTorch checkpoint is evaluated as the "base" model and the ONNX
+    export as the "tuned" model on the same validation pairs.
+
+    Args:
+        validation_path: Validation pairs JSONL.
+        model_path: Fine-tuned checkpoint directory.
+        quantized: Evaluate the int8 export.
+        top_k: Recall@k cutoff.
+        tolerance: Maximum acceptable recall drop.
+        onnx_client: Prebuilt client override (for tests).
+        model_loader: Loader for the PyTorch reference model.
+        logger: Structured logger override.
+
+    Returns:
+        OnnxParityReport summarising both backends.
+    """
+    from src.rag_pipeline.embeddings.eval import (
+        EvaluationRequest,
+        _default_model_loader as default_loader,
+        run_evaluation,
+    )
+
+    log = logger or get_logger(__name__)
+    client = onnx_client or OnnxEmbeddingClient.from_checkpoint(
+        model_path=model_path,
+        quantized=quantized,
+        logger=log,
+    )
+    onnx_model = OnnxEvaluationModel(client, dimension=client.embedding_dimension)
+    torch_loader = model_loader or default_loader
+    onnx_label = f"onnx:{model_path}"
+
+    def loader(name: str) -> Any:
+        return onnx_model if name == onnx_label else torch_loader(name)
+
+    report = run_evaluation(
+        EvaluationRequest(
+            validation_path=validation_path,
+            base_model_path=str(model_path),
+            tuned_model_path=onnx_label,
+            top_k=top_k,
+        ),
+        model_loader=loader,
+        logger=log,
+    )
+    delta = report.tuned.recall_at_k - report.base.recall_at_k
+    parity = OnnxParityReport(
+        torch_recall_at_k=report.base.recall_at_k,
+        onnx_recall_at_k=report.tuned.recall_at_k,
+        recall_delta=delta,
+        tolerance=tolerance,
+        within_tolerance=delta >= -tolerance,
+        quantized=quantized,
+    )
+    log.info(
+        "onnx_parity_evaluated",
+        torch_recall_at_k=parity.torch_recall_at_k,
+        onnx_recall_at_k=parity.onnx_recall_at_k,
+        recall_delta=parity.recall_delta,
+        within_tolerance=parity.within_tolerance,
+        quantized=quantized,
+        top_k=top_k,
+    )
+    return parity
+
+
+def _default_session_factory(onnx_path: Path, intra_op_threads: int) -> OnnxSessionProtocol:
+    """Create a CPU onnxruntime session.
+
+    Args:
+        onnx_path: ONNX model file.
+        intra_op_threads: Intra-op thread count (0 lets the runtime choose).
+
+    Returns:
+        onnxruntime InferenceSession.
+    """
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = max(0, intra_op_threads)
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return ort.InferenceSession(str(onnx_path), sess_options=options, providers=["CPUExecutionProvider"])
+
+
+def _default_tokenizer(model_path: Path) -> Any:
+    """Load the checkpoint's Hugging Face tokenizer."""
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(str(model_path))
+
+
+def _read_json(path: Path, *, default: Any) -> Any:
+    if not path.exists():
+        return default
+    return json.loads(path.read_text(encoding="utf-8"))
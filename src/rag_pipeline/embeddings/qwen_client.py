@@ -3,27 +3,39 @@
 The pipeline prefers the hosted Qwen3-Embedding-0.6B API exposed by DashScope
 or an OpenAI-compatible gateway. The client keeps the implementation small and
 type-safe while exposing structured metrics for observability and retries. The
-API key is read from ``QWEN_API_KEY`` unless provided explicitly.
+API key is read from ``QWEN_API_KEY`` unless provided explicitly. Calls go
+through a circuit breaker so an outage fails fast instead of holding threads
+in retries, and can optionally be hedged to cut tail latency. A shared
+rate limiter paces requests and absorbs 429 responses, so throttling slows
+the run down instead of failing batches.
 """
 
 from __future__ import annotations
 
 import os
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from time import perf_counter, sleep
-from typing import Any, Iterable, Sequence
+from typing import Any, Callable, Iterable, Sequence
 from uuid import uuid4
 import random
 
+import numpy as np
 import requests
 
+from src.rag_pipeline.embeddings.batching import plan_batches
 from src.rag_pipeline.embeddings.client_types import (
     EmbeddingBatchMetrics,
     EmbeddingModelInfo,
     EmbeddingResponse,
 )
 from src.rag_pipeline.config import RagIngestionConfig
-from src.rag_pipeline.schemas import ChunkData, EmbeddingRecord
+from src.rag_pipeline.schemas import ChunkData, EmbeddingRecord, EmbeddingVector
+from src.shared.deadline import DeadlineExceeded, bounded_timeout, current_deadline, retry_allowed
 from src.shared.logging import LoggerProtocol, get_logger
+from src.shared.metrics import get_metrics
+from src.shared.rate_limit import RateLimiter, shared_rate_limiter
+from src.shared.resilience import OPEN, CircuitBreaker, CircuitOpenError, Hedger
 from src.shared.tracing import Tracer, noop_tracer
 
 DEFAULT_QWEN_EMBEDDING_URL = (
@@ -43,11 +55,13 @@ class EmbeddingError(RuntimeError):
         status_code: int | None,
         batch_id: str,
         retry_count: int,
+        retry_after_seconds: float | None = None,
     ) -> None:
         super().__init__(message)
         self.status_code = status_code
         self.batch_id = batch_id
         self.retry_count = retry_count
+        self.retry_after_seconds = retry_after_seconds
 
 
 class QwenEmbeddingClient:
@@ -64,8 +78,13 @@ class QwenEmbeddingClient:
         retry_backoff_seconds: float = 2.0,
         expected_dimensions: int = 1024,
         batch_size: int = 8,
+        max_batch_tokens: int | None = None,
         session: requests.Session | None = None,
         tracer: Tracer | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hedger: Hedger | None = None,
+        rate_limiter: RateLimiter | None = None,
+        max_throttled_retries: int = 8,
     ) -> None:
         self._model = model
         self._api_key = api_key
@@ -75,8 +94,13 @@ class QwenEmbeddingClient:
         self._retry_backoff_seconds = retry_backoff_seconds
         self._expected_dimensions = expected_dimensions
         self._batch_size = max(1, batch_size)
+        self._max_batch_tokens = max_batch_tokens
         self._session = session or requests.Session()
         self._tracer = tracer or noop_tracer()
+        self._breaker = circuit_breaker or CircuitBreaker(name="qwen_embedding")
+        self._hedger = hedger
+        self._rate_limiter = rate_limiter
+        self._max_throttled_retries = max_throttled_retries
         self.model_info = EmbeddingModelInfo(
             model=model,
             dataset_fingerprint=None,
@@ -93,8 +117,11 @@ class QwenEmbeddingClient:
             model=model,
             base_url=base_url,
             batch_size=self._batch_size,
+            max_batch_tokens=max_batch_tokens,
             retry_count=retry_count,
             timeout_seconds=timeout_seconds,
+            hedging=hedger is not None,
+            rate_limited=rate_limiter is not None,
         )
 
     @classmethod
@@ -112,6 +139,17 @@ class QwenEmbeddingClient:
         env_base_url = os.getenv("QWEN_EMBEDDING_BASE_URL")
         fallback_base_url = env_base_url if env_base_url is not None else DEFAULT_QWEN_EMBEDDING_URL
         resolved_base_url = base_url if base_url is not None else fallback_base_url
+        circuit_breaker = CircuitBreaker(
+            name="qwen_embedding",
+            failure_rate_threshold=config.embedding_circuit_failure_rate,
+            open_seconds=config.embedding_circuit_open_seconds,
+        )
+        hedger = Hedger(name="qwen_embedding") if config.embedding_hedging_enabled else None
+        rate_limiter = shared_rate_limiter(
+            "qwen_embedding",
+            requests_per_second=config.embedding_requests_per_second or None,
+            tokens_per_minute=config.embedding_tokens_per_minute or None,
+        )
         return cls(
             model=config.embedding_model,
             api_key=resolved_api_key,
@@ -121,12 +159,18 @@ class QwenEmbeddingClient:
             retry_backoff_seconds=config.embedding_retry_backoff_seconds,
             expected_dimensions=config.embedding_dimension,
             batch_size=config.embedding_batch_size,
+            max_batch_tokens=config.embedding_batch_max_tokens,
             session=session,
             tracer=tracer,
+            circuit_breaker=circuit_breaker,
+            hedger=hedger,
+            rate_limiter=rate_limiter,
         )
 
     def close(self) -> None:
         """Close the underlying HTTP session."""
+        if self._hedger is not None:
+            self._hedger.close()
         self._session.close()
 
     def embed_texts(self, texts: Sequence[str], *, correlation_id: str | None = None) -> EmbeddingResponse:
@@ -135,12 +179,17 @@ class QwenEmbeddingClient:
             return EmbeddingResponse(embeddings=[], metrics=[])
         embeddings: list[EmbeddingRecord] = []
         metrics: list[EmbeddingBatchMetrics] = []
-        for batch in _batched(texts, self._batch_size):
+        for batch in plan_batches(
+            texts,
+            max_items=self._batch_size,
+            max_tokens=self._max_batch_tokens,
+        ):
             batch_id = uuid4().hex
             batch_embeddings, batch_metric = self._embed_batch(
                 batch_id=batch_id,
-                texts=batch,
+                texts=[texts[index] for index in batch.indices],
                 correlation_id=correlation_id,
+                token_count=batch.token_total,
             )
             embeddings.extend(batch_embeddings)
             metrics.append(batch_metric)
@@ -172,15 +221,33 @@ class QwenEmbeddingClient:
         batch_id: str,
         texts: Sequence[str],
         correlation_id: str | None,
+        token_count: int | None = None,
     ) -> tuple[list[EmbeddingRecord], EmbeddingBatchMetrics]:
         attempts = 0
+        throttled = 0
         last_error: EmbeddingError | None = None
         while attempts <= self._retry_count:
+            timeout_seconds = bounded_timeout(self._timeout_seconds, stage="embedding")
+            # Wait for the rate limiter first: a wait that outlives the
+            # deadline must not strand a half-open probe slot.
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire(tokens=token_count or 0)
+            try:
+                self._breaker.allow()
+            except CircuitOpenError as exc:
+                raise EmbeddingError(
+                    str(exc),
+                    status_code=None,
+                    batch_id=batch_id,
+                    retry_count=attempts,
+                ) from exc
+            settled = False
             start = perf_counter()
             logger.info(
                 "embedding_batch_started",
                 batch_id=batch_id,
                 item_count=len(texts),
+                token_count=token_count,
                 attempt=attempts,
                 correlation_id=correlation_id,
             )
@@ -190,12 +257,24 @@ class QwenEmbeddingClient:
                 attributes={"batch_id": batch_id, "item_count": len(texts)},
             ):
                 try:
-                    vectors = self._invoke_api(
-                        batch_id=batch_id,
-                        texts=texts,
-                        attempt=attempts,
+                    vectors = self._call_upstream(
+                        lambda: self._invoke_api(
+                            batch_id=batch_id,
+                            texts=texts,
+                            attempt=attempts,
+                            timeout_seconds=timeout_seconds,
+                        ),
                     )
+                    self._breaker.record_success()
+                    settled = True
+                    if self._rate_limiter is not None:
+                        self._rate_limiter.on_success()
                     duration_ms = (perf_counter() - start) * 1000.0
+                    get_metrics().observe_embedding_batch(
+                        backend="qwen",
+                        duration_seconds=duration_ms / 1000.0,
+                        item_count=len(texts),
+                    )
                     logger.info(
                         "embedding_batch_succeeded",
                         batch_id=batch_id,
@@ -206,7 +285,7 @@ class QwenEmbeddingClient:
                     )
                     embeddings = [
                         EmbeddingRecord(
-                            vector=tuple(vector),
+                            vector=vector,
                             model=self._model,
                             dimensions=self._expected_dimensions,
                         )
@@ -217,10 +296,22 @@ class QwenEmbeddingClient:
                         item_count=len(texts),
                         retry_count=attempts,
                         duration_ms=duration_ms,
+                        token_count=token_count,
                     )
                     return embeddings, metrics
                 except EmbeddingError as exc:
                     last_error = exc
+                    if _is_upstream_failure(exc):
+                        self._breaker.record_failure()
+                    else:
+                        self._breaker.record_success()
+                    settled = True
+                    get_metrics().observe_embedding_batch(
+                        backend="qwen",
+                        duration_seconds=perf_counter() - start,
+                        item_count=len(texts),
+                        outcome="error",
+                    )
                     logger.warning(
                         "embedding_batch_failed",
                         batch_id=batch_id,
@@ -230,11 +321,32 @@ class QwenEmbeddingClient:
                         error=str(exc),
                         correlation_id=correlation_id,
                     )
-                    if attempts >= self._retry_count:
+                    deadline = current_deadline()
+                    if deadline is not None and deadline.expired:
+                        raise DeadlineExceeded("embedding") from exc
+                    if exc.status_code == 429 and self._rate_limiter is not None:
+                        # The limiter pauses every caller for Retry-After and
+                        # lowers the rate; the next acquire() does the waiting.
+                        self._rate_limiter.on_throttled(exc.retry_after_seconds)
+                        throttled += 1
+                        if throttled > self._max_throttled_retries:
+                            raise
+                        logger.info(
+                            "embedding_batch_throttled",
+                            batch_id=batch_id,
+                            throttled=throttled,
+                            retry_after_seconds=exc.retry_after_seconds,
+                            correlation_id=correlation_id,
+                        )
+                        continue
+                    if attempts >= self._retry_count or self._breaker.state == OPEN:
                         raise
-                    attempts += 1
-                    backoff = self._retry_backoff_seconds * (2 ** (attempts - 1))
+                    backoff = self._retry_backoff_seconds * (2**attempts)
                     jitter = random.uniform(0.0, 0.5)
+                    if not retry_allowed(backoff + jitter):
+                        raise DeadlineExceeded("embedding") from exc
+                    attempts += 1
+                    get_metrics().embedding_retries.labels(backend="qwen").inc()
                     logger.info(
                         "embedding_batch_retry_scheduled",
                         batch_id=batch_id,
@@ -243,15 +355,24 @@ class QwenEmbeddingClient:
                         correlation_id=correlation_id,
                     )
                     sleep(backoff + jitter)
+                finally:
+                    if not settled:
+                        self._breaker.release()
         assert last_error is not None  # pragma: no cover - defensive
         raise last_error
 
+    def _call_upstream(self, call: Callable[[], list[EmbeddingVector]]) -> list[EmbeddingVector]:
+        if self._hedger is None:
+            return call()
+        return self._hedger.call(call)
+
     def _invoke_api(
         self,
         batch_id: str,
         texts: Sequence[str],
         attempt: int,
-    ) -> list[list[float]]:
+        timeout_seconds: float | None = None,
+    ) -> list[EmbeddingVector]:
         payload = self._build_payload(texts=texts)
         preview = _preview(texts[0]) if texts else ""
         try:
@@ -259,7 +380,7 @@ class QwenEmbeddingClient:
                 self._base_url,
                 headers=self._headers,
                 json=payload,
-                timeout=self._timeout_seconds,
+                timeout=self._timeout_seconds if timeout_seconds is None else timeout_seconds,
             )
         except requests.RequestException as exc:
             raise EmbeddingError(
@@ -278,6 +399,11 @@ class QwenEmbeddingClient:
                 status_code=response.status_code,
                 batch_id=batch_id,
                 retry_count=attempt,
+                retry_after_seconds=(
+                    _parse_retry_after(getattr(response, "headers", {}).get("Retry-After"))
+                    if response.status_code == 429
+                    else None
+                ),
             )
         try:
             payload_json = response.json()
@@ -310,7 +436,7 @@ class QwenEmbeddingClient:
         batch_id: str,
         sample: str,
         attempt: int,
-    ) -> list[list[float]]:
+    ) -> list[EmbeddingVector]:
         data = payload.get("data")
         embeddings_field = payload.get("embeddings")
         vectors_raw: Iterable[Any]
@@ -329,7 +455,7 @@ class QwenEmbeddingClient:
                 batch_id=batch_id,
                 retry_count=attempt,
             )
-        vectors: list[list[float]] = []
+        vectors: list[EmbeddingVector] = []
         for vector in vectors_raw:
             if not isinstance(vector, Sequence):
                 raise EmbeddingError(
@@ -338,8 +464,8 @@ class QwenEmbeddingClient:
                     batch_id=batch_id,
                     retry_count=attempt,
                 )
-            converted = [float(value) for value in vector]
-            if len(converted) != self._expected_dimensions:
+            converted = np.asarray(vector, dtype=np.float32)
+            if converted.ndim != 1 or len(converted) != self._expected_dimensions:
                 text_preview = _preview(sample)
                 raise EmbeddingError(
                     (
@@ -363,13 +489,30 @@ class QwenEmbeddingClient:
         return vectors
 
 
-def _batched(sequence: Sequence[str], batch_size: int) -> Iterable[Sequence[str]]:
-    start = 0
-    total = len(sequence)
-    while start < total:
-        end = min(total, start + batch_size)
-        yield sequence[start:end]
-        start = end
+def _is_upstream_failure(exc: EmbeddingError) -> bool:
+    """Whether the error says the endpoint is unhealthy.
+
+    Throttling (429) is left to the rate limiter rather than the breaker.
+    """
+    status = exc.status_code
+    return status is None or status >= 500
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
 
 
 def _preview(text: str, limit: int = 96) -> str:
@@ -0,0 +1,194 @@
+"""Corpus-scale retrieval evaluation against a live ``RetrieverProtocol``.
+
+``run_evaluation`` scores pairs inside the validation set only. This harness
+replays labelled queries through a real retriever (``DatabaseRetriever`` and
+the ANN index behind ``match_chunks``, or any alternative implementation) and
+reports recall@k, MRR and latency percentiles, so index settings such as
+ivfflat ``lists``/``probes`` can be compared on recall and latency together.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from src.rag_pipeline.embeddings.eval import RECALL_CUTOFFS
+from src.rag_pipeline.retrieval import RetrievedChunk, RetrieverProtocol
+from src.shared.logging import LoggerProtocol, get_logger
+
+MATCH_FIELDS: tuple[str, ...] = ("document_name", "source_id", "chunk_id")
+
+
+@dataclass(frozen=True, slots=True)
+class LabeledQuery:
+    """Query with the identifiers of the chunks/documents that answer it."""
+
+    query: str
+    relevant: frozenset[str]
+
+
+@dataclass(frozen=True, slots=True)
+class RetrievalEvaluation:
+    """Recall and latency measured for one retriever configuration."""
+
+    retriever: str
+    total_queries: int
+    top_k: int
+    match_field: str
+    concurrency: int
+    recall_at: dict[int, float]
+    mrr: float
+    latency_ms_p50: float
+    latency_ms_p95: float
+    latency_ms_p99: float
+    latency_ms_mean: float
+    queries_per_second: float
+    empty_results: int
+    settings: dict[str, str] = field(default_factory=dict)
+
+
+def load_labeled_queries(path: Path) -> list[LabeledQuery]:
+    """Load labelled queries from JSONL.
+
+    Rows either carry ``{"query": ..., "relevant": [...]}`` or are validation
+    pairs written by ``data_prep.write_jsonl``, in which case the pair's
+    ``source`` is the relevant label.
+
+    Args:
+        path: JSONL file.
+
+    Returns:
+        Parsed queries in file order.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Labelled queries not found at {path}")
+    queries: list[LabeledQuery] = []
+    with path.open("r", encoding="utf-8") as fp:
+        for line in fp:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            raw_relevant = data.get("relevant")
+            if raw_relevant is None:
+                raw_relevant = [data["source"]]
+            elif isinstance(raw_relevant, str):
+                raw_relevant = [raw_relevant]
+            queries.append(
+                LabeledQuery(query=str(data["query"]), relevant=frozenset(str(item) for item in raw_relevant)),
+            )
+    if not queries:
+        raise ValueError(f"No labelled queries found in {path}")
+    return queries
+
+
+async def evaluate_retriever(
+    retriever: RetrieverProtocol,
+    queries: Sequence[LabeledQuery],
+    *,
+    top_k: int = 10,
+    min_score: float = 0.0,
+    concurrency: int = 8,
+    match_field: str = "document_name",
+    label: str | None = None,
+    settings: dict[str, str] | None = None,
+    logger: LoggerProtocol | None = None,
+) -> RetrievalEvaluation:
+    """Replay queries through a retriever concurrently and score the results.
+
+    Recall@k is the share of a query's relevant labels found in the first
+    ``k`` results (several chunks of one document count once); MRR uses the
+    first relevant result.
+
+    Args:
+        retriever: Retriever under test.
+        queries: Labelled queries.
+        top_k: Results fetched per query; recall cutoffs above it are skipped.
+        min_score: Similarity floor passed to the retriever.
+        concurrency: Maximum in-flight queries.
+        match_field: ``RetrievedChunk`` attribute compared with the labels.
+        label: Retriever name recorded in the report.
+        settings: Free-form settings recorded in the report (e.g. probes).
+        logger: Structured logger override.
+
+    Returns:
+        RetrievalEvaluation summarising recall and latency.
+    """
+    if top_k <= 0:
+        raise ValueError("top_k must be greater than zero.")
+    if concurrency <= 0:
+        raise ValueError("concurrency must be greater than zero.")
+    if match_field not in MATCH_FIELDS:
+        raise ValueError(f"match_field must be one of {', '.join(MATCH_FIELDS)}")
+    if not queries:
+        raise ValueError("At least one labelled query is required.")
+    log = logger or get_logger(__name__)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(index: int, item: LabeledQuery) -> tuple[float, list[RetrievedChunk]]:
+        async with semaphore:
+            start = perf_counter()
+            results = await retriever.retrieve(
+                item.query,
+                top_k=top_k,
+                min_score=min_score,
+                correlation_id=f"retrieval-eval-{index}",
+            )
+            return (perf_counter() - start) * 1000.0, results
+
+    started = perf_counter()
+    outcomes = await asyncio.gather(*(run_one(index, item) for index, item in enumerate(queries)))
+    elapsed = perf_counter() - started
+    cutoffs = sorted({cutoff for cutoff in (*RECALL_CUTOFFS, top_k) if cutoff <= top_k})
+    recall_sums = dict.fromkeys(cutoffs, 0.0)
+    reciprocal_ranks: list[float] = []
+    latencies = np.array([latency for latency, _ in outcomes], dtype=np.float64)
+    empty_results = 0
+    for item, (_latency, results) in zip(queries, outcomes):
+        labels = [str(getattr(chunk, match_field)) for chunk in results]
+        empty_results += not labels
+        for cutoff in cutoffs:
+            recall_sums[cutoff] += len(item.relevant.intersection(labels[:cutoff])) / len(item.relevant)
+        reciprocal_ranks.append(_reciprocal_rank(labels, item.relevant))
+    total = len(queries)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    evaluation = RetrievalEvaluation(
+        retriever=label or type(retriever).__name__,
+        total_queries=total,
+        top_k=top_k,
+        match_field=match_field,
+        concurrency=concurrency,
+        recall_at={cutoff: value / total for cutoff, value in recall_sums.items()},
+        mrr=float(np.mean(reciprocal_ranks)),
+        latency_ms_p50=float(p50),
+        latency_ms_p95=float(p95),
+        latency_ms_p99=float(p99),
+        latency_ms_mean=float(latencies.mean()),
+        queries_per_second=total / elapsed if elapsed > 0 else 0.0,
+        empty_results=empty_results,
+        settings=dict(settings or {}),
+    )
+    log.info(
+        "retrieval_evaluation_completed",
+        retriever=evaluation.retriever,
+        total_queries=total,
+        top_k=top_k,
+        recall_at_k=evaluation.recall_at[top_k],
+        mrr=evaluation.mrr,
+        latency_ms_p95=evaluation.latency_ms_p95,
+        queries_per_second=evaluation.queries_per_second,
+        empty_results=empty_results,
+    )
+    return evaluation
+
+
+def _reciprocal_rank(labels: Iterable[str], relevant: frozenset[str]) -> float:
+    for rank, value in enumerate(labels, start=1):
+        if value in relevant:
+            return 1.0 / rank
+    return 0.0
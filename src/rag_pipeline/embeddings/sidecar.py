@@ -0,0 +1,347 @@
+"""Local embedding sidecar shared by every API worker on a host.
+
+Run one sidecar per host (``python -m src.rag_pipeline.embeddings.sidecar``)
+and point workers at it with ``RAG_EMBEDDING_SIDECAR_SOCKET``. The sidecar
+loads the configured embedding backend once and coalesces concurrent requests
+into shared batches: a batch is dispatched once it holds ``max_batch_items``
+texts or ``max_wait_ms`` has passed since its first request arrived.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Sequence
+from uuid import uuid4
+
+import numpy as np
+
+from src.rag_pipeline.embeddings.client_types import EmbeddingClientProtocol
+from src.rag_pipeline.embeddings.sidecar_client import (
+    FRAME_HEADER,
+    MAX_FRAME_BYTES,
+    VECTOR_DTYPE,
+    encode_frame,
+    encode_json_frame,
+)
+from src.shared.logging import LoggerProtocol, get_logger
+
+
+@dataclass(frozen=True, slots=True)
+class BatchResult:
+    """Slice of a coalesced batch returned to one caller.
+
+    Attributes:
+        vectors: Float32 matrix with one row per requested text.
+        batch_id: Identifier of the shared backend batch.
+        batch_items: Total texts embedded in the shared batch.
+        token_count: Tokens reported by the backend for the shared batch.
+    """
+
+    vectors: np.ndarray
+    batch_id: str
+    batch_items: int
+    token_count: int | None
+
+
+@dataclass(slots=True)
+class _PendingRequest:
+    texts: Sequence[str]
+    future: asyncio.Future[BatchResult]
+    enqueued_at: float = field(default_factory=perf_counter)
+
+
+class DynamicBatcher:
+    """Coalesce concurrent embedding requests into shared backend batches."""
+
+    def __init__(
+        self,
+        client: EmbeddingClientProtocol,
+        *,
+        max_batch_items: int = 64,
+        max_wait_ms: float = 5.0,
+        logger: LoggerProtocol | None = None,
+    ) -> None:
+        """Initialize the batcher.
+
+        Args:
+            client: Embedding backend that owns the model.
+            max_batch_items: Dispatch once this many texts are queued.
+            max_wait_ms: Longest time the first queued request waits for
+                company before its batch is dispatched.
+            logger: Structured logger override.
+        """
+        if max_batch_items <= 0:
+            raise ValueError("max_batch_items must be greater than zero.")
+        self._client = client
+        self._max_batch_items = max_batch_items
+        self._max_wait_seconds = max(0.0, max_wait_ms) / 1000.0
+        self._logger = logger or get_logger(__name__)
+        self._queue: asyncio.Queue[_PendingRequest] = asyncio.Queue()
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start the dispatch loop on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the dispatch loop and fail any queued requests."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        while not self._queue.empty():
+            pending = self._queue.get_nowait()
+            if not pending.future.done():
+                pending.future.set_exception(RuntimeError("Embedding sidecar is shutting down."))
+
+    async def submit(self, texts: Sequence[str]) -> BatchResult:
+        """Queue texts for the next batch and wait for their vectors.
+
+        Args:
+            texts: Texts to embed.
+
+        Returns:
+            BatchResult holding this caller's rows.
+        """
+        future: asyncio.Future[BatchResult] = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingRequest(texts=texts, future=future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            item_count = len(pending[0].texts)
+            deadline = loop.time() + self._max_wait_seconds
+            while item_count < self._max_batch_items:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(request)
+                item_count += len(request.texts)
+            await self._dispatch(pending)
+
+    async def _dispatch(self, pending: list[_PendingRequest]) -> None:
+        live = [request for request in pending if not request.future.done()]
+        if not live:
+            return
+        texts = [text for request in live for text in request.texts]
+        batch_id = uuid4().hex
+        start = perf_counter()
+        try:
+            response = await asyncio.to_thread(self._client.embed_texts, texts, correlation_id=batch_id)
+            matrix = np.stack([record.vector for record in response.embeddings]).astype(VECTOR_DTYPE, copy=False)
+            if matrix.shape[0] != len(texts):
+                raise ValueError("Embedding count mismatch in sidecar batch.")
+        except Exception as exc:  # noqa: BLE001 - surfaced to every waiting caller
+            self._logger.warning("sidecar_batch_failed", batch_id=batch_id, item_count=len(texts), error=str(exc))
+            for request in live:
+                if not request.future.done():
+                    request.future.set_exception(exc)
+            return
+        token_counts = [metric.token_count for metric in response.metrics if metric.token_count is not None]
+        token_count = sum(token_counts) if token_counts else None
+        offset = 0
+        for request in live:
+            rows = matrix[offset : offset + len(request.texts)]
+            offset += len(request.texts)
+            if not request.future.done():
+                request.future.set_result(
+                    BatchResult(vectors=rows, batch_id=batch_id, batch_items=len(texts), token_count=token_count),
+                )
+        self._logger.info(
+            "sidecar_batch_completed",
+            batch_id=batch_id,
+            request_count=len(live),
+            item_count=len(texts),
+            token_count=token_count,
+            max_queue_wait_ms=(start - min(request.enqueued_at for request in live)) * 1000.0,
+            duration_ms=(perf_counter() - start) * 1000.0,
+        )
+
+
+class EmbeddingSidecarServer:
+    """Serve a DynamicBatcher over a Unix socket."""
+
+    def __init__(
+        self,
+        client: EmbeddingClientProtocol,
+        *,
+        socket_path: Path,
+        max_batch_items: int = 64,
+        max_wait_ms: float = 5.0,
+        logger: LoggerProtocol | None = None,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            client: Embedding backend that owns the model.
+            socket_path: Unix socket path to listen on.
+            max_batch_items: Dynamic batching item cap.
+            max_wait_ms: Dynamic batching wait window.
+            logger: Structured logger override.
+        """
+        self._client = client
+        self._socket_path = socket_path
+        self._logger = logger or get_logger(__name__)
+        self._batcher = DynamicBatcher(
+            client,
+            max_batch_items=max_batch_items,
+            max_wait_ms=max_wait_ms,
+            logger=self._logger,
+        )
+        self._server: asyncio.Server | None = None
+        self._dimensions: int | None = None
+
+    async def start(self) -> None:
+        """Bind the socket and start accepting connections."""
+        with contextlib.suppress(FileNotFoundError):
+            self._socket_path.unlink()
+        self._socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self._dimensions = await asyncio.to_thread(self._probe_dimensions)
+        self._batcher.start()
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=str(self._socket_path))
+        os.chmod(self._socket_path, 0o660)
+        self._logger.info(
+            "embedding_sidecar_started",
+            socket_path=str(self._socket_path),
+            model_label=self._client.model_info.model,
+            dimensions=self._dimensions,
+        )
+
+    async def serve_forever(self) -> None:
+        """Start the server and block until cancelled."""
+        await self.start()
+        assert self._server is not None
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop accepting connections and release the socket."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self._batcher.stop()
+        with contextlib.suppress(FileNotFoundError):
+            self._socket_path.unlink()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(FRAME_HEADER.size)
+                except asyncio.IncompleteReadError:
+                    return
+                (length,) = FRAME_HEADER.unpack(header)
+                if length > MAX_FRAME_BYTES:
+                    return
+                message = json.loads(await reader.readexactly(length))
+                writer.write(await self._handle_message(message))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as exc:
+            self._logger.warning("sidecar_connection_error", error=str(exc))
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _handle_message(self, message: Any) -> bytes:
+        if not isinstance(message, dict):
+            return encode_json_frame({"ok": False, "error": "request must be a JSON object"})
+        op = message.get("op")
+        if op == "info":
+            info = self._client.model_info
+            return encode_json_frame(
+                {
+                    "ok": True,
+                    "model": info.model,
+                    "dataset_fingerprint": info.dataset_fingerprint,
+                    "artifact_version": info.artifact_version,
+                    "dimensions": self._dimensions,
+                },
+            )
+        if op != "embed":
+            return encode_json_frame({"ok": False, "error": f"unknown op {op!r}"})
+        texts = message.get("texts") or []
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            return encode_json_frame({"ok": False, "error": "texts must be a list of strings"})
+        try:
+            result = await self._batcher.submit(texts)
+        except Exception as exc:  # noqa: BLE001 - reported to the caller
+            return encode_json_frame({"ok": False, "error": str(exc)})
+        header = encode_json_frame(
+            {
+                "ok": True,
+                "count": int(result.vectors.shape[0]),
+                "dimensions": int(result.vectors.shape[1]),
+                "model": self._client.model_info.model,
+                "batch_id": result.batch_id,
+                "server_batch_items": result.batch_items,
+                "token_count": result.token_count,
+            },
+        )
+        return header + encode_frame(np.ascontiguousarray(result.vectors).tobytes())
+
+    def _probe_dimensions(self) -> int:
+        response = self._client.embed_texts(["dimension probe"])
+        return int(response.embeddings[0].dimensions)
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    """Parse sidecar command-line arguments.
+
+    Args:
+        argv: Optional argument list (defaults to ``sys.argv``).
+
+    Returns:
+        Parsed argparse namespace.
+    """
+    parser = argparse.ArgumentParser(description="Shared local embedding sidecar.")
+    parser.add_argument("--socket", type=Path, help="Unix socket path (default: RAG_EMBEDDING_SIDECAR_SOCKET).")
+    parser.add_argument("--max-batch-items", type=int, help="Dynamic batching item cap.")
+    parser.add_argument("--max-wait-ms", type=float, help="Dynamic batching wait window in milliseconds.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Load the configured local backend once and serve it over a Unix socket."""
+    from src.rag_pipeline.config import get_rag_ingestion_config
+    from src.rag_pipeline.embeddings.factory import create_embedding_client
+
+    args = parse_args(argv)
+    config = get_rag_ingestion_config()
+    socket_path = args.socket or config.embedding_sidecar_socket
+    if socket_path is None:
+        raise SystemExit("Provide --socket or set RAG_EMBEDDING_SIDECAR_SOCKET.")
+    logger = get_logger(__name__)
+    backend = create_embedding_client(replace(config, embedding_sidecar_socket=None), logger=logger)
+    server = EmbeddingSidecarServer(
+        backend,
+        socket_path=socket_path,
+        max_batch_items=args.max_batch_items or config.embedding_sidecar_max_batch_items,
+        max_wait_ms=args.max_wait_ms if args.max_wait_ms is not None else config.embedding_sidecar_max_wait_ms,
+        logger=logger,
+    )
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(server.serve_forever())
+    backend.close()
+
+
+if __name__ == "__main__":
+    main()
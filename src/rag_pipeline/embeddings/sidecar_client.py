@@ -0,0 +1,319 @@
+"""Thin embedding client for the shared local embedding sidecar.
+
+The sidecar (``src.rag_pipeline.embeddings.sidecar``) keeps one model in
+memory per host and serves every uvicorn worker over a Unix socket. Messages
+are length-prefixed frames: requests are JSON, responses are a JSON header
+followed (for embeddings) by a little-endian float32 matrix.
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+import struct
+import threading
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Mapping, Sequence
+from uuid import uuid4
+
+import numpy as np
+
+from src.rag_pipeline.embeddings.client_types import (
+    EmbeddingBatchMetrics,
+    EmbeddingModelInfo,
+    EmbeddingResponse,
+)
+from src.rag_pipeline.embeddings.qwen_client import EmbeddingError
+from src.rag_pipeline.schemas import ChunkData, EmbeddingRecord
+from src.shared.logging import LoggerProtocol, get_logger
+from src.shared.tracing import Tracer, noop_tracer
+
+FRAME_HEADER = struct.Struct(">I")
+VECTOR_DTYPE = np.dtype("<f4")
+MAX_FRAME_BYTES = 256 * 1024 * 1024
+
+SocketFactory = Callable[[Path, float], socket.socket]
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """Prefix a payload with its big-endian ``uint32`` length.
+
+    Args:
+        payload: Frame body.
+
+    Returns:
+        Bytes ready to write to the socket.
+    """
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def encode_json_frame(message: Mapping[str, Any]) -> bytes:
+    """Serialise a JSON message into a frame."""
+    return encode_frame(json.dumps(message, separators=(",", ":")).encode("utf-8"))
+
+
+def read_frame(sock: socket.socket) -> bytes:
+    """Read one frame from a blocking socket.
+
+    Args:
+        sock: Connected socket.
+
+    Returns:
+        Frame body.
+
+    Raises:
+        ConnectionError: If the peer closes mid-frame or sends an oversized frame.
+    """
+    (length,) = FRAME_HEADER.unpack(_recv_exactly(sock, FRAME_HEADER.size))
+    if length > MAX_FRAME_BYTES:
+        raise ConnectionError(f"Sidecar frame too large ({length} bytes).")
+    return _recv_exactly(sock, length)
+
+
+class SidecarEmbeddingClient:
+    """Embed texts by delegating to the local embedding sidecar.
+
+    Nothing is sent at construction: the served model's metadata is fetched
+    on first use and cached once it succeeds, so API workers may start before
+    the sidecar is listening. Until then each use retries the ``info`` call
+    and fails with ``EmbeddingError``.
+    """
+
+    def __init__(
+        self,
+        *,
+        socket_path: Path,
+        timeout_seconds: float = 60.0,
+        max_idle_connections: int = 8,
+        socket_factory: SocketFactory | None = None,
+        logger: LoggerProtocol | None = None,
+        tracer: Tracer | None = None,
+    ) -> None:
+        """Configure the client; the sidecar is contacted on first use.
+
+        Args:
+            socket_path: Unix socket the sidecar listens on.
+            timeout_seconds: Per-request socket timeout.
+            max_idle_connections: Connections kept open for reuse; concurrent
+                callers each use their own connection so the sidecar can batch
+                them together.
+            socket_factory: Connection factory override (for tests).
+            logger: Structured logger for embedding events.
+            tracer: Tracer for span reporting.
+        """
+        self._socket_path = socket_path
+        self._timeout_seconds = timeout_seconds
+        self._max_idle_connections = max(0, max_idle_connections)
+        self._socket_factory = socket_factory or _connect_unix
+        self._logger = logger or get_logger(__name__)
+        self._tracer = tracer or noop_tracer()
+        self._idle: list[socket.socket] = []
+        self._lock = threading.Lock()
+        self._info_lock = threading.Lock()
+        self._server_info: tuple[EmbeddingModelInfo, int] | None = None
+
+    @property
+    def model_info(self) -> EmbeddingModelInfo:
+        """Metadata of the model the sidecar serves, fetched on first access.
+
+        Raises:
+            EmbeddingError: If the sidecar cannot be reached yet.
+        """
+        return self._info()[0]
+
+    def embed_texts(self, texts: Sequence[str], *, correlation_id: str | None = None) -> EmbeddingResponse:
+        """Embed the given texts through the sidecar, preserving order.
+
+        Args:
+            texts: Raw text inputs to embed.
+            correlation_id: Optional request identifier.
+
+        Returns:
+            EmbeddingResponse with one metrics entry for the round trip.
+        """
+        if not texts:
+            return EmbeddingResponse(embeddings=[], metrics=[])
+        model_info, expected_dimensions = self._info()
+        batch_id = uuid4().hex
+        start = perf_counter()
+        with self._tracer.span(
+            name="embedding_batch_sidecar",
+            correlation_id=correlation_id,
+            attributes={"batch_id": batch_id, "item_count": len(texts), "embedding_model": model_info.model},
+        ):
+            header, payload = self._request(
+                {"op": "embed", "texts": list(texts), "correlation_id": correlation_id},
+                batch_id=batch_id,
+                expect_payload=True,
+            )
+        count = int(header["count"])
+        dimensions = int(header["dimensions"])
+        if count != len(texts) or dimensions != expected_dimensions:
+            raise EmbeddingError(
+                f"Sidecar returned {count}x{dimensions} embeddings for {len(texts)} texts.",
+                status_code=None,
+                batch_id=batch_id,
+                retry_count=0,
+            )
+        matrix = np.frombuffer(payload, dtype=VECTOR_DTYPE).reshape(count, dimensions)
+        model = str(header.get("model", model_info.model))
+        embeddings = [EmbeddingRecord(vector=row, model=model, dimensions=dimensions) for row in matrix]
+        duration_ms = (perf_counter() - start) * 1000.0
+        metrics = EmbeddingBatchMetrics(
+            batch_id=batch_id,
+            item_count=len(texts),
+            retry_count=0,
+            duration_ms=duration_ms,
+            token_count=header.get("token_count"),
+        )
+        self._logger.info(
+            "sidecar_embedding_completed",
+            batch_id=batch_id,
+            item_count=len(texts),
+            server_batch_items=header.get("server_batch_items"),
+            duration_ms=duration_ms,
+            correlation_id=correlation_id,
+        )
+        return EmbeddingResponse(embeddings=embeddings, metrics=[metrics])
+
+    def embed_document_chunks(
+        self,
+        chunks: Sequence[ChunkData],
+        *,
+        correlation_id: str | None = None,
+    ) -> list[EmbeddingRecord]:
+        """Embed chunk payloads.
+
+        Args:
+            chunks: Chunk payloads to embed.
+            correlation_id: Optional request identifier.
+
+        Returns:
+            Embeddings in the same order as the provided chunks.
+        """
+        if not chunks:
+            return []
+        return self.embed_texts([chunk.text for chunk in chunks], correlation_id=correlation_id).embeddings
+
+    def close(self) -> None:
+        """Close idle sidecar connections.
+
+        Returns:
+            None.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for sock in idle:
+            sock.close()
+
+    def _info(self) -> tuple[EmbeddingModelInfo, int]:
+        """Return the cached model metadata and dimensions, fetching them once."""
+        server_info = self._server_info
+        if server_info is not None:
+            return server_info
+        with self._info_lock:
+            if self._server_info is None:
+                info, _ = self._request({"op": "info"}, batch_id="info")
+                model_info = EmbeddingModelInfo(
+                    model=str(info["model"]),
+                    dataset_fingerprint=info.get("dataset_fingerprint"),
+                    artifact_version=info.get("artifact_version"),
+                )
+                self._server_info = (model_info, int(info["dimensions"]))
+                self._logger.info(
+                    "sidecar_embedding_client_connected",
+                    socket_path=str(self._socket_path),
+                    model_label=model_info.model,
+                    dimensions=self._server_info[1],
+                )
+            return self._server_info
+
+    def _request(
+        self,
+        message: Mapping[str, Any],
+        *,
+        batch_id: str,
+        expect_payload: bool = False,
+    ) -> tuple[dict[str, Any], bytes]:
+        """Send one request, retrying once if a pooled connection went stale.
+
+        Args:
+            message: JSON request body.
+            batch_id: Identifier used in errors.
+            expect_payload: Read the binary vector frame after the header.
+
+        Returns:
+            Tuple of the JSON response header and the binary payload.
+        """
+        frame = encode_json_frame(message)
+        for attempt in range(2):
+            sock, reused = self._acquire()
+            try:
+                sock.sendall(frame)
+                header = json.loads(read_frame(sock))
+                payload = read_frame(sock) if expect_payload and header.get("ok") else b""
+            except (OSError, ConnectionError, ValueError) as exc:
+                sock.close()
+                if reused and attempt == 0:
+                    continue
+                raise EmbeddingError(
+                    f"Embedding sidecar request failed: {exc}",
+                    status_code=None,
+                    batch_id=batch_id,
+                    retry_count=attempt,
+                ) from exc
+            self._release(sock)
+            if not header.get("ok"):
+                raise EmbeddingError(
+                    f"Embedding sidecar error: {header.get('error', 'unknown error')}",
+                    status_code=None,
+                    batch_id=batch_id,
+                    retry_count=attempt,
+                )
+            return header, payload
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _acquire(self) -> tuple[socket.socket, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        try:
+            return self._socket_factory(self._socket_path, self._timeout_seconds), False
+        except OSError as exc:
+            raise EmbeddingError(
+                f"Failed to connect to embedding sidecar at {self._socket_path}: {exc}",
+                status_code=None,
+                batch_id="connect",
+                retry_count=0,
+            ) from exc
+
+    def _release(self, sock: socket.socket) -> None:
+        with self._lock:
+            if len(self._idle) < self._max_idle_connections:
+                self._idle.append(sock)
+                return
+        sock.close()
+
+
+def _connect_unix(socket_path: Path, timeout_seconds: float) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout_seconds)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        read = sock.recv_into(view[received:], size - received)
+        if read == 0:
+            raise ConnectionError("Embedding sidecar closed the connection.")
+        received += read
+    return bytes(buffer)
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from .job_ledger import DocumentCheckpoint, JobLedger, JobRecord, LedgerDocument
+from .pgvector import encode_vector_binary, register_vector_adapters
 from .supabase_store import (
     DatabaseClientProtocol,
     InMemoryStore,
@@ -10,12 +12,24 @@ from .supabase_store import (
     SourceRow,
     SupabaseStore,
 )
+from .work_queue import FailedItem, InMemoryWorkQueue, PostgresWorkQueue, WorkItem, WorkQueueProtocol
 
 __all__ = [
     "DatabaseClientProtocol",
+    "DocumentCheckpoint",
+    "FailedItem",
     "PersistenceStoreProtocol",
     "InMemoryStore",
+    "InMemoryWorkQueue",
+    "JobLedger",
+    "JobRecord",
+    "LedgerDocument",
+    "PostgresWorkQueue",
     "PsycopgDatabaseClient",
     "SourceRow",
     "SupabaseStore",
+    "WorkItem",
+    "WorkQueueProtocol",
+    "encode_vector_binary",
+    "register_vector_adapters",
 ]
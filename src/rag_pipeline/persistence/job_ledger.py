@@ -0,0 +1,341 @@
+"""SQLite ledger that makes ingestion jobs resumable.
+
+A job records the documents it discovered, in order, together with each
+document's stage. Embeddings are written to the ledger batch by batch
+until they are persisted. After a crash, ``run_ingestion_job(...,
+resume=True)`` reads the ledger and skips finished documents. For a
+partially embedded document it re-chunks, which is cheap and deterministic
+for unchanged content, and reuses every stored embedding whose chunk text
+still matches. Only the missing chunks are embedded again.
+
+The ledger is a local file rather than a database table. It must survive
+the very outages (database down, process killed) that make a resume
+necessary, and it holds bulky intermediate vectors that do not belong in
+the serving database. Stored vectors are only reused when they were made by
+the same embedding model with the same dimensions as the resuming run, so a
+resumed document never mixes vectors from two models.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Mapping, Sequence
+from uuid import uuid4
+
+import numpy as np
+
+from src.rag_pipeline.embeddings.client_types import EmbeddingModelInfo
+
+from src.rag_pipeline.schemas import ChunkData, DocumentInput, EmbeddingRecord, JSONValue
+
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_ABORTED = "aborted"
+
+STAGE_PENDING = "pending"
+STAGE_CHUNKED = "chunked"
+STAGE_EMBEDDED = "embedded"
+STAGE_DONE = "done"
+STAGE_SKIPPED = "skipped"
+STAGE_FAILED = "failed"
+
+FINISHED_STAGES = frozenset({STAGE_DONE, STAGE_SKIPPED})
+
+_SCHEMA = """
+create table if not exists jobs (
+    job_id text primary key,
+    pipeline_id text not null,
+    status text not null,
+    parameters text not null,
+    created_at text not null,
+    updated_at text not null
+);
+create table if not exists job_documents (
+    job_id text not null references jobs(job_id),
+    location text not null,
+    position integer not null,
+    content_hash text not null,
+    stage text not null,
+    chunk_count integer,
+    error text,
+    updated_at text not null,
+    primary key (job_id, location)
+);
+create table if not exists job_embeddings (
+    job_id text not null,
+    location text not null,
+    position integer not null,
+    text_hash text not null,
+    model text not null,
+    dimensions integer not null,
+    vector blob not null,
+    primary key (job_id, location, position)
+);
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class JobRecord:
+    """One ingestion job in the ledger."""
+
+    job_id: str
+    pipeline_id: str
+    status: str
+    parameters: dict[str, JSONValue]
+    created_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class LedgerDocument:
+    """Progress of one document within a job."""
+
+    location: str
+    position: int
+    content_hash: str
+    stage: str
+    chunk_count: int | None
+    error: str | None
+
+
+class JobLedger:
+    """Durable record of ingestion jobs backed by a SQLite file.
+
+    Every write commits immediately, so the ledger is never more than one
+    batch behind the work actually done.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._connection.execute("pragma journal_mode=wal")
+        self._connection.execute("pragma synchronous=normal")
+        self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        self._connection.close()
+
+    def create_job(
+        self,
+        *,
+        pipeline_id: str,
+        parameters: Mapping[str, JSONValue],
+        documents: Sequence[DocumentInput],
+        job_id: str | None = None,
+    ) -> str:
+        """Record a new job and its discovered documents.
+
+        Returns:
+            The job identifier.
+        """
+        resolved_id = job_id or uuid4().hex
+        now = _now()
+        with self._lock, self._connection:
+            self._connection.execute("begin")
+            self._connection.execute(
+                "insert into jobs (job_id, pipeline_id, status, parameters, created_at, updated_at) "
+                "values (?, ?, ?, ?, ?, ?)",
+                (resolved_id, pipeline_id, JOB_RUNNING, json.dumps(dict(parameters)), now, now),
+            )
+            self._connection.executemany(
+                "insert into job_documents (job_id, location, position, content_hash, stage, updated_at) "
+                "values (?, ?, ?, ?, ?, ?)",
+                [
+                    (resolved_id, str(document.metadata.location), position, document.metadata.content_hash, STAGE_PENDING, now)
+                    for position, document in enumerate(documents)
+                ],
+            )
+        return resolved_id
+
+    def get_job(self, job_id: str) -> JobRecord:
+        """Return the job, raising ``LookupError`` if it is unknown."""
+        with self._lock:
+            row = self._connection.execute(
+                "select job_id, pipeline_id, status, parameters, created_at from jobs where job_id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            raise LookupError(f"Unknown ingestion job: {job_id}")
+        return JobRecord(
+            job_id=row[0],
+            pipeline_id=row[1],
+            status=row[2],
+            parameters=json.loads(row[3]),
+            created_at=datetime.fromisoformat(row[4]),
+        )
+
+    def documents(self, job_id: str) -> list[LedgerDocument]:
+        """Return the job's documents in discovery order."""
+        with self._lock:
+            rows = self._connection.execute(
+                "select location, position, content_hash, stage, chunk_count, error "
+                "from job_documents where job_id = ? order by position",
+                (job_id,),
+            ).fetchall()
+        return [LedgerDocument(*row) for row in rows]
+
+    def set_stage(
+        self,
+        job_id: str,
+        location: str,
+        stage: str,
+        *,
+        chunk_count: int | None = None,
+        error: str | None = None,
+        content_hash: str | None = None,
+    ) -> None:
+        """Advance a document to ``stage``.
+
+        Finishing a document (``done`` or ``skipped``) also drops its stored
+        embeddings.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("begin")
+            self._connection.execute(
+                "update job_documents set stage = ?, chunk_count = coalesce(?, chunk_count), error = ?, "
+                "content_hash = coalesce(?, content_hash), updated_at = ? where job_id = ? and location = ?",
+                (stage, chunk_count, error, content_hash, _now(), job_id, location),
+            )
+            if stage in FINISHED_STAGES:
+                self._delete_embeddings(job_id, location)
+
+    def finish_job(self, job_id: str, status: str) -> None:
+        """Record the job's final status."""
+        with self._lock:
+            self._connection.execute(
+                "update jobs set status = ?, updated_at = ? where job_id = ?",
+                (status, _now(), job_id),
+            )
+
+    def checkpoint(self, job_id: str, location: str) -> "DocumentCheckpoint":
+        """Return a handle for recording one document's progress."""
+        return DocumentCheckpoint(self, job_id, location)
+
+    def save_embeddings(
+        self,
+        job_id: str,
+        location: str,
+        items: Sequence[tuple[int, ChunkData, EmbeddingRecord]],
+    ) -> None:
+        """Store embedded chunks that are not persisted yet."""
+        with self._lock, self._connection:
+            self._connection.execute("begin")
+            self._connection.executemany(
+                "insert or replace into job_embeddings "
+                "(job_id, location, position, text_hash, model, dimensions, vector) values (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        job_id,
+                        location,
+                        position,
+                        _text_hash(chunk.text),
+                        record.model,
+                        record.dimensions,
+                        np.asarray(record.vector, dtype=np.float32).tobytes(),
+                    )
+                    for position, chunk, record in items
+                ],
+            )
+
+    def load_embeddings(
+        self,
+        job_id: str,
+        location: str,
+        chunks: Sequence[ChunkData],
+        *,
+        model_info: EmbeddingModelInfo,
+        dimensions: int,
+    ) -> dict[int, EmbeddingRecord]:
+        """Return stored embeddings that can stand in for embedding ``chunks``.
+
+        Args:
+            job_id: Job identifier.
+            location: Document location.
+            chunks: The document's current chunks.
+            model_info: Model the resuming run embeds with.
+            dimensions: Vector size the resuming run expects.
+
+        Returns:
+            Embedding records keyed by position in ``chunks``, limited to rows
+            whose chunk text still matches and that came from the same model
+            and dimensions.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "select position, text_hash, model, dimensions, vector from job_embeddings "
+                "where job_id = ? and location = ?",
+                (job_id, location),
+            ).fetchall()
+        records: dict[int, EmbeddingRecord] = {}
+        for position, text_hash, model, stored_dimensions, vector in rows:
+            if position >= len(chunks) or _text_hash(chunks[position].text) != text_hash:
+                continue
+            if model != model_info.model or dimensions != stored_dimensions:
+                continue
+            records[position] = EmbeddingRecord(
+                vector=np.frombuffer(vector, dtype=np.float32).copy(),
+                model=model,
+                dimensions=stored_dimensions,
+            )
+        return records
+
+    def clear_embeddings(self, job_id: str, location: str) -> None:
+        """Drop every stored embedding of one document."""
+        with self._lock, self._connection:
+            self._connection.execute("begin")
+            self._delete_embeddings(job_id, location)
+
+    def _delete_embeddings(self, job_id: str, location: str) -> None:
+        self._connection.execute(
+            "delete from job_embeddings where job_id = ? and location = ?",
+            (job_id, location),
+        )
+
+
+class DocumentCheckpoint:
+    """A ``JobLedger`` bound to one document of one job."""
+
+    def __init__(self, ledger: JobLedger, job_id: str, location: str) -> None:
+        self._ledger = ledger
+        self.job_id = job_id
+        self.location = location
+
+    def mark(self, stage: str, *, chunk_count: int | None = None, error: str | None = None) -> None:
+        """Advance the document to ``stage``."""
+        self._ledger.set_stage(self.job_id, self.location, stage, chunk_count=chunk_count, error=error)
+
+    def save_embeddings(self, items: Sequence[tuple[int, ChunkData, EmbeddingRecord]]) -> None:
+        """Store one embedded batch."""
+        self._ledger.save_embeddings(self.job_id, self.location, items)
+
+    def load_embeddings(
+        self,
+        chunks: Sequence[ChunkData],
+        *,
+        model_info: EmbeddingModelInfo,
+        dimensions: int,
+    ) -> dict[int, EmbeddingRecord]:
+        """Return reusable embeddings keyed by chunk position."""
+        return self._ledger.load_embeddings(
+            self.job_id,
+            self.location,
+            chunks,
+            model_info=model_info,
+            dimensions=dimensions,
+        )
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _now() -> str:
+    return datetime.now(tz=timezone.utc).isoformat()
@@ -0,0 +1,106 @@
+"""Binary pgvector adaptation for NumPy embedding arrays."""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Sequence
+
+import numpy as np
+
+try:  # pragma: no cover - optional dependency
+    from psycopg.adapt import Dumper
+    from psycopg.pq import Format
+    from psycopg.types import TypeInfo
+except ImportError:  # pragma: no cover - optional dependency
+    Dumper = None  # type: ignore
+    Format = None  # type: ignore
+    TypeInfo = None  # type: ignore
+
+from src.rag_pipeline.schemas import EmbeddingVector, as_embedding_vector
+from src.shared.logging import LoggerProtocol, get_logger
+
+logger: LoggerProtocol = get_logger(__name__)
+
+_HEADER = struct.Struct(">HH")
+
+
+def encode_vector_binary(vector: Sequence[float] | EmbeddingVector) -> bytes:
+    """Encode a vector in pgvector's binary wire format.
+
+    The format is a big-endian ``uint16`` dimension count, an unused
+    ``uint16`` and the values as big-endian ``float4``.
+
+    Args:
+        vector: Embedding values.
+
+    Returns:
+        Bytes accepted by pgvector's ``vector_recv``.
+    """
+    array = as_embedding_vector(vector)
+    return _HEADER.pack(array.shape[0], 0) + array.astype(">f4", copy=False).tobytes()
+
+
+def decode_vector_binary(data: bytes) -> EmbeddingVector:
+    """Decode pgvector's binary wire format into a float32 array.
+
+    Args:
+        data: Bytes produced by ``vector_send`` or ``encode_vector_binary``.
+
+    Returns:
+        Contiguous float32 array.
+    """
+    dimensions, _unused = _HEADER.unpack_from(data)
+    values = np.frombuffer(data, dtype=">f4", count=dimensions, offset=_HEADER.size)
+    return values.astype(np.float32)
+
+
+def encode_vector_text(vector: Sequence[float] | EmbeddingVector) -> bytes:
+    """Encode a vector as a pgvector text literal (``[1,2,3]``)."""
+    array = as_embedding_vector(vector)
+    return ("[" + ",".join(repr(value) for value in array.tolist()) + "]").encode("ascii")
+
+
+def register_vector_adapters(connection: Any) -> bool:
+    """Teach a psycopg connection to send NumPy arrays as pgvector values.
+
+    Uses the binary protocol when the ``vector`` type exists in the database
+    and falls back to the text literal otherwise (the server then casts from
+    the target column or an explicit ``::vector``).
+
+    Args:
+        connection: Open psycopg connection.
+
+    Returns:
+        True when the binary dumper was registered.
+    """
+    if Dumper is None or TypeInfo is None:  # pragma: no cover - optional dependency
+        raise RuntimeError("psycopg is required to register pgvector adapters.")
+    info = TypeInfo.fetch(connection, "vector")
+    if info is None:
+        connection.adapters.register_dumper(np.ndarray, _VectorTextDumper)
+        logger.warning("pgvector_type_missing", fallback="text")
+        return False
+    binary_dumper = type(
+        "VectorBinaryDumper",
+        (_VectorBinaryDumper,),
+        {"oid": info.oid},
+    )
+    connection.adapters.register_dumper(np.ndarray, binary_dumper)
+    return True
+
+
+if Dumper is not None:
+
+    class _VectorBinaryDumper(Dumper):
+        """psycopg dumper emitting pgvector's binary format."""
+
+        format = Format.BINARY
+
+        def dump(self, obj: EmbeddingVector) -> bytes:
+            return encode_vector_binary(obj)
+
+    class _VectorTextDumper(Dumper):
+        """psycopg dumper emitting pgvector text literals."""
+
+        def dump(self, obj: EmbeddingVector) -> bytes:
+            return encode_vector_text(obj)
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import contextlib
 import json
+import threading
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from time import perf_counter
-from typing import Any, Callable, ContextManager, Mapping, MutableMapping, Protocol, Sequence, TypeVar
+from typing import Any, Callable, ContextManager, Iterator, Mapping, MutableMapping, Protocol, Sequence, TypeVar
 from uuid import uuid4
 
 try:  # pragma: no cover - optional dependency
@@ -18,13 +21,18 @@ except ImportError:  # pragma: no cover - optional dependency
     dict_row = None  # type: ignore
 
 from src.rag_pipeline.config import RagIngestionConfig
+from src.rag_pipeline.persistence.pgvector import register_vector_adapters
 from src.rag_pipeline.schemas import (
     ChunkRecord,
     DocumentInput,
     JSONValue,
+    RetrievalFilters,
     SourceIngestionStatus,
+    as_embedding_vector,
 )
+from src.shared.deadline import DeadlineExceeded, current_deadline
 from src.shared.logging import LoggerProtocol, get_logger
+from src.shared.metrics import get_metrics
 
 logger: LoggerProtocol = get_logger(__name__)
 
@@ -60,46 +68,121 @@ class DatabaseClientProtocol(Protocol):
 
 
 class PsycopgDatabaseClient(DatabaseClientProtocol):
-    """Lightweight psycopg3 wrapper implementing DatabaseClientProtocol."""
+    """Lightweight psycopg3 wrapper implementing DatabaseClientProtocol.
 
-    def __init__(self, dsn: str) -> None:
+    Holds up to ``pool_size`` connections so concurrent callers (parallel
+    retrieval queries, concurrent API requests) do not serialize on one
+    connection. The first connection is opened eagerly so configuration
+    errors surface at construction; the rest are opened on demand. Inside
+    ``transaction()`` every call on the same thread reuses the transaction's
+    connection.
+    """
+
+    def __init__(self, dsn: str, *, pool_size: int = 1) -> None:
         if psycopg is None:  # pragma: no cover - optional dependency
             raise RuntimeError(
                 "psycopg is required for PsycopgDatabaseClient but is not installed.",
             )
-        self._connection: Connection[Any] = psycopg.connect(dsn)  # type: ignore[assignment]
-        self._connection.autocommit = True
+        self._dsn = dsn
+        self._pool_size = max(1, pool_size)
+        self._connections: list[Connection[Any]] = []
+        self._idle: list[Connection[Any]] = []
+        self._available = threading.Condition()
+        self._local = threading.local()
+        self._idle.append(self._open())
 
     def close(self) -> None:
-        """Close the underlying psycopg connection."""
-        self._connection.close()
+        """Close every pooled psycopg connection."""
+        with self._available:
+            connections, self._connections = self._connections, []
+            self._idle = []
+        for connection in connections:
+            connection.close()
 
     def execute(self, query: str, parameters: SQLParams = None) -> None:
-        with self._connection.cursor() as cursor:
+        with self._connection() as connection, connection.cursor() as cursor:
             cursor.execute(query, parameters)
 
     def executemany(self, query: str, param_sets: Sequence[BatchSQLParams]) -> None:
-        with self._connection.cursor() as cursor:
+        with self._connection() as connection, connection.cursor() as cursor:
             cursor.executemany(query, param_sets)
 
     def fetchrow(self, query: str, parameters: SQLParams = None) -> Mapping[str, Any] | None:
-        with self._connection.cursor(row_factory=dict_row) as cursor:  # type: ignore[arg-type]
+        with self._connection() as connection, connection.cursor(row_factory=dict_row) as cursor:  # type: ignore[arg-type]
             cursor.execute(query, parameters)
             return cursor.fetchone()
 
     def fetchval(self, query: str, parameters: SQLParams = None) -> Any:
-        with self._connection.cursor() as cursor:
+        with self._connection() as connection, connection.cursor() as cursor:
             cursor.execute(query, parameters)
             row = cursor.fetchone()
             return None if row is None else row[0]
 
     def fetchall(self, query: str, parameters: SQLParams = None) -> Sequence[Mapping[str, Any]]:
-        with self._connection.cursor(row_factory=dict_row) as cursor:  # type: ignore[arg-type]
+        with self._connection() as connection, connection.cursor(row_factory=dict_row) as cursor:  # type: ignore[arg-type]
             cursor.execute(query, parameters)
             return cursor.fetchall()
 
-    def transaction(self) -> ContextManager[Any]:
-        return self._connection.transaction()
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[Any]:
+        with self._connection() as connection:
+            previous = getattr(self._local, "connection", None)
+            self._local.connection = connection
+            try:
+                with connection.transaction() as transaction:
+                    yield transaction
+            finally:
+                self._local.connection = previous
+
+    def _open(self) -> Connection[Any]:
+        connection: Connection[Any] = psycopg.connect(self._dsn)  # type: ignore[assignment]
+        connection.autocommit = True
+        try:
+            register_vector_adapters(connection)
+        except Exception as exc:  # pragma: no cover - depends on live database
+            logger.warning("pgvector_adapter_registration_failed", error=str(exc))
+        with self._available:
+            self._connections.append(connection)
+        return connection
+
+    @contextlib.contextmanager
+    def _connection(self) -> Iterator[Connection[Any]]:
+        pinned = getattr(self._local, "connection", None)
+        if pinned is not None:
+            yield pinned
+            return
+        connection = self._acquire()
+        try:
+            yield connection
+        finally:
+            self._release(connection)
+
+    def _acquire(self) -> Connection[Any]:
+        with self._available:
+            while not self._idle and len(self._connections) >= self._pool_size:
+                self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            # Reserve the slot before connecting outside the lock.
+            placeholder: Any = object()
+            self._connections.append(placeholder)
+        try:
+            connection = self._open()
+        finally:
+            with self._available:
+                self._connections.remove(placeholder)
+                self._available.notify()
+        return connection
+
+    def _release(self, connection: Connection[Any]) -> None:
+        with self._available:
+            if connection.closed:
+                # Broken connections are dropped; the next caller reopens one.
+                if connection in self._connections:
+                    self._connections.remove(connection)
+            else:
+                self._idle.append(connection)
+            self._available.notify()
 
 
 @dataclass(frozen=True, slots=True)
@@ -264,7 +347,7 @@ class SupabaseStore:
                 _safe_str(record.metadata.get("structural_type")),
                 _safe_str(record.metadata.get("section_heading")),
                 record.text,
-                list(record.embedding),
+                record.embedding,
                 record.embedding_model,
                 _serialize_chunk_metadata(record),
             )
@@ -295,27 +378,96 @@ class SupabaseStore:
         query_embedding: Sequence[float],
         match_count: int,
         min_score: float,
+        filters: RetrievalFilters | None = None,
     ) -> Sequence[Mapping[str, Any]]:
-        """Return chunks matching the provided embedding using DB function."""
-        sql = """
-            select
-                chunk_id,
-                source_id,
-                document_name,
-                content,
-                score,
-                metadata
-            from rag.match_chunks(%s::vector, %s, %s)
+        """Return chunks matching the provided embedding.
+
+        Unfiltered searches call the ``rag.match_chunks`` database function.
+        With filters the search is issued inline: a materialized CTE first
+        selects the rows matching the predicates (via the btree and GIN
+        indexes from the schema) and computes their exact distance, and only
+        then is that candidate set ordered and limited. Letting the planner
+        order by the ivfflat index instead would post-filter the few lists it
+        probes and silently return fewer than ``match_count`` rows for
+        selective filters. The cost is an exact scan of the filtered rows, so
+        filters that match most of the corpus are slower than an unfiltered
+        search.
+
+        Under a request deadline the query runs with a transaction-local
+        ``statement_timeout`` equal to the remaining time, so Postgres cancels
+        it instead of finishing work nobody is waiting for.
+
+        Raises:
+            DeadlineExceeded: When the request deadline expires before or
+                during the query.
         """
-        rows = self._run_query(
-            "match_chunks",
-            lambda: self._db.fetchall(
-                sql,
-                (list(query_embedding), match_count, min_score),
-            ),
-        )
+        vector = as_embedding_vector(query_embedding)
+        if filters is None or filters.is_empty:
+            sql = """
+                select
+                    chunk_id,
+                    source_id,
+                    document_name,
+                    content,
+                    score,
+                    metadata
+                from rag.match_chunks(%s::vector, %s, %s)
+            """
+            parameters: tuple[Any, ...] = (vector, match_count, min_score)
+            operation = "match_chunks"
+        else:
+            predicates, filter_parameters = _compile_retrieval_filters(filters)
+            sql = f"""
+                with candidates as materialized (
+                    select
+                        c.id as chunk_id,
+                        c.source_id,
+                        s.document_name,
+                        c.text as content,
+                        c.embedding <=> %s::vector as distance,
+                        c.metadata || jsonb_build_object('chunk_index', c.chunk_index) as metadata
+                    from {self._chunks_table} c
+                    join {self._sources_table} s on s.id = c.source_id
+                    where {" and ".join(predicates)}
+                )
+                select
+                    chunk_id,
+                    source_id,
+                    document_name,
+                    content,
+                    1 - distance as score,
+                    metadata
+                from candidates
+                where 1 - distance >= %s
+                order by distance
+                limit %s
+            """
+            parameters = (vector, *filter_parameters, min_score, match_count)
+            operation = "match_chunks_filtered"
+        deadline = current_deadline()
+        if deadline is None:
+            rows = self._run_query(operation, lambda: self._db.fetchall(sql, parameters))
+            return rows or []
+        deadline.check("retrieval")
+        timeout_ms = max(1, int(deadline.remaining() * 1000))
+        try:
+            rows = self._run_query(operation, lambda: self._fetchall_with_timeout(sql, parameters, timeout_ms))
+        except Exception as exc:
+            if deadline.expired:
+                raise DeadlineExceeded("retrieval") from exc
+            raise
         return rows or []
 
+    def _fetchall_with_timeout(
+        self,
+        sql: str,
+        parameters: SQLParams,
+        timeout_ms: int,
+    ) -> Sequence[Mapping[str, Any]]:
+        with self._db.transaction():
+            self._db.execute("select set_config('statement_timeout', %s, true)", (str(timeout_ms),))
+            return self._db.fetchall(sql, parameters)
+
     @staticmethod
     def has_content_changed(
         document: DocumentInput,
@@ -351,9 +503,15 @@ class SupabaseStore:
         try:
             result = func()
         except Exception:
+            get_metrics().observe_db_operation(
+                operation=name,
+                duration_seconds=perf_counter() - start,
+                outcome="error",
+            )
             logger.exception("db_query_failed", operation=name)
             raise
         duration_ms = (perf_counter() - start) * 1000.0
+        get_metrics().observe_db_operation(operation=name, duration_seconds=duration_ms / 1000.0)
         logger.info(
             "db_query_completed",
             operation=name,
@@ -467,6 +625,46 @@ def _build_source_metadata(document: DocumentInput) -> dict[str, JSONValue]:
     return metadata
 
 
+def _compile_retrieval_filters(filters: RetrievalFilters) -> tuple[list[str], list[Any]]:
+    """Translate filters into SQL predicates over ``c`` (chunks) and ``s`` (sources).
+
+    Each predicate matches an index in the example schema: btree on the
+    type/heading columns and on ``metadata->>'last_modified'``, and GIN
+    ``jsonb_path_ops`` for metadata containment. ``last_modified`` is stored
+    as a UTC ISO-8601 string, so bounds compare as text in the same format.
+    """
+    predicates: list[str] = []
+    parameters: list[Any] = []
+    if filters.document_types:
+        predicates.append("s.document_type = any(%s)")
+        parameters.append(list(filters.document_types))
+    if filters.source_types:
+        predicates.append("s.source_type = any(%s)")
+        parameters.append(list(filters.source_types))
+    if filters.section_headings:
+        predicates.append("c.section_heading = any(%s)")
+        parameters.append(list(filters.section_headings))
+    if filters.modified_after is not None:
+        predicates.append("(s.metadata->>'last_modified') >= %s")
+        parameters.append(_utc_isoformat(filters.modified_after))
+    if filters.modified_before is not None:
+        predicates.append("(s.metadata->>'last_modified') < %s")
+        parameters.append(_utc_isoformat(filters.modified_before))
+    if filters.source_metadata:
+        predicates.append("s.metadata @> %s::jsonb")
+        parameters.append(json.dumps(filters.source_metadata))
+    if filters.chunk_metadata:
+        predicates.append("c.metadata @> %s::jsonb")
+        parameters.append(json.dumps(filters.chunk_metadata))
+    return predicates, parameters
+
+
+def _utc_isoformat(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
 def _serialize_chunk_metadata(record: ChunkRecord) -> str:
     return json.dumps(record.metadata)
 
@@ -0,0 +1,506 @@
+"""Durable work queue that spreads ingestion across worker processes.
+
+A coordinator discovers documents and enqueues one row per document in a
+Postgres table. Any number of workers, on any number of nodes, lease rows
+with ``select ... for update skip locked``. Concurrent workers never block
+on each other and never receive the same row. A lease hides its row for a
+visibility timeout. The worker extends the lease while it processes the
+document, then acks it (done) or nacks it (queued again after a delay).
+
+If a worker dies, its lease expires and another worker picks the row up
+again. A row is failed for good once ``max_attempts`` leases are used up.
+Each lease carries a fresh token, and acks or extends only apply while the
+token still matches. A worker whose lease already expired and was handed to
+someone else cannot overwrite the new owner's outcome.
+
+All lease arithmetic uses the database clock (``now()``), so clock skew
+between nodes does not matter. ``InMemoryWorkQueue`` implements the same
+protocol with the same semantics in-process for tests.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from time import monotonic
+from typing import Any, Callable, Mapping, Protocol, Sequence
+from uuid import uuid4
+
+from src.rag_pipeline.config import RagIngestionConfig
+from src.rag_pipeline.persistence.supabase_store import DatabaseClientProtocol
+from src.rag_pipeline.schemas import DocumentInput, DocumentMetadata, JSONValue, SourceType
+
+ITEM_QUEUED = "queued"
+ITEM_LEASED = "leased"
+ITEM_DONE = "done"
+ITEM_FAILED = "failed"
+
+PENDING_STATUSES = (ITEM_QUEUED, ITEM_LEASED)
+
+_EXPIRED_MESSAGE = "Lease expired on the final attempt."
+
+
+@dataclass(frozen=True, slots=True)
+class WorkItem:
+    """One leased document.
+
+    Attributes:
+        id: Queue row id.
+        job_id: Job the document was enqueued for.
+        document: The document to ingest.
+        attempts: Leases taken so far, including this one.
+        max_attempts: Leases allowed before the item fails for good.
+        lease_token: Proof of ownership required to ack, nack or extend.
+        options: Job-wide settings chosen by the coordinator, such as
+            ``force_reingest`` and ``pipeline_id``.
+    """
+
+    id: int
+    job_id: str
+    document: DocumentInput
+    attempts: int
+    max_attempts: int
+    lease_token: str
+    options: dict[str, JSONValue] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class FailedItem:
+    """A document that used up its attempts."""
+
+    location: str
+    attempts: int
+    error: str | None
+
+
+class WorkQueueProtocol(Protocol):
+    """Operations shared by the Postgres and in-memory queues."""
+
+    def enqueue(
+        self,
+        job_id: str,
+        documents: Sequence[DocumentInput],
+        *,
+        max_attempts: int,
+        options: Mapping[str, JSONValue] | None = None,
+    ) -> None:
+        """Add documents to a job; documents already queued for it are ignored."""
+
+    def lease(
+        self,
+        *,
+        worker_id: str,
+        visibility_timeout_seconds: float,
+        job_id: str | None = None,
+        limit: int = 1,
+    ) -> list[WorkItem]:
+        """Lease up to ``limit`` visible items, oldest first."""
+
+    def extend(self, item: WorkItem, visibility_timeout_seconds: float) -> bool:
+        """Push the item's lease out; False if the lease was lost."""
+
+    def ack(self, item: WorkItem, *, note: str | None = None) -> bool:
+        """Mark the item done; False if the lease was lost."""
+
+    def nack(self, item: WorkItem, *, error: str | None, retry_delay_seconds: float) -> bool:
+        """Release the item for a retry, or fail it once attempts run out."""
+
+    def reap_expired(self) -> int:
+        """Fail items whose lease expired on their final attempt."""
+
+    def pending(self, job_id: str | None = None) -> int:
+        """Count items still queued or leased."""
+
+    def counts(self, job_id: str) -> dict[str, int]:
+        """Count a job's items by status."""
+
+    def failed_items(self, job_id: str) -> list[FailedItem]:
+        """Return a job's items that failed for good."""
+
+
+class PostgresWorkQueue:
+    """Work queue stored in ``{supabase_schema}.{work_queue_table}``."""
+
+    def __init__(self, db: DatabaseClientProtocol, config: RagIngestionConfig) -> None:
+        self._db = db
+        self._table = f"{config.supabase_schema}.{config.work_queue_table}"
+        self._index_prefix = config.work_queue_table
+
+    def ensure_table(self) -> None:
+        """Create the queue table and its index if they do not exist."""
+        self._db.execute(
+            f"""
+            create table if not exists {self._table} (
+                id bigserial primary key,
+                job_id text not null,
+                location text not null,
+                payload jsonb not null,
+                status text not null default '{ITEM_QUEUED}',
+                attempts integer not null default 0,
+                max_attempts integer not null default 3,
+                visible_at timestamptz not null default now(),
+                lease_token uuid,
+                leased_by text,
+                last_error text,
+                created_at timestamptz not null default now(),
+                updated_at timestamptz not null default now(),
+                unique (job_id, location)
+            )
+            """,
+        )
+        self._db.execute(
+            f"create index if not exists {self._index_prefix}_ready_idx "
+            f"on {self._table} (visible_at, id) where status in ('{ITEM_QUEUED}', '{ITEM_LEASED}')",
+        )
+
+    def enqueue(
+        self,
+        job_id: str,
+        documents: Sequence[DocumentInput],
+        *,
+        max_attempts: int,
+        options: Mapping[str, JSONValue] | None = None,
+    ) -> None:
+        if not documents:
+            return
+        self._db.executemany(
+            f"insert into {self._table} (job_id, location, payload, max_attempts) "
+            f"values (%s, %s, %s::jsonb, %s) on conflict (job_id, location) do nothing",
+            [
+                (
+                    job_id,
+                    str(document.metadata.location),
+                    json.dumps({"document": document_payload(document), "options": dict(options or {})}),
+                    max_attempts,
+                )
+                for document in documents
+            ],
+        )
+
+    def lease(
+        self,
+        *,
+        worker_id: str,
+        visibility_timeout_seconds: float,
+        job_id: str | None = None,
+        limit: int = 1,
+    ) -> list[WorkItem]:
+        self.reap_expired()
+        with self._db.transaction():
+            rows = self._db.fetchall(
+                f"""
+                with candidate as (
+                    select id from {self._table}
+                    where status in ('{ITEM_QUEUED}', '{ITEM_LEASED}')
+                      and visible_at <= now()
+                      and attempts < max_attempts
+                      and (%s::text is null or job_id = %s)
+                    order by visible_at, id
+                    limit %s
+                    for update skip locked
+                )
+                update {self._table} as queue
+                set status = '{ITEM_LEASED}',
+                    attempts = queue.attempts + 1,
+                    lease_token = gen_random_uuid(),
+                    leased_by = %s,
+                    visible_at = now() + make_interval(secs => %s),
+                    updated_at = now()
+                from candidate
+                where queue.id = candidate.id
+                returning queue.id, queue.job_id, queue.payload, queue.attempts, queue.max_attempts, queue.lease_token
+                """,
+                (job_id, job_id, limit, worker_id, visibility_timeout_seconds),
+            )
+        return [_map_item(row) for row in rows]
+
+    def reap_expired(self) -> int:
+        # Such leases will never be handed out again; failing them lets the
+        # job finish even when the worker holding them died.
+        rows = self._db.fetchall(
+            f"""
+            update {self._table}
+            set status = '{ITEM_FAILED}',
+                lease_token = null,
+                last_error = coalesce(last_error, '{_EXPIRED_MESSAGE}'),
+                updated_at = now()
+            where id in (
+                select id from {self._table}
+                where status = '{ITEM_LEASED}' and visible_at <= now() and attempts >= max_attempts
+                for update skip locked
+            )
+            returning id
+            """,
+        )
+        return len(rows)
+
+    def extend(self, item: WorkItem, visibility_timeout_seconds: float) -> bool:
+        row = self._db.fetchval(
+            f"update {self._table} set visible_at = now() + make_interval(secs => %s), updated_at = now() "
+            f"where id = %s and lease_token = %s and status = '{ITEM_LEASED}' returning id",
+            (visibility_timeout_seconds, item.id, item.lease_token),
+        )
+        return row is not None
+
+    def ack(self, item: WorkItem, *, note: str | None = None) -> bool:
+        row = self._db.fetchval(
+            f"update {self._table} set status = '{ITEM_DONE}', lease_token = null, last_error = %s, updated_at = now() "
+            f"where id = %s and lease_token = %s and status = '{ITEM_LEASED}' returning id",
+            (note, item.id, item.lease_token),
+        )
+        return row is not None
+
+    def nack(self, item: WorkItem, *, error: str | None, retry_delay_seconds: float) -> bool:
+        row = self._db.fetchval(
+            f"""
+            update {self._table}
+            set status = case when attempts >= max_attempts then '{ITEM_FAILED}' else '{ITEM_QUEUED}' end,
+                visible_at = now() + make_interval(secs => %s),
+                lease_token = null,
+                last_error = %s,
+                updated_at = now()
+            where id = %s and lease_token = %s and status = '{ITEM_LEASED}'
+            returning id
+            """,
+            (retry_delay_seconds, error, item.id, item.lease_token),
+        )
+        return row is not None
+
+    def pending(self, job_id: str | None = None) -> int:
+        value = self._db.fetchval(
+            f"select count(*) from {self._table} "
+            f"where status in ('{ITEM_QUEUED}', '{ITEM_LEASED}') and (%s::text is null or job_id = %s)",
+            (job_id, job_id),
+        )
+        return int(value or 0)
+
+    def counts(self, job_id: str) -> dict[str, int]:
+        rows = self._db.fetchall(
+            f"select status, count(*) as items from {self._table} where job_id = %s group by status",
+            (job_id,),
+        )
+        return {str(row["status"]): int(row["items"]) for row in rows}
+
+    def failed_items(self, job_id: str) -> list[FailedItem]:
+        rows = self._db.fetchall(
+            f"select location, attempts, last_error from {self._table} "
+            f"where job_id = %s and status = '{ITEM_FAILED}' order by id",
+            (job_id,),
+        )
+        return [
+            FailedItem(location=str(row["location"]), attempts=int(row["attempts"]), error=row["last_error"])
+            for row in rows
+        ]
+
+
+@dataclass(slots=True)
+class _MemoryRow:
+    id: int
+    job_id: str
+    location: str
+    document: DocumentInput
+    max_attempts: int
+    options: dict[str, JSONValue]
+    status: str = ITEM_QUEUED
+    attempts: int = 0
+    visible_at: float = 0.0
+    lease_token: str | None = None
+    last_error: str | None = None
+
+
+class InMemoryWorkQueue:
+    """Thread-safe in-process queue with the Postgres queue's semantics."""
+
+    def __init__(self, *, clock: Callable[[], float] = monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._rows: list[_MemoryRow] = []
+
+    def enqueue(
+        self,
+        job_id: str,
+        documents: Sequence[DocumentInput],
+        *,
+        max_attempts: int,
+        options: Mapping[str, JSONValue] | None = None,
+    ) -> None:
+        with self._lock:
+            existing = {(row.job_id, row.location) for row in self._rows}
+            for document in documents:
+                location = str(document.metadata.location)
+                if (job_id, location) in existing:
+                    continue
+                existing.add((job_id, location))
+                self._rows.append(
+                    _MemoryRow(
+                        id=len(self._rows) + 1,
+                        job_id=job_id,
+                        location=location,
+                        document=document,
+                        max_attempts=max_attempts,
+                        options=dict(options or {}),
+                        visible_at=self._clock(),
+                    ),
+                )
+
+    def lease(
+        self,
+        *,
+        worker_id: str,
+        visibility_timeout_seconds: float,
+        job_id: str | None = None,
+        limit: int = 1,
+    ) -> list[WorkItem]:
+        self.reap_expired()
+        leased: list[WorkItem] = []
+        with self._lock:
+            now = self._clock()
+            candidates = sorted(
+                (
+                    row
+                    for row in self._rows
+                    if row.status in PENDING_STATUSES
+                    and row.visible_at <= now
+                    and row.attempts < row.max_attempts
+                    and (job_id is None or row.job_id == job_id)
+                ),
+                key=lambda row: (row.visible_at, row.id),
+            )
+            for row in candidates[:limit]:
+                row.status = ITEM_LEASED
+                row.attempts += 1
+                row.lease_token = uuid4().hex
+                row.visible_at = now + visibility_timeout_seconds
+                leased.append(
+                    WorkItem(
+                        id=row.id,
+                        job_id=row.job_id,
+                        document=row.document,
+                        attempts=row.attempts,
+                        max_attempts=row.max_attempts,
+                        lease_token=row.lease_token,
+                        options=dict(row.options),
+                    ),
+                )
+        return leased
+
+    def reap_expired(self) -> int:
+        reaped = 0
+        with self._lock:
+            now = self._clock()
+            for row in self._rows:
+                if row.status == ITEM_LEASED and row.visible_at <= now and row.attempts >= row.max_attempts:
+                    row.status = ITEM_FAILED
+                    row.lease_token = None
+                    row.last_error = row.last_error or _EXPIRED_MESSAGE
+                    reaped += 1
+        return reaped
+
+    def extend(self, item: WorkItem, visibility_timeout_seconds: float) -> bool:
+        with self._lock:
+            row = self._owned(item)
+            if row is None:
+                return False
+            row.visible_at = self._clock() + visibility_timeout_seconds
+            return True
+
+    def ack(self, item: WorkItem, *, note: str | None = None) -> bool:
+        with self._lock:
+            row = self._owned(item)
+            if row is None:
+                return False
+            row.status = ITEM_DONE
+            row.lease_token = None
+            row.last_error = note
+            return True
+
+    def nack(self, item: WorkItem, *, error: str | None, retry_delay_seconds: float) -> bool:
+        with self._lock:
+            row = self._owned(item)
+            if row is None:
+                return False
+            row.status = ITEM_FAILED if row.attempts >= row.max_attempts else ITEM_QUEUED
+            row.visible_at = self._clock() + retry_delay_seconds
+            row.lease_token = None
+            row.last_error = error
+            return True
+
+    def pending(self, job_id: str | None = None) -> int:
+        with self._lock:
+            return sum(
+                1
+                for row in self._rows
+                if row.status in PENDING_STATUSES and (job_id is None or row.job_id == job_id)
+            )
+
+    def counts(self, job_id: str) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        with self._lock:
+            for row in self._rows:
+                if row.job_id == job_id:
+                    counts[row.status] = counts.get(row.status, 0) + 1
+        return counts
+
+    def failed_items(self, job_id: str) -> list[FailedItem]:
+        with self._lock:
+            return [
+                FailedItem(location=row.location, attempts=row.attempts, error=row.last_error)
+                for row in self._rows
+                if row.job_id == job_id and row.status == ITEM_FAILED
+            ]
+
+    def _owned(self, item: WorkItem) -> _MemoryRow | None:
+        for row in self._rows:
+            if row.id == item.id:
+                if row.status == ITEM_LEASED and row.lease_token == item.lease_token:
+                    return row
+                return None
+        return None
+
+
+def document_payload(document: DocumentInput) -> dict[str, JSONValue]:
+    """Serialize a document for the queue's ``payload`` column."""
+    metadata = document.metadata
+    return {
+        "location": str(metadata.location),
+        "display_name": document.display_name,
+        "document_type": metadata.document_type,
+        "source_type": metadata.source_type.value,
+        "content_hash": metadata.content_hash,
+        "size_bytes": metadata.size_bytes,
+        "last_modified": metadata.last_modified.isoformat() if metadata.last_modified else None,
+        "extra_metadata": dict(metadata.extra_metadata),
+    }
+
+
+def document_from_payload(payload: Mapping[str, Any]) -> DocumentInput:
+    """Rebuild a document serialized by ``document_payload``."""
+    last_modified = payload.get("last_modified")
+    metadata = DocumentMetadata(
+        location=Path(payload["location"]),
+        document_type=str(payload["document_type"]),
+        source_type=SourceType(payload["source_type"]),
+        content_hash=str(payload["content_hash"]),
+        size_bytes=int(payload["size_bytes"]),
+        last_modified=datetime.fromisoformat(last_modified) if last_modified else None,
+        extra_metadata=dict(payload.get("extra_metadata") or {}),
+    )
+    return DocumentInput(metadata=metadata, display_name=str(payload["display_name"]))
+
+
+def _map_item(row: Mapping[str, Any]) -> WorkItem:
+    payload = row["payload"]
+    if isinstance(payload, str):
+        payload = json.loads(payload)
+    return WorkItem(
+        id=int(row["id"]),
+        job_id=str(row["job_id"]),
+        document=document_from_payload(payload["document"]),
+        attempts=int(row["attempts"]),
+        max_attempts=int(row["max_attempts"]),
+        lease_token=str(row["lease_token"]),
+        options=dict(payload.get("options") or {}),
+    )
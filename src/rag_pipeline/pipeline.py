@@ -2,17 +2,37 @@
 
 from __future__ import annotations
 
+import threading
 from contextlib import ExitStack
 from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from pathlib import Path
-from time import perf_counter
-from typing import Callable, Sequence
+from time import monotonic, perf_counter, sleep
+from typing import Callable, Mapping, Sequence
+from uuid import uuid4
 
 from src.rag_pipeline.chunking.docling_chunker import DoclingChunker
 from src.rag_pipeline.config import RagIngestionConfig, get_rag_ingestion_config
 from src.rag_pipeline.embeddings import EmbeddingClientProtocol
-from src.rag_pipeline.persistence import PersistenceStoreProtocol, SourceRow
+from src.rag_pipeline.persistence import (
+    DocumentCheckpoint,
+    JobLedger,
+    PersistenceStoreProtocol,
+    SourceRow,
+    WorkItem,
+    WorkQueueProtocol,
+)
+from src.rag_pipeline.persistence.job_ledger import (
+    FINISHED_STAGES,
+    JOB_ABORTED,
+    JOB_COMPLETED,
+    STAGE_CHUNKED,
+    STAGE_DONE,
+    STAGE_EMBEDDED,
+    STAGE_FAILED,
+    STAGE_PENDING,
+    STAGE_SKIPPED,
+)
 from src.rag_pipeline.schemas import (
     ChunkData,
     ChunkRecord,
@@ -22,15 +42,26 @@ from src.rag_pipeline.schemas import (
     IngestionRequest,
     IngestionResult,
     IngestionStatistics,
+    JSONValue,
     SourceIngestionStatus,
 )
 from src.rag_pipeline.sources.local_files import discover_documents
 from src.shared.logging import LoggerProtocol, get_logger
+from src.shared.metrics import get_metrics
+from src.shared.tracing import Tracer, noop_tracer
 
 logger: LoggerProtocol = get_logger(__name__)
 
 ClockFunc = Callable[[], datetime]
 
+# Embedding batches per ledger checkpoint: larger loses more work on a crash,
+# smaller splits requests the client could have batched together.
+_CHECKPOINT_BATCHES = 4
+
+# Delay before a failed work item becomes visible again, doubled per attempt.
+_QUEUE_RETRY_DELAY_SECONDS = 5.0
+_QUEUE_MAX_RETRY_DELAY_SECONDS = 300.0
+
 
 def _default_clock() -> datetime:
     return datetime.now(tz=timezone.utc)
@@ -45,14 +76,21 @@ class PipelineServices:
     persistence: PersistenceStoreProtocol
     clock: ClockFunc = _default_clock
     logger: LoggerProtocol = field(default_factory=lambda: get_logger(__name__))
+    tracer: Tracer = field(default_factory=noop_tracer)
 
 
 def ingest_single_document(
     document: DocumentInput,
     config: RagIngestionConfig,
     services: PipelineServices,
+    checkpoint: DocumentCheckpoint | None = None,
 ) -> DocumentIngestionResult:
-    """Ingest a single document and return a status summary."""
+    """Ingest a single document and return a status summary.
+
+    With a ``checkpoint`` the document's stage is recorded in the job ledger
+    and embeddings are stored batch by batch, reusing any left by an earlier
+    attempt.
+    """
     doc_logger = services.logger
     location = str(document.metadata.location)
     embedding_info = services.embedding_client.model_info
@@ -70,41 +108,67 @@ def ingest_single_document(
     chunk_count = 0
     final_status: SourceIngestionStatus = SourceIngestionStatus.FAILED
     error_message: str | None = None
+    tracer = services.tracer
+    trace_id = config.pipeline_id
     with ExitStack() as stack:
+        document_span = stack.enter_context(
+            tracer.span(name="ingest_document", correlation_id=trace_id, attributes={"file": location}),
+        )
+
         def finalize_failure() -> None:
             if final_status == SourceIngestionStatus.FAILED and error_message:
                 services.persistence.mark_source_failed(location, error_message)
 
         stack.callback(finalize_failure)
-        source_row = services.persistence.upsert_source(
-            document=document,
-            status=SourceIngestionStatus.PENDING,
-            embedding_model=embedding_info.model,
-        )
+        with tracer.span(name="upsert_source", correlation_id=trace_id):
+            source_row = services.persistence.upsert_source(
+                document=document,
+                status=SourceIngestionStatus.PENDING,
+                embedding_model=embedding_info.model,
+            )
         try:
             chunk_start = perf_counter()
-            chunks = services.chunker.chunk_document(document)
+            with tracer.span(name="chunk", correlation_id=trace_id) as span:
+                chunks = services.chunker.chunk_document(document)
+                span.set_attribute("chunks", len(chunks))
             chunk_duration_ms = (perf_counter() - chunk_start) * 1000.0
             if not chunks:
                 error_message = "Document produced no chunks."
                 raise RuntimeError(error_message)
+            if checkpoint is not None:
+                checkpoint.mark(STAGE_CHUNKED, chunk_count=len(chunks))
             embedding_start = perf_counter()
-            embeddings = services.embedding_client.embed_document_chunks(chunks)
+            with tracer.span(name="embed", correlation_id=trace_id):
+                if checkpoint is None:
+                    embeddings = services.embedding_client.embed_document_chunks(chunks)
+                else:
+                    embeddings = _embed_with_checkpoint(
+                        chunks,
+                        embedding_client=services.embedding_client,
+                        checkpoint=checkpoint,
+                        batch_size=config.embedding_batch_size * _CHECKPOINT_BATCHES,
+                        dimensions=config.embedding_dimension,
+                    )
+                    checkpoint.mark(STAGE_EMBEDDED, chunk_count=len(chunks))
             embedding_duration_ms = (perf_counter() - embedding_start) * 1000.0
-            chunk_records = _build_chunk_records(document=document, chunks=chunks, embeddings=embeddings)
+            with tracer.span(name="build_records", correlation_id=trace_id):
+                chunk_records = _build_chunk_records(document=document, chunks=chunks, embeddings=embeddings)
             chunk_count = len(chunk_records)
             db_start = perf_counter()
-            services.persistence.replace_chunks_for_source(
-                source_id=source_row.id,
-                chunk_records=chunk_records,
-            )
+            with tracer.span(name="replace_chunks", correlation_id=trace_id):
+                services.persistence.replace_chunks_for_source(
+                    source_id=source_row.id,
+                    chunk_records=chunk_records,
+                )
             db_duration_ms = (perf_counter() - db_start) * 1000.0
-            services.persistence.mark_source_status(
-                location=location,
-                status=SourceIngestionStatus.INGESTED,
-                error_message=None,
-            )
+            with tracer.span(name="mark_source_status", correlation_id=trace_id):
+                services.persistence.mark_source_status(
+                    location=location,
+                    status=SourceIngestionStatus.INGESTED,
+                    error_message=None,
+                )
             final_status = SourceIngestionStatus.INGESTED
+            document_span.set_attribute("status", final_status.value)
             total_duration_ms = (perf_counter() - start_perf) * 1000.0
             doc_logger.info(
                 "document_ingestion_completed",
@@ -118,13 +182,18 @@ def ingest_single_document(
                 embedding_model=embedding_info.model,
                 embedding_dataset_fingerprint=embedding_info.dataset_fingerprint,
             )
-            return DocumentIngestionResult(
+            document_result = DocumentIngestionResult(
                 location=location,
                 status=final_status,
                 chunks_ingested=chunk_count,
                 error=None,
                 duration_ms=total_duration_ms,
+                chunk_duration_ms=chunk_duration_ms,
+                embedding_duration_ms=embedding_duration_ms,
+                db_duration_ms=db_duration_ms,
             )
+            _observe_document(document_result)
+            return document_result
         except Exception as exc:  # noqa: BLE001
             error_message = str(exc)
             doc_logger.exception(
@@ -138,6 +207,7 @@ def ingest_single_document(
                 if chunk_count > 0
                 else SourceIngestionStatus.FAILED
             )
+            document_span.set_attribute("status", final_status.value)
             if final_status == SourceIngestionStatus.PARTIAL:
                 services.persistence.mark_source_status(
                     location=location,
@@ -145,13 +215,40 @@ def ingest_single_document(
                     error_message=error_message,
                 )
             total_duration_ms = (perf_counter() - start_perf) * 1000.0
-            return DocumentIngestionResult(
+            document_result = DocumentIngestionResult(
                 location=location,
                 status=final_status,
                 chunks_ingested=chunk_count,
                 error=error_message,
                 duration_ms=total_duration_ms,
+                chunk_duration_ms=chunk_duration_ms,
+                embedding_duration_ms=embedding_duration_ms,
+                db_duration_ms=db_duration_ms,
             )
+            _observe_document(document_result)
+            return document_result
+
+
+def is_document_unchanged(
+    document: DocumentInput,
+    *,
+    config: RagIngestionConfig,
+    services: PipelineServices,
+) -> bool:
+    """Return whether ``document`` is stored with the same content hash.
+
+    Always False under ``force_reingest``. Records a ``content_hash`` cache
+    hit or miss when the source already exists.
+    """
+    existing: SourceRow | None = services.persistence.get_source_by_location(str(document.metadata.location))
+    unchanged = (
+        not config.force_reingest
+        and existing is not None
+        and not services.persistence.has_content_changed(document=document, existing=existing)
+    )
+    if existing is not None:
+        get_metrics().record_cache(cache="content_hash", hit=unchanged)
+    return unchanged
 
 
 def run_ingestion_job(
@@ -160,19 +257,40 @@ def run_ingestion_job(
     config: RagIngestionConfig | None = None,
     services: PipelineServices,
     max_failures: int | None = None,
+    ledger: JobLedger | None = None,
+    job_id: str | None = None,
+    resume: bool = False,
 ) -> IngestionResult:
-    """Run a full ingestion job across configured directories."""
-    active_request = request or IngestionRequest()
+    """Run a full ingestion job across configured directories.
+
+    Args:
+        request: Per-run overrides; ignored when resuming, where the job's
+            recorded parameters are used instead.
+        config: Base configuration (defaults to the environment).
+        services: Pipeline dependencies.
+        max_failures: Abort after this many failed documents.
+        ledger: Job ledger that records progress so the run can be resumed.
+        job_id: Identifier for a new job, or the job to resume.
+        resume: Continue ``job_id`` from the ledger. Finished documents are
+            reported from the ledger; the rest, including earlier failures,
+            are processed again in their original order.
+
+    Raises:
+        ValueError: When resuming without a ledger or job id.
+        LookupError: When the job to resume is not in the ledger.
+    """
+    resumed_from: dict[str, str] = {}
+    if resume:
+        if ledger is None or job_id is None:
+            raise ValueError("Resuming an ingestion job requires a ledger and a job id.")
+        job = ledger.get_job(job_id)
+        active_request = IngestionRequest.model_validate(job.parameters)
+    else:
+        active_request = request or IngestionRequest()
     base_config = config or get_rag_ingestion_config()
     merged_config = _merge_request_overrides(config=base_config, request=active_request)
     merged_config.require_sources()
     job_logger = services.logger
-    job_logger.info(
-        "ingestion_job_started",
-        pipeline_id=merged_config.pipeline_id,
-        directories=[str(path) for path in merged_config.source_directories],
-        force_reingest=merged_config.force_reingest,
-    )
     started_at = services.clock()
     documents: list[DocumentIngestionResult] = []
     stats = IngestionStatistics(
@@ -181,26 +299,54 @@ def run_ingestion_job(
         documents_failed=0,
         chunks_created=0,
     )
-    discovered_docs = _discover_unique_documents(
-        config=merged_config,
-        glob_patterns=active_request.document_glob_patterns,
+    with services.tracer.span(name="discover_documents", correlation_id=merged_config.pipeline_id):
+        discovered_docs = _discover_unique_documents(
+            config=merged_config,
+            glob_patterns=active_request.document_glob_patterns,
+        )
+    if resume and ledger is not None and job_id is not None:
+        discovered_docs, resumed_from = _resume_job_documents(
+            ledger=ledger,
+            job_id=job_id,
+            discovered=discovered_docs,
+            documents=documents,
+            stats=stats,
+        )
+        stats.documents_discovered = len(discovered_docs) + len(documents)
+    else:
+        if ledger is not None:
+            job_id = ledger.create_job(
+                pipeline_id=merged_config.pipeline_id,
+                parameters=_job_parameters(active_request, merged_config),
+                documents=discovered_docs,
+                job_id=job_id,
+            )
+        stats.documents_discovered = len(discovered_docs)
+    job_logger.info(
+        "ingestion_job_started",
+        pipeline_id=merged_config.pipeline_id,
+        job_id=job_id,
+        resumed=resume,
+        directories=[str(path) for path in merged_config.source_directories],
+        force_reingest=merged_config.force_reingest,
     )
-    stats.documents_discovered = len(discovered_docs)
     failure_count = 0
+    aborted = False
     for document in discovered_docs:
         location = str(document.metadata.location)
-        existing: SourceRow | None = services.persistence.get_source_by_location(location)
-        should_skip = (
-            not merged_config.force_reingest
-            and existing is not None
-            and not services.persistence.has_content_changed(document=document, existing=existing)
-        )
+        checkpoint = ledger.checkpoint(job_id, location) if ledger is not None and job_id is not None else None
+        # A document this job already started has its new hash stored, so
+        # the unchanged-hash check would wrongly skip it.
+        started = resumed_from.get(location, STAGE_PENDING) != STAGE_PENDING
+        should_skip = not started and is_document_unchanged(document, config=merged_config, services=services)
         if should_skip:
             job_logger.info(
                 "document_skipped",
                 file=location,
                 pipeline_id=merged_config.pipeline_id,
             )
+            if checkpoint is not None:
+                checkpoint.mark(STAGE_SKIPPED)
             documents.append(
                 DocumentIngestionResult(
                     location=location,
@@ -215,8 +361,14 @@ def run_ingestion_job(
             document=document,
             config=merged_config,
             services=services,
+            checkpoint=checkpoint,
         )
         documents.append(result)
+        if checkpoint is not None:
+            if result.status == SourceIngestionStatus.INGESTED:
+                checkpoint.mark(STAGE_DONE, chunk_count=result.chunks_ingested)
+            else:
+                checkpoint.mark(STAGE_FAILED, error=result.error)
         if result.status == SourceIngestionStatus.INGESTED:
             stats.documents_ingested += 1
         else:
@@ -229,8 +381,11 @@ def run_ingestion_job(
                     failure_count=failure_count,
                     max_failures=max_failures,
                 )
+                aborted = True
                 break
         stats.chunks_created += result.chunks_ingested
+    if ledger is not None and job_id is not None:
+        ledger.finish_job(job_id, JOB_ABORTED if aborted else JOB_COMPLETED)
     completed_at = services.clock()
     result_summary = IngestionResult(
         started_at=started_at,
@@ -238,17 +393,373 @@ def run_ingestion_job(
         pipeline_id=merged_config.pipeline_id,
         documents=documents,
         stats=stats,
+        job_id=job_id if ledger is not None else None,
     )
     job_logger.info(
         "ingestion_job_completed",
         pipeline_id=merged_config.pipeline_id,
+        job_id=result_summary.job_id,
         duration_seconds=result_summary.duration_seconds,
         documents_ingested=stats.documents_ingested,
         documents_failed=stats.documents_failed,
+        resumed_documents=len(resumed_from),
     )
     return result_summary
 
 
+@dataclass(slots=True)
+class WorkerStats:
+    """Outcome counts of one queue worker's run."""
+
+    ingested: int = 0
+    skipped: int = 0
+    retried: int = 0
+    failed: int = 0
+    lease_lost: int = 0
+
+    @property
+    def processed(self) -> int:
+        """Work items this worker finished handling."""
+        return self.ingested + self.skipped + self.retried + self.failed + self.lease_lost
+
+
+def enqueue_ingestion_job(
+    queue: WorkQueueProtocol,
+    request: IngestionRequest | None = None,
+    *,
+    config: RagIngestionConfig | None = None,
+    job_id: str | None = None,
+) -> tuple[str, int]:
+    """Discover documents and enqueue them for queue workers.
+
+    Re-enqueueing an existing ``job_id`` only adds documents that are not
+    already part of it.
+
+    Returns:
+        The job id and the number of documents discovered.
+    """
+    active_request = request or IngestionRequest()
+    merged_config = _merge_request_overrides(config=config or get_rag_ingestion_config(), request=active_request)
+    merged_config.require_sources()
+    documents = _discover_unique_documents(config=merged_config, glob_patterns=active_request.document_glob_patterns)
+    resolved_job_id = job_id or uuid4().hex
+    queue.enqueue(
+        resolved_job_id,
+        documents,
+        max_attempts=merged_config.work_queue_max_attempts,
+        options={"force_reingest": merged_config.force_reingest, "pipeline_id": merged_config.pipeline_id},
+    )
+    logger.info(
+        "ingestion_job_enqueued",
+        job_id=resolved_job_id,
+        pipeline_id=merged_config.pipeline_id,
+        documents=len(documents),
+    )
+    return resolved_job_id, len(documents)
+
+
+def wait_for_queue_job(
+    queue: WorkQueueProtocol,
+    job_id: str,
+    *,
+    poll_interval_seconds: float = 5.0,
+    timeout_seconds: float | None = None,
+    clock: Callable[[], float] = monotonic,
+    sleeper: Callable[[float], None] = sleep,
+) -> dict[str, int]:
+    """Block until no item of ``job_id`` is queued or leased.
+
+    Returns:
+        The job's item counts by status.
+
+    Raises:
+        TimeoutError: When ``timeout_seconds`` passes first.
+    """
+    started = clock()
+    while True:
+        queue.reap_expired()
+        if queue.pending(job_id) == 0:
+            return queue.counts(job_id)
+        if timeout_seconds is not None and clock() - started >= timeout_seconds:
+            raise TimeoutError(f"Ingestion job {job_id} still has pending documents.")
+        sleeper(poll_interval_seconds)
+
+
+def run_queue_worker(
+    queue: WorkQueueProtocol,
+    *,
+    services: PipelineServices,
+    worker_id: str,
+    config: RagIngestionConfig | None = None,
+    job_id: str | None = None,
+    visibility_timeout_seconds: float | None = None,
+    poll_interval_seconds: float = 2.0,
+    exit_when_idle: bool = False,
+    max_items: int | None = None,
+    stop_event: threading.Event | None = None,
+) -> WorkerStats:
+    """Lease and ingest queued documents until stopped.
+
+    Args:
+        queue: Work queue shared with the coordinator and other workers.
+        services: Pipeline dependencies.
+        worker_id: Name recorded on leased rows.
+        config: Base configuration (defaults to the environment).
+        job_id: Only take documents of this job.
+        visibility_timeout_seconds: Lease length (defaults to
+            ``work_queue_visibility_seconds``).
+        poll_interval_seconds: Sleep between polls of an empty queue.
+        exit_when_idle: Return once nothing is queued or leased.
+        max_items: Return after handling this many items.
+        stop_event: Set to stop after the current item.
+
+    Returns:
+        Counts of how this worker's items ended.
+    """
+    base_config = config or get_rag_ingestion_config()
+    visibility = visibility_timeout_seconds or base_config.work_queue_visibility_seconds
+    stop = stop_event or threading.Event()
+    stats = WorkerStats()
+    logger.info("queue_worker_started", worker_id=worker_id, job_id=job_id)
+    while not stop.is_set() and (max_items is None or stats.processed < max_items):
+        try:
+            items = queue.lease(worker_id=worker_id, visibility_timeout_seconds=visibility, job_id=job_id)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("work_queue_lease_failed", worker_id=worker_id, error=str(exc))
+            stop.wait(poll_interval_seconds)
+            continue
+        if not items:
+            if exit_when_idle and queue.pending(job_id) == 0:
+                break
+            stop.wait(poll_interval_seconds)
+            continue
+        get_metrics().record_work_leases(len(items))
+        for item in items:
+            outcome = process_work_item(
+                item,
+                queue,
+                config=base_config,
+                services=services,
+                visibility_timeout_seconds=visibility,
+            )
+            setattr(stats, outcome, getattr(stats, outcome) + 1)
+    logger.info(
+        "queue_worker_stopped",
+        worker_id=worker_id,
+        ingested=stats.ingested,
+        skipped=stats.skipped,
+        retried=stats.retried,
+        failed=stats.failed,
+        lease_lost=stats.lease_lost,
+    )
+    return stats
+
+
+def process_work_item(
+    item: WorkItem,
+    queue: WorkQueueProtocol,
+    *,
+    config: RagIngestionConfig,
+    services: PipelineServices,
+    visibility_timeout_seconds: float,
+) -> str:
+    """Ingest one leased document and settle its lease.
+
+    The unchanged-hash skip only applies on the first attempt: a failed
+    attempt has already stored the new hash on the source row.
+
+    Returns:
+        ``ingested``, ``skipped``, ``retried``, ``failed`` or ``lease_lost``
+        (the lease expired and the item now belongs to another worker).
+    """
+    item_config = _apply_job_options(config, item.options)
+    location = str(item.document.metadata.location)
+    error: str | None = None
+    try:
+        if item.attempts == 1 and is_document_unchanged(item.document, config=item_config, services=services):
+            settled = queue.ack(item, note="Skipped (content hash unchanged).")
+            outcome = "skipped"
+        else:
+            with _LeaseHeartbeat(queue, item, visibility_timeout_seconds):
+                result = ingest_single_document(document=item.document, config=item_config, services=services)
+            if result.status == SourceIngestionStatus.INGESTED:
+                settled = queue.ack(item)
+                outcome = "ingested"
+            else:
+                error = result.error
+                settled = queue.nack(item, error=error, retry_delay_seconds=_queue_retry_delay(item.attempts))
+                outcome = "failed" if item.attempts >= item.max_attempts else "retried"
+    except Exception as exc:  # noqa: BLE001
+        error = str(exc)
+        logger.exception("work_item_failed", job_id=item.job_id, file=location, error=error)
+        try:
+            settled = queue.nack(item, error=error, retry_delay_seconds=_queue_retry_delay(item.attempts))
+        except Exception:  # noqa: BLE001
+            # The lease simply expires and the item is redelivered.
+            settled = True
+        outcome = "failed" if item.attempts >= item.max_attempts else "retried"
+    if not settled:
+        outcome = "lease_lost"
+    get_metrics().record_work_item(outcome=outcome)
+    logger.info(
+        "work_item_processed",
+        job_id=item.job_id,
+        file=location,
+        attempt=item.attempts,
+        outcome=outcome,
+        error=error,
+    )
+    return outcome
+
+
+class _LeaseHeartbeat:
+    """Extend a work item's lease from a background thread while it is processed."""
+
+    def __init__(self, queue: WorkQueueProtocol, item: WorkItem, visibility_timeout_seconds: float) -> None:
+        self._queue = queue
+        self._item = item
+        self._visibility = visibility_timeout_seconds
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-{item.id}", daemon=True)
+
+    def __enter__(self) -> "_LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._visibility / 3.0):
+            try:
+                extended = self._queue.extend(self._item, self._visibility)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("work_item_lease_extend_failed", item_id=self._item.id, error=str(exc))
+                continue
+            if not extended:
+                logger.warning("work_item_lease_lost", item_id=self._item.id, job_id=self._item.job_id)
+                return
+
+
+def _apply_job_options(config: RagIngestionConfig, options: Mapping[str, JSONValue]) -> RagIngestionConfig:
+    pipeline_id = options.get("pipeline_id")
+    return replace(
+        config,
+        force_reingest=bool(options.get("force_reingest", config.force_reingest)),
+        pipeline_id=pipeline_id if isinstance(pipeline_id, str) else config.pipeline_id,
+    )
+
+
+def _queue_retry_delay(attempts: int) -> float:
+    return min(_QUEUE_MAX_RETRY_DELAY_SECONDS, _QUEUE_RETRY_DELAY_SECONDS * 2 ** max(0, attempts - 1))
+
+
+def _resume_job_documents(
+    *,
+    ledger: JobLedger,
+    job_id: str,
+    discovered: Sequence[DocumentInput],
+    documents: list[DocumentIngestionResult],
+    stats: IngestionStatistics,
+) -> tuple[list[DocumentInput], dict[str, str]]:
+    """Split a job's recorded documents into finished results and remaining work.
+
+    Finished documents are appended to ``documents`` and counted in
+    ``stats``. Documents that changed on disk since the job started lose
+    their stored embeddings; documents that disappeared are reported as
+    failed.
+
+    Returns:
+        The documents still to process, in job order, and the ledger stage
+        each one was resumed from.
+    """
+    by_location = {str(document.metadata.location): document for document in discovered}
+    remaining: list[DocumentInput] = []
+    resumed_from: dict[str, str] = {}
+    for entry in ledger.documents(job_id):
+        if entry.stage in FINISHED_STAGES:
+            done = entry.stage == STAGE_DONE
+            chunk_count = (entry.chunk_count or 0) if done else 0
+            documents.append(
+                DocumentIngestionResult(
+                    location=entry.location,
+                    status=SourceIngestionStatus.INGESTED,
+                    chunks_ingested=chunk_count,
+                    error=None if done else "Skipped (content hash unchanged).",
+                    duration_ms=0.0,
+                ),
+            )
+            if done:
+                stats.documents_ingested += 1
+                stats.chunks_created += chunk_count
+            continue
+        document = by_location.get(entry.location)
+        if document is None:
+            message = "Document no longer exists."
+            ledger.set_stage(job_id, entry.location, STAGE_FAILED, error=message)
+            documents.append(
+                DocumentIngestionResult(
+                    location=entry.location,
+                    status=SourceIngestionStatus.FAILED,
+                    chunks_ingested=0,
+                    error=message,
+                ),
+            )
+            stats.documents_failed += 1
+            continue
+        if document.metadata.content_hash != entry.content_hash:
+            ledger.clear_embeddings(job_id, entry.location)
+            ledger.set_stage(job_id, entry.location, entry.stage, content_hash=document.metadata.content_hash)
+        remaining.append(document)
+        resumed_from[entry.location] = entry.stage
+    return remaining, resumed_from
+
+
+def _job_parameters(request: IngestionRequest, config: RagIngestionConfig) -> dict[str, JSONValue]:
+    return {
+        "source_directories": [str(path) for path in config.source_directories],
+        "document_glob_patterns": list(request.document_glob_patterns),
+        "force_reingest": config.force_reingest,
+        "pipeline_id": config.pipeline_id,
+    }
+
+
+def _embed_with_checkpoint(
+    chunks: Sequence[ChunkData],
+    *,
+    embedding_client: EmbeddingClientProtocol,
+    checkpoint: DocumentCheckpoint,
+    batch_size: int,
+    dimensions: int,
+) -> list[EmbeddingRecord]:
+    """Embed chunks in checkpointed slices, reusing stored embeddings."""
+    embedded = checkpoint.load_embeddings(chunks, model_info=embedding_client.model_info, dimensions=dimensions)
+    missing = [position for position in range(len(chunks)) if position not in embedded]
+    for start in range(0, len(missing), max(1, batch_size)):
+        positions = missing[start : start + max(1, batch_size)]
+        records = embedding_client.embed_document_chunks([chunks[position] for position in positions])
+        if len(records) != len(positions):
+            raise ValueError("Chunk and embedding counts do not match.")
+        checkpoint.save_embeddings(
+            [(position, chunks[position], record) for position, record in zip(positions, records)],
+        )
+        embedded.update(zip(positions, records))
+    return [embedded[position] for position in range(len(chunks))]
+
+
+def _observe_document(result: DocumentIngestionResult) -> None:
+    get_metrics().observe_ingested_document(
+        status=result.status.value,
+        stage_seconds={
+            "chunk": (result.chunk_duration_ms or 0.0) / 1000.0,
+            "embedding": (result.embedding_duration_ms or 0.0) / 1000.0,
+            "db": (result.db_duration_ms or 0.0) / 1000.0,
+            "total": (result.duration_ms or 0.0) / 1000.0,
+        },
+    )
+
+
 def _merge_request_overrides(
     config: RagIngestionConfig,
     request: IngestionRequest,
@@ -300,7 +811,7 @@ def _build_chunk_records(
                 source_location=str(document.metadata.location),
                 chunk_index=chunk.metadata.chunk_index,
                 text=chunk.text,
-                embedding=tuple(float(value) for value in embedding.vector),
+                embedding=embedding.vector,
                 metadata=metadata,
                 embedding_model=embedding.model,
             ),
@@ -0,0 +1,96 @@
+"""Query reformulation for multi-query retrieval.
+
+A vague question embedded once often lands between the chunks that answer
+it. Expanders produce a few alternative phrasings that ``DatabaseRetriever``
+embeds in one batch, searches in parallel and fuses by reciprocal rank.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Mapping, Protocol
+
+_TOKEN = re.compile(r"[A-Za-z0-9][A-Za-z0-9'_-]*")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be can could do does for from have how i in is it me my of on or our please "
+    "should tell the their there this to us was we what when where which who why will with would you your".split()
+)
+
+DEFAULT_SYNONYMS: Mapping[str, str] = {
+    "pto": "paid time off",
+    "vacation": "annual leave",
+    "holiday": "annual leave",
+    "sick": "sick leave",
+    "laptop": "computer equipment",
+    "pc": "computer equipment",
+    "wfh": "remote work",
+    "remote": "remote work",
+    "expenses": "expense reimbursement",
+    "expense": "expense reimbursement",
+    "salary": "payroll compensation",
+    "pay": "payroll compensation",
+    "login": "account access password",
+    "password": "account access password",
+    "onboarding": "new hire onboarding",
+    "travel": "business travel policy",
+}
+
+
+class QueryExpanderProtocol(Protocol):
+    """Produces alternative phrasings of a search query."""
+
+    def expand(self, query: str, *, count: int) -> list[str]:
+        """Return up to ``count`` reformulations, excluding the query itself."""
+
+
+class RuleBasedQueryExpander:
+    """Cheap, deterministic expander built from keyword and synonym rules.
+
+    Produces, in order: the query reduced to its content words, the query
+    with known terms replaced by their synonyms, and the keyword form with
+    synonyms appended. No model call is made, so expansion costs microseconds.
+    """
+
+    def __init__(self, synonyms: Mapping[str, str] | None = None) -> None:
+        self._synonyms = {key.casefold(): value for key, value in (synonyms or DEFAULT_SYNONYMS).items()}
+
+    def expand(self, query: str, *, count: int) -> list[str]:
+        tokens = _TOKEN.findall(query)
+        keywords = [token for token in tokens if token.casefold() not in _STOPWORDS]
+        rewritten = [self._synonyms.get(token.casefold(), token) for token in tokens]
+        expansions = [self._synonyms[token.casefold()] for token in keywords if token.casefold() in self._synonyms]
+        candidates = [
+            " ".join(keywords),
+            " ".join(rewritten),
+            " ".join([*keywords, *expansions]),
+        ]
+        return unique_reformulations(query, candidates, count=count)
+
+
+def unique_reformulations(query: str, candidates: list[str], *, count: int) -> list[str]:
+    """Drop blanks, duplicates and restatements of ``query``; keep order.
+
+    Args:
+        query: Original query.
+        candidates: Proposed reformulations.
+        count: Maximum number to return.
+
+    Returns:
+        At most ``count`` distinct reformulations.
+    """
+    seen = {_normalize(query)}
+    unique: list[str] = []
+    for candidate in candidates:
+        normalized = _normalize(candidate)
+        if not normalized or normalized in seen:
+            continue
+        seen.add(normalized)
+        unique.append(candidate.strip())
+        if len(unique) >= count:
+            break
+    return unique
+
+
+def _normalize(text: str) -> str:
+    return " ".join(token.casefold() for token in _TOKEN.findall(text))
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
 from dataclasses import dataclass
 from time import perf_counter
 from typing import Any, Mapping, Protocol, Sequence
 
 from src.rag_pipeline.embeddings import EmbeddingClientProtocol
-from src.rag_pipeline.schemas import JSONValue
+from src.rag_pipeline.query_expansion import QueryExpanderProtocol, unique_reformulations
+from src.rag_pipeline.schemas import EmbeddingVector, JSONValue, RetrievalFilters
+from src.shared.deadline import DeadlineExceeded, check_deadline, current_deadline
 from src.shared.logging import LoggerProtocol, get_logger
+from src.shared.metrics import get_metrics
 from src.shared.tracing import Tracer, noop_tracer
 
 
@@ -33,6 +39,7 @@ class RetrieverProtocol(Protocol):
         top_k: int,
         min_score: float,
         correlation_id: str | None = None,
+        filters: RetrievalFilters | None = None,
     ) -> list[RetrievedChunk]:
         """Return relevant chunks for the provided query."""
 
@@ -46,8 +53,13 @@ class RetrievalStoreProtocol(Protocol):
         query_embedding: Sequence[float],
         match_count: int,
         min_score: float,
+        filters: RetrievalFilters | None = None,
     ) -> Sequence[Mapping[str, Any]]:
-        """Return chunk rows ordered by similarity to the query embedding."""
+        """Return chunk rows ordered by similarity to the query embedding.
+
+        ``filters`` is only passed when the caller asked for filtering, so
+        stores without filter support keep working for unfiltered queries.
+        """
 
 
 class NullRetriever(RetrieverProtocol):
@@ -60,13 +72,61 @@ class NullRetriever(RetrieverProtocol):
         top_k: int,
         min_score: float,
         correlation_id: str | None = None,
+        filters: RetrievalFilters | None = None,
     ) -> list[RetrievedChunk]:
         """Return an empty result set regardless of input."""
         return []
 
 
+def reciprocal_rank_fusion(
+    result_lists: Sequence[Sequence[RetrievedChunk]],
+    *,
+    limit: int,
+    k: int = 60,
+) -> list[RetrievedChunk]:
+    """Fuse ranked result lists by reciprocal rank.
+
+    Each chunk scores ``sum(1 / (k + rank))`` over the lists it appears in,
+    so chunks found by several queries rise to the top regardless of their
+    raw similarity scale. The returned chunks keep their best similarity
+    score.
+
+    Args:
+        result_lists: Ranked results, best first, one list per query.
+        limit: Maximum number of chunks to return.
+        k: Rank smoothing constant (60 is the usual choice).
+
+    Returns:
+        Chunks ordered by fused score descending.
+    """
+    fused: dict[str, float] = {}
+    best: dict[str, RetrievedChunk] = {}
+    for results in result_lists:
+        for rank, chunk in enumerate(results, start=1):
+            fused[chunk.chunk_id] = fused.get(chunk.chunk_id, 0.0) + 1.0 / (k + rank)
+            current = best.get(chunk.chunk_id)
+            if current is None or chunk.score > current.score:
+                best[chunk.chunk_id] = chunk
+    ranked = sorted(fused, key=lambda chunk_id: fused[chunk_id], reverse=True)
+    return [best[chunk_id] for chunk_id in ranked[:limit]]
+
+
 class DatabaseRetriever(RetrieverProtocol):
-    """Retrieve context by embedding the query and calling the DB matcher."""
+    """Retrieve context by embedding the query and calling the DB matcher.
+
+    With a ``query_expander`` the retriever also searches up to
+    ``expansion_count`` reformulations. They are embedded in the same batch
+    as the query, matched in parallel and fused by reciprocal rank. If the
+    expansion work misses ``expansion_deadline_seconds`` (or the request
+    deadline, whichever is sooner), the single-query result is returned
+    instead.
+
+    Expander calls (typically an LLM) run on their own executor, separate
+    from the one running matches. A timed-out call keeps its thread until it
+    returns, so at most ``max_concurrent_expansions`` may be outstanding; a
+    request arriving while all are busy skips expansion rather than queueing
+    behind calls nobody is waiting for. Call ``close`` to release the threads.
+    """
 
     def __init__(
         self,
@@ -75,11 +135,35 @@ class DatabaseRetriever(RetrieverProtocol):
         store: RetrievalStoreProtocol,
         logger: LoggerProtocol | None = None,
         tracer: Tracer | None = None,
+        query_expander: QueryExpanderProtocol | None = None,
+        expansion_count: int = 3,
+        expansion_deadline_seconds: float = 1.0,
+        max_concurrent_expansions: int = 4,
     ) -> None:
         self._embedding_client = embedding_client
         self._store = store
         self._logger = logger or get_logger(__name__)
         self._tracer = tracer or noop_tracer()
+        self._query_expander = query_expander
+        self._expansion_count = max(0, expansion_count)
+        self._expansion_deadline_seconds = expansion_deadline_seconds
+        expanding = query_expander is not None and self._expansion_count > 0
+        self._executor: ThreadPoolExecutor | None = (
+            ThreadPoolExecutor(max_workers=4 * self._expansion_count, thread_name_prefix="retrieval")
+            if expanding
+            else None
+        )
+        slots = max(1, max_concurrent_expansions)
+        self._expansion_executor: ThreadPoolExecutor | None = (
+            ThreadPoolExecutor(max_workers=slots, thread_name_prefix="query-expansion") if expanding else None
+        )
+        self._expansion_slots = threading.BoundedSemaphore(slots)
+
+    def close(self) -> None:
+        """Stop the retrieval and expansion threads; queued work is dropped."""
+        for executor in (self._executor, self._expansion_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
 
     async def retrieve(
         self,
@@ -88,6 +172,7 @@ class DatabaseRetriever(RetrieverProtocol):
         top_k: int,
         min_score: float,
         correlation_id: str | None = None,
+        filters: RetrievalFilters | None = None,
     ) -> list[RetrievedChunk]:
         """Embed the query and return similar chunks.
 
@@ -96,9 +181,15 @@ class DatabaseRetriever(RetrieverProtocol):
             top_k: Maximum number of chunks to return.
             min_score: Minimum similarity score filter.
             correlation_id: Optional identifier used for log correlation.
+            filters: Optional metadata constraints applied in the database
+                query.
 
         Returns:
             Retrieved chunks ordered by similarity descending.
+
+        Raises:
+            DeadlineExceeded: When the request deadline expires during
+                retrieval. Other failures are logged and yield no chunks.
         """
         stripped_query = query.strip()
         if not stripped_query:
@@ -110,22 +201,57 @@ class DatabaseRetriever(RetrieverProtocol):
             safe_top_k,
             min_score,
             correlation_id,
+            None if filters is None or filters.is_empty else filters,
         )
 
+    def warm_up(self) -> dict[str, float]:
+        """Pay first-request costs ahead of traffic.
+
+        Embeds a short query (tokenizer load, kernel warm-up, HTTP/TLS
+        connection) and runs a one-row match (database connection, pgvector
+        adapters, index pages). Errors propagate so callers can report the
+        service as not ready.
+
+        Returns:
+            Duration of each step in milliseconds.
+        """
+        start = perf_counter()
+        response = self._embedding_client.embed_texts(["warm-up query"], correlation_id="warm-up")
+        embedding_ms = (perf_counter() - start) * 1000.0
+        if not response.embeddings:
+            raise RuntimeError("Embedding client returned no vector during warm-up.")
+        start = perf_counter()
+        self._store.match_chunks(
+            query_embedding=response.embeddings[0].vector,
+            match_count=1,
+            min_score=0.0,
+        )
+        database_ms = (perf_counter() - start) * 1000.0
+        self._logger.info("retriever_warm_up_completed", embedding_ms=embedding_ms, database_ms=database_ms)
+        return {"embedding": embedding_ms, "database": database_ms}
+
     def _retrieve_sync(
         self,
         query: str,
         top_k: int,
         min_score: float,
         correlation_id: str | None,
+        filters: RetrievalFilters | None = None,
     ) -> list[RetrievedChunk]:
         start = perf_counter()
-        embedding_info = self._embedding_client.model_info
+        try:
+            # Clients that connect lazily (the sidecar) resolve this on first use.
+            embedding_info = self._embedding_client.model_info
+        except Exception as exc:  # noqa: BLE001
+            get_metrics().observe_retrieval(duration_seconds=perf_counter() - start, results=0, outcome="error")
+            self._logger.warning("retrieval_failed", error=str(exc), correlation_id=correlation_id)
+            return []
         self._logger.info(
             "retrieval_started",
             query_length=len(query),
             top_k=top_k,
             min_score=min_score,
+            filtered=filters is not None,
             embedding_model=embedding_info.model,
             embedding_dataset_fingerprint=embedding_info.dataset_fingerprint,
             correlation_id=correlation_id,
@@ -136,35 +262,64 @@ class DatabaseRetriever(RetrieverProtocol):
             attributes={
                 "top_k": top_k,
                 "min_score": min_score,
+                "filtered": filters is not None,
                 "embedding_model": embedding_info.model,
                 "embedding_dataset_fingerprint": embedding_info.dataset_fingerprint or "",
             },
         ):
             try:
-                embedding_response = self._embedding_client.embed_texts(
-                    [query],
-                    correlation_id=correlation_id,
-                )
-                if not embedding_response.embeddings:
-                    self._logger.warning("retrieval_skipped_no_embedding")
-                    return []
-                query_embedding = embedding_response.embeddings[0].vector
-                rows = self._store.match_chunks(
-                    query_embedding=query_embedding,
-                    match_count=top_k,
-                    min_score=min_score,
-                )
-                results = [self._map_row(row) for row in rows]
+                check_deadline("retrieval")
+                if self._executor is None:
+                    expansion = "off"
+                    embedding_response = self._embedding_client.embed_texts(
+                        [query],
+                        correlation_id=correlation_id,
+                    )
+                    if not embedding_response.embeddings:
+                        self._logger.warning("retrieval_skipped_no_embedding")
+                        return []
+                    results = self._match(
+                        embedding_response.embeddings[0].vector,
+                        top_k=top_k,
+                        min_score=min_score,
+                        filters=filters,
+                    )
+                else:
+                    results, expansion = self._retrieve_expanded(
+                        query,
+                        self._executor,
+                        top_k=top_k,
+                        min_score=min_score,
+                        correlation_id=correlation_id,
+                        filters=filters,
+                    )
+                    get_metrics().record_query_expansion(outcome=expansion)
+                duration_ms = (perf_counter() - start) * 1000.0
+                get_metrics().observe_retrieval(duration_seconds=duration_ms / 1000.0, results=len(results))
                 self._logger.info(
                     "retrieval_completed",
                     results_count=len(results),
-                    duration_ms=(perf_counter() - start) * 1000.0,
+                    duration_ms=duration_ms,
+                    expansion=expansion,
                     embedding_model=embedding_info.model,
                     embedding_dataset_fingerprint=embedding_info.dataset_fingerprint,
                     correlation_id=correlation_id,
                 )
                 return results
+            except DeadlineExceeded as exc:
+                get_metrics().observe_retrieval(
+                    duration_seconds=perf_counter() - start,
+                    results=0,
+                    outcome="timeout",
+                )
+                self._logger.warning("retrieval_deadline_exceeded", stage=exc.stage, correlation_id=correlation_id)
+                raise
             except Exception as exc:  # noqa: BLE001
+                get_metrics().observe_retrieval(
+                    duration_seconds=perf_counter() - start,
+                    results=0,
+                    outcome="error",
+                )
                 self._logger.exception(
                     "retrieval_failed",
                     error=str(exc),
@@ -172,6 +327,128 @@ class DatabaseRetriever(RetrieverProtocol):
                 )
                 return []
 
+    def _retrieve_expanded(
+        self,
+        query: str,
+        executor: ThreadPoolExecutor,
+        *,
+        top_k: int,
+        min_score: float,
+        correlation_id: str | None,
+        filters: RetrievalFilters | None,
+    ) -> tuple[list[RetrievedChunk], str]:
+        """Search the query and its reformulations; return results and outcome.
+
+        The original query is matched on the calling thread while the
+        reformulations run on the executor. The outcome is ``fused`` when every
+        reformulation finished within the deadline, ``fallback`` when the
+        single-query result was used instead, ``single`` when the expander
+        produced nothing new and ``skipped`` when every expansion slot was
+        still busy. Executor work runs in a copy of the caller's context so
+        embedding and database calls see the request deadline.
+        """
+        budget = self._expansion_deadline_seconds
+        request_deadline = current_deadline()
+        if request_deadline is not None:
+            budget = min(budget, request_deadline.remaining())
+        deadline = perf_counter() + budget
+        variants: list[str] = []
+        pending_expansion = self._submit_expansion(query)
+        if pending_expansion is None:
+            self._logger.warning("query_expansion_skipped_busy", correlation_id=correlation_id)
+        else:
+            try:
+                variants = unique_reformulations(
+                    query,
+                    pending_expansion.result(timeout=max(0.0, deadline - perf_counter())),
+                    count=self._expansion_count,
+                )
+            except FutureTimeoutError:
+                self._logger.warning("query_expansion_timed_out", correlation_id=correlation_id)
+            except Exception as exc:  # noqa: BLE001
+                self._logger.warning("query_expansion_failed", error=str(exc), correlation_id=correlation_id)
+        queries = [query, *variants]
+        embedding_response = self._embedding_client.embed_texts(queries, correlation_id=correlation_id)
+        vectors = [record.vector for record in embedding_response.embeddings]
+        if not vectors:
+            self._logger.warning("retrieval_skipped_no_embedding")
+            return [], "fallback"
+        matches = [
+            executor.submit(
+                contextvars.copy_context().run,
+                self._match,
+                vector,
+                top_k=top_k,
+                min_score=min_score,
+                filters=filters,
+            )
+            for vector in vectors[1:]
+        ]
+        primary = self._match(vectors[0], top_k=top_k, min_score=min_score, filters=filters)
+        if not matches:
+            return primary, "single" if pending_expansion is not None else "skipped"
+        _done, pending = wait(matches, timeout=max(0.0, deadline - perf_counter()))
+        if pending:
+            for future in pending:
+                future.cancel()
+            self._logger.warning(
+                "query_expansion_deadline_exceeded",
+                pending_queries=len(pending),
+                correlation_id=correlation_id,
+            )
+            return primary, "fallback"
+        failures = [future.exception() for future in matches if future.exception() is not None]
+        if failures:
+            self._logger.warning(
+                "query_expansion_match_failed",
+                error=str(failures[0]),
+                correlation_id=correlation_id,
+            )
+            return primary, "fallback"
+        return (
+            reciprocal_rank_fusion([primary, *(future.result() for future in matches)], limit=top_k),
+            "fused",
+        )
+
+    def _submit_expansion(self, query: str) -> Future[list[str]] | None:
+        """Start the expander on a free slot, or return None when all are busy."""
+        expander = self._query_expander
+        executor = self._expansion_executor
+        assert expander is not None and executor is not None
+        if not self._expansion_slots.acquire(blocking=False):
+            return None
+        try:
+            future = executor.submit(
+                contextvars.copy_context().run,
+                expander.expand,
+                query,
+                count=self._expansion_count,
+            )
+        except BaseException:
+            self._expansion_slots.release()
+            raise
+        future.add_done_callback(lambda _future: self._expansion_slots.release())
+        return future
+
+    def _match(
+        self,
+        vector: EmbeddingVector,
+        *,
+        top_k: int,
+        min_score: float,
+        filters: RetrievalFilters | None = None,
+    ) -> list[RetrievedChunk]:
+        if filters is None:
+            rows = self._store.match_chunks(query_embedding=vector, match_count=top_k, min_score=min_score)
+        else:
+            rows = self._store.match_chunks(
+                query_embedding=vector,
+                match_count=top_k,
+                min_score=min_score,
+                filters=filters,
+            )
+        return [self._map_row(row) for row in rows]
+
     @staticmethod
     def _map_row(row: Mapping[str, Any]) -> RetrievedChunk:
         metadata_value = row.get("metadata", {}) or {}
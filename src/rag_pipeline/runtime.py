@@ -23,6 +23,7 @@ def create_pipeline_runtime(
             chunk_min_chars=config.chunk_min_chars,
             chunk_max_chars=config.chunk_max_chars,
             docling_target_tokens=config.docling_chunk_target_tokens,
+            chunk_max_tokens=config.chunk_max_tokens,
         )
         embedding_client = create_embedding_client(config=config)
         db_client = PsycopgDatabaseClient(config.database_url)
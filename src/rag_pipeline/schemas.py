@@ -8,9 +8,25 @@ from enum import Enum
 from pathlib import Path
 from typing import Iterable, Sequence
 
+import numpy as np
+from numpy.typing import NDArray
 from pydantic import BaseModel, Field, model_validator
 
 JSONValue = str | int | float | bool | None | list["JSONValue"] | dict[str, "JSONValue"]
+EmbeddingVector = NDArray[np.float32]
+
+
+def as_embedding_vector(values: Sequence[float] | EmbeddingVector) -> EmbeddingVector:
+    """Return ``values`` as a contiguous 1-D float32 array.
+
+    Arrays that are already contiguous float32 are returned as-is (no copy), so
+    rows sliced from a model's output matrix flow through to persistence
+    without being re-boxed into Python floats.
+    """
+    array = np.ascontiguousarray(values, dtype=np.float32)
+    if array.ndim != 1:
+        raise ValueError(f"Embedding vectors must be 1-D, received shape {array.shape}.")
+    return array
 
 
 class SourceType(str, Enum):
@@ -76,26 +92,38 @@ class ChunkData:
         return self.text[:limit] + ("…" if len(self.text) > limit else "")
 
 
-@dataclass(frozen=True, slots=True)
+@dataclass(frozen=True, slots=True, eq=False)
 class EmbeddingRecord:
-    """Dense vector representation of a chunk."""
+    """Dense vector representation of a chunk.
 
-    vector: Sequence[float]
+    ``vector`` is normalised to a contiguous float32 array on construction.
+    """
+
+    vector: EmbeddingVector
     model: str
     dimensions: int
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "vector", as_embedding_vector(self.vector))
 
-@dataclass(frozen=True, slots=True)
+
+@dataclass(frozen=True, slots=True, eq=False)
 class ChunkRecord:
-    """Combined chunk and embedding payload stored in the database."""
+    """Combined chunk and embedding payload stored in the database.
+
+    ``embedding`` is normalised to a contiguous float32 array on construction.
+    """
 
     source_location: str
     chunk_index: int
     text: str
-    embedding: Sequence[float]
+    embedding: EmbeddingVector
     metadata: dict[str, JSONValue]
     embedding_model: str
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "embedding", as_embedding_vector(self.embedding))
+
 
 @dataclass(frozen=True, slots=True)
 class SourceRecord:
@@ -110,6 +138,46 @@ class SourceRecord:
     error_message: str | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class RetrievalFilters:
+    """Structured constraints applied inside the vector search query.
+
+    Empty fields do not constrain results. Multi-valued fields match any of
+    their values; metadata fields use JSONB containment.
+
+    Attributes:
+        document_types: Allowed ``sources.document_type`` values.
+        source_types: Allowed ``sources.source_type`` values.
+        section_headings: Allowed ``chunks.section_heading`` values.
+        modified_after: Inclusive lower bound on the source's last-modified time.
+        modified_before: Exclusive upper bound on the source's last-modified time.
+        source_metadata: Key/values the source metadata must contain
+            (e.g. ``{"department": "finance"}``).
+        chunk_metadata: Key/values the chunk metadata must contain.
+    """
+
+    document_types: tuple[str, ...] = ()
+    source_types: tuple[str, ...] = ()
+    section_headings: tuple[str, ...] = ()
+    modified_after: datetime | None = None
+    modified_before: datetime | None = None
+    source_metadata: dict[str, JSONValue] = field(default_factory=dict)
+    chunk_metadata: dict[str, JSONValue] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether no constraint is set."""
+        return not (
+            self.document_types
+            or self.source_types
+            or self.section_headings
+            or self.modified_after
+            or self.modified_before
+            or self.source_metadata
+            or self.chunk_metadata
+        )
+
+
 class IngestionRequest(BaseModel):
     """User-facing options for triggering an ingestion run."""
 
@@ -148,6 +216,9 @@ class DocumentIngestionResult(BaseModel):
     chunks_ingested: int
     error: str | None = None
     duration_ms: float | None = None
+    chunk_duration_ms: float | None = None
+    embedding_duration_ms: float | None = None
+    db_duration_ms: float | None = None
 
 
 class IngestionStatistics(BaseModel):
@@ -167,6 +238,7 @@ class IngestionResult(BaseModel):
     pipeline_id: str
     documents: list[DocumentIngestionResult]
     stats: IngestionStatistics
+    job_id: str | None = None
 
     @property
     def duration_seconds(self) -> float:
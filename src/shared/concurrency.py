@@ -0,0 +1,169 @@
+"""Adaptive concurrency limiting with a bounded, deadline-aware queue.
+
+``AdaptiveConcurrencyLimiter`` admits at most ``limit`` concurrent
+operations and tunes ``limit`` with AIMD on observed latency. When a call
+finishes within the target and the limiter was actually busy, the limit
+grows by about one per window. A call slower than the target cuts the limit
+by ``backoff_ratio``. Calls over the limit wait in a FIFO queue until a slot
+frees or their queue deadline passes. When the queue is full they are
+rejected immediately, so an overloaded dependency produces fast 503s
+instead of unbounded latency.
+
+The limiter is meant for a single event loop; it uses no thread locks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import math
+from collections import deque
+from time import perf_counter
+from typing import AsyncIterator
+
+from src.shared.logging import LoggerProtocol, get_logger
+from src.shared.metrics import get_metrics
+
+logger: LoggerProtocol = get_logger(__name__)
+
+
+class ConcurrencyLimitExceeded(Exception):
+    """Raised when a call cannot be admitted.
+
+    Attributes:
+        reason: ``queue_full`` or ``queue_timeout``.
+        retry_after_seconds: Suggested client back-off in whole seconds.
+    """
+
+    def __init__(self, *, reason: str, retry_after_seconds: int) -> None:
+        super().__init__(f"Concurrency limit exceeded ({reason}); retry after {retry_after_seconds}s")
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limiter with a bounded FIFO wait queue.
+
+    Attributes:
+        name: Label used for the ``rag_concurrency_*`` metrics.
+        limit: Current concurrency limit (fractional; admission uses the floor).
+        in_flight: Calls currently admitted.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target_seconds: float,
+        max_queue_size: int,
+        queue_timeout_seconds: float,
+        backoff_ratio: float = 0.9,
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0.0 < backoff_ratio < 1.0:
+            raise ValueError("backoff_ratio must be between 0 and 1")
+        self.name = name
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._latency_target = latency_target_seconds
+        self._max_queue_size = max_queue_size
+        self._queue_timeout = queue_timeout_seconds
+        self._backoff_ratio = backoff_ratio
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._smoothed_latency = latency_target_seconds
+        self._publish()
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for admission."""
+        return len(self._waiters)
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Hold one concurrency slot for the enclosed block.
+
+        Raises:
+            ConcurrencyLimitExceeded: When the queue is full or the wait
+                exceeds the queue timeout.
+        """
+        await self._admit()
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._release(perf_counter() - start)
+
+    async def _admit(self) -> None:
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            self._publish()
+            return
+        if len(self._waiters) >= self._max_queue_size:
+            self._reject("queue_full")
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._publish()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self._queue_timeout)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            self._reject("queue_timeout")
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+
+    def _abandon(self, waiter: asyncio.Future[None]) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # The slot was handed over just as the wait ended; pass it on.
+            self.in_flight -= 1
+            self._wake()
+        else:
+            waiter.cancel()
+            with contextlib.suppress(ValueError):
+                self._waiters.remove(waiter)
+        self._publish()
+
+    def _release(self, latency_seconds: float) -> None:
+        self._smoothed_latency = 0.8 * self._smoothed_latency + 0.2 * latency_seconds
+        if latency_seconds > self._latency_target:
+            self.limit = max(float(self._min_limit), self.limit * self._backoff_ratio)
+        elif self.in_flight >= self.limit / 2:
+            self.limit = min(float(self._max_limit), self.limit + 1.0 / self.limit)
+        self.in_flight -= 1
+        self._wake()
+        self._publish()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def _reject(self, reason: str) -> None:
+        retry_after = max(1, math.ceil(self._smoothed_latency))
+        get_metrics().record_concurrency_rejection(limiter=self.name, reason=reason)
+        logger.warning(
+            "concurrency_limit_rejected",
+            limiter=self.name,
+            reason=reason,
+            limit=int(self.limit),
+            in_flight=self.in_flight,
+            queue_depth=len(self._waiters),
+        )
+        raise ConcurrencyLimitExceeded(reason=reason, retry_after_seconds=retry_after)
+
+    def _publish(self) -> None:
+        get_metrics().set_concurrency_state(
+            limiter=self.name,
+            limit=int(self.limit),
+            in_flight=self.in_flight,
+            queue_depth=len(self._waiters),
+        )
@@ -85,6 +85,44 @@ class Settings:
         llm_api_key: Optional token for the configured LLM endpoint.
         retrieval_top_k: Maximum number of chunks returned per query.
         retrieval_min_score: Minimum similarity score for retrieved chunks.
+        langfuse_sample_ratio: Fraction of requests (by correlation id) whose
+            spans are recorded when tracing is enabled.
+        langfuse_max_queue_size: Finished spans buffered before the oldest
+            are dropped.
+        langfuse_export_batch_size: Spans per background export call.
+        langfuse_export_interval_seconds: Longest a span waits for export.
+        warmup_retry_seconds: Delay between warm-up attempts while the API
+            reports not ready.
+        chat_coalescing_enabled: Whether identical concurrent chat queries
+            share one retrieval and generation.
+        chat_coalescing_max_waiters: Most requests that may share one
+            in-flight chat computation.
+        chat_coalescing_deadline_tolerance_seconds: Largest difference in
+            request deadlines for chat requests to share a computation.
+        chat_concurrency_initial_limit: Starting concurrency limit for /chat.
+        chat_concurrency_min_limit: Floor for the adaptive /chat limit.
+        chat_concurrency_max_limit: Ceiling for the adaptive /chat limit.
+        chat_latency_target_seconds: /chat latency above which the limit
+            backs off.
+        chat_queue_size: Requests that may wait for a /chat slot before new
+            ones are rejected.
+        chat_queue_timeout_seconds: Longest a request waits for a /chat slot.
+        chat_deadline_seconds: End-to-end budget for one /chat request;
+            embedding, database and LLM timeouts are clamped to what is left.
+        context_token_budget: Maximum prompt tokens spent on retrieved
+            context per chat request.
+        query_expansion_mode: ``off``, ``rules`` (local keyword/synonym
+            rewrites) or ``llm`` (reformulations from the chat model).
+        query_expansion_count: Reformulations searched alongside the query.
+        query_expansion_deadline_seconds: Budget for expansion work before
+            retrieval falls back to the single-query result.
+        retrieval_pool_size: Database connections available to retrieval.
+        llm_circuit_failure_rate: Failure rate over recent LLM calls that
+            opens the circuit.
+        llm_circuit_open_seconds: How long an open LLM circuit fails fast
+            before admitting a probe.
+        llm_hedging_enabled: Fire a duplicate LLM request when one runs past
+            the observed p95 latency.
     """
 
     database_url: str
@@ -103,6 +141,29 @@ class Settings:
     langfuse_public_key: str | None
     langfuse_secret_key: str | None
     gpu_device: str
+    langfuse_sample_ratio: float = 1.0
+    langfuse_max_queue_size: int = 2048
+    langfuse_export_batch_size: int = 64
+    langfuse_export_interval_seconds: float = 1.0
+    warmup_retry_seconds: float = 5.0
+    chat_coalescing_enabled: bool = True
+    chat_coalescing_max_waiters: int = 64
+    chat_coalescing_deadline_tolerance_seconds: float = 1.0
+    chat_concurrency_initial_limit: int = 16
+    chat_concurrency_min_limit: int = 2
+    chat_concurrency_max_limit: int = 128
+    chat_latency_target_seconds: float = 10.0
+    chat_queue_size: int = 64
+    chat_queue_timeout_seconds: float = 2.0
+    chat_deadline_seconds: float = 30.0
+    context_token_budget: int = 3000
+    query_expansion_mode: str = "off"
+    query_expansion_count: int = 3
+    query_expansion_deadline_seconds: float = 1.0
+    retrieval_pool_size: int = 4
+    llm_circuit_failure_rate: float = 0.5
+    llm_circuit_open_seconds: float = 30.0
+    llm_hedging_enabled: bool = False
 
 
 def get_settings() -> Settings:
@@ -154,4 +215,27 @@ def get_settings() -> Settings:
         langfuse_public_key=langfuse_public_key,
         langfuse_secret_key=langfuse_secret_key,
         gpu_device=gpu_device,
+        langfuse_sample_ratio=_get_float("LANGFUSE_SAMPLE_RATIO", 1.0),
+        langfuse_max_queue_size=_get_int("LANGFUSE_MAX_QUEUE_SIZE", 2048),
+        langfuse_export_batch_size=_get_int("LANGFUSE_EXPORT_BATCH_SIZE", 64),
+        langfuse_export_interval_seconds=_get_float("LANGFUSE_EXPORT_INTERVAL_SECONDS", 1.0),
+        warmup_retry_seconds=_get_float("WARMUP_RETRY_SECONDS", 5.0),
+        chat_coalescing_enabled=_get_bool("CHAT_COALESCING_ENABLED", True),
+        chat_coalescing_max_waiters=_get_int("CHAT_COALESCING_MAX_WAITERS", 64),
+        chat_coalescing_deadline_tolerance_seconds=_get_float("CHAT_COALESCING_DEADLINE_TOLERANCE_SECONDS", 1.0),
+        chat_concurrency_initial_limit=_get_int("CHAT_CONCURRENCY_INITIAL_LIMIT", 16),
+        chat_concurrency_min_limit=_get_int("CHAT_CONCURRENCY_MIN_LIMIT", 2),
+        chat_concurrency_max_limit=_get_int("CHAT_CONCURRENCY_MAX_LIMIT", 128),
+        chat_latency_target_seconds=_get_float("CHAT_LATENCY_TARGET_SECONDS", 10.0),
+        chat_queue_size=_get_int("CHAT_QUEUE_SIZE", 64),
+        chat_queue_timeout_seconds=_get_float("CHAT_QUEUE_TIMEOUT_SECONDS", 2.0),
+        chat_deadline_seconds=_get_float("CHAT_DEADLINE_SECONDS", 30.0),
+        context_token_budget=_get_int("CONTEXT_TOKEN_BUDGET", 3000),
+        query_expansion_mode=os.getenv("QUERY_EXPANSION_MODE", "off").strip().lower(),
+        query_expansion_count=_get_int("QUERY_EXPANSION_COUNT", 3),
+        query_expansion_deadline_seconds=_get_float("QUERY_EXPANSION_DEADLINE_SECONDS", 1.0),
+        retrieval_pool_size=_get_int("RETRIEVAL_POOL_SIZE", 4),
+        llm_circuit_failure_rate=_get_float("LLM_CIRCUIT_FAILURE_RATE", 0.5),
+        llm_circuit_open_seconds=_get_float("LLM_CIRCUIT_OPEN_SECONDS", 30.0),
+        llm_hedging_enabled=_get_bool("LLM_HEDGING_ENABLED", False),
     )
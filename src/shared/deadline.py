@@ -0,0 +1,112 @@
+"""End-to-end request deadlines.
+
+A ``Deadline`` is created once per request (``src/main.py`` does it for
+``/chat``) and installed with ``deadline_scope``. Because it lives in a
+``ContextVar`` it follows the request through ``asyncio.to_thread`` and
+spawned tasks. That lets leaf clients (embedding, LLM, database) clamp their
+own timeouts and retry budgets with ``bounded_timeout`` instead of each
+applying its own fixed limit. Work running on plain executor threads must be
+submitted with ``contextvars.copy_context().run`` to see the deadline.
+"""
+
+from __future__ import annotations
+
+import contextlib
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import monotonic
+from typing import Iterator
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a stage starts, or would retry, after the deadline.
+
+    Attributes:
+        stage: Pipeline stage that observed the expiry.
+    """
+
+    def __init__(self, stage: str) -> None:
+        super().__init__(f"Request deadline exceeded during {stage}")
+        self.stage = stage
+
+
+@dataclass(frozen=True, slots=True)
+class Deadline:
+    """Absolute point in monotonic time by which a request must finish."""
+
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        """Return a deadline ``seconds`` from now."""
+        return cls(expires_at=monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.expires_at - monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether no time is left."""
+        return self.remaining() <= 0.0
+
+    def check(self, stage: str) -> None:
+        """Raise ``DeadlineExceeded`` when the deadline has passed."""
+        if self.expired:
+            raise DeadlineExceeded(stage)
+
+    def allows(self, seconds: float) -> bool:
+        """Whether ``seconds`` of additional waiting still fits before expiry."""
+        return self.remaining() > seconds
+
+
+_CURRENT_DEADLINE: ContextVar[Deadline | None] = ContextVar("rag_request_deadline", default=None)
+
+
+def current_deadline() -> Deadline | None:
+    """Return the deadline of the request being served, if any."""
+    return _CURRENT_DEADLINE.get()
+
+
+@contextlib.contextmanager
+def deadline_scope(deadline: Deadline | None) -> Iterator[Deadline | None]:
+    """Install ``deadline`` as the current deadline for the enclosed block."""
+    token = _CURRENT_DEADLINE.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _CURRENT_DEADLINE.reset(token)
+
+
+def check_deadline(stage: str) -> None:
+    """Raise ``DeadlineExceeded`` if the current deadline has passed."""
+    deadline = _CURRENT_DEADLINE.get()
+    if deadline is not None:
+        deadline.check(stage)
+
+
+def bounded_timeout(default_seconds: float, *, stage: str) -> float:
+    """Clamp a stage timeout to the remaining request budget.
+
+    Args:
+        default_seconds: The stage's own timeout.
+        stage: Stage name reported if the deadline already passed.
+
+    Returns:
+        ``default_seconds`` without a current deadline, otherwise the smaller
+        of it and the time remaining.
+
+    Raises:
+        DeadlineExceeded: When the current deadline has already passed.
+    """
+    deadline = _CURRENT_DEADLINE.get()
+    if deadline is None:
+        return default_seconds
+    deadline.check(stage)
+    return min(default_seconds, deadline.remaining())
+
+
+def retry_allowed(backoff_seconds: float) -> bool:
+    """Whether a retry after ``backoff_seconds`` can still finish in time."""
+    deadline = _CURRENT_DEADLINE.get()
+    return deadline is None or deadline.allows(backoff_seconds)
@@ -1,9 +1,27 @@
 from __future__ import annotations
 
+import atexit
 import json
 import logging
+import os
+import queue
+import random
+import threading
 from dataclasses import dataclass
-from typing import Protocol, runtime_checkable
+from logging.handlers import QueueHandler, QueueListener
+from typing import Mapping, Protocol, runtime_checkable
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+_LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+_EXCEPTION_FORMATTER = logging.Formatter()
+_CONFIGURE_LOCK = threading.Lock()
+_CONFIGURED = False
+_LISTENER: QueueListener | None = None
+_SAMPLE_RATES: dict[str, float] = {}
 
 
 @runtime_checkable
@@ -35,6 +53,14 @@ class StructuredLogger:
     supplied by the caller. The wrapped standard logger is responsible
     for output formatting, log levels and handlers.
 
+    Level checks run before any work is done, and the JSON payload is only
+    serialized once a handler accepts the record. With asynchronous output
+    the queue handler serializes it on the calling thread, so the logged
+    values are those at the time of the call; only formatting of the line
+    and the write happen on the listener thread. Events listed in
+    ``LOG_SAMPLE_RATES`` are kept with the configured probability and carry a
+    ``sample_rate`` field so counts can be re-weighted downstream.
+
     Attributes:
         _logger: Underlying standard-library logger instance.
     """
@@ -43,43 +69,144 @@ class StructuredLogger:
 
     def debug(self, event: str, **kwargs: object) -> None:
         """Log a debug-level event."""
-        self._logger.debug(self._format(event=event, fields=kwargs))
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._emit(logging.DEBUG, event, kwargs)
 
     def info(self, event: str, **kwargs: object) -> None:
         """Log an info-level event."""
-        self._logger.info(self._format(event=event, fields=kwargs))
+        if self._logger.isEnabledFor(logging.INFO):
+            self._emit(logging.INFO, event, kwargs)
 
     def warning(self, event: str, **kwargs: object) -> None:
         """Log a warning-level event."""
-        self._logger.warning(self._format(event=event, fields=kwargs))
+        if self._logger.isEnabledFor(logging.WARNING):
+            self._emit(logging.WARNING, event, kwargs)
 
     def error(self, event: str, **kwargs: object) -> None:
         """Log an error-level event."""
-        self._logger.error(self._format(event=event, fields=kwargs))
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._emit(logging.ERROR, event, kwargs)
 
     def exception(self, event: str, **kwargs: object) -> None:
         """Log an exception with a stack trace."""
-        self._logger.exception(self._format(event=event, fields=kwargs))
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._emit(logging.ERROR, event, kwargs, exc_info=True)
+
+    def _emit(self, level: int, event: str, fields: dict[str, object], *, exc_info: bool = False) -> None:
+        rate = _SAMPLE_RATES.get(event)
+        if rate is not None:
+            if random.random() >= rate:
+                return
+            fields["sample_rate"] = rate
+        self._logger.log(level, _JsonMessage(event, fields), exc_info=exc_info)
 
     @staticmethod
     def _format(event: str, fields: dict[str, object]) -> str:
         """Format an event name and fields as a JSON string."""
-        payload: dict[str, object] = {"event": event, **fields}
-        return json.dumps(payload, default=str)
+        return _dumps({"event": event, **fields})
 
 
-def _configure_root_logger() -> None:
-    """Configure the root logger with sensible defaults.
+class _JsonMessage:
+    """Log message that serializes its payload on first ``str()``."""
+
+    __slots__ = ("_event", "_fields", "_text")
+
+    def __init__(self, event: str, fields: dict[str, object]) -> None:
+        self._event = event
+        self._fields = fields
+        self._text: str | None = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = _dumps({"event": self._event, **self._fields})
+        return self._text
+
+
+def _dumps(payload: dict[str, object]) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:  # e.g. integers beyond 64 bits
+            pass
+    return json.dumps(payload, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that snapshots the payload and defers the rest.
 
-    This setup is intentionally minimal: log records include timestamps,
-    level names, logger names and the JSON-formatted message produced by
-    StructuredLogger. Applications that need more advanced logging can
-    extend this configuration without changing the StructuredLogger API.
+    The stdlib ``prepare`` fully formats the record on the caller's thread.
+    Here only the message is rendered (the JSON payload, whose fields may be
+    mutable objects the caller keeps changing) and the traceback captured;
+    the line format and the write are left to the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def set_sample_rates(rates: Mapping[str, float]) -> None:
+    """Replace the per-event sampling rates.
+
+    Args:
+        rates: Mapping of event name to keep probability in ``[0, 1]``.
+            Events not listed are always logged.
+    """
+    cleaned = {event: min(1.0, max(0.0, float(rate))) for event, rate in rates.items()}
+    _SAMPLE_RATES.clear()
+    _SAMPLE_RATES.update(cleaned)
+
+
+def _parse_sample_rates(raw: str | None) -> dict[str, float]:
+    """Parse ``event=rate`` pairs separated by commas."""
+    rates: dict[str, float] = {}
+    for pair in (raw or "").split(","):
+        event, separator, value = pair.partition("=")
+        if not separator or not event.strip():
+            continue
+        try:
+            rates[event.strip()] = float(value)
+        except ValueError:
+            continue
+    return rates
+
+
+def _configure_root_logger() -> None:
+    """Configure the root logger once per process.
+
+    Mirrors ``logging.basicConfig``: when the root logger already has handlers
+    (uvicorn, pytest, an embedding application) it is left alone. Otherwise a
+    stderr handler is installed behind a ``QueueHandler``/``QueueListener``
+    pair so formatting and I/O happen off the calling thread. Behaviour is
+    controlled by ``LOG_LEVEL`` (default ``INFO``), ``LOG_ASYNC`` (default
+    ``true``) and ``LOG_SAMPLE_RATES`` (``event=rate`` pairs).
     """
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s %(levelname)s %(name)s %(message)s",
-    )
+    global _CONFIGURED, _LISTENER
+    if _CONFIGURED:
+        return
+    with _CONFIGURE_LOCK:
+        if _CONFIGURED:
+            return
+        set_sample_rates(_parse_sample_rates(os.getenv("LOG_SAMPLE_RATES")))
+        root = logging.getLogger()
+        if not root.handlers:
+            root.setLevel(os.getenv("LOG_LEVEL", "INFO").strip().upper() or "INFO")
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+            if os.getenv("LOG_ASYNC", "true").strip().lower() in {"1", "true", "yes", "on"}:
+                log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+                _LISTENER = QueueListener(log_queue, handler, respect_handler_level=True)
+                _LISTENER.start()
+                atexit.register(_LISTENER.stop)
+                root.addHandler(_DeferredQueueHandler(log_queue))
+            else:
+                root.addHandler(handler)
+        _CONFIGURED = True
 
 
 def get_logger(name: str) -> LoggerProtocol:
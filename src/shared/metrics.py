@@ -0,0 +1,400 @@
+"""Prometheus metrics shared by the API and the ingestion pipeline.
+
+All metrics live in one process-wide ``CollectorRegistry`` returned by
+``get_metrics``. The API renders it at ``/metrics``; short-lived CLI runs push
+it to a Pushgateway at the end of the job. When ``prometheus_client`` is not
+installed every helper degrades to a no-op so instrumentation never breaks a
+code path.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+from src.shared.logging import LoggerProtocol, get_logger
+
+try:  # pragma: no cover - optional dependency
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        generate_latest,
+        push_to_gateway,
+    )
+except ImportError:  # pragma: no cover - optional dependency
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+    CollectorRegistry = None  # type: ignore[assignment,misc]
+    Counter = None  # type: ignore[assignment,misc]
+    Gauge = None  # type: ignore[assignment,misc]
+    Histogram = None  # type: ignore[assignment,misc]
+    generate_latest = None  # type: ignore[assignment]
+    push_to_gateway = None  # type: ignore[assignment]
+
+logger: LoggerProtocol = get_logger(__name__)
+
+LATENCY_BUCKETS_SECONDS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+BATCH_SIZE_BUCKETS: tuple[float, ...] = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+TOKEN_BUCKETS: tuple[float, ...] = (0, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+_NAMESPACE = "rag"
+
+CIRCUIT_STATE_VALUES: Mapping[str, int] = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class _NoOpMetric:
+    """Stand-in accepting the prometheus_client metric API and discarding it."""
+
+    def labels(self, *_args: Any, **_kwargs: Any) -> "_NoOpMetric":
+        return self
+
+    def observe(self, _value: float) -> None:
+        return None
+
+    def inc(self, _amount: float = 1.0) -> None:
+        return None
+
+    def dec(self, _amount: float = 1.0) -> None:
+        return None
+
+    def set(self, _value: float) -> None:
+        return None
+
+
+class MetricsRegistry:
+    """Counters and histograms for the per-stage latencies of the service.
+
+    Attributes:
+        enabled: Whether ``prometheus_client`` is available.
+        registry: Underlying ``CollectorRegistry`` (``None`` when disabled).
+    """
+
+    def __init__(self) -> None:
+        self.enabled = CollectorRegistry is not None
+        self.registry: Any | None = CollectorRegistry() if self.enabled else None
+        self._metrics: dict[str, Any] = {}
+        self.embedding_batch_seconds = self.histogram(
+            "embedding_batch_duration_seconds",
+            "Wall time of one embedding backend call.",
+            ("backend", "outcome"),
+        )
+        self.embedding_batch_items = self.histogram(
+            "embedding_batch_items",
+            "Texts per embedding backend call.",
+            ("backend",),
+            buckets=BATCH_SIZE_BUCKETS,
+        )
+        self.embedding_retries = self.counter(
+            "embedding_retries_total",
+            "Embedding batch retries after a transient failure.",
+            ("backend",),
+        )
+        self.db_operation_seconds = self.histogram(
+            "db_operation_duration_seconds",
+            "Wall time of one database operation.",
+            ("operation", "outcome"),
+        )
+        self.retrieval_seconds = self.histogram(
+            "retrieval_duration_seconds",
+            "End-to-end retrieval time (query embedding plus vector search).",
+            ("outcome",),
+        )
+        self.retrieval_results = self.histogram(
+            "retrieval_results",
+            "Chunks returned per retrieval.",
+            (),
+            buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+        )
+        self.llm_call_seconds = self.histogram(
+            "llm_call_duration_seconds",
+            "Wall time of one LLM completion including retries.",
+            ("outcome",),
+        )
+        self.llm_retries = self.counter(
+            "llm_retries_total",
+            "LLM request retries.",
+            (),
+        )
+        self.cache_requests = self.counter(
+            "cache_requests_total",
+            "Cache lookups by cache name and result (hit or miss).",
+            ("cache", "result"),
+        )
+        self.ingestion_stage_seconds = self.histogram(
+            "ingestion_stage_duration_seconds",
+            "Per-document ingestion time by stage.",
+            ("stage",),
+        )
+        self.ingestion_documents = self.counter(
+            "ingestion_documents_total",
+            "Documents processed by ingestion, by final status.",
+            ("status",),
+        )
+        self.single_flight_requests = self.counter(
+            "singleflight_requests_total",
+            "Calls through a single-flight group by role (leader, coalesced, overflow or deadline_skew).",
+            ("operation", "role"),
+        )
+        self.query_expansions = self.counter(
+            "query_expansion_total",
+            "Expanded retrievals by outcome (fused, fallback, single or skipped).",
+            ("outcome",),
+        )
+        self.context_tokens = self.histogram(
+            "context_tokens",
+            "Prompt context tokens per chat request, used and saved by packing.",
+            ("kind",),
+            buckets=TOKEN_BUCKETS,
+        )
+        self.concurrency_limit = self.gauge(
+            "concurrency_limit",
+            "Current adaptive concurrency limit.",
+            ("limiter",),
+        )
+        self.concurrency_in_flight = self.gauge(
+            "concurrency_in_flight",
+            "Calls currently admitted by a concurrency limiter.",
+            ("limiter",),
+        )
+        self.concurrency_queue_depth = self.gauge(
+            "concurrency_queue_depth",
+            "Calls waiting for admission by a concurrency limiter.",
+            ("limiter",),
+        )
+        self.concurrency_rejections = self.counter(
+            "concurrency_rejections_total",
+            "Calls shed by a concurrency limiter, by reason.",
+            ("limiter", "reason"),
+        )
+        self.circuit_state = self.gauge(
+            "circuit_breaker_state",
+            "Circuit breaker state (0 closed, 1 half-open, 2 open).",
+            ("breaker",),
+        )
+        self.circuit_rejections = self.counter(
+            "circuit_breaker_rejections_total",
+            "Calls failed fast because their circuit was open.",
+            ("breaker",),
+        )
+        self.hedged_requests = self.counter(
+            "hedged_requests_total",
+            "Calls slower than the hedge delay, by which attempt won (primary, hedge or none) or skipped when no worker was free.",
+            ("operation", "winner"),
+        )
+        self.rate_limit_rps = self.gauge(
+            "rate_limit_requests_per_second",
+            "Current client-side request rate limit (0 while unlimited).",
+            ("limiter",),
+        )
+        self.rate_limit_throttles = self.counter(
+            "rate_limit_throttled_total",
+            "Throttled (HTTP 429) responses reported to a rate limiter.",
+            ("limiter",),
+        )
+        self.rate_limit_wait_seconds = self.histogram(
+            "rate_limit_wait_seconds",
+            "Time a request waited for rate limiter admission.",
+            ("limiter",),
+        )
+        self.work_queue_items = self.counter(
+            "work_queue_items_total",
+            "Work items finished by queue workers, by outcome (ingested, skipped, failed, lease_lost).",
+            ("outcome",),
+        )
+        self.work_queue_leases = self.counter(
+            "work_queue_leases_total",
+            "Work items leased by queue workers; more than one lease per item means redelivery.",
+            (),
+        )
+
+    def counter(self, name: str, documentation: str, labels: tuple[str, ...]) -> Any:
+        """Return the counter ``rag_<name>``, creating it on first use."""
+        return self._get_or_create(Counter, name, documentation, labels)
+
+    def gauge(self, name: str, documentation: str, labels: tuple[str, ...]) -> Any:
+        """Return the gauge ``rag_<name>``, creating it on first use."""
+        return self._get_or_create(Gauge, name, documentation, labels)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...],
+        *,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS_SECONDS,
+    ) -> Any:
+        """Return the histogram ``rag_<name>``, creating it on first use."""
+        return self._get_or_create(Histogram, name, documentation, labels, buckets=buckets)
+
+    def observe_embedding_batch(
+        self,
+        *,
+        backend: str,
+        duration_seconds: float,
+        item_count: int,
+        outcome: str = "success",
+    ) -> None:
+        """Record one embedding backend call."""
+        self.embedding_batch_seconds.labels(backend=backend, outcome=outcome).observe(duration_seconds)
+        if outcome == "success":
+            self.embedding_batch_items.labels(backend=backend).observe(item_count)
+
+    def observe_db_operation(self, *, operation: str, duration_seconds: float, outcome: str = "success") -> None:
+        """Record one database operation."""
+        self.db_operation_seconds.labels(operation=operation, outcome=outcome).observe(duration_seconds)
+
+    def observe_retrieval(self, *, duration_seconds: float, results: int, outcome: str = "success") -> None:
+        """Record one retrieval call."""
+        self.retrieval_seconds.labels(outcome=outcome).observe(duration_seconds)
+        if outcome == "success":
+            self.retrieval_results.observe(results)
+
+    def observe_llm_call(self, *, duration_seconds: float, retries: int, outcome: str = "success") -> None:
+        """Record one LLM completion."""
+        self.llm_call_seconds.labels(outcome=outcome).observe(duration_seconds)
+        if retries:
+            self.llm_retries.inc(retries)
+
+    def record_cache(self, *, cache: str, hit: bool) -> None:
+        """Count a cache lookup."""
+        self.cache_requests.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+    def record_single_flight(self, *, operation: str, role: str) -> None:
+        """Count a call entering a single-flight group."""
+        self.single_flight_requests.labels(operation=operation, role=role).inc()
+
+    def record_query_expansion(self, *, outcome: str) -> None:
+        """Count an expanded retrieval by outcome."""
+        self.query_expansions.labels(outcome=outcome).inc()
+
+    def observe_context_packing(self, *, tokens_used: int, tokens_saved: int) -> None:
+        """Record the prompt tokens one packed context used and saved."""
+        self.context_tokens.labels(kind="used").observe(tokens_used)
+        self.context_tokens.labels(kind="saved").observe(tokens_saved)
+
+    def set_concurrency_state(self, *, limiter: str, limit: int, in_flight: int, queue_depth: int) -> None:
+        """Publish a concurrency limiter's current limit, load and queue depth."""
+        self.concurrency_limit.labels(limiter=limiter).set(limit)
+        self.concurrency_in_flight.labels(limiter=limiter).set(in_flight)
+        self.concurrency_queue_depth.labels(limiter=limiter).set(queue_depth)
+
+    def record_concurrency_rejection(self, *, limiter: str, reason: str) -> None:
+        """Count a call shed by a concurrency limiter."""
+        self.concurrency_rejections.labels(limiter=limiter, reason=reason).inc()
+
+    def set_circuit_state(self, *, breaker: str, state: str) -> None:
+        """Publish a circuit breaker's state."""
+        self.circuit_state.labels(breaker=breaker).set(CIRCUIT_STATE_VALUES[state])
+
+    def record_circuit_rejection(self, *, breaker: str) -> None:
+        """Count a call failed fast by an open circuit."""
+        self.circuit_rejections.labels(breaker=breaker).inc()
+
+    def record_hedged_request(self, *, operation: str, winner: str) -> None:
+        """Count a hedged call by the attempt that won."""
+        self.hedged_requests.labels(operation=operation, winner=winner).inc()
+
+    def set_rate_limit(self, *, limiter: str, requests_per_second: float) -> None:
+        """Publish a rate limiter's current request rate."""
+        self.rate_limit_rps.labels(limiter=limiter).set(requests_per_second)
+
+    def record_rate_limit_throttle(self, *, limiter: str) -> None:
+        """Count a throttled response."""
+        self.rate_limit_throttles.labels(limiter=limiter).inc()
+
+    def observe_rate_limit_wait(self, *, limiter: str, seconds: float) -> None:
+        """Record how long a request waited for admission."""
+        self.rate_limit_wait_seconds.labels(limiter=limiter).observe(seconds)
+
+    def record_work_item(self, *, outcome: str) -> None:
+        """Count a work item finished by a queue worker."""
+        self.work_queue_items.labels(outcome=outcome).inc()
+
+    def record_work_leases(self, count: int) -> None:
+        """Count work items leased from the queue."""
+        self.work_queue_leases.inc(count)
+
+    def observe_ingested_document(self, *, status: str, stage_seconds: Mapping[str, float]) -> None:
+        """Record one document's final status and per-stage durations."""
+        self.ingestion_documents.labels(status=status).inc()
+        for stage, seconds in stage_seconds.items():
+            self.ingestion_stage_seconds.labels(stage=stage).observe(seconds)
+
+    def render(self) -> tuple[bytes, str]:
+        """Serialize the registry in the Prometheus text exposition format.
+
+        Returns:
+            Tuple of payload bytes and the matching content type.
+        """
+        if not self.enabled:
+            return b"", CONTENT_TYPE_LATEST
+        return generate_latest(self.registry), CONTENT_TYPE_LATEST
+
+    def push(self, gateway: str, *, job: str, grouping_key: Mapping[str, str] | None = None) -> bool:
+        """Push the registry to a Prometheus Pushgateway.
+
+        Failures are logged rather than raised so a monitoring outage never
+        fails an otherwise successful ingestion run.
+
+        Args:
+            gateway: Pushgateway address (``host:port`` or URL).
+            job: Job label for the pushed group.
+            grouping_key: Extra grouping labels, e.g. the pipeline id.
+
+        Returns:
+            True when the push succeeded.
+        """
+        if not self.enabled:
+            logger.warning("metrics_push_skipped", reason="prometheus_client not installed")
+            return False
+        try:
+            push_to_gateway(gateway, job=job, registry=self.registry, grouping_key=dict(grouping_key or {}))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("metrics_push_failed", gateway=gateway, job=job, error=str(exc))
+            return False
+        logger.info("metrics_pushed", gateway=gateway, job=job)
+        return True
+
+    def _get_or_create(self, factory: Any, name: str, documentation: str, labels: tuple[str, ...], **kwargs: Any) -> Any:
+        existing = self._metrics.get(name)
+        if existing is not None:
+            return existing
+        if not self.enabled:
+            metric: Any = _NoOpMetric()
+        else:
+            metric = factory(
+                name,
+                documentation,
+                labelnames=labels,
+                namespace=_NAMESPACE,
+                registry=self.registry,
+                **kwargs,
+            )
+        self._metrics[name] = metric
+        return metric
+
+
+_METRICS: MetricsRegistry | None = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    global _METRICS
+    if _METRICS is None:
+        _METRICS = MetricsRegistry()
+    return _METRICS
@@ -0,0 +1,130 @@
+"""Profiling helpers that turn a run into reproducible performance artifacts.
+
+``profile_session`` wraps a block of work with ``cProfile`` and a tracer whose
+spans are written as a Chrome trace (open in ``chrome://tracing`` or
+https://ui.perfetto.dev). The ``.prof`` file loads in snakeviz or
+``python -m pstats``; for a sampled flame graph of the same command run it
+under ``py-spy record`` instead.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+from src.shared.logging import LoggerProtocol, get_logger
+from src.shared.tracing import FinishedSpan, Tracer, TracerConfig
+
+logger: LoggerProtocol = get_logger(__name__)
+
+
+class ChromeTraceExporter:
+    """Span exporter that writes the Chrome trace-event JSON format on shutdown."""
+
+    def __init__(self, path: Path, *, category: str = "rag") -> None:
+        self._path = path
+        self._category = category
+        self._events: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[FinishedSpan]) -> None:
+        events = [self._event(span) for span in spans]
+        with self._lock:
+            self._events.extend(events)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            events = sorted(self._events, key=lambda event: event["ts"])
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._path.write_text(
+            json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, default=str),
+            encoding="utf-8",
+        )
+
+    def _event(self, span: FinishedSpan) -> dict[str, Any]:
+        args = dict(span.attributes)
+        if span.error is not None:
+            args["error"] = span.error
+        return {
+            "name": span.name,
+            "cat": self._category,
+            "ph": "X",
+            "ts": span.start_time_ns / 1000.0,
+            "dur": span.duration_ms * 1000.0,
+            "pid": os.getpid(),
+            "tid": span.thread_id,
+            "args": args,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileArtifacts:
+    """Files produced by a profiling session."""
+
+    profile_path: Path
+    summary_path: Path
+    trace_path: Path
+
+
+@contextlib.contextmanager
+def profile_session(
+    output_dir: Path,
+    *,
+    name: str,
+    top: int = 40,
+) -> Iterator[tuple[Tracer, ProfileArtifacts]]:
+    """Profile the enclosed block and record tracer spans as a Chrome trace.
+
+    Args:
+        output_dir: Directory receiving ``<name>.prof``, ``<name>.txt`` and
+            ``<name>.trace.json``.
+        name: Base file name for the artifacts.
+        top: Number of functions listed in the text summary.
+
+    Yields:
+        Tuple of a tracer to hand to the profiled code and the artifact paths
+        (written when the block exits).
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    artifacts = ProfileArtifacts(
+        profile_path=output_dir / f"{name}.prof",
+        summary_path=output_dir / f"{name}.txt",
+        trace_path=output_dir / f"{name}.trace.json",
+    )
+    tracer = Tracer(
+        TracerConfig(
+            enabled=True,
+            host=None,
+            public_key=None,
+            secret_key=None,
+            max_queue_size=1_000_000,
+            export_batch_size=512,
+        ),
+        exporter=ChromeTraceExporter(artifacts.trace_path),
+    )
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield tracer, artifacts
+    finally:
+        profiler.disable()
+        tracer.shutdown()
+        profiler.dump_stats(str(artifacts.profile_path))
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(top)
+        artifacts.summary_path.write_text(summary.getvalue(), encoding="utf-8")
+        logger.info(
+            "profile_written",
+            profile=str(artifacts.profile_path),
+            summary=str(artifacts.summary_path),
+            trace=str(artifacts.trace_path),
+            dropped_spans=tracer.dropped_spans,
+        )
@@ -0,0 +1,273 @@
+"""Client-side rate limiting for metered upstream APIs.
+
+``RateLimiter`` combines a requests-per-second bucket and a tokens-per-minute
+bucket. Callers ``acquire`` before each request and report the outcome with
+``on_success`` or ``on_throttled``. Each ``acquire`` reserves its share of
+both buckets under a lock and then sleeps outside it. The buckets can go
+into debt, so concurrent callers queue in reservation order and nobody
+spins.
+
+A throttled response (HTTP 429) does two things. It pauses every caller
+until the response's ``Retry-After`` has elapsed. It also cuts the request
+rate multiplicatively, starting from the observed rate when no limit was
+configured. Each success then raises the rate additively back toward the
+configured ceiling. The limiter settles just under the provider's real
+limit instead of alternating between bursts and backoff.
+
+``shared_rate_limiter`` returns one limiter per name for the whole process,
+so every client and thread calling the same endpoint shares one budget.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from time import monotonic, sleep
+from typing import Callable
+
+from src.shared.deadline import DeadlineExceeded, retry_allowed
+from src.shared.logging import LoggerProtocol, get_logger
+from src.shared.metrics import get_metrics
+
+logger: LoggerProtocol = get_logger(__name__)
+
+
+class TokenBucket:
+    """Token bucket that may go into debt; not thread-safe on its own.
+
+    Attributes:
+        rate: Tokens added per second.
+        capacity: Most tokens the bucket holds, i.e. the allowed burst.
+    """
+
+    def __init__(self, *, rate: float, capacity: float, clock: Callable[[], float] = monotonic) -> None:
+        if rate <= 0.0 or capacity <= 0.0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` tokens and return the seconds to wait before using them."""
+        self._refill()
+        self._tokens -= amount
+        return 0.0 if self._tokens >= 0.0 else -self._tokens / self.rate
+
+    def refund(self, amount: float) -> None:
+        """Return tokens from a reservation that was not used."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+    def set_rate(self, rate: float, *, capacity: float | None = None) -> None:
+        """Change the refill rate, keeping tokens accrued so far."""
+        self._refill()
+        self.rate = rate
+        if capacity is not None:
+            self.capacity = capacity
+            self._tokens = min(self._tokens, capacity)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RateLimiter:
+    """Thread-safe request and token quotas with 429 feedback.
+
+    Attributes:
+        name: Label used in logs and the ``rag_rate_limit_*`` metrics.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        requests_per_second: float | None = None,
+        tokens_per_minute: float | None = None,
+        decrease_factor: float = 0.5,
+        recovery_step: float = 0.05,
+        min_requests_per_second: float = 0.2,
+        default_pause_seconds: float = 1.0,
+        window_seconds: float = 10.0,
+        clock: Callable[[], float] = monotonic,
+        sleeper: Callable[[float], None] = sleep,
+    ) -> None:
+        if not 0.0 < decrease_factor < 1.0:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self.name = name
+        self._max_requests_per_second = requests_per_second or None
+        self._tokens_per_minute = tokens_per_minute or None
+        self._decrease_factor = decrease_factor
+        self._recovery_step = recovery_step
+        self._min_requests_per_second = min_requests_per_second
+        self._default_pause_seconds = default_pause_seconds
+        self._window_seconds = window_seconds
+        self._clock = clock
+        self._sleep = sleeper
+        self._lock = threading.Lock()
+        self._request_rate = self._max_requests_per_second
+        self._request_bucket = (
+            None if self._request_rate is None else self._new_request_bucket(self._request_rate)
+        )
+        self._token_scale = 1.0
+        self._token_bucket = (
+            None
+            if self._tokens_per_minute is None
+            else TokenBucket(rate=self._tokens_per_minute / 60.0, capacity=self._tokens_per_minute / 60.0, clock=clock)
+        )
+        self._paused_until = 0.0
+        self._decrease_allowed_at = 0.0
+        self._recent: deque[float] = deque()
+        self._publish()
+
+    @property
+    def requests_per_second(self) -> float | None:
+        """Current request rate, or None while unlimited."""
+        with self._lock:
+            return self._request_rate
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until one request carrying ``tokens`` may be sent.
+
+        Args:
+            tokens: Input tokens the request will consume.
+
+        Returns:
+            Seconds spent waiting.
+
+        Raises:
+            DeadlineExceeded: When the wait would outlive the request
+                deadline; the reservation is returned.
+        """
+        with self._lock:
+            now = self._clock()
+            wait = max(0.0, self._paused_until - now)
+            if self._request_bucket is not None:
+                wait = max(wait, self._request_bucket.reserve(1))
+            if self._token_bucket is not None and tokens:
+                wait = max(wait, self._token_bucket.reserve(tokens))
+            self._prune_recent(now)
+            self._recent.append(now + wait)
+        if not retry_allowed(wait):
+            self._release(tokens)
+            raise DeadlineExceeded("rate_limit")
+        if wait > 0.0:
+            get_metrics().observe_rate_limit_wait(limiter=self.name, seconds=wait)
+            self._sleep(wait)
+        return wait
+
+    def on_success(self) -> None:
+        """Report an accepted request; the rate recovers additively."""
+        with self._lock:
+            changed = False
+            if self._request_rate is not None and (
+                self._max_requests_per_second is None or self._request_rate < self._max_requests_per_second
+            ):
+                self._request_rate += self._recovery_step
+                if self._max_requests_per_second is not None:
+                    self._request_rate = min(self._request_rate, self._max_requests_per_second)
+                self._set_request_rate(self._request_rate)
+                changed = True
+            if self._token_bucket is not None and self._token_scale < 1.0:
+                self._token_scale = min(1.0, self._token_scale + self._recovery_step / 10.0)
+                self._set_token_scale(self._token_scale)
+                changed = True
+            if changed:
+                self._publish()
+
+    def on_throttled(self, retry_after_seconds: float | None = None) -> None:
+        """Report a 429: pause every caller and cut the rate.
+
+        Several in-flight requests usually get throttled together, so the
+        rate is cut at most once per pause.
+
+        Args:
+            retry_after_seconds: The response's ``Retry-After``, if any.
+        """
+        pause = self._default_pause_seconds if retry_after_seconds is None else max(0.0, retry_after_seconds)
+        get_metrics().record_rate_limit_throttle(limiter=self.name)
+        with self._lock:
+            now = self._clock()
+            self._paused_until = max(self._paused_until, now + pause)
+            if now < self._decrease_allowed_at:
+                return
+            self._decrease_allowed_at = now + max(pause, self._default_pause_seconds)
+            current = self._request_rate if self._request_rate is not None else self._observed_rate(now)
+            self._request_rate = max(self._min_requests_per_second, current * self._decrease_factor)
+            self._set_request_rate(self._request_rate)
+            if self._token_bucket is not None:
+                self._token_scale = max(0.05, self._token_scale * self._decrease_factor)
+                self._set_token_scale(self._token_scale)
+            rate = self._request_rate
+            self._publish()
+        logger.warning(
+            "rate_limit_throttled",
+            limiter=self.name,
+            retry_after_seconds=retry_after_seconds,
+            requests_per_second=rate,
+        )
+
+    def _release(self, tokens: int) -> None:
+        with self._lock:
+            if self._request_bucket is not None:
+                self._request_bucket.refund(1)
+            if self._token_bucket is not None and tokens:
+                self._token_bucket.refund(tokens)
+
+    def _observed_rate(self, now: float) -> float:
+        self._prune_recent(now)
+        return len(self._recent) / self._window_seconds
+
+    def _prune_recent(self, now: float) -> None:
+        """Drop send times older than the window so the deque stays bounded."""
+        while self._recent and self._recent[0] < now - self._window_seconds:
+            self._recent.popleft()
+
+    def _new_request_bucket(self, rate: float) -> TokenBucket:
+        return TokenBucket(rate=rate, capacity=max(1.0, rate), clock=self._clock)
+
+    def _set_request_rate(self, rate: float) -> None:
+        if self._request_bucket is None:
+            self._request_bucket = self._new_request_bucket(rate)
+            # Start empty so the new limit applies right after the pause.
+            self._request_bucket.reserve(self._request_bucket.capacity)
+        else:
+            self._request_bucket.set_rate(rate, capacity=max(1.0, rate))
+
+    def _set_token_scale(self, scale: float) -> None:
+        assert self._token_bucket is not None and self._tokens_per_minute is not None
+        rate = self._tokens_per_minute / 60.0 * scale
+        self._token_bucket.set_rate(rate, capacity=rate)
+
+    def _publish(self) -> None:
+        get_metrics().set_rate_limit(limiter=self.name, requests_per_second=self._request_rate or 0.0)
+
+
+_SHARED: dict[str, RateLimiter] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_rate_limiter(
+    name: str,
+    *,
+    requests_per_second: float | None = None,
+    tokens_per_minute: float | None = None,
+) -> RateLimiter:
+    """Return the process-wide limiter called ``name``, creating it once.
+
+    Limits passed after the first call are ignored so that every client of
+    an endpoint shares one budget.
+    """
+    with _SHARED_LOCK:
+        limiter = _SHARED.get(name)
+        if limiter is None:
+            limiter = RateLimiter(
+                name=name,
+                requests_per_second=requests_per_second,
+                tokens_per_minute=tokens_per_minute,
+            )
+            _SHARED[name] = limiter
+        return limiter
@@ -0,0 +1,297 @@
+"""Circuit breaking and request hedging for upstream HTTP clients.
+
+``CircuitBreaker`` stops calling a failing dependency. It tracks the outcome
+of the last ``window_size`` calls. Once at least ``minimum_calls`` are
+recorded and the failure rate reaches ``failure_rate_threshold``, the circuit
+opens and calls fail immediately with ``CircuitOpenError`` instead of
+tying up a thread in timeouts and backoff sleeps. After ``open_seconds`` the
+circuit goes half-open and admits ``half_open_max_calls`` probes. A
+successful probe closes it; a failed one opens it again.
+
+``Hedger`` trims tail latency for idempotent calls. Once it has enough
+samples it runs a call on its executor and, if the call has not finished by
+the observed ``quantile`` latency (p95 by default), fires one duplicate.
+Whichever succeeds first wins. The losing request is not interrupted (a
+blocking HTTP call cannot be), its result is discarded. The delay is
+measured from when the call starts running, not from when it was queued,
+and no hedge is fired while every worker is busy, so a burst of callers
+larger than the pool does not double upstream load.
+
+Both are thread-safe and are shared by the embedding and LLM clients.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import math
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from time import monotonic, perf_counter
+from typing import Callable, TypeVar
+
+from src.shared.logging import LoggerProtocol, get_logger
+from src.shared.metrics import get_metrics
+
+logger: LoggerProtocol = get_logger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose circuit is open.
+
+    Attributes:
+        name: Breaker name.
+        retry_after_seconds: Time until the circuit admits a probe.
+    """
+
+    def __init__(self, *, name: str, retry_after_seconds: float) -> None:
+        super().__init__(f"Circuit {name!r} is open; retry after {retry_after_seconds:.1f}s")
+        self.name = name
+        self.retry_after_seconds = retry_after_seconds
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker over a sliding window of calls.
+
+    Callers ask ``allow()`` before each call and report the outcome with
+    ``record_success()`` or ``record_failure()``. Only failures of the
+    dependency itself (connection errors, timeouts, 5xx, 429) should be
+    recorded as failures; a rejected request still proves it is up.
+
+    Attributes:
+        name: Label used in logs and the ``rag_circuit_breaker_*`` metrics.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        minimum_calls: int = 5,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        if not 0.0 < failure_rate_threshold <= 1.0:
+            raise ValueError("failure_rate_threshold must be in (0, 1]")
+        if not 1 <= minimum_calls <= window_size:
+            raise ValueError("Expected 1 <= minimum_calls <= window_size")
+        self.name = name
+        self._threshold = failure_rate_threshold
+        self._minimum_calls = minimum_calls
+        self._open_seconds = open_seconds
+        self._half_open_max_calls = max(1, half_open_max_calls)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: deque[bool] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._publish()
+
+    @property
+    def state(self) -> str:
+        """``closed``, ``open`` or ``half_open``."""
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def allow(self) -> None:
+        """Admit one call or raise.
+
+        Raises:
+            CircuitOpenError: While open, or while half-open with every probe
+                slot taken.
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and self._probes_in_flight < self._half_open_max_calls:
+                self._probes_in_flight += 1
+                return
+            retry_after = max(0.0, self._opened_at + self._open_seconds - self._clock())
+        get_metrics().record_circuit_rejection(breaker=self.name)
+        raise CircuitOpenError(name=self.name, retry_after_seconds=retry_after)
+
+    def record_success(self) -> None:
+        """Report that an admitted call reached a healthy dependency."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                self._outcomes.clear()
+                self._transition(CLOSED)
+            else:
+                self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        """Report that an admitted call failed because of the dependency."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                self._trip()
+                return
+            if self._state == OPEN:
+                return
+            self._outcomes.append(False)
+            if len(self._outcomes) >= self._minimum_calls:
+                failure_rate = self._outcomes.count(False) / len(self._outcomes)
+                if failure_rate >= self._threshold:
+                    self._trip()
+
+    def release(self) -> None:
+        """Give back an admitted call's probe slot without recording an outcome.
+
+        For calls that ended before telling anything about the dependency
+        (a deadline, a client-side bug); otherwise a half-open circuit would
+        keep the slot forever and reject every later call.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _refresh(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self._open_seconds:
+            self._probes_in_flight = 0
+            self._transition(HALF_OPEN)
+
+    def _trip(self) -> None:
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        if state == self._state:
+            return
+        previous, self._state = self._state, state
+        logger.warning("circuit_breaker_transition", breaker=self.name, previous=previous, state=state)
+        self._publish()
+
+    def _publish(self) -> None:
+        get_metrics().set_circuit_state(breaker=self.name, state=self._state)
+
+
+class Hedger:
+    """Duplicate slow idempotent calls once they pass a latency quantile.
+
+    Until ``min_samples`` successful calls have been observed, calls run
+    inline on the caller's thread. Afterwards each call runs on the
+    hedger's executor, in a copy of the caller's context so request
+    deadlines still apply, and a single hedge is fired once the call has
+    been running for the current ``quantile`` latency (never sooner than
+    ``min_delay_seconds``) and a worker is free for it. Size ``max_workers``
+    to the callers' concurrency plus headroom for hedges.
+
+    Attributes:
+        name: Label used in the ``rag_hedged_requests_total`` metric.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        quantile: float = 0.95,
+        min_samples: int = 20,
+        window_size: int = 200,
+        min_delay_seconds: float = 0.05,
+        max_workers: int = 16,
+    ) -> None:
+        if not 0.0 < quantile < 1.0:
+            raise ValueError("quantile must be between 0 and 1")
+        self.name = name
+        self._quantile = quantile
+        self._min_samples = max(1, min_samples)
+        self._min_delay_seconds = min_delay_seconds
+        self._latencies: deque[float] = deque(maxlen=max(window_size, self._min_samples))
+        self._lock = threading.Lock()
+        self._max_workers = max_workers
+        self._running = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"hedge-{name}")
+
+    def hedge_delay(self) -> float | None:
+        """Seconds to wait before hedging, or None while still sampling."""
+        with self._lock:
+            if len(self._latencies) < self._min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, math.ceil(self._quantile * len(ordered)) - 1)
+        return max(self._min_delay_seconds, ordered[index])
+
+    def call(self, func: Callable[[], T]) -> T:
+        """Run ``func``, hedging it if it is slower than usual.
+
+        Args:
+            func: Idempotent zero-argument call, typically one HTTP request.
+
+        Returns:
+            The result of whichever attempt succeeded first.
+
+        Raises:
+            Exception: The primary's error when neither attempt succeeds.
+        """
+        delay = self.hedge_delay()
+        if delay is None:
+            start = perf_counter()
+            result = func()
+            self._observe(perf_counter() - start)
+            return result
+        started = threading.Event()
+        primary = self._submit(func, started)
+        # A cancelled primary (executor shut down) never runs; don't block on it.
+        primary.add_done_callback(lambda _future: started.set())
+        started.wait()
+        start = perf_counter()
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            result = primary.result()
+            self._observe(perf_counter() - start)
+            return result
+        with self._lock:
+            saturated = self._running >= self._max_workers
+        if saturated:
+            get_metrics().record_hedged_request(operation=self.name, winner="skipped")
+            result = primary.result()
+            self._observe(perf_counter() - start)
+            return result
+        hedge = self._submit(func, threading.Event())
+        pending: set[Future[T]] = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    winner = "primary" if future is primary else "hedge"
+                    get_metrics().record_hedged_request(operation=self.name, winner=winner)
+                    self._observe(perf_counter() - start)
+                    return future.result()
+        get_metrics().record_hedged_request(operation=self.name, winner="none")
+        return primary.result()
+
+    def _submit(self, func: Callable[[], T], started: threading.Event) -> Future[T]:
+        context = contextvars.copy_context()
+
+        def run() -> T:
+            with self._lock:
+                self._running += 1
+            started.set()
+            try:
+                return context.run(func)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        return self._executor.submit(run)
+
+    def close(self) -> None:
+        """Stop the executor without waiting for abandoned attempts."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _observe(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
@@ -0,0 +1,149 @@
+"""Single-flight coalescing of identical concurrent async calls.
+
+Callers that ask for the same key while a call is in flight await that call
+instead of starting their own, so a burst of identical requests costs one
+computation. The shared task is shielded from any single caller's
+cancellation and is only cancelled once every waiter has gone away.
+
+Callers may carry request deadlines. The shared task must not inherit the
+leader's deadline, or a follower that arrived later would be cut short by
+someone else's budget. Only callers whose deadlines lie within
+``deadline_tolerance_seconds`` of the leader's share a call, the shared task
+runs under the leader's deadline plus that tolerance (so no later than any
+waiter admitted), and each caller stops waiting at its own deadline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+from src.shared.deadline import Deadline, DeadlineExceeded, deadline_scope
+from src.shared.metrics import get_metrics
+
+T = TypeVar("T")
+
+LEADER = "leader"
+COALESCED = "coalesced"
+OVERFLOW = "overflow"
+DEADLINE_SKEW = "deadline_skew"
+
+
+@dataclass(slots=True)
+class _Call(Generic[T]):
+    task: asyncio.Task[T]
+    expires_at: float | None
+    waiters: int = 1
+
+
+class SingleFlight(Generic[T]):
+    """Deduplicate concurrent calls that share a key.
+
+    Attributes:
+        name: Operation label used for the ``rag_singleflight_requests_total``
+            metric.
+        max_waiters: Most callers (leader included) that may share one call.
+            Callers beyond the bound run their own computation so a single
+            slow or failing call cannot hold an unbounded crowd.
+        deadline_tolerance_seconds: Largest difference between a caller's
+            deadline and the leader's for the caller to join the call.
+    """
+
+    def __init__(self, *, name: str, max_waiters: int, deadline_tolerance_seconds: float = 1.0) -> None:
+        if max_waiters < 1:
+            raise ValueError("max_waiters must be at least 1")
+        if deadline_tolerance_seconds < 0:
+            raise ValueError("deadline_tolerance_seconds must not be negative")
+        self.name = name
+        self.max_waiters = max_waiters
+        self.deadline_tolerance_seconds = deadline_tolerance_seconds
+        self._calls: dict[Hashable, _Call[T]] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of keys with a call currently running."""
+        return len(self._calls)
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[[], Awaitable[T]],
+        *,
+        deadline: Deadline | None = None,
+    ) -> tuple[T, str]:
+        """Run ``func`` once per key among concurrent callers.
+
+        Args:
+            key: Identity of the computation; callers with equal keys share it.
+            func: Zero-argument coroutine factory producing the result.
+            deadline: The caller's request deadline, if any. It bounds how long
+                this caller waits and decides which calls it may join.
+
+        Returns:
+            Tuple of the result and the caller's role: ``leader`` (started the
+            call), ``coalesced`` (joined one in flight), ``overflow`` (ran on
+            its own because the waiter bound was reached) or ``deadline_skew``
+            (ran on its own because its deadline differs too much from the
+            in-flight call's).
+
+        Raises:
+            DeadlineExceeded: When the caller's deadline passes while it waits
+                on a shared call.
+            Exception: Whatever ``func`` raised; it is delivered to every
+                caller sharing the call.
+        """
+        expires_at = deadline.expires_at if deadline is not None else None
+        call = self._calls.get(key)
+        if call is not None and call.waiters >= self.max_waiters:
+            get_metrics().record_single_flight(operation=self.name, role=OVERFLOW)
+            return await func(), OVERFLOW
+        if call is not None and not self._deadlines_compatible(call.expires_at, expires_at):
+            get_metrics().record_single_flight(operation=self.name, role=DEADLINE_SKEW)
+            return await func(), DEADLINE_SKEW
+        if call is None:
+            role = LEADER
+            shared_deadline = (
+                Deadline(expires_at=expires_at + self.deadline_tolerance_seconds) if expires_at is not None else None
+            )
+            # The task copies the current context, so it runs under the shared
+            # deadline rather than the leader's own.
+            with deadline_scope(shared_deadline):
+                task = asyncio.ensure_future(func())
+            call = _Call(task=task, expires_at=expires_at)
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _task: self._release(key, call))
+        else:
+            role = COALESCED
+            call.waiters += 1
+        get_metrics().record_single_flight(operation=self.name, role=role)
+        try:
+            if deadline is None:
+                result = await asyncio.shield(call.task)
+            else:
+                result = await asyncio.wait_for(asyncio.shield(call.task), timeout=deadline.remaining())
+        except asyncio.CancelledError:
+            self._leave(call)
+            raise
+        except TimeoutError as exc:
+            if call.task.done():
+                # The shared computation itself timed out; every waiter sees it.
+                raise
+            self._leave(call)
+            raise DeadlineExceeded(self.name) from exc
+        return result, role
+
+    @staticmethod
+    def _leave(call: _Call[T]) -> None:
+        call.waiters -= 1
+        if call.waiters == 0 and not call.task.done():
+            call.task.cancel()
+
+    def _deadlines_compatible(self, leader: float | None, caller: float | None) -> bool:
+        if leader is None or caller is None:
+            return leader is None and caller is None
+        return abs(caller - leader) <= self.deadline_tolerance_seconds
+
+    def _release(self, key: Hashable, call: _Call[T]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
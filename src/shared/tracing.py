@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import atexit
 import contextlib
+import contextvars
 import datetime as dt
-import sys
+import hashlib
 import os
-from dataclasses import dataclass
-from typing import Any, Iterator, Protocol
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Iterator, Protocol, Sequence
 
 from src.shared.logging import get_logger
+from src.shared.metrics import get_metrics
 
 logger = get_logger(__name__)
 
@@ -23,6 +31,10 @@ class SpanProtocol(Protocol):
 
 
 class _NoOpSpan:
+    """Span used when tracing is disabled; every operation is free."""
+
+    __slots__ = ("name", "correlation_id")
+
     def __init__(self, name: str, correlation_id: str | None) -> None:
         self.name = name
         self.correlation_id = correlation_id
@@ -34,21 +46,10 @@ class _NoOpSpan:
         return None
 
     def set_attribute(self, key: str, value: Any) -> None:
-        logger.debug(
-            "tracing_noop_attribute",
-            span=self.name,
-            correlation_id=self.correlation_id,
-            key=key,
-            value=value,
-        )
+        return None
 
     def end(self, **attributes: Any) -> None:
-        logger.debug(
-            "tracing_noop_end",
-            span=self.name,
-            correlation_id=self.correlation_id,
-            attributes=attributes,
-        )
+        return None
 
 
 class _NoOpTracer:
@@ -63,86 +64,370 @@ class _NoOpTracer:
         correlation_id: str | None = None,
         attributes: dict[str, Any] | None = None,
     ) -> Iterator[SpanProtocol]:
-        span = _NoOpSpan(name=name, correlation_id=correlation_id)
-        if attributes:
-            for key, value in attributes.items():
-                span.set_attribute(key, value)
-        yield span
-        span.end()
+        yield _NoOpSpan(name=name, correlation_id=correlation_id)
 
 
 @dataclass(frozen=True)
 class TracerConfig:
-    """Configuration required to enable Langfuse traces."""
+    """Configuration required to enable Langfuse traces.
+
+    Attributes:
+        enabled: Whether spans are recorded at all.
+        host: Langfuse host URL.
+        public_key: Langfuse public key.
+        secret_key: Langfuse secret key.
+        sample_ratio: Fraction of correlation ids whose spans are recorded.
+            The decision is a hash of the correlation id, so every span of a
+            sampled request is kept and every span of an unsampled one is not.
+        max_queue_size: Finished spans buffered for export; when full the
+            oldest span is dropped and counted.
+        export_batch_size: Spans sent to the exporter per call.
+        export_interval_seconds: Longest a finished span waits before export.
+    """
 
     enabled: bool
     host: str | None
     public_key: str | None
     secret_key: str | None
+    sample_ratio: float = 1.0
+    max_queue_size: int = 2048
+    export_batch_size: int = 64
+    export_interval_seconds: float = 1.0
+
+
+@dataclass(slots=True)
+class FinishedSpan:
+    """A completed span waiting for export."""
+
+    span_id: str
+    parent_id: str | None
+    name: str
+    correlation_id: str | None
+    start_time_ns: int
+    end_time_ns: int
+    duration_ms: float
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+    thread_id: int = 0
+
+    @property
+    def start_time(self) -> dt.datetime:
+        """Start time as an aware UTC datetime."""
+        return dt.datetime.fromtimestamp(self.start_time_ns / 1e9, tz=dt.timezone.utc)
+
+    @property
+    def end_time(self) -> dt.datetime:
+        """End time as an aware UTC datetime."""
+        return dt.datetime.fromtimestamp(self.end_time_ns / 1e9, tz=dt.timezone.utc)
+
+
+class SpanExporter(Protocol):
+    """Destination for batches of finished spans."""
+
+    def export(self, spans: Sequence[FinishedSpan]) -> None:
+        """Send a batch of spans; may block."""
+
+    def shutdown(self) -> None:
+        """Flush and release exporter resources."""
+
+
+class _RecordingSpan:
+    """In-memory span; only attributes and timestamps are touched on the request path."""
+
+    __slots__ = (
+        "span_id",
+        "parent_id",
+        "name",
+        "correlation_id",
+        "attributes",
+        "_thread_id",
+        "_start_ns",
+        "_start_perf",
+        "_end_perf",
+    )
 
-
-class _LangfuseSpanAdapter:
-    """Adapter that provides the SpanProtocol interface for Langfuse spans."""
-
-    def __init__(self, span: Any) -> None:
-        self._span = span
+    def __init__(
+        self,
+        *,
+        name: str,
+        correlation_id: str | None,
+        parent_id: str | None,
+        attributes: dict[str, Any] | None,
+    ) -> None:
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.correlation_id = correlation_id
+        self.attributes: dict[str, Any] = dict(attributes) if attributes else {}
+        self._thread_id = threading.get_ident()
+        self._start_ns = time.time_ns()
+        self._start_perf = perf_counter()
+        self._end_perf: float | None = None
 
     def set_attribute(self, key: str, value: Any) -> None:
-        otel_span = getattr(self._span, "_otel_span", None)
-        if otel_span is not None:
-            try:
-                otel_span.set_attribute(key, value)
-            except Exception:  # pragma: no cover - defensive
-                logger.exception("tracing_otlp_set_attribute_failed", key=key)
+        self.attributes[key] = value
 
     def end(self, **attributes: Any) -> None:
-        if attributes:
-            for key, value in attributes.items():
-                self.set_attribute(key, value)
+        self.attributes.update(attributes)
+        if self._end_perf is None:
+            self._end_perf = perf_counter()
+
+    def finish(self, error: str | None) -> FinishedSpan:
+        end_perf = self._end_perf if self._end_perf is not None else perf_counter()
+        duration_s = end_perf - self._start_perf
+        return FinishedSpan(
+            span_id=self.span_id,
+            parent_id=self.parent_id,
+            name=self.name,
+            correlation_id=self.correlation_id,
+            start_time_ns=self._start_ns,
+            end_time_ns=self._start_ns + int(duration_s * 1e9),
+            duration_ms=duration_s * 1000.0,
+            attributes=self.attributes,
+            error=error,
+            thread_id=self._thread_id,
+        )
+
+
+_CURRENT_SPAN: contextvars.ContextVar[_RecordingSpan | None] = contextvars.ContextVar(
+    "tracing_current_span",
+    default=None,
+)
+
+
+class BatchSpanProcessor:
+    """Bounded ring of finished spans drained by a background export thread.
+
+    ``submit`` never blocks: when the ring is full the oldest span is dropped
+    and counted. The worker exports whenever a full batch is available or the
+    export interval elapses.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        *,
+        max_queue_size: int = 2048,
+        export_batch_size: int = 64,
+        export_interval_seconds: float = 1.0,
+    ) -> None:
+        self._exporter = exporter
+        self._max_queue_size = max(1, max_queue_size)
+        self._batch_size = max(1, export_batch_size)
+        self._interval = max(0.001, export_interval_seconds)
+        self._queue: deque[FinishedSpan] = deque()
+        self._condition = threading.Condition()
+        self._exporting = False
+        self._flush_requested = False
+        self._shutdown = False
+        self.dropped = 0
+        self.exported = 0
+        self._dropped_counter = get_metrics().counter(
+            "tracing_spans_dropped_total",
+            "Finished spans discarded before export.",
+            ("reason",),
+        )
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, span: FinishedSpan) -> None:
+        """Queue a finished span for export."""
+        with self._condition:
+            if self._shutdown:
+                return
+            if len(self._queue) >= self._max_queue_size:
+                self._queue.popleft()
+                self._record_drop("queue_full", 1)
+            self._queue.append(span)
+            if len(self._queue) >= self._batch_size:
+                self._condition.notify_all()
+
+    def force_flush(self, timeout_seconds: float = 5.0) -> bool:
+        """Export everything queued so far.
+
+        Returns:
+            True when the queue drained within the timeout.
+        """
+        deadline = perf_counter() + timeout_seconds
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._queue or self._exporting:
+                remaining = deadline - perf_counter()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def shutdown(self, timeout_seconds: float = 5.0) -> None:
+        """Flush pending spans, stop the worker and shut the exporter down."""
+        with self._condition:
+            if self._shutdown:
+                return
+        self.force_flush(timeout_seconds)
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+        self._thread.join(timeout_seconds)
         try:
-            self._span.end()
+            self._exporter.shutdown()
         except Exception:  # pragma: no cover - defensive
-            logger.exception("tracing_otlp_span_end_failed")
+            logger.exception("tracing_exporter_shutdown_failed")
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._shutdown and len(self._queue) < self._batch_size and not self._flush_requested:
+                    self._condition.wait(self._interval)
+                if self._shutdown and not self._queue:
+                    return
+                batch = [self._queue.popleft() for _ in range(min(self._batch_size, len(self._queue)))]
+                if not self._queue:
+                    self._flush_requested = False
+                self._exporting = bool(batch)
+            if batch:
+                try:
+                    self._exporter.export(batch)
+                    self.exported += len(batch)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("tracing_export_failed", spans=len(batch), error=str(exc))
+                    with self._condition:
+                        self._record_drop("export_error", len(batch))
+                with self._condition:
+                    self._exporting = False
+                    self._condition.notify_all()
+
+    def _record_drop(self, reason: str, count: int) -> None:
+        self.dropped += count
+        self._dropped_counter.labels(reason=reason).inc(count)
+
+
+class LangfuseSpanExporter:
+    """Replay finished spans into a Langfuse client from the export thread.
+
+    Supports the v2 SDK (explicit ``trace``/``span`` calls with timestamps)
+    and the v3 OpenTelemetry-based SDK (``start_span``), where the original
+    start time and duration are carried in metadata because the SDK stamps
+    spans at creation.
+    """
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+        self._otlp = hasattr(client, "start_span")
+        self._trace_ids: dict[str, str] = {}
+
+    def export(self, spans: Sequence[FinishedSpan]) -> None:
+        for span in spans:
+            metadata = dict(span.attributes)
+            if span.error is not None:
+                metadata["error"] = span.error
+            if self._otlp:
+                self._export_otlp(span, metadata)
+            else:
+                self._export_legacy(span, metadata)
+
+    def shutdown(self) -> None:
+        flush = getattr(self._client, "flush", None)
+        if callable(flush):
+            flush()
+
+    def _export_legacy(self, span: FinishedSpan, metadata: dict[str, Any]) -> None:
+        trace_id = span.correlation_id or span.span_id
+        if span.parent_id is None:
+            self._client.trace(id=trace_id, name=span.name, timestamp=span.start_time, metadata=metadata)
+        self._client.span(
+            id=span.span_id,
+            trace_id=trace_id,
+            parent_observation_id=span.parent_id,
+            name=span.name,
+            start_time=span.start_time,
+            end_time=span.end_time,
+            metadata=metadata,
+            level="ERROR" if span.error is not None else "DEFAULT",
+            status_message=span.error,
+        )
+
+    def _export_otlp(self, span: FinishedSpan, metadata: dict[str, Any]) -> None:
+        metadata.update(
+            span_id=span.span_id,
+            parent_span_id=span.parent_id,
+            start_time=span.start_time.isoformat(),
+            duration_ms=span.duration_ms,
+        )
+        observation = self._client.start_span(
+            trace_context={"trace_id": self._trace_id(span)},
+            name=span.name,
+            metadata=metadata,
+        )
+        observation.end()
+
+    def _trace_id(self, span: FinishedSpan) -> str:
+        key = span.correlation_id or span.span_id
+        trace_id = self._trace_ids.get(key)
+        if trace_id is None:
+            trace_id = self._client.create_trace_id(seed=key)
+            if len(self._trace_ids) >= 4096:
+                self._trace_ids.clear()
+            self._trace_ids[key] = trace_id
+        return trace_id
 
 
 class Tracer:
-    """Wrapper around Langfuse with a safe no-op fallback."""
+    """Span recorder with background batched export and a safe no-op fallback.
+
+    Spans are plain in-memory objects while open. When they close they are
+    handed to a ``BatchSpanProcessor`` so all exporter I/O (Langfuse by
+    default) happens off the request thread.
+    """
 
-    def __init__(self, config: TracerConfig) -> None:
+    def __init__(self, config: TracerConfig, *, exporter: SpanExporter | None = None) -> None:
         self._config = config
         self._client: Any | None = None
+        self._processor: BatchSpanProcessor | None = None
         self.enabled = False
-        self._use_otlp_api = False
-        self._setup_client()
-
-    def _setup_client(self) -> None:
-        if not self._config.enabled:
+        if exporter is None and config.enabled:
+            exporter = self._setup_client()
+        elif not config.enabled:
             logger.info("tracing_disabled")
-            return
+        if exporter is not None:
+            self._processor = BatchSpanProcessor(
+                exporter,
+                max_queue_size=config.max_queue_size,
+                export_batch_size=config.export_batch_size,
+                export_interval_seconds=config.export_interval_seconds,
+            )
+            self.enabled = True
+            atexit.register(self.shutdown)
+
+    @property
+    def dropped_spans(self) -> int:
+        """Spans discarded because the buffer was full or export failed."""
+        return self._processor.dropped if self._processor is not None else 0
+
+    def _setup_client(self) -> SpanExporter | None:
         try:
             from langfuse import Langfuse  # type: ignore
         except Exception:  # pragma: no cover - optional dependency
             logger.warning("tracing_langfuse_import_failed")
-            return
+            return None
         host = self._config.host or "http://127.0.0.1:3000"
         public_key = self._config.public_key or os.getenv("LANGFUSE_PUBLIC_KEY")
         secret_key = self._config.secret_key or os.getenv("LANGFUSE_SECRET_KEY")
         if not public_key or not secret_key:
             logger.warning("tracing_langfuse_missing_keys")
-            return
+            return None
         try:
             self._client = Langfuse(
                 host=host,
                 public_key=public_key,
                 secret_key=secret_key,
             )
-            self.enabled = True
-            self._use_otlp_api = hasattr(self._client, "start_as_current_span")
-            logger.info("tracing_langfuse_enabled", host=host)
         except Exception:  # pragma: no cover - optional dependency
             logger.exception("tracing_langfuse_init_failed", host=host)
             self._client = None
-            self.enabled = False
+            return None
+        logger.info("tracing_langfuse_enabled", host=host, sample_ratio=self._config.sample_ratio)
+        return LangfuseSpanExporter(self._client)
 
     @contextlib.contextmanager
     def span(
@@ -152,79 +437,52 @@ class Tracer:
         correlation_id: str | None = None,
         attributes: dict[str, Any] | None = None,
     ) -> Iterator[SpanProtocol]:
-        if self._use_otlp_api and self._client is not None:
-            trace_id = self._generate_trace_id(correlation_id)
-            context: dict[str, str] | None = {"trace_id": trace_id} if trace_id else None
-            try:
-                span_cm = self._client.start_as_current_span(
-                    trace_context=context,
-                    name=name,
-                    metadata=attributes,
-                )
-                langfuse_span = span_cm.__enter__()
-                span: SpanProtocol = _LangfuseSpanAdapter(langfuse_span)
-            except Exception:  # pragma: no cover - defensive
-                logger.exception("tracing_otlp_span_start_failed", span_name=name)
-                span = _NoOpSpan(name=name, correlation_id=correlation_id)
-                span_cm = None
-
-            try:
-                yield span
-            except Exception as exc:
-                try:
-                    span.set_attribute("error", str(exc))
-                finally:
-                    if span_cm is not None:
-                        span_cm.__exit__(*sys.exc_info())
-                raise
-            else:
-                if span_cm is not None:
-                    span_cm.__exit__(None, None, None)
-            return
-
-        if not self.enabled or self._client is None:
-            span = _NoOpSpan(name=name, correlation_id=correlation_id)
-            if attributes:
-                for key, value in attributes.items():
-                    span.set_attribute(key, value)
-            yield span
-            span.end()
+        processor = self._processor
+        if processor is None or not self._is_sampled(correlation_id):
+            yield _NoOpSpan(name=name, correlation_id=correlation_id)
             return
-        try:
-            trace = self._client.trace(
-                id=correlation_id,
-                name=name,
-                timestamp=dt.datetime.utcnow(),
-                metadata=attributes or {},
-            )
-            span = trace.span(name=name, start_time=dt.datetime.utcnow())
-        except Exception:  # pragma: no cover - defensive
-            logger.exception("tracing_span_start_failed", span_name=name)
-            span = _NoOpSpan(name=name, correlation_id=correlation_id)
+        parent = _CURRENT_SPAN.get()
+        span = _RecordingSpan(
+            name=name,
+            correlation_id=correlation_id or (parent.correlation_id if parent else None),
+            parent_id=parent.span_id if parent else None,
+            attributes=attributes,
+        )
+        token = _CURRENT_SPAN.set(span)
+        error: str | None = None
         try:
             yield span
-        except Exception as exc:
-            try:
-                span.set_attribute("error", str(exc))
-            finally:
-                span.end()
+        except BaseException as exc:
+            error = str(exc) or type(exc).__name__
             raise
-        else:
-            span.end()
-
-    def _generate_trace_id(self, correlation_id: str | None) -> str:
-        if self._client is None:
-            return ""
-        if correlation_id:
-            try:
-                return self._client.create_trace_id(seed=correlation_id)
-            except Exception:  # pragma: no cover - defensive
-                logger.exception("tracing_otlp_trace_id_seed_failed", correlation_id=correlation_id)
-        try:
-            return self._client.create_trace_id()
-        except Exception:  # pragma: no cover - defensive
-            logger.exception("tracing_otlp_trace_id_failed")
-            return ""
+        finally:
+            _CURRENT_SPAN.reset(token)
+            processor.submit(span.finish(error))
+
+    def flush(self, timeout_seconds: float = 5.0) -> bool:
+        """Block until queued spans are exported."""
+        if self._processor is None:
+            return True
+        return self._processor.force_flush(timeout_seconds)
+
+    def shutdown(self, timeout_seconds: float = 5.0) -> None:
+        """Flush pending spans and stop the export worker."""
+        if self._processor is not None:
+            self._processor.shutdown(timeout_seconds)
+
+    def _is_sampled(self, correlation_id: str | None) -> bool:
+        ratio = self._config.sample_ratio
+        if ratio >= 1.0:
+            return True
+        if ratio <= 0.0:
+            return False
+        parent = _CURRENT_SPAN.get()
+        if parent is not None and (correlation_id is None or correlation_id == parent.correlation_id):
+            return True
+        if correlation_id is None:
+            return random.random() < ratio
+        digest = hashlib.blake2b(correlation_id.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big") / 2**64 < ratio
 
 
 def build_tracer(
@@ -233,12 +491,20 @@ def build_tracer(
     host: str | None,
     public_key: str | None,
     secret_key: str | None,
+    sample_ratio: float = 1.0,
+    max_queue_size: int = 2048,
+    export_batch_size: int = 64,
+    export_interval_seconds: float = 1.0,
 ) -> Tracer:
     config = TracerConfig(
         enabled=enabled,
         host=host,
         public_key=public_key,
         secret_key=secret_key,
+        sample_ratio=sample_ratio,
+        max_queue_size=max_queue_size,
+        export_batch_size=export_batch_size,
+        export_interval_seconds=export_interval_seconds,
     )
     return Tracer(config=config)
 
@@ -1,4 +1,5 @@
 import datetime as dt
+from dataclasses import replace
 
 import pytest
 
@@ -6,7 +7,7 @@ from src.agent.agent import ChatRequest, ChatResponse, RAGAgent
 from src.agent.llm_client import LLMResult
 from src.rag_pipeline.retrieval import RetrievedChunk, RetrieverProtocol
 from src.rag_pipeline.schemas import IngestionResult, IngestionStatistics
-from src.shared.config import Settings
+from src.shared.config import Settings, get_settings
 from src.tools.ingestion_skill.schemas import IngestionSkillRequest, IngestionSkillResponse
 
 
@@ -131,3 +132,62 @@ async def test_rag_agent_ingestion_tool(monkeypatch: pytest.MonkeyPatch) -> None
     response = await agent.ingest_documents(IngestionSkillRequest())
     assert isinstance(response, IngestionSkillResponse)
     assert "ingestion_skill" in agent.tools
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_warm_up_is_not_ready_while_the_retriever_falls_back(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A configured database whose retriever failed to build must not report ready."""
+    attempts: list[int] = []
+
+    def failing_client(**_kwargs: object) -> None:
+        attempts.append(1)
+        raise RuntimeError("embedding backend down")
+
+    monkeypatch.setattr("src.agent.agent.create_embedding_client", failing_client)
+    settings = replace(
+        get_settings(),
+        rag_database_url="postgresql://localhost:5432/example",
+        langfuse_enabled=False,
+    )
+    agent = RAGAgent(settings=settings, llm_client=FakeLLMClient())
+
+    report = await agent.warm_up()
+
+    assert report.ready is False
+    assert report.checks["retriever"] == "not_ready: embedding backend down"
+    # Start-up built once; warm-up retried the build.
+    assert len(attempts) == 2
+
+
+@pytest.mark.unit
+def test_close_releases_the_retriever() -> None:
+    class ClosableRetriever(FakeRetriever):
+        closed = False
+
+        def close(self) -> None:
+            self.closed = True
+
+    retriever = ClosableRetriever()
+    settings = replace(get_settings(), langfuse_enabled=False)
+    agent = RAGAgent(settings=settings, retriever=retriever, llm_client=FakeLLMClient())
+
+    agent.close()
+
+    assert retriever.closed
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_warm_up_reports_llm_errors_without_failing() -> None:
+    class BrokenGatewayLLM(FakeLLMClient):
+        def warm_up(self) -> bool:
+            raise RuntimeError("gateway exploded")
+
+    settings = replace(get_settings(), langfuse_enabled=False)
+    agent = RAGAgent(settings=settings, retriever=FakeRetriever(), llm_client=BrokenGatewayLLM())
+
+    report = await agent.warm_up()
+
+    assert report.ready is True
+    assert report.checks["llm"] == "error: gateway exploded"
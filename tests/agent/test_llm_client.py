@@ -1,6 +1,8 @@
 import pytest
 
 from src.agent.llm_client import LLMClient, LLMConfig, LLMResult
+from src.agent.query_expansion import LLMQueryExpander
+from src.shared.deadline import Deadline, DeadlineExceeded, deadline_scope
 
 
 class _FakeResponse:
@@ -63,3 +65,57 @@ def test_llm_client_uses_session_post() -> None:
     assert call["json"]["model"] == "demo"
     assert call["json"]["messages"][1]["content"].startswith("Answer the user query")
     assert call["headers"]["Authorization"] == "Bearer token"
+
+
+@pytest.mark.unit
+def test_llm_client_stops_retrying_at_request_deadline() -> None:
+    class _FailingSession(_FakeSession):
+        def post(self, url: str, json: dict[str, object], headers: dict[str, str], timeout: int) -> _FakeResponse:
+            self.calls.append({"timeout": timeout})
+            raise ConnectionError("endpoint down")
+
+    session = _FailingSession()
+    config = LLMConfig(model="demo", base_url="http://llm.local", api_key=None, max_retries=3, retry_backoff_seconds=5.0)
+    client = LLMClient(config=config, session=session)
+
+    with deadline_scope(Deadline.after(1.0)), pytest.raises(DeadlineExceeded) as excinfo:
+        client.generate_answer(system_prompt="sys", query="hi", context=[])
+
+    assert excinfo.value.stage == "generation"
+    assert len(session.calls) == 1
+    assert session.calls[0]["timeout"] <= 1.0
+
+
+@pytest.mark.unit
+def test_llm_client_falls_back_without_calling_endpoint_while_circuit_open() -> None:
+    class _FailingSession(_FakeSession):
+        def post(self, url: str, json: dict[str, object], headers: dict[str, str], timeout: int) -> _FakeResponse:
+            self.calls.append({"timeout": timeout})
+            raise ConnectionError("endpoint down")
+
+    session = _FailingSession()
+    config = LLMConfig(model="demo", base_url="http://llm.local", api_key=None, max_retries=0, circuit_failure_rate=0.5)
+    client = LLMClient(config=config, session=session)
+
+    results = [client.generate_answer(system_prompt="sys", query="hi", context=[]) for _ in range(8)]
+
+    assert all(result.fallback for result in results)
+    assert len(session.calls) == 5
+    assert "open" in results[-1].content
+
+
+@pytest.mark.unit
+def test_llm_query_expander_parses_listed_reformulations() -> None:
+    class _ListSession(_FakeSession):
+        def post(self, url: str, json: dict[str, object], headers: dict[str, str], timeout: int) -> _FakeResponse:
+            return _FakeResponse(
+                {"choices": [{"message": {"content": "1. vacation policy\n- Annual leave rules\n\nvacation policy"}}]},
+            )
+
+    client = LLMClient(config=LLMConfig(model="demo", base_url="http://llm", api_key=None), session=_ListSession())
+
+    assert LLMQueryExpander(client).expand("time off?", count=3) == ["vacation policy", "Annual leave rules"]
+    assert LLMQueryExpander(LLMClient(config=LLMConfig(model="demo", base_url="", api_key=None))).expand(
+        "time off?",
+        count=3,
+    ) == []
@@ -0,0 +1,78 @@
+"""Compare two benchmark result files and flag regressions.
+
+Usage::
+
+    python -m tests.benchmarks.compare baseline.json candidate.json --max-regression 0.10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Sequence
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    candidate: dict[str, Any],
+    *,
+    max_regression: float,
+) -> list[str]:
+    """Return human-readable regressions between two result payloads.
+
+    A level regresses when throughput drops, or p95 latency grows, by more
+    than ``max_regression`` (a fraction).
+
+    Args:
+        baseline: Result payload from the reference commit.
+        candidate: Result payload from the commit under test.
+        max_regression: Allowed relative change.
+
+    Returns:
+        List of regression descriptions (empty when within tolerance).
+    """
+    regressions: list[str] = []
+    for scenario, levels in candidate.get("scenarios", {}).items():
+        reference = {level["concurrency"]: level for level in baseline.get("scenarios", {}).get(scenario, [])}
+        for level in levels:
+            base = reference.get(level["concurrency"])
+            if base is None:
+                continue
+            label = f"{scenario}@{level['concurrency']}"
+            if base["throughput_rps"] > 0:
+                change = level["throughput_rps"] / base["throughput_rps"] - 1.0
+                if change < -max_regression:
+                    regressions.append(
+                        f"{label}: throughput {base['throughput_rps']:.1f} -> {level['throughput_rps']:.1f} rps",
+                    )
+            base_p95 = base["latency_ms"]["p95"]
+            if base_p95 > 0:
+                change = level["latency_ms"]["p95"] / base_p95 - 1.0
+                if change > max_regression:
+                    regressions.append(
+                        f"{label}: p95 {base_p95:.1f} -> {level['latency_ms']['p95']:.1f} ms",
+                    )
+    return regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """CLI entry point; exits non-zero when regressions are found."""
+    parser = argparse.ArgumentParser(description="Compare benchmark result JSON files.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--max-regression", type=float, default=0.10)
+    args = parser.parse_args(argv)
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    candidate = json.loads(args.candidate.read_text(encoding="utf-8"))
+    regressions = compare_results(baseline, candidate, max_regression=args.max_regression)
+    print(f"{baseline.get('commit', '?')[:12]} -> {candidate.get('commit', '?')[:12]}")
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print("No regressions beyond tolerance.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,154 @@
+"""Seeded synthetic corpus generator for ingestion benchmarks.
+
+Documents are written as Markdown, plain text or DOCX (a minimal OOXML
+package built with ``zipfile`` so no extra dependency is needed). Document
+length follows a lognormal distribution over word counts, which mirrors the
+long tail of real knowledge bases: many short notes, a few long manuals.
+"""
+
+from __future__ import annotations
+
+import random
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+_VOCABULARY = (
+    "policy employee request approval manager budget travel expense invoice contract vendor "
+    "onboarding laptop security access password review quarter report revenue customer support "
+    "incident escalation schedule holiday leave benefit insurance payroll compliance audit "
+    "training document process template deadline project milestone risk owner team meeting"
+).split()
+
+_ZIP_TIMESTAMP = (2024, 1, 1, 0, 0, 0)
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+
+_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+
+@dataclass(frozen=True, slots=True)
+class CorpusSpec:
+    """Shape of a synthetic corpus.
+
+    Attributes:
+        documents: Number of documents to generate.
+        format_weights: Relative frequency per extension (``md``, ``txt``, ``docx``).
+        median_words: Median document length in words.
+        sigma: Lognormal spread of document length.
+        max_words: Hard cap on document length.
+        seed: RNG seed; the same spec always yields the same corpus.
+    """
+
+    documents: int = 200
+    format_weights: dict[str, float] = field(default_factory=lambda: {"md": 0.6, "txt": 0.3, "docx": 0.1})
+    median_words: int = 600
+    sigma: float = 0.9
+    max_words: int = 20_000
+    seed: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class CorpusSummary:
+    """What was written to disk."""
+
+    documents: int
+    total_bytes: int
+    total_words: int
+    by_format: dict[str, int]
+
+
+def generate_corpus(directory: Path, spec: CorpusSpec) -> CorpusSummary:
+    """Write a synthetic corpus under ``directory``.
+
+    Args:
+        directory: Destination directory (created if missing).
+        spec: Corpus shape.
+
+    Returns:
+        CorpusSummary describing the generated files.
+    """
+    rng = random.Random(spec.seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    formats = list(spec.format_weights)
+    weights = [spec.format_weights[name] for name in formats]
+    by_format = dict.fromkeys(formats, 0)
+    total_bytes = 0
+    total_words = 0
+    for index in range(spec.documents):
+        extension = rng.choices(formats, weights=weights)[0]
+        words = min(spec.max_words, max(20, int(rng.lognormvariate(0.0, spec.sigma) * spec.median_words)))
+        sections = _sections(rng, words)
+        path = directory / f"doc-{index:05d}.{extension}"
+        if extension == "md":
+            _write_markdown(path, index, sections)
+        elif extension == "txt":
+            path.write_text("\n\n".join(body for _heading, body in sections), encoding="utf-8")
+        elif extension == "docx":
+            _write_docx(path, sections)
+        else:
+            raise ValueError(f"Unsupported synthetic format: {extension}")
+        by_format[extension] += 1
+        total_bytes += path.stat().st_size
+        total_words += words
+    return CorpusSummary(
+        documents=spec.documents,
+        total_bytes=total_bytes,
+        total_words=total_words,
+        by_format=by_format,
+    )
+
+
+def _sections(rng: random.Random, words: int) -> list[tuple[str, str]]:
+    sections: list[tuple[str, str]] = []
+    remaining = words
+    while remaining > 0:
+        size = min(remaining, rng.randint(80, 400))
+        remaining -= size
+        heading = " ".join(rng.choice(_VOCABULARY) for _ in range(3)).title()
+        paragraphs: list[str] = []
+        while size > 0:
+            length = min(size, rng.randint(30, 120))
+            size -= length
+            sentence_words = [rng.choice(_VOCABULARY) for _ in range(length)]
+            paragraphs.append(" ".join(sentence_words).capitalize() + ".")
+        sections.append((heading, "\n\n".join(paragraphs)))
+    return sections
+
+
+def _write_markdown(path: Path, index: int, sections: list[tuple[str, str]]) -> None:
+    lines = [f"# Synthetic document {index}", ""]
+    for heading, body in sections:
+        lines.extend([f"## {heading}", "", body, ""])
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+
+def _write_docx(path: Path, sections: list[tuple[str, str]]) -> None:
+    paragraphs: list[str] = []
+    for heading, body in sections:
+        paragraphs.append(
+            f'<w:p><w:pPr><w:pStyle w:val="Heading2"/></w:pPr><w:r><w:t>{escape(heading)}</w:t></w:r></w:p>',
+        )
+        for paragraph in body.split("\n\n"):
+            paragraphs.append(f"<w:p><w:r><w:t>{escape(paragraph)}</w:t></w:r></w:p>")
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{''.join(paragraphs)}</w:body></w:document>"
+    )
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in (
+            ("[Content_Types].xml", _CONTENT_TYPES),
+            ("_rels/.rels", _RELS),
+            ("word/document.xml", document),
+        ):
+            archive.writestr(zipfile.ZipInfo(name, date_time=_ZIP_TIMESTAMP), content, zipfile.ZIP_DEFLATED)
@@ -0,0 +1,205 @@
+"""Local stand-ins for the LLM, embedding endpoint and vector store.
+
+The fake endpoints speak the same HTTP shapes as the real services (OpenAI
+chat completions and the Qwen/DashScope embedding API), so ``LLMClient`` and
+``QwenEmbeddingClient`` are exercised unmodified, while response latency is
+drawn from a configurable, seeded distribution.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class LatencyModel:
+    """Latency distribution in milliseconds.
+
+    Attributes:
+        kind: ``fixed``, ``uniform`` or ``lognormal``.
+        mean_ms: Fixed value, uniform midpoint or lognormal median.
+        spread: Uniform half-width in ms, or lognormal sigma.
+    """
+
+    kind: str = "lognormal"
+    mean_ms: float = 20.0
+    spread: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency in seconds."""
+        if self.kind == "fixed":
+            value = self.mean_ms
+        elif self.kind == "uniform":
+            value = rng.uniform(self.mean_ms - self.spread, self.mean_ms + self.spread)
+        elif self.kind == "lognormal":
+            value = self.mean_ms * rng.lognormvariate(0.0, self.spread)
+        else:
+            raise ValueError(f"Unknown latency distribution: {self.kind}")
+        return max(0.0, value) / 1000.0
+
+    @classmethod
+    def parse(cls, raw: str | None, default: "LatencyModel") -> "LatencyModel":
+        """Parse ``kind:mean_ms[:spread]`` (e.g. ``lognormal:40:0.6``)."""
+        if not raw:
+            return default
+        parts = raw.split(":")
+        return cls(
+            kind=parts[0],
+            mean_ms=float(parts[1]) if len(parts) > 1 else default.mean_ms,
+            spread=float(parts[2]) if len(parts) > 2 else default.spread,
+        )
+
+    def describe(self) -> dict[str, Any]:
+        """Return a JSON-friendly description."""
+        return asdict(self)
+
+
+def deterministic_vector(text: str, dimensions: int) -> np.ndarray:
+    """Return a unit vector derived from the text hash."""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+    vector = np.random.default_rng(seed).standard_normal(dimensions).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class FakeServiceServer:
+    """Threaded HTTP server emulating the embedding and LLM endpoints."""
+
+    def __init__(
+        self,
+        *,
+        embedding_latency: LatencyModel,
+        llm_latency: LatencyModel,
+        dimensions: int,
+        seed: int = 0,
+    ) -> None:
+        self.embedding_latency = embedding_latency
+        self.llm_latency = llm_latency
+        self.dimensions = dimensions
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.request_counts: dict[str, int] = {"embedding": 0, "llm": 0}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """Return the server's base URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def embedding_url(self) -> str:
+        """Return the embedding endpoint URL."""
+        return f"{self.base_url}/embeddings"
+
+    def start(self) -> "FakeServiceServer":
+        """Start serving in a background thread."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _sleep(self, model: LatencyModel) -> None:
+        with self._rng_lock:
+            delay = model.sample(self._rng)
+        time.sleep(delay)
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+                return None
+
+            def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+                length = int(self.headers.get("Content-Length", "0"))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if self.path.endswith("/v1/chat/completions"):
+                    service.request_counts["llm"] += 1
+                    service._sleep(service.llm_latency)
+                    payload = _chat_completion(body)
+                elif self.path.endswith("/embeddings"):
+                    service.request_counts["embedding"] += 1
+                    service._sleep(service.embedding_latency)
+                    payload = _embedding_payload(body.get("input", []), service.dimensions)
+                else:
+                    self.send_error(404)
+                    return
+                encoded = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+        return Handler
+
+
+class SeededVectorStore:
+    """In-memory ``RetrievalStoreProtocol`` backed by a NumPy matrix."""
+
+    def __init__(self, *, chunk_count: int, dimensions: int, seed: int = 0) -> None:
+        rng = np.random.default_rng(seed)
+        matrix = rng.standard_normal((chunk_count, dimensions)).astype(np.float32)
+        self._matrix = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+        self._rows = [
+            {
+                "chunk_id": f"chunk-{index}",
+                "source_id": f"source-{index // 10}",
+                "document_name": f"doc-{index // 10}.md",
+                "content": f"Synthetic chunk {index} " + "lorem ipsum " * 40,
+                "metadata": {"chunk_index": index % 10},
+            }
+            for index in range(chunk_count)
+        ]
+
+    def match_chunks(
+        self,
+        *,
+        query_embedding: Sequence[float],
+        match_count: int,
+        min_score: float,
+    ) -> list[Mapping[str, Any]]:
+        scores = self._matrix @ np.asarray(query_embedding, dtype=np.float32)
+        count = min(match_count, len(self._rows))
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {**self._rows[index], "score": float(scores[index])}
+            for index in top
+            if scores[index] >= min_score
+        ]
+
+
+def _chat_completion(body: Mapping[str, Any]) -> dict[str, Any]:
+    messages = body.get("messages") or [{}]
+    prompt = str(messages[-1].get("content", ""))
+    return {
+        "choices": [
+            {"message": {"role": "assistant", "content": f"Benchmark answer ({len(prompt)} prompt chars)."}},
+        ],
+    }
+
+
+def _embedding_payload(texts: Sequence[str], dimensions: int) -> dict[str, Any]:
+    return {
+        "data": [
+            {"index": index, "embedding": deterministic_vector(text, dimensions).tolist()}
+            for index, text in enumerate(texts)
+        ],
+    }
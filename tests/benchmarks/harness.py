@@ -0,0 +1,196 @@
+"""Closed-loop load generator and result recording for benchmarks."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import platform
+import subprocess
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+
+import numpy as np
+
+RequestFactory = Callable[[int], Awaitable[Any]]
+
+
+@dataclass(frozen=True, slots=True)
+class LoadLevelResult:
+    """Measurements for one concurrency level."""
+
+    concurrency: int
+    requests: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    latency_ms: dict[str, float]
+    loop_lag_ms: dict[str, float]
+
+
+class EventLoopLagMonitor:
+    """Measure how late the event loop wakes a periodic timer."""
+
+    def __init__(self, interval_s: float = 0.005) -> None:
+        self._interval_s = interval_s
+        self._samples: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> "EventLoopLagMonitor":
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    async def __aexit__(self, *_exc: object) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def summary(self) -> dict[str, float]:
+        """Return lag percentiles in milliseconds."""
+        return _summarise(self._samples, keys=("p50", "p99", "max"))
+
+    async def _run(self) -> None:
+        while True:
+            start = perf_counter()
+            await asyncio.sleep(self._interval_s)
+            self._samples.append(max(0.0, perf_counter() - start - self._interval_s) * 1000.0)
+
+
+async def run_load_level(
+    make_request: RequestFactory,
+    *,
+    concurrency: int,
+    total_requests: int,
+) -> LoadLevelResult:
+    """Issue ``total_requests`` with ``concurrency`` closed-loop workers.
+
+    Args:
+        make_request: Coroutine factory receiving the request index.
+        concurrency: Number of concurrent workers.
+        total_requests: Requests issued across all workers.
+
+    Returns:
+        LoadLevelResult with throughput, latency and loop-lag figures.
+    """
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(total_requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in counter:
+            start = perf_counter()
+            try:
+                await make_request(index)
+            except Exception:  # noqa: BLE001 - counted, not raised
+                errors += 1
+                continue
+            latencies.append((perf_counter() - start) * 1000.0)
+
+    async with EventLoopLagMonitor() as monitor:
+        started = perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        duration = perf_counter() - started
+    return LoadLevelResult(
+        concurrency=concurrency,
+        requests=total_requests,
+        errors=errors,
+        duration_s=duration,
+        throughput_rps=len(latencies) / duration if duration > 0 else 0.0,
+        latency_ms=_summarise(latencies, keys=("p50", "p95", "p99", "mean", "max")),
+        loop_lag_ms=monitor.summary(),
+    )
+
+
+def parse_levels(raw: str | None, default: tuple[int, ...]) -> tuple[int, ...]:
+    """Parse a comma-separated list of concurrency levels."""
+    if not raw:
+        return default
+    return tuple(int(part) for part in raw.split(",") if part.strip())
+
+
+def write_results(
+    *,
+    name: str,
+    scenarios: dict[str, list[LoadLevelResult]],
+    config: dict[str, Any],
+    output_dir: Path,
+) -> Path:
+    """Write benchmark results as JSON keyed by commit for later comparison.
+
+    Args:
+        name: Benchmark name used in the file name.
+        scenarios: Results per scenario, ordered by concurrency.
+        config: Benchmark settings recorded alongside the results.
+        output_dir: Destination directory.
+
+    Returns:
+        Path of the written file.
+    """
+    return write_payload(
+        name=name,
+        payload={
+            "config": config,
+            "scenarios": {key: [asdict(level) for level in levels] for key, levels in scenarios.items()},
+        },
+        output_dir=output_dir,
+    )
+
+
+def write_payload(*, name: str, payload: dict[str, Any], output_dir: Path) -> Path:
+    """Write a benchmark payload with commit and host metadata.
+
+    Args:
+        name: Benchmark name used in the file name.
+        payload: Benchmark-specific results.
+        output_dir: Destination directory.
+
+    Returns:
+        Path of the written file.
+    """
+    commit = _git_commit()
+    document = {
+        "benchmark": name,
+        "commit": commit,
+        "created_at": datetime.now(tz=timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        **payload,
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"{name}-{commit[:12]}.json"
+    path.write_text(json.dumps(document, indent=2, sort_keys=True), encoding="utf-8")
+    return path
+
+
+def _summarise(samples: list[float], *, keys: tuple[str, ...]) -> dict[str, float]:
+    if not samples:
+        return dict.fromkeys(keys, 0.0)
+    values = np.asarray(samples, dtype=np.float64)
+    summary: dict[str, float] = {}
+    for key in keys:
+        if key == "mean":
+            summary[key] = float(values.mean())
+        elif key == "max":
+            summary[key] = float(values.max())
+        else:
+            summary[key] = float(np.percentile(values, float(key[1:])))
+    return summary
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
@@ -0,0 +1,230 @@
+"""Ingestion throughput benchmark runner.
+
+Runs ``run_ingestion_job`` over a synthetic corpus with ``InMemoryStore`` and
+a deterministic embedding client so results isolate discovery, chunking and
+record building from network and database variance::
+
+    python -m tests.benchmarks.ingestion --documents 500 --median-words 800 --output-dir benchmark-results
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Sequence
+
+import numpy as np
+
+from src.rag_pipeline.chunking.docling_chunker import DoclingChunker
+from src.rag_pipeline.config import RagIngestionConfig, get_rag_ingestion_config
+from src.rag_pipeline.embeddings.client_types import EmbeddingModelInfo, EmbeddingResponse
+from src.rag_pipeline.persistence import InMemoryStore
+from src.rag_pipeline.pipeline import PipelineServices, run_ingestion_job
+from src.rag_pipeline.schemas import ChunkData, EmbeddingRecord, IngestionRequest, SourceIngestionStatus
+from src.shared.logging import StructuredLogger
+from tests.benchmarks.corpus import CorpusSpec, CorpusSummary, generate_corpus
+from tests.benchmarks.fakes import deterministic_vector
+from tests.benchmarks.harness import write_payload
+
+
+class DeterministicEmbeddingClient:
+    """Hash-seeded embedding client with optional simulated batch latency."""
+
+    def __init__(self, *, dimensions: int = 1024, batch_latency_ms: float = 0.0) -> None:
+        self.model_info = EmbeddingModelInfo(model="bench-deterministic", dataset_fingerprint=None, artifact_version=None)
+        self._dimensions = dimensions
+        self._batch_latency_s = batch_latency_ms / 1000.0
+
+    def embed_texts(self, texts: Sequence[str], *, correlation_id: str | None = None) -> EmbeddingResponse:
+        if self._batch_latency_s:
+            time.sleep(self._batch_latency_s)
+        embeddings = [
+            EmbeddingRecord(vector=deterministic_vector(text, self._dimensions), model=self.model_info.model, dimensions=self._dimensions)
+            for text in texts
+        ]
+        return EmbeddingResponse(embeddings=embeddings, metrics=[])
+
+    def embed_document_chunks(self, chunks: Sequence[ChunkData], *, correlation_id: str | None = None) -> list[EmbeddingRecord]:
+        return self.embed_texts([chunk.text for chunk in chunks]).embeddings
+
+    def close(self) -> None:
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class IngestionBenchmarkResult:
+    """Throughput, stage breakdown and memory for one ingestion run."""
+
+    documents: int
+    documents_failed: int
+    chunks: int
+    wall_time_s: float
+    docs_per_second: float
+    chunks_per_second: float
+    stage_ms: dict[str, float]
+    stage_share: dict[str, float]
+    document_ms: dict[str, float]
+    peak_rss_mb: float
+    corpus: dict[str, Any]
+
+
+class PeakRssSampler:
+    """Sample resident set size in a background thread."""
+
+    def __init__(self, interval_s: float = 0.02) -> None:
+        self._interval_s = interval_s
+        self._peak_bytes = _current_rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> "PeakRssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._peak_bytes = max(self._peak_bytes, _current_rss_bytes())
+
+    @property
+    def peak_mb(self) -> float:
+        """Return the highest RSS observed, in MiB."""
+        return self._peak_bytes / (1024 * 1024)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval_s):
+            self._peak_bytes = max(self._peak_bytes, _current_rss_bytes())
+
+
+def run_ingestion_benchmark(
+    corpus_dir: Path,
+    *,
+    corpus: CorpusSummary,
+    config: RagIngestionConfig | None = None,
+    dimensions: int = 1024,
+    batch_latency_ms: float = 0.0,
+) -> IngestionBenchmarkResult:
+    """Ingest ``corpus_dir`` and measure throughput.
+
+    Args:
+        corpus_dir: Directory produced by ``generate_corpus``.
+        corpus: Summary of the generated corpus (recorded in the result).
+        config: Base ingestion config; source directories are overridden.
+        dimensions: Fake embedding dimension.
+        batch_latency_ms: Simulated latency per embedding call.
+
+    Returns:
+        IngestionBenchmarkResult for the run.
+    """
+    base = config or get_rag_ingestion_config()
+    run_config = replace(base, source_directories=[corpus_dir], force_reingest=True, embedding_dimension=dimensions)
+    quiet = logging.getLogger("benchmarks.ingestion")
+    quiet.setLevel(logging.WARNING)
+    services = PipelineServices(
+        chunker=DoclingChunker(
+            chunk_min_chars=run_config.chunk_min_chars,
+            chunk_max_chars=run_config.chunk_max_chars,
+            docling_target_tokens=run_config.docling_chunk_target_tokens,
+            chunk_max_tokens=run_config.chunk_max_tokens,
+        ),
+        embedding_client=DeterministicEmbeddingClient(dimensions=dimensions, batch_latency_ms=batch_latency_ms),
+        persistence=InMemoryStore(),
+        logger=StructuredLogger(quiet),
+    )
+    with PeakRssSampler() as sampler:
+        start = perf_counter()
+        result = run_ingestion_job(request=IngestionRequest(), config=run_config, services=services)
+        wall_time = perf_counter() - start
+    ingested = [doc for doc in result.documents if doc.status == SourceIngestionStatus.INGESTED]
+    stage_ms = {
+        "chunk": sum(doc.chunk_duration_ms or 0.0 for doc in result.documents),
+        "embedding": sum(doc.embedding_duration_ms or 0.0 for doc in result.documents),
+        "db": sum(doc.db_duration_ms or 0.0 for doc in result.documents),
+    }
+    wall_ms = wall_time * 1000.0
+    stage_ms["other"] = max(0.0, wall_ms - sum(stage_ms.values()))
+    durations = np.asarray([doc.duration_ms or 0.0 for doc in result.documents] or [0.0], dtype=np.float64)
+    return IngestionBenchmarkResult(
+        documents=len(ingested),
+        documents_failed=result.stats.documents_failed,
+        chunks=result.stats.chunks_created,
+        wall_time_s=wall_time,
+        docs_per_second=len(ingested) / wall_time if wall_time > 0 else 0.0,
+        chunks_per_second=result.stats.chunks_created / wall_time if wall_time > 0 else 0.0,
+        stage_ms=stage_ms,
+        stage_share={stage: value / wall_ms if wall_ms else 0.0 for stage, value in stage_ms.items()},
+        document_ms={
+            "p50": float(np.percentile(durations, 50)),
+            "p95": float(np.percentile(durations, 95)),
+            "max": float(durations.max()),
+        },
+        peak_rss_mb=sampler.peak_mb,
+        corpus=asdict(corpus),
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Synthetic ingestion throughput benchmark.")
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--median-words", type=int, default=600)
+    parser.add_argument("--sigma", type=float, default=0.9)
+    parser.add_argument("--formats", default="md=0.6,txt=0.3,docx=0.1", help="extension=weight pairs.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dimensions", type=int, default=1024)
+    parser.add_argument("--embedding-latency-ms", type=float, default=0.0)
+    parser.add_argument("--corpus-dir", type=Path, help="Reuse/keep the corpus here instead of a temp dir.")
+    parser.add_argument("--output-dir", type=Path, default=Path("benchmark-results"))
+    args = parser.parse_args(argv)
+    spec = CorpusSpec(
+        documents=args.documents,
+        format_weights={
+            name: float(weight)
+            for name, weight in (pair.split("=") for pair in args.formats.split(",") if pair)
+        },
+        median_words=args.median_words,
+        sigma=args.sigma,
+        seed=args.seed,
+    )
+    with tempfile.TemporaryDirectory() as scratch:
+        corpus_dir = args.corpus_dir or Path(scratch)
+        summary = generate_corpus(corpus_dir, spec)
+        result = run_ingestion_benchmark(
+            corpus_dir,
+            corpus=summary,
+            dimensions=args.dimensions,
+            batch_latency_ms=args.embedding_latency_ms,
+        )
+    path = write_payload(
+        name="ingestion",
+        payload={"spec": asdict(spec), "result": asdict(result)},
+        output_dir=args.output_dir,
+    )
+    print(
+        f"{result.documents} docs, {result.chunks} chunks in {result.wall_time_s:.2f}s "
+        f"({result.docs_per_second:.1f} docs/s, {result.chunks_per_second:.1f} chunks/s, "
+        f"peak RSS {result.peak_rss_mb:.0f} MiB) -> {path}",
+    )
+    return 0
+
+
+def _current_rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
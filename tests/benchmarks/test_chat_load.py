@@ -0,0 +1,143 @@
+"""Load benchmark for ``RAGAgent.chat`` and the ``/chat`` endpoint.
+
+Skipped unless ``RUN_PERFORMANCE=1``. Tunables (environment variables):
+
+- ``BENCH_CONCURRENCY``: comma-separated levels (default ``1,4,16,64``)
+- ``BENCH_REQUESTS_PER_LEVEL``: requests per level (default ``4 x level``, min 32)
+- ``BENCH_EMBEDDING_LATENCY`` / ``BENCH_LLM_LATENCY``: ``kind:mean_ms[:spread]``
+- ``BENCH_CHUNKS``: seeded corpus size (default 20000)
+- ``BENCH_OUTPUT_DIR``: where JSON results are written (default ``benchmark-results``)
+
+Compare two runs with ``python -m tests.benchmarks.compare old.json new.json``.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import replace
+from pathlib import Path
+from typing import Iterator
+
+import httpx
+import pytest
+
+from src.agent.agent import ChatRequest, RAGAgent
+from src.agent.llm_client import LLMClient, LLMConfig
+from src.rag_pipeline.embeddings.qwen_client import QwenEmbeddingClient
+from src.rag_pipeline.retrieval import DatabaseRetriever
+from src.shared.config import get_settings
+from src.shared.tracing import noop_tracer
+from tests.benchmarks.fakes import FakeServiceServer, LatencyModel, SeededVectorStore
+from tests.benchmarks.harness import LoadLevelResult, parse_levels, run_load_level, write_results
+
+DIMENSIONS = 1024
+QUERIES = [
+    "How do I request parental leave?",
+    "What is the travel reimbursement policy?",
+    "Who approves hardware purchases?",
+    "Where are the onboarding documents stored?",
+    "How is on-call compensation calculated?",
+]
+
+pytestmark = [
+    pytest.mark.performance,
+    pytest.mark.skipif(
+        os.getenv("RUN_PERFORMANCE") != "1",
+        reason="Set RUN_PERFORMANCE=1 to enable load benchmarks.",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def fake_services() -> Iterator[FakeServiceServer]:
+    server = FakeServiceServer(
+        embedding_latency=LatencyModel.parse(os.getenv("BENCH_EMBEDDING_LATENCY"), LatencyModel(mean_ms=15.0)),
+        llm_latency=LatencyModel.parse(os.getenv("BENCH_LLM_LATENCY"), LatencyModel(mean_ms=250.0)),
+        dimensions=DIMENSIONS,
+    ).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="module")
+def agent(fake_services: FakeServiceServer) -> RAGAgent:
+    settings = replace(
+        get_settings(),
+        llm_base_url=fake_services.base_url,
+        langfuse_enabled=False,
+        chat_coalescing_enabled=False,
+    )
+    logger = _quiet_logger()
+    embedding_client = QwenEmbeddingClient(
+        model="bench-embedding",
+        api_key="bench",
+        base_url=fake_services.embedding_url,
+        expected_dimensions=DIMENSIONS,
+    )
+    retriever = DatabaseRetriever(
+        embedding_client=embedding_client,
+        store=SeededVectorStore(chunk_count=int(os.getenv("BENCH_CHUNKS", "20000")), dimensions=DIMENSIONS),
+        logger=logger,
+    )
+    llm_client = LLMClient(
+        LLMConfig(model="bench-llm", base_url=fake_services.base_url, api_key=None),
+        logger=logger,
+    )
+    return RAGAgent(
+        settings=settings,
+        retriever=retriever,
+        llm_client=llm_client,
+        logger=logger,
+        tracer=noop_tracer(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_chat_load_benchmark(agent: RAGAgent, fake_services: FakeServiceServer) -> None:
+    import src.main as app_module
+
+    app_module._agent = agent
+    levels = parse_levels(os.getenv("BENCH_CONCURRENCY"), (1, 4, 16, 64))
+    scenarios: dict[str, list[LoadLevelResult]] = {"agent_chat": [], "http_chat": []}
+    transport = httpx.ASGITransport(app=app_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for concurrency in levels:
+            total = int(os.getenv("BENCH_REQUESTS_PER_LEVEL", str(max(32, concurrency * 4))))
+
+            async def agent_request(index: int) -> None:
+                await agent.chat(ChatRequest(query=QUERIES[index % len(QUERIES)]))
+
+            async def http_request(index: int) -> None:
+                response = await client.post("/chat", json={"query": QUERIES[index % len(QUERIES)]})
+                response.raise_for_status()
+
+            scenarios["agent_chat"].append(
+                await run_load_level(agent_request, concurrency=concurrency, total_requests=total),
+            )
+            scenarios["http_chat"].append(
+                await run_load_level(http_request, concurrency=concurrency, total_requests=total),
+            )
+    path = write_results(
+        name="chat",
+        scenarios=scenarios,
+        config={
+            "levels": list(levels),
+            "embedding_latency": fake_services.embedding_latency.describe(),
+            "llm_latency": fake_services.llm_latency.describe(),
+            "dimensions": DIMENSIONS,
+        },
+        output_dir=Path(os.getenv("BENCH_OUTPUT_DIR", "benchmark-results")),
+    )
+    assert path.exists()
+    for levels_result in scenarios.values():
+        assert all(level.errors == 0 for level in levels_result)
+
+
+def _quiet_logger():
+    import logging
+
+    from src.shared.logging import StructuredLogger
+
+    base = logging.getLogger("benchmarks")
+    base.setLevel(logging.WARNING)
+    return StructuredLogger(base)
@@ -1,25 +1,14 @@
 from __future__ import annotations
 
 import os
-import time
-from dataclasses import replace
+from dataclasses import asdict
 from pathlib import Path
-from typing import TYPE_CHECKING, Sequence
 
 import pytest
 
-from src.rag_pipeline.config import RagIngestionConfig, get_rag_ingestion_config
-from src.rag_pipeline.persistence import InMemoryStore
-from src.rag_pipeline.pipeline import PipelineServices, run_ingestion_job
-from src.rag_pipeline.schemas import ChunkData, EmbeddingRecord, IngestionRequest
-
-
-class FastEmbeddingClient:
-    def embed_document_chunks(self, chunks: Sequence[ChunkData]) -> list[EmbeddingRecord]:
-        return [EmbeddingRecord(vector=(0.0, 1.0), model="fast", dimensions=2) for _ in chunks]
-
-    def close(self) -> None:
-        """No-op."""
+from tests.benchmarks.corpus import CorpusSpec, generate_corpus
+from tests.benchmarks.harness import write_payload
+from tests.benchmarks.ingestion import run_ingestion_benchmark
 
 
 @pytest.mark.performance
@@ -28,30 +17,35 @@ class FastEmbeddingClient:
     reason="Set RUN_PERFORMANCE=1 to enable throughput benchmark.",
 )
 def test_ingestion_performance_baseline(tmp_path: Path) -> None:
-    """Simple benchmark that ingests synthetic files and records duration."""
-    for index in range(10):
-        (tmp_path / f"doc{index}.txt").write_text("performance", encoding="utf-8")
-    config = replace(get_rag_ingestion_config(), source_directories=[tmp_path])
-    services = PipelineServices(
-        chunker=_chunker(config),
-        embedding_client=FastEmbeddingClient(),
-        persistence=InMemoryStore(),
-        clock=time.time,
+    """Ingest a seeded synthetic corpus and record throughput and stage timings."""
+    spec = CorpusSpec(documents=int(os.getenv("BENCH_DOCUMENTS", "100")), seed=0)
+    corpus_dir = tmp_path / "corpus"
+    summary = generate_corpus(corpus_dir, spec)
+
+    result = run_ingestion_benchmark(corpus_dir, corpus=summary)
+
+    path = write_payload(
+        name="ingestion",
+        payload={"spec": asdict(spec), "result": asdict(result)},
+        output_dir=Path(os.getenv("BENCH_OUTPUT_DIR", str(tmp_path / "results"))),
     )
-    start = time.perf_counter()
-    result = run_ingestion_job(request=IngestionRequest(), config=config, services=services)
-    duration = time.perf_counter() - start
-    assert result.stats.documents_discovered == 10
-    assert duration >= 0.0, f"unexpected negative duration {duration}"
+    print(f"ingestion benchmark written to {path}")
+    assert result.documents == spec.documents
+    assert result.documents_failed == 0
+    assert result.chunks >= result.documents
+    assert result.docs_per_second > 0.0
+    assert result.stage_ms["chunk"] > 0.0
 
 
-def _chunker(config: RagIngestionConfig) -> "DoclingChunker":
-    from src.rag_pipeline.chunking.docling_chunker import DoclingChunker
+@pytest.mark.unit
+def test_generate_corpus_is_deterministic(tmp_path: Path) -> None:
+    spec = CorpusSpec(documents=6, format_weights={"md": 1.0, "txt": 1.0, "docx": 1.0}, median_words=50, seed=3)
+
+    first = generate_corpus(tmp_path / "a", spec)
+    second = generate_corpus(tmp_path / "b", spec)
+
+    assert first == second
+    assert sum(first.by_format.values()) == 6
+    for path in (tmp_path / "a").iterdir():
+        assert path.read_bytes() == (tmp_path / "b" / path.name).read_bytes()
 
-    return DoclingChunker(
-        chunk_min_chars=config.chunk_min_chars,
-        chunk_max_chars=config.chunk_max_chars,
-        docling_target_tokens=config.docling_chunk_target_tokens,
-    )
-if TYPE_CHECKING:
-    from src.rag_pipeline.chunking.docling_chunker import DoclingChunker
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pytest
+
+from src.rag_pipeline.embeddings.batching import plan_batches
+
+
+def _word_counter(texts) -> list[int]:
+    return [len(text.split()) for text in texts]
+
+
+@pytest.mark.unit
+def test_plan_batches_respects_item_cap_and_token_budget() -> None:
+    texts = ["a b c d", "e f", "g", "h i j k l m", "n"]
+    batches = plan_batches(texts, max_items=3, max_tokens=6, token_counter=_word_counter)
+    assert [batch.indices for batch in batches] == [(0, 1), (2,), (3,), (4,)]
+    assert all(batch.token_total <= 6 for batch in batches)
+    assert sorted(index for batch in batches for index in batch.indices) == list(range(len(texts)))
+
+
+@pytest.mark.unit
+def test_plan_batches_sorts_by_length_and_reports_padding() -> None:
+    texts = ["one two three four", "x", "five six seven eight", "y"]
+    unsorted = plan_batches(texts, max_items=2, token_counter=_word_counter)
+    sorted_batches = plan_batches(texts, max_items=2, token_counter=_word_counter, sort_by_length=True)
+    assert [batch.indices for batch in sorted_batches] == [(1, 3), (0, 2)]
+    assert all(batch.padding_efficiency == 1.0 for batch in sorted_batches)
+    assert unsorted[0].padding_efficiency < 1.0
+
+
+@pytest.mark.unit
+def test_plan_batches_isolates_oversized_text() -> None:
+    batches = plan_batches(["a", "b c d e f g h", "i"], max_items=8, max_tokens=4, token_counter=_word_counter)
+    assert [batch.indices for batch in batches] == [(0,), (1,), (2,)]
+
+
+@pytest.mark.unit
+def test_plan_batches_validates_arguments() -> None:
+    with pytest.raises(ValueError):
+        plan_batches(["a"], max_items=0)
+    assert plan_batches([], max_items=1) == []
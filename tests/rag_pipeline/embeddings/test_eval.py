@@ -85,3 +85,48 @@ def test_run_evaluation_validates_top_k(tmp_path: Path) -> None:
                 top_k=0,
             ),
         )
+
+
+def test_run_evaluation_blocked_metrics_match_reference(tmp_path: Path) -> None:
+    import numpy as np
+
+    rng = np.random.default_rng(7)
+    count = 37
+    pairs = [
+        QueryDocumentPair(query=f"q{index}", document=f"d{index}", source="s", document_id=str(index))
+        for index in range(count)
+    ]
+    validation_path = tmp_path / "valid.jsonl"
+    write_jsonl(pairs, validation_path)
+    documents = rng.normal(size=(count, 8))
+    queries = documents + rng.normal(scale=1.5, size=(count, 8))
+    mapping = {f"d{index}": documents[index].tolist() for index in range(count)}
+    mapping.update({f"q{index}": queries[index].tolist() for index in range(count)})
+    model = MappingModel("m", mapping)
+
+    report = run_evaluation(
+        EvaluationRequest(
+            validation_path=validation_path,
+            base_model_path="m",
+            tuned_model_path="m",
+            top_k=5,
+            query_block_size=4,
+        ),
+        model_loader=lambda _name: model,
+    )
+
+    unit_docs = documents / np.linalg.norm(documents, axis=1, keepdims=True)
+    unit_queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    ranks = []
+    for index in range(count):
+        scores = (unit_docs @ unit_queries[index]).tolist()
+        ordered = sorted(range(count), key=scores.__getitem__, reverse=True)
+        ranks.append(ordered.index(index) + 1)
+    metrics = report.base
+    assert metrics.mean_rank == pytest.approx(sum(ranks) / count)
+    assert metrics.mrr == pytest.approx(sum(1.0 / rank for rank in ranks) / count)
+    assert metrics.recall_at_k == pytest.approx(sum(rank <= 5 for rank in ranks) / count)
+    assert metrics.recall_at[1] == pytest.approx(sum(rank == 1 for rank in ranks) / count)
+    assert metrics.recall_at[50] == 1.0
+    expected_ndcg = sum(1.0 / np.log2(rank + 1) for rank in ranks if rank <= 5) / count
+    assert metrics.ndcg_at_k == pytest.approx(expected_ndcg)
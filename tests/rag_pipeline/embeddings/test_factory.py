@@ -80,3 +80,28 @@ def test_create_embedding_client_uses_remote(monkeypatch: pytest.MonkeyPatch) ->
     config = replace(get_rag_ingestion_config(), use_fine_tuned_embeddings=False)
     client = create_embedding_client(config, api_key="secret")
     assert client is dummy_client
+
+
+def test_create_embedding_client_uses_onnx_runtime(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    dummy_client = DummyEmbeddingClient("onnx")
+    captured: dict[str, object] = {}
+
+    def fake_from_checkpoint(**kwargs):
+        captured.update(kwargs)
+        return dummy_client
+
+    monkeypatch.setattr(
+        "src.rag_pipeline.embeddings.factory.OnnxEmbeddingClient.from_checkpoint",
+        fake_from_checkpoint,
+    )
+    config = replace(
+        get_rag_ingestion_config(),
+        use_fine_tuned_embeddings=True,
+        fine_tuned_model_path=tmp_path,
+        embedding_runtime="onnx",
+        onnx_quantize=True,
+    )
+    client = create_embedding_client(config)
+    assert client is dummy_client
+    assert captured["model_path"] == tmp_path
+    assert captured["quantized"] is True
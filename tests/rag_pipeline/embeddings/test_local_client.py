@@ -64,3 +64,19 @@ def test_sentence_transformer_client_embeds_texts_and_chunks(tmp_path: Path) ->
     )
     chunk_embeddings = client.embed_document_chunks([chunk])
     assert chunk_embeddings[0].vector[0] == 5.0
+
+
+def test_sentence_transformer_client_restores_order_after_length_sorting(tmp_path: Path) -> None:
+    stub = StubModel()
+    client = SentenceTransformerEmbeddingClient(
+        model_path=tmp_path,
+        batch_size=2,
+        model_label="ft-model",
+        model_loader=lambda _: stub,
+    )
+    texts = ["a much longer piece of text here", "ab", "mid size text", "c"]
+    response = client.embed_texts(texts)
+    assert [record.vector[0] for record in response.embeddings] == [float(len(text)) for text in texts]
+    assert len(response.metrics) == 2
+    assert all(metric.padding_efficiency is not None for metric in response.metrics)
+    assert all(metric.token_count for metric in response.metrics)
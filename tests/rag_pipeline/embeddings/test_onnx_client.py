@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.rag_pipeline.embeddings.onnx_client import (
+    OnnxEmbeddingClient,
+    PoolingConfig,
+    load_pooling_config,
+    onnx_model_path,
+    pool_hidden_states,
+)
+
+
+class StubTokenizer:
+    """Whitespace tokenizer returning padded NumPy batches."""
+
+    def __call__(self, texts, *, padding=False, return_tensors=None, **_kwargs):
+        token_lists = [[len(word) for word in text.split()] or [1] for text in texts]
+        if return_tensors != "np":
+            return {"input_ids": token_lists}
+        width = max(len(tokens) for tokens in token_lists)
+        input_ids = np.zeros((len(texts), width), dtype=np.int64)
+        attention_mask = np.zeros((len(texts), width), dtype=np.int64)
+        for row, tokens in enumerate(token_lists):
+            input_ids[row, : len(tokens)] = tokens
+            attention_mask[row, : len(tokens)] = 1
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+class StubSession:
+    """Echo token ids into a two-dimensional hidden state."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[int, int]] = []
+
+    def run(self, output_names, input_feed):
+        input_ids = input_feed["input_ids"].astype(np.float32)
+        self.calls.append(input_ids.shape)
+        hidden = np.stack([input_ids, np.ones_like(input_ids)], axis=-1)
+        return [hidden]
+
+
+def _write_checkpoint(path: Path) -> None:
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "modules.json").write_text(
+        json.dumps(
+            [
+                {"idx": 0, "name": "0", "path": "", "type": "sentence_transformers.models.Transformer"},
+                {"idx": 1, "name": "1", "path": "1_Pooling", "type": "sentence_transformers.models.Pooling"},
+                {"idx": 2, "name": "2", "path": "2_Normalize", "type": "sentence_transformers.models.Normalize"},
+            ],
+        ),
+        encoding="utf-8",
+    )
+    (path / "1_Pooling").mkdir()
+    (path / "1_Pooling" / "config.json").write_text(
+        json.dumps({"word_embedding_dimension": 2, "pooling_mode_mean_tokens": True}),
+        encoding="utf-8",
+    )
+    (path / "sentence_bert_config.json").write_text(json.dumps({"max_seq_length": 16}), encoding="utf-8")
+
+
+@pytest.mark.unit
+def test_load_pooling_config_reads_sentence_transformer_modules(tmp_path: Path) -> None:
+    _write_checkpoint(tmp_path)
+
+    pooling = load_pooling_config(tmp_path)
+
+    assert pooling == PoolingConfig(mode="mean_tokens", dimension=2, normalize=True, max_seq_length=16)
+
+
+@pytest.mark.unit
+def test_pool_hidden_states_ignores_padding() -> None:
+    hidden = np.array([[[1.0, 0.0], [3.0, 0.0], [100.0, 100.0]]], dtype=np.float32)
+    mask = np.array([[1, 1, 0]])
+
+    mean = pool_hidden_states(hidden, mask, mode="mean_tokens", normalize=False)
+    last = pool_hidden_states(hidden, mask, mode="lasttoken", normalize=False)
+    normalized = pool_hidden_states(hidden, mask, mode="mean_tokens", normalize=True)
+
+    np.testing.assert_allclose(mean, [[2.0, 0.0]])
+    np.testing.assert_allclose(last, [[3.0, 0.0]])
+    np.testing.assert_allclose(normalized, [[1.0, 0.0]])
+
+
+@pytest.mark.unit
+def test_pool_hidden_states_last_token_handles_left_padding() -> None:
+    hidden = np.array(
+        [
+            [[100.0, 100.0], [100.0, 100.0], [1.0, 0.0], [2.0, 0.0]],
+            [[3.0, 0.0], [4.0, 0.0], [5.0, 0.0], [6.0, 0.0]],
+        ],
+        dtype=np.float32,
+    )
+    left_padded = np.array([[0, 0, 1, 1], [1, 1, 1, 1]])
+    right_padded = np.array([[1, 1, 0, 0], [1, 1, 1, 1]])
+
+    left = pool_hidden_states(hidden, left_padded, mode="lasttoken", normalize=False)
+    right = pool_hidden_states(hidden, right_padded, mode="lasttoken", normalize=False)
+
+    np.testing.assert_allclose(left, [[2.0, 0.0], [6.0, 0.0]])
+    np.testing.assert_allclose(right, [[100.0, 100.0], [6.0, 0.0]])
+
+
+@pytest.mark.unit
+def test_onnx_client_embeds_in_input_order(tmp_path: Path) -> None:
+    _write_checkpoint(tmp_path)
+    session = StubSession()
+    opened: list[tuple[Path, int]] = []
+
+    def factory(path: Path, threads: int) -> StubSession:
+        opened.append((path, threads))
+        return session
+
+    client = OnnxEmbeddingClient(
+        model_path=tmp_path,
+        quantized=True,
+        batch_size=2,
+        intra_op_threads=3,
+        model_label="ft-onnx",
+        tokenizer=StubTokenizer(),
+        session_factory=factory,
+    )
+    texts = ["aaaa bb cccccc", "x", "yyy zz"]
+
+    response = client.embed_texts(texts)
+
+    assert opened == [(onnx_model_path(tmp_path, quantized=True), 3)]
+    assert len(session.calls) == 2
+    assert [record.model for record in response.embeddings] == ["ft-onnx"] * 3
+    for text, record in zip(texts, response.embeddings):
+        lengths = [len(word) for word in text.split()]
+        expected = np.array([sum(lengths) / len(lengths), 1.0], dtype=np.float32)
+        expected /= np.linalg.norm(expected)
+        np.testing.assert_allclose(record.vector, expected, rtol=1e-6)
+        assert record.vector.dtype == np.float32
+    assert all(metric.padding_efficiency is not None for metric in response.metrics)
+    assert client.encode_matrix(texts).shape == (3, 2)
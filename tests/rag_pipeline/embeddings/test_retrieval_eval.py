@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from src.rag_pipeline.embeddings.retrieval_eval import (
+    LabeledQuery,
+    evaluate_retriever,
+    load_labeled_queries,
+)
+from src.rag_pipeline.retrieval import RetrievedChunk
+
+
+class ScriptedRetriever:
+    def __init__(self, results: dict[str, list[str]]) -> None:
+        self._results = results
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def retrieve(self, query, *, top_k, min_score, correlation_id=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return [
+            RetrievedChunk(
+                chunk_id=f"{name}-{index}",
+                source_id="s",
+                document_name=name,
+                content="",
+                score=1.0,
+                metadata={},
+            )
+            for index, name in enumerate(self._results[query][:top_k])
+        ]
+
+
+def test_load_labeled_queries_accepts_both_formats(tmp_path: Path) -> None:
+    path = tmp_path / "queries.jsonl"
+    rows = [
+        {"query": "q1", "relevant": ["a.md", "b.md"]},
+        {"query": "q2", "document": "text", "source": "c.md", "document_id": "3"},
+    ]
+    path.write_text("\n".join(json.dumps(row) for row in rows), encoding="utf-8")
+
+    queries = load_labeled_queries(path)
+
+    assert queries == [
+        LabeledQuery(query="q1", relevant=frozenset({"a.md", "b.md"})),
+        LabeledQuery(query="q2", relevant=frozenset({"c.md"})),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_evaluate_retriever_reports_recall_mrr_and_latency() -> None:
+    retriever = ScriptedRetriever(
+        {
+            "q1": ["a.md", "x.md", "y.md"],
+            "q2": ["x.md", "x.md", "b.md"],
+            "q3": ["x.md", "y.md", "z.md"],
+            "q4": [],
+        },
+    )
+    queries = [
+        LabeledQuery(query="q1", relevant=frozenset({"a.md"})),
+        LabeledQuery(query="q2", relevant=frozenset({"b.md"})),
+        LabeledQuery(query="q3", relevant=frozenset({"c.md"})),
+        LabeledQuery(query="q4", relevant=frozenset({"d.md"})),
+    ]
+
+    evaluation = await evaluate_retriever(retriever, queries, top_k=3, concurrency=2)
+
+    assert evaluation.recall_at == {1: 0.25, 3: 0.5}
+    assert evaluation.mrr == pytest.approx((1.0 + 1.0 / 3.0) / 4.0)
+    assert evaluation.empty_results == 1
+    assert retriever.max_in_flight == 2
+    assert 0.0 < evaluation.latency_ms_p50 <= evaluation.latency_ms_p95 <= evaluation.latency_ms_p99
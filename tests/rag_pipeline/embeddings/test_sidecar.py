@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pytest
+
+from src.rag_pipeline.embeddings.client_types import (
+    EmbeddingBatchMetrics,
+    EmbeddingModelInfo,
+    EmbeddingResponse,
+)
+from src.rag_pipeline.embeddings.qwen_client import EmbeddingError
+from src.rag_pipeline.embeddings.sidecar import EmbeddingSidecarServer
+from src.rag_pipeline.embeddings.sidecar_client import (
+    SidecarEmbeddingClient,
+    _connect_unix,
+    encode_frame,
+    encode_json_frame,
+    read_frame,
+)
+from src.rag_pipeline.schemas import EmbeddingRecord
+
+
+class RecordingBackend:
+    def __init__(self) -> None:
+        self.model_info = EmbeddingModelInfo(model="local-ft", dataset_fingerprint="fp", artifact_version="v1")
+        self.batch_sizes: list[int] = []
+
+    def embed_texts(self, texts: Sequence[str], *, correlation_id: str | None = None) -> EmbeddingResponse:
+        if any(text == "boom" for text in texts):
+            raise RuntimeError("backend exploded")
+        self.batch_sizes.append(len(texts))
+        embeddings = [
+            EmbeddingRecord(vector=[float(len(text)), 1.0], model="local-ft", dimensions=2)
+            for text in texts
+        ]
+        metrics = [EmbeddingBatchMetrics(batch_id="b", item_count=len(texts), retry_count=0, duration_ms=0.0)]
+        return EmbeddingResponse(embeddings=embeddings, metrics=metrics)
+
+    def embed_document_chunks(self, chunks, *, correlation_id=None):  # pragma: no cover - unused
+        return []
+
+    def close(self) -> None:  # pragma: no cover - unused
+        return None
+
+
+@pytest.fixture()
+def sidecar(tmp_path: Path):
+    backend = RecordingBackend()
+    socket_path = tmp_path / "embed.sock"
+    server = EmbeddingSidecarServer(backend, socket_path=socket_path, max_batch_items=64, max_wait_ms=50.0)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result(timeout=5)
+    backend.batch_sizes.clear()
+    yield backend, socket_path
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result(timeout=5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+
+
+@pytest.mark.unit
+def test_sidecar_client_round_trips_vectors_and_model_info(sidecar) -> None:
+    backend, socket_path = sidecar
+    client = SidecarEmbeddingClient(socket_path=socket_path)
+
+    response = client.embed_texts(["abc", "a"])
+
+    assert client.model_info == backend.model_info
+    np.testing.assert_array_equal(np.stack([record.vector for record in response.embeddings]), [[3.0, 1.0], [1.0, 1.0]])
+    assert response.embeddings[0].vector.dtype == np.float32
+    client.close()
+
+
+@pytest.mark.unit
+def test_sidecar_coalesces_concurrent_requests(sidecar) -> None:
+    backend, socket_path = sidecar
+    client = SidecarEmbeddingClient(socket_path=socket_path)
+    queries = [f"query {'x' * index}" for index in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda query: client.embed_texts([query]), queries))
+
+    for query, response in zip(queries, results):
+        assert float(response.embeddings[0].vector[0]) == float(len(query))
+    assert sum(backend.batch_sizes) == len(queries)
+    assert len(backend.batch_sizes) < len(queries)
+    client.close()
+
+
+@pytest.mark.unit
+def test_sidecar_reports_backend_errors(sidecar) -> None:
+    _backend, socket_path = sidecar
+    client = SidecarEmbeddingClient(socket_path=socket_path)
+
+    with pytest.raises(EmbeddingError, match="backend exploded"):
+        client.embed_texts(["boom"])
+    assert len(client.embed_texts(["still works"]).embeddings) == 1
+    client.close()
+
+
+@pytest.mark.unit
+def test_sidecar_client_connects_lazily(sidecar, tmp_path: Path) -> None:
+    backend, socket_path = sidecar
+    late_path = tmp_path / "late.sock"
+    # Constructed before anything listens on the socket.
+    client = SidecarEmbeddingClient(socket_path=late_path)
+
+    with pytest.raises(EmbeddingError, match="Failed to connect"):
+        client.embed_texts(["too early"])
+    late_path.symlink_to(socket_path)
+
+    assert client.model_info == backend.model_info
+    assert len(client.embed_texts(["now"]).embeddings) == 1
+    client.close()
+
+
+@pytest.mark.unit
+def test_sidecar_rejects_frames_that_are_not_objects(sidecar) -> None:
+    _backend, socket_path = sidecar
+    sock = _connect_unix(socket_path, 5.0)
+    try:
+        for body in (b"[]", b'"x"', b"1"):
+            sock.sendall(encode_frame(body))
+            assert json.loads(read_frame(sock)) == {"ok": False, "error": "request must be a JSON object"}
+        # The connection survives and still serves well-formed requests.
+        sock.sendall(encode_json_frame({"op": "info"}))
+        assert json.loads(read_frame(sock))["ok"] is True
+    finally:
+        sock.close()
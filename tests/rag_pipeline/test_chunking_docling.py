@@ -50,3 +50,48 @@ def test_chunk_document_fallback_reads_plain_text(tmp_path) -> None:
     assert chunks
     assert all(chunk.text for chunk in chunks)
     assert chunker.uses_docling() is False
+
+
+def _char_counter(texts) -> list[int]:
+    """Deterministic counter: one token per two characters."""
+    return [max(1, len(text) // 2) for text in texts]
+
+
+@pytest.mark.unit
+def test_enforce_character_bounds_respects_token_budget() -> None:
+    """Chunks should be split and never merged past the token budget."""
+    calls: list[int] = []
+
+    def counter(texts) -> list[int]:
+        calls.append(len(texts))
+        return _char_counter(texts)
+
+    chunks = [
+        _chunk("word " * 80, 0),
+        _chunk("tail words here", 1),
+    ]
+    normalized = enforce_character_bounds(
+        chunks=chunks,
+        min_chars=10,
+        max_chars=1000,
+        max_tokens=50,
+        token_counter=counter,
+    )
+    assert len(normalized) > 1
+    assert all(chunk.token_estimate is not None and chunk.token_estimate <= 50 for chunk in normalized)
+    assert [chunk.metadata.chunk_index for chunk in normalized] == list(range(len(normalized)))
+    assert "".join(chunk.text for chunk in normalized).replace(" ", "") == (
+        "".join(chunk.text for chunk in chunks).replace(" ", "")
+    )
+    # Initial segments are counted in a single batch per document.
+    assert calls[0] == 2
+
+
+@pytest.mark.unit
+def test_estimate_token_counts_does_not_undercount_dense_text() -> None:
+    """The heuristic should not treat long identifiers or CJK as a single token."""
+    from src.rag_pipeline.chunking.docling_chunker import estimate_token_counts
+
+    counts = estimate_token_counts(["some_really_long_identifier_name_here", "這是一個沒有空格的中文句子"])
+    assert counts[0] > 1
+    assert counts[1] > 1
@@ -0,0 +1,88 @@
+import pytest
+
+from src.rag_pipeline.context_packing import pack_context
+from src.rag_pipeline.retrieval import RetrievedChunk
+
+
+def _chunk(chunk_id: str, content: str, *, score: float, source: str = "s1", index: int | None = None) -> RetrievedChunk:
+    metadata = {} if index is None else {"chunk_index": index}
+    return RetrievedChunk(
+        chunk_id=chunk_id,
+        source_id=source,
+        document_name=f"doc-{source}",
+        content=content,
+        score=score,
+        metadata=metadata,
+    )
+
+
+def _words(count: int, word: str = "alpha") -> str:
+    return " ".join(f"{word}{position}" for position in range(count))
+
+
+@pytest.mark.unit
+def test_contained_chunks_from_same_source_are_dropped() -> None:
+    long_text = "Expense reports are due on the fifth. Managers approve within two days."
+    chunks = [
+        _chunk("a", long_text, score=0.9),
+        _chunk("b", "expense reports are  due on the fifth.", score=0.8),
+        _chunk("c", "expense reports are due on the fifth.", score=0.7, source="s2"),
+    ]
+
+    packed = pack_context(chunks, token_budget=1000)
+
+    assert [chunk.chunk_id for chunk in packed.included] == ["a", "c"]
+    assert packed.duplicates_dropped == 1
+
+
+@pytest.mark.unit
+def test_adjacent_chunks_are_merged_without_repeating_overlap() -> None:
+    first = "Travel must be booked through the portal. Receipts are required for all expenses."
+    second = "Receipts are required for all expenses. Mileage is reimbursed at the standard rate."
+    chunks = [
+        _chunk("a", first, score=0.7, index=3),
+        _chunk("b", second, score=0.9, index=4),
+        _chunk("c", "Unrelated later section.", score=0.5, index=9),
+    ]
+
+    packed = pack_context(chunks, token_budget=1000)
+
+    assert packed.chunks_merged == 1
+    merged = packed.blocks[0]
+    assert merged.score == 0.9
+    assert merged.content.count("Receipts are required") == 1
+    assert merged.content.endswith("standard rate.")
+    assert {chunk.chunk_id for chunk in packed.included} == {"a", "b", "c"}
+
+
+@pytest.mark.unit
+def test_budget_is_filled_by_score_per_token() -> None:
+    chunks = [
+        _chunk("big", _words(300), score=0.95, source="s1"),
+        _chunk("small-1", _words(40, "beta"), score=0.8, source="s2"),
+        _chunk("small-2", _words(40, "gamma"), score=0.75, source="s3"),
+    ]
+
+    packed = pack_context(chunks, token_budget=200)
+
+    assert [chunk.chunk_id for chunk in packed.blocks] == ["small-1", "small-2"]
+    assert packed.tokens_used <= 200
+    assert packed.tokens_saved == packed.tokens_retrieved - packed.tokens_used
+    assert packed.blocks_dropped == 1
+
+
+@pytest.mark.unit
+def test_best_chunk_is_truncated_when_nothing_fits() -> None:
+    packed = pack_context([_chunk("big", _words(500), score=0.9)], token_budget=100)
+
+    assert len(packed.blocks) == 1
+    assert len(packed.blocks[0].content) < len(_words(500))
+    assert packed.tokens_used == 100
+
+
+@pytest.mark.unit
+def test_empty_input_packs_to_nothing() -> None:
+    packed = pack_context([], token_budget=100)
+
+    assert packed.blocks == []
+    assert packed.tokens_saved == 0
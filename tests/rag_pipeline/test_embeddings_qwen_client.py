@@ -4,12 +4,16 @@ import pytest
 
 from src.rag_pipeline.embeddings.qwen_client import EmbeddingError, QwenEmbeddingClient
 from src.rag_pipeline.schemas import ChunkData, ChunkMetadata
+from src.shared.deadline import Deadline, DeadlineExceeded, deadline_scope
+from src.shared.rate_limit import RateLimiter
+from src.shared.resilience import CLOSED, HALF_OPEN, CircuitBreaker
 
 
 class DummyResponse:
-    def __init__(self, status_code: int, payload: dict):
+    def __init__(self, status_code: int, payload: dict, headers: dict | None = None):
         self.status_code = status_code
         self._payload = payload
+        self.headers = headers or {}
 
     def json(self) -> dict:
         return self._payload
@@ -68,6 +72,143 @@ def test_embed_texts_retries_on_failure() -> None:
     assert session.post.call_count == 2
 
 
+@pytest.mark.unit
+def test_embed_texts_does_not_retry_past_request_deadline() -> None:
+    """A retry whose backoff outlives the deadline should not be attempted."""
+    session = mock.Mock()
+    session.post.side_effect = [DummyResponse(500, {}), DummyResponse(200, _payload_for(1))]
+    client = QwenEmbeddingClient(
+        model="demo",
+        api_key=None,
+        batch_size=1,
+        retry_count=3,
+        retry_backoff_seconds=5.0,
+        expected_dimensions=2,
+        session=session,
+    )
+    with deadline_scope(Deadline.after(1.0)), pytest.raises(DeadlineExceeded):
+        client.embed_texts(["hello"])
+    assert session.post.call_count == 1
+    assert session.post.call_args.kwargs["timeout"] <= 1.0
+
+
+@pytest.mark.unit
+def test_embed_texts_fails_fast_once_circuit_opens() -> None:
+    """Server errors should open the circuit and stop further requests."""
+    session = mock.Mock()
+    session.post.return_value = DummyResponse(503, {})
+    client = QwenEmbeddingClient(
+        model="demo",
+        api_key=None,
+        batch_size=1,
+        retry_count=5,
+        retry_backoff_seconds=0.0,
+        expected_dimensions=2,
+        session=session,
+        circuit_breaker=CircuitBreaker(name="test", window_size=2, minimum_calls=2),
+    )
+    with pytest.raises(EmbeddingError):
+        client.embed_texts(["hello"])
+    assert session.post.call_count == 2
+    with pytest.raises(EmbeddingError, match="open"):
+        client.embed_texts(["again"])
+    assert session.post.call_count == 2
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _half_open_breaker(clock: _Clock) -> CircuitBreaker:
+    breaker = CircuitBreaker(name="test", window_size=1, minimum_calls=1, open_seconds=10.0, clock=clock)
+    breaker.allow()
+    breaker.record_failure()
+    clock.now += 10.0
+    assert breaker.state == HALF_OPEN
+    return breaker
+
+
+@pytest.mark.unit
+def test_half_open_probe_survives_a_rate_limit_deadline() -> None:
+    """A deadline hit while waiting on the limiter must not strand the probe slot."""
+    clock = _Clock()
+    breaker = _half_open_breaker(clock)
+    limiter = RateLimiter(name="test", clock=clock, sleeper=clock.sleep)
+    limiter.on_throttled(60.0)
+    session = mock.Mock()
+    session.post.return_value = DummyResponse(200, _payload_for(1))
+    client = QwenEmbeddingClient(
+        model="demo",
+        api_key=None,
+        expected_dimensions=2,
+        session=session,
+        circuit_breaker=breaker,
+        rate_limiter=limiter,
+    )
+
+    with deadline_scope(Deadline.after(1.0)), pytest.raises(DeadlineExceeded):
+        client.embed_texts(["hello"])
+    clock.now += 60.0
+
+    assert len(client.embed_texts(["hello"]).embeddings) == 1
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.unit
+def test_half_open_probe_is_released_on_unexpected_errors() -> None:
+    clock = _Clock()
+    breaker = _half_open_breaker(clock)
+    session = mock.Mock()
+    session.post.side_effect = [RuntimeError("client bug"), DummyResponse(200, _payload_for(1))]
+    client = QwenEmbeddingClient(
+        model="demo",
+        api_key=None,
+        expected_dimensions=2,
+        session=session,
+        circuit_breaker=breaker,
+    )
+
+    with pytest.raises(RuntimeError):
+        client.embed_texts(["hello"])
+
+    assert len(client.embed_texts(["hello"]).embeddings) == 1
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.unit
+def test_throttled_batch_waits_for_retry_after_without_spending_retries() -> None:
+    """429s should pause the shared limiter instead of failing the batch."""
+    session = mock.Mock()
+    session.post.side_effect = [
+        DummyResponse(429, {}, headers={"Retry-After": "2"}),
+        DummyResponse(429, {}, headers={"Retry-After": "1"}),
+        DummyResponse(200, _payload_for(1)),
+    ]
+    sleeps: list[float] = []
+    client = QwenEmbeddingClient(
+        model="demo",
+        api_key=None,
+        batch_size=1,
+        retry_count=0,
+        expected_dimensions=2,
+        session=session,
+        rate_limiter=RateLimiter(name="test", sleeper=sleeps.append),
+    )
+
+    response = client.embed_texts(["hello"])
+
+    assert len(response.embeddings) == 1
+    assert session.post.call_count == 3
+    assert sleeps and max(sleeps) > 1.5
+
+
 @pytest.mark.unit
 def test_embed_texts_raises_on_dimension_mismatch() -> None:
     """Mismatched vector dimension should raise EmbeddingError."""
@@ -0,0 +1,174 @@
+import datetime as dt
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from src.rag_pipeline.config import get_rag_ingestion_config
+from src.rag_pipeline.embeddings.client_types import EmbeddingModelInfo
+from src.rag_pipeline.persistence import InMemoryStore, JobLedger
+from src.rag_pipeline.persistence.job_ledger import JOB_COMPLETED, STAGE_DONE, STAGE_FAILED
+from src.rag_pipeline.pipeline import PipelineServices, run_ingestion_job
+from src.rag_pipeline.schemas import (
+    ChunkData,
+    ChunkMetadata,
+    EmbeddingRecord,
+    IngestionRequest,
+    SourceIngestionStatus,
+)
+
+
+class LineChunker:
+    """Chunk one chunk per non-empty line."""
+
+    def chunk_document(self, document):
+        lines = [line for line in document.metadata.location.read_text().splitlines() if line]
+        return [
+            ChunkData(
+                text=line,
+                metadata=ChunkMetadata(page_number=None, chunk_index=index, section_heading=None, structural_type=None),
+                character_count=len(line),
+            )
+            for index, line in enumerate(lines)
+        ]
+
+
+class RecordingEmbeddingClient:
+    def __init__(self, fail_on_text: str | None = None, model: str = "demo") -> None:
+        self.model_info = EmbeddingModelInfo(model=model, dataset_fingerprint=None, artifact_version=None)
+        self.fail_on_text = fail_on_text
+        self.embedded: list[str] = []
+
+    def embed_document_chunks(self, chunks):
+        if any(chunk.text == self.fail_on_text for chunk in chunks):
+            raise RuntimeError("embedding service went away")
+        self.embedded.extend(chunk.text for chunk in chunks)
+        return [
+            EmbeddingRecord(vector=(float(len(chunk.text)), 1.0), model=self.model_info.model, dimensions=2)
+            for chunk in chunks
+        ]
+
+    def close(self) -> None:
+        """No-op for compatibility."""
+
+
+def _services(client: RecordingEmbeddingClient, store: InMemoryStore) -> PipelineServices:
+    return PipelineServices(
+        chunker=LineChunker(),
+        embedding_client=client,
+        persistence=store,
+        clock=lambda: dt.datetime.now(tz=dt.timezone.utc),
+    )
+
+
+@pytest.fixture()
+def corpus(tmp_path: Path) -> Path:
+    source = tmp_path / "docs"
+    source.mkdir()
+    (source / "a.txt").write_text("alpha one\nalpha two\n", encoding="utf-8")
+    (source / "b.txt").write_text("\n".join(f"beta {index}" for index in range(10)), encoding="utf-8")
+    return source
+
+
+@pytest.mark.unit
+def test_resume_embeds_only_missing_chunks(corpus: Path, tmp_path: Path) -> None:
+    config = replace(
+        get_rag_ingestion_config(), source_directories=[corpus], embedding_batch_size=1, embedding_dimension=2
+    )
+    request = IngestionRequest(source_directories=[str(corpus)], document_glob_patterns=["*.txt"])
+    ledger = JobLedger(tmp_path / "ledger.sqlite3")
+    store = InMemoryStore()
+
+    # Slices hold four chunks, so b.txt checkpoints "beta 0".."beta 3" first.
+    crashing = RecordingEmbeddingClient(fail_on_text="beta 4")
+    first = run_ingestion_job(
+        request=request, config=config, services=_services(crashing, store), ledger=ledger, job_id="job-1"
+    )
+    assert first.job_id == "job-1"
+    assert first.stats.documents_failed == 1
+    stages = {Path(entry.location).name: entry.stage for entry in ledger.documents("job-1")}
+    assert stages == {"a.txt": STAGE_DONE, "b.txt": STAGE_FAILED}
+
+    resumed_client = RecordingEmbeddingClient()
+    resumed = run_ingestion_job(
+        config=config, services=_services(resumed_client, store), ledger=ledger, job_id="job-1", resume=True
+    )
+
+    assert resumed_client.embedded == [f"beta {index}" for index in range(4, 10)]
+    assert resumed.stats.documents_ingested == 2
+    assert resumed.stats.documents_failed == 0
+    assert resumed.stats.chunks_created == 12
+    assert all(doc.status == SourceIngestionStatus.INGESTED for doc in resumed.documents)
+    assert ledger.get_job("job-1").status == JOB_COMPLETED
+    b_row = store.get_source_by_location(str(corpus / "b.txt"))
+    assert b_row is not None
+    assert len(store.chunks[b_row.id]) == 10
+    ledger.close()
+
+
+@pytest.mark.unit
+def test_resume_discards_embeddings_of_changed_documents(corpus: Path, tmp_path: Path) -> None:
+    config = replace(
+        get_rag_ingestion_config(), source_directories=[corpus], embedding_batch_size=1, embedding_dimension=2
+    )
+    request = IngestionRequest(source_directories=[str(corpus)], document_glob_patterns=["b.txt"])
+    ledger = JobLedger(tmp_path / "ledger.sqlite3")
+    store = InMemoryStore()
+    run_ingestion_job(
+        request=request,
+        config=config,
+        services=_services(RecordingEmbeddingClient(fail_on_text="beta 4"), store),
+        ledger=ledger,
+        job_id="job-2",
+    )
+    (corpus / "b.txt").write_text("\n".join(f"gamma {index}" for index in range(3)), encoding="utf-8")
+
+    resumed_client = RecordingEmbeddingClient()
+    resumed = run_ingestion_job(
+        config=config, services=_services(resumed_client, store), ledger=ledger, job_id="job-2", resume=True
+    )
+
+    assert resumed_client.embedded == ["gamma 0", "gamma 1", "gamma 2"]
+    assert resumed.stats.chunks_created == 3
+    ledger.close()
+
+
+@pytest.mark.unit
+def test_resume_with_another_model_re_embeds_everything(corpus: Path, tmp_path: Path) -> None:
+    config = replace(
+        get_rag_ingestion_config(), source_directories=[corpus], embedding_batch_size=1, embedding_dimension=2
+    )
+    request = IngestionRequest(source_directories=[str(corpus)], document_glob_patterns=["b.txt"])
+    ledger = JobLedger(tmp_path / "ledger.sqlite3")
+    store = InMemoryStore()
+    run_ingestion_job(
+        request=request,
+        config=config,
+        services=_services(RecordingEmbeddingClient(fail_on_text="beta 4"), store),
+        ledger=ledger,
+        job_id="job-3",
+    )
+
+    resumed_client = RecordingEmbeddingClient(model="demo-v2")
+    run_ingestion_job(
+        config=config, services=_services(resumed_client, store), ledger=ledger, job_id="job-3", resume=True
+    )
+
+    assert resumed_client.embedded == [f"beta {index}" for index in range(10)]
+    b_row = store.get_source_by_location(str(corpus / "b.txt"))
+    assert b_row is not None
+    assert {chunk.embedding_model for chunk in store.chunks[b_row.id]} == {"demo-v2"}
+    ledger.close()
+
+
+@pytest.mark.unit
+def test_resume_unknown_job_raises(tmp_path: Path) -> None:
+    ledger = JobLedger(tmp_path / "ledger.sqlite3")
+    with pytest.raises(LookupError):
+        run_ingestion_job(
+            services=_services(RecordingEmbeddingClient(), InMemoryStore()),
+            ledger=ledger,
+            job_id="missing",
+            resume=True,
+        )
+    ledger.close()
@@ -0,0 +1,51 @@
+import struct
+
+import numpy as np
+import pytest
+
+from src.rag_pipeline.persistence.pgvector import (
+    decode_vector_binary,
+    encode_vector_binary,
+    encode_vector_text,
+)
+from src.rag_pipeline.schemas import ChunkRecord, EmbeddingRecord
+
+
+@pytest.mark.unit
+def test_encode_vector_binary_matches_pgvector_wire_format() -> None:
+    """Binary encoding should be a dim/unused header followed by big-endian float4."""
+    encoded = encode_vector_binary(np.array([1.0, -2.5, 0.25], dtype=np.float32))
+    assert encoded[:4] == struct.pack(">HH", 3, 0)
+    assert struct.unpack(">3f", encoded[4:]) == (1.0, -2.5, 0.25)
+    np.testing.assert_array_equal(decode_vector_binary(encoded), [1.0, -2.5, 0.25])
+
+
+@pytest.mark.unit
+def test_encode_vector_text_literal() -> None:
+    assert encode_vector_text((0.5, 1.0)) == b"[0.5,1.0]"
+
+
+@pytest.mark.unit
+def test_records_share_model_output_without_copying() -> None:
+    """Rows of a float32 matrix should flow into records as views, not copies."""
+    matrix = np.arange(6, dtype=np.float32).reshape(2, 3)
+    embedding = EmbeddingRecord(vector=matrix[1], model="demo", dimensions=3)
+    record = ChunkRecord(
+        source_location="doc.pdf",
+        chunk_index=0,
+        text="hello",
+        embedding=embedding.vector,
+        metadata={},
+        embedding_model="demo",
+    )
+    assert np.shares_memory(record.embedding, matrix)
+    assert record.embedding.dtype == np.float32
+
+
+@pytest.mark.unit
+def test_records_coerce_sequences_to_float32() -> None:
+    record = EmbeddingRecord(vector=(0.1, 0.2), model="demo", dimensions=2)
+    assert isinstance(record.vector, np.ndarray)
+    assert record.vector.dtype == np.float32
+    with pytest.raises(ValueError):
+        EmbeddingRecord(vector=[[0.1], [0.2]], model="demo", dimensions=2)
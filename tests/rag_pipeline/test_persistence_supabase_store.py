@@ -1,16 +1,20 @@
+import datetime as dt
 from unittest import mock
 
 import pytest
 
 from src.rag_pipeline.config import get_rag_ingestion_config
+from src.rag_pipeline.persistence import supabase_store
 from src.rag_pipeline.persistence.supabase_store import SourceRow, SupabaseStore
 from src.rag_pipeline.schemas import (
     ChunkRecord,
     DocumentInput,
     DocumentMetadata,
+    RetrievalFilters,
     SourceIngestionStatus,
     SourceType,
 )
+from src.shared.deadline import Deadline, deadline_scope
 
 
 def _mock_db() -> mock.Mock:
@@ -94,3 +98,110 @@ def test_mark_source_failed_updates_status(tmp_path) -> None:
     result = store.mark_source_failed("doc.pdf", "boom")
     assert result is not None
     assert db.fetchrow.called
+
+
+@pytest.mark.unit
+def test_psycopg_client_pools_connections_and_pins_transactions(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Concurrent callers get distinct connections; a transaction reuses one."""
+    opened: list[mock.MagicMock] = []
+
+    def fake_connect(_dsn: str) -> mock.MagicMock:
+        connection = mock.MagicMock()
+        connection.closed = False
+        opened.append(connection)
+        return connection
+
+    monkeypatch.setattr(supabase_store.psycopg, "connect", fake_connect)
+    monkeypatch.setattr(supabase_store, "register_vector_adapters", lambda _connection: None)
+    client = supabase_store.PsycopgDatabaseClient("postgresql://example", pool_size=2)
+    assert len(opened) == 1
+
+    with client._connection() as first, client._connection() as second:
+        assert first is not second
+    assert len(opened) == 2
+
+    with client.transaction():
+        client.execute("select 1")
+        client.execute("select 2")
+    used = [connection for connection in opened if connection.cursor.called]
+    assert len(used) == 1
+
+    client.close()
+    assert all(connection.close.called for connection in opened)
+
+
+@pytest.mark.unit
+def test_match_chunks_pushes_filters_into_sql() -> None:
+    """Filtered matches should compile predicates instead of post-filtering."""
+    db = _mock_db()
+    db.fetchall.return_value = []
+    store = SupabaseStore(db=db, config=get_rag_ingestion_config())
+
+    store.match_chunks(
+        query_embedding=(0.1, 0.2),
+        match_count=5,
+        min_score=0.3,
+        filters=RetrievalFilters(
+            document_types=("pdf",),
+            modified_after=dt.datetime(2024, 1, 1, 2, 0, tzinfo=dt.timezone(dt.timedelta(hours=2))),
+            source_metadata={"department": "finance"},
+        ),
+    )
+
+    sql, parameters = db.fetchall.call_args[0]
+    assert "rag.match_chunks" not in sql
+    assert "s.document_type = any(%s)" in sql
+    assert "(s.metadata->>'last_modified') >= %s" in sql
+    assert "s.metadata @> %s::jsonb" in sql
+    assert parameters[1:4] == (["pdf"], "2024-01-01T00:00:00+00:00", '{"department": "finance"}')
+    assert parameters[-2:] == (0.3, 5)
+
+
+@pytest.mark.unit
+def test_filtered_match_ranks_an_exact_candidate_set() -> None:
+    """Filters must bound the candidates before ordering, not post-filter ivfflat lists."""
+    db = _mock_db()
+    db.fetchall.return_value = []
+    store = SupabaseStore(db=db, config=get_rag_ingestion_config())
+
+    store.match_chunks(
+        query_embedding=(0.1, 0.2),
+        match_count=5,
+        min_score=0.3,
+        filters=RetrievalFilters(document_types=("pdf",)),
+    )
+
+    sql, parameters = db.fetchall.call_args[0]
+    normalized = " ".join(sql.split())
+    assert "with candidates as materialized (" in normalized
+    cte, outer = normalized.split(") select", 1)
+    assert "s.document_type = any(%s)" in cte
+    assert "order by" not in cte and "limit" not in cte
+    assert "from candidates where 1 - distance >= %s order by distance limit %s" in outer
+    assert parameters[1:] == (["pdf"], 0.3, 5)
+
+
+@pytest.mark.unit
+def test_match_chunks_without_filters_uses_database_function() -> None:
+    db = _mock_db()
+    db.fetchall.return_value = []
+    store = SupabaseStore(db=db, config=get_rag_ingestion_config())
+
+    store.match_chunks(query_embedding=(0.1, 0.2), match_count=5, min_score=0.3, filters=RetrievalFilters())
+
+    assert "rag.match_chunks" in db.fetchall.call_args[0][0]
+
+
+@pytest.mark.unit
+def test_match_chunks_sets_statement_timeout_from_request_deadline() -> None:
+    db = _mock_db()
+    db.fetchall.return_value = []
+    store = SupabaseStore(db=db, config=get_rag_ingestion_config())
+
+    with deadline_scope(Deadline.after(2.0)):
+        store.match_chunks(query_embedding=(0.1, 0.2), match_count=5, min_score=0.3)
+
+    assert db.transaction.called
+    sql, (timeout_ms,) = db.execute.call_args[0]
+    assert "statement_timeout" in sql
+    assert 0 < int(timeout_ms) <= 2000
@@ -0,0 +1,164 @@
+import threading
+import time
+from typing import Any, Mapping, Sequence
+
+import pytest
+
+from src.rag_pipeline.embeddings import EmbeddingModelInfo
+from src.rag_pipeline.embeddings.qwen_client import EmbeddingResponse
+from src.rag_pipeline.query_expansion import RuleBasedQueryExpander, unique_reformulations
+from src.rag_pipeline.retrieval import DatabaseRetriever, RetrievedChunk, reciprocal_rank_fusion
+from src.rag_pipeline.schemas import EmbeddingRecord
+
+
+class _IndexedEmbeddingClient:
+    """Encodes the position of each text in the batch as the first vector component."""
+
+    model_info = EmbeddingModelInfo(model="demo", dataset_fingerprint=None, artifact_version=None)
+
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    def embed_texts(self, texts: Sequence[str], *, correlation_id: str | None = None) -> EmbeddingResponse:
+        self.batches.append(list(texts))
+        return EmbeddingResponse(
+            embeddings=[
+                EmbeddingRecord(vector=(float(position), 1.0), model="demo", dimensions=2)
+                for position in range(len(texts))
+            ],
+            metrics=[],
+        )
+
+
+class _PerQueryStore:
+    def __init__(self, rows_by_query: dict[int, list[str]], *, slow_variants: float = 0.0) -> None:
+        self._rows_by_query = rows_by_query
+        self._slow_variants = slow_variants
+
+    def match_chunks(
+        self,
+        *,
+        query_embedding: Sequence[float],
+        match_count: int,
+        min_score: float,
+    ) -> Sequence[Mapping[str, Any]]:
+        position = int(query_embedding[0])
+        if position and self._slow_variants:
+            time.sleep(self._slow_variants)
+        return [
+            {"chunk_id": chunk_id, "source_id": "s", "document_name": "doc", "content": chunk_id, "score": 0.5}
+            for chunk_id in self._rows_by_query[position][:match_count]
+        ]
+
+
+class _FixedExpander:
+    def __init__(self, variants: list[str]) -> None:
+        self._variants = variants
+
+    def expand(self, query: str, *, count: int) -> list[str]:
+        return self._variants[:count]
+
+
+def _chunk(chunk_id: str, score: float = 0.5) -> RetrievedChunk:
+    return RetrievedChunk(chunk_id, "s", "doc", chunk_id, score, {})
+
+
+@pytest.mark.unit
+def test_rule_based_expander_produces_keyword_and_synonym_forms() -> None:
+    expansions = RuleBasedQueryExpander().expand("How do I request PTO?", count=3)
+
+    assert expansions[0] == "request PTO"
+    assert "How do I request paid time off" in expansions
+    assert len(expansions) == len(set(expansions)) <= 3
+
+
+@pytest.mark.unit
+def test_unique_reformulations_drops_restatements() -> None:
+    assert unique_reformulations("Expense policy?", ["expense  POLICY", "", "travel policy", "travel policy"], count=5) == [
+        "travel policy",
+    ]
+
+
+@pytest.mark.unit
+def test_reciprocal_rank_fusion_prefers_chunks_found_by_several_queries() -> None:
+    fused = reciprocal_rank_fusion(
+        [[_chunk("a"), _chunk("b")], [_chunk("c"), _chunk("b", score=0.9)], [_chunk("b"), _chunk("d")]],
+        limit=3,
+    )
+
+    assert [chunk.chunk_id for chunk in fused] == ["b", "a", "c"]
+    assert fused[0].score == 0.9
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_expanded_retrieval_embeds_once_and_fuses() -> None:
+    embedding_client = _IndexedEmbeddingClient()
+    store = _PerQueryStore({0: ["a", "b"], 1: ["c", "b"], 2: ["b", "d"]})
+    retriever = DatabaseRetriever(
+        embedding_client=embedding_client,
+        store=store,
+        query_expander=_FixedExpander(["variant one", "variant two"]),
+        expansion_count=2,
+    )
+
+    chunks = await retriever.retrieve("original", top_k=2, min_score=0.0)
+
+    assert embedding_client.batches == [["original", "variant one", "variant two"]]
+    assert [chunk.chunk_id for chunk in chunks] == ["b", "a"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_expanded_retrieval_falls_back_after_deadline() -> None:
+    store = _PerQueryStore({0: ["a", "b"], 1: ["c"]}, slow_variants=0.5)
+    retriever = DatabaseRetriever(
+        embedding_client=_IndexedEmbeddingClient(),
+        store=store,
+        query_expander=_FixedExpander(["variant"]),
+        expansion_count=1,
+        expansion_deadline_seconds=0.05,
+    )
+
+    start = time.perf_counter()
+    chunks = await retriever.retrieve("original", top_k=2, min_score=0.0)
+
+    assert [chunk.chunk_id for chunk in chunks] == ["a", "b"]
+    assert time.perf_counter() - start < 0.4
+
+
+class _BlockingExpander:
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.calls = 0
+
+    def expand(self, query: str, *, count: int) -> list[str]:
+        self.calls += 1
+        self.release.wait(timeout=5.0)
+        return ["variant"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_stuck_expansions_do_not_queue_behind_each_other() -> None:
+    expander = _BlockingExpander()
+    retriever = DatabaseRetriever(
+        embedding_client=_IndexedEmbeddingClient(),
+        store=_PerQueryStore({0: ["a"], 1: ["b"]}),
+        query_expander=expander,
+        expansion_count=1,
+        expansion_deadline_seconds=0.05,
+        max_concurrent_expansions=1,
+    )
+    try:
+        first = await retriever.retrieve("original", top_k=1, min_score=0.0)
+        start = time.perf_counter()
+        second = await retriever.retrieve("original", top_k=1, min_score=0.0)
+
+        # The first call still holds the only slot, so the second skips expansion.
+        assert [chunk.chunk_id for chunk in first + second] == ["a", "a"]
+        assert expander.calls == 1
+        assert time.perf_counter() - start < 0.05
+    finally:
+        expander.release.set()
+        retriever.close()
@@ -1,8 +1,9 @@
 import pytest
 
+from src.rag_pipeline.embeddings import EmbeddingModelInfo
 from src.rag_pipeline.embeddings.qwen_client import EmbeddingResponse
 from src.rag_pipeline.retrieval import DatabaseRetriever, NullRetriever, RetrievedChunk
-from src.rag_pipeline.schemas import EmbeddingRecord, JSONValue
+from src.rag_pipeline.schemas import EmbeddingRecord, JSONValue, RetrievalFilters
 
 
 class _FakeEmbeddingClient:
@@ -70,3 +71,48 @@ async def test_null_retriever_returns_empty() -> None:
     retriever = NullRetriever()
     chunks = await retriever.retrieve("anything", top_k=1, min_score=0.0)
     assert chunks == []
+
+
+@pytest.mark.unit
+def test_database_retriever_warm_up_touches_embedding_and_store() -> None:
+    embedding_client = _FakeEmbeddingClient()
+    store = _FakeStore()
+    retriever = DatabaseRetriever(embedding_client=embedding_client, store=store)
+
+    durations = retriever.warm_up()
+
+    assert set(durations) == {"embedding", "database"}
+    assert embedding_client.calls == [["warm-up query"]]
+    assert store.calls == [((0.1, 0.2), 1, 0.0)]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_database_retriever_forwards_filters_to_store() -> None:
+    class _FilteringStore(_FakeStore):
+        def __init__(self) -> None:
+            super().__init__()
+            self.filters: list[RetrievalFilters] = []
+
+        def match_chunks(
+            self,
+            *,
+            query_embedding: tuple[float, ...],
+            match_count: int,
+            min_score: float,
+            filters: RetrievalFilters | None = None,
+        ) -> list[dict[str, JSONValue]]:
+            assert filters is not None
+            self.filters.append(filters)
+            return super().match_chunks(query_embedding=query_embedding, match_count=match_count, min_score=min_score)
+
+    embedding_client = _FakeEmbeddingClient()
+    embedding_client.model_info = EmbeddingModelInfo(model="demo", dataset_fingerprint=None, artifact_version=None)  # type: ignore[attr-defined]
+    store = _FilteringStore()
+    retriever = DatabaseRetriever(embedding_client=embedding_client, store=store)
+    filters = RetrievalFilters(document_types=("pdf",))
+
+    chunks = await retriever.retrieve("hello", top_k=2, min_score=0.1, filters=filters)
+
+    assert len(chunks) == 1
+    assert store.filters == [filters]
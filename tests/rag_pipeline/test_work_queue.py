@@ -0,0 +1,277 @@
+import threading
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from src.rag_pipeline.config import get_rag_ingestion_config
+from src.rag_pipeline.embeddings.client_types import EmbeddingModelInfo
+from src.rag_pipeline.persistence import InMemoryStore, InMemoryWorkQueue, PostgresWorkQueue
+from src.rag_pipeline.persistence.work_queue import (
+    ITEM_DONE,
+    ITEM_FAILED,
+    ITEM_QUEUED,
+    document_from_payload,
+    document_payload,
+)
+from src.rag_pipeline.pipeline import (
+    PipelineServices,
+    enqueue_ingestion_job,
+    process_work_item,
+    run_queue_worker,
+    wait_for_queue_job,
+)
+from src.rag_pipeline.schemas import (
+    ChunkData,
+    ChunkMetadata,
+    DocumentInput,
+    DocumentMetadata,
+    EmbeddingRecord,
+    IngestionRequest,
+    SourceIngestionStatus,
+    SourceType,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class OneChunkChunker:
+    def chunk_document(self, document):
+        return [
+            ChunkData(
+                text=document.display_name,
+                metadata=ChunkMetadata(page_number=None, chunk_index=0, section_heading=None, structural_type=None),
+                character_count=len(document.display_name),
+            ),
+        ]
+
+
+class FakeEmbeddingClient:
+    model_info = EmbeddingModelInfo(model="demo", dataset_fingerprint=None, artifact_version=None)
+
+    def __init__(self, failing: set[str] | None = None) -> None:
+        self.failing = failing or set()
+        self.embedded: list[str] = []
+        self._lock = threading.Lock()
+
+    def embed_document_chunks(self, chunks):
+        if any(chunk.text in self.failing for chunk in chunks):
+            raise RuntimeError("embedding failed")
+        with self._lock:
+            self.embedded.extend(chunk.text for chunk in chunks)
+        return [EmbeddingRecord(vector=(1.0, 0.0), model="demo", dimensions=2) for _ in chunks]
+
+    def close(self) -> None:
+        """No-op for compatibility."""
+
+
+def _document(name: str, content_hash: str = "hash") -> DocumentInput:
+    metadata = DocumentMetadata(
+        location=Path("/data") / name,
+        document_type="txt",
+        source_type=SourceType.LOCAL_FILE,
+        content_hash=content_hash,
+        size_bytes=10,
+    )
+    return DocumentInput(metadata=metadata, display_name=name)
+
+
+def _services(client: FakeEmbeddingClient, store: InMemoryStore | None = None) -> PipelineServices:
+    return PipelineServices(chunker=OneChunkChunker(), embedding_client=client, persistence=store or InMemoryStore())
+
+
+@pytest.mark.unit
+def test_leases_are_exclusive_until_they_expire() -> None:
+    clock = FakeClock()
+    queue = InMemoryWorkQueue(clock=clock)
+    queue.enqueue("job", [_document("a.txt"), _document("b.txt")], max_attempts=3)
+
+    first = queue.lease(worker_id="w1", visibility_timeout_seconds=30)
+    second = queue.lease(worker_id="w2", visibility_timeout_seconds=30)
+    assert [item.document.display_name for item in first + second] == ["a.txt", "b.txt"]
+    assert queue.lease(worker_id="w3", visibility_timeout_seconds=30) == []
+
+    clock.now = 31.0
+    redelivered = queue.lease(worker_id="w3", visibility_timeout_seconds=30)
+    assert [item.document.display_name for item in redelivered] == ["a.txt"]
+    assert redelivered[0].attempts == 2
+    # The first worker's lease is gone: it can no longer settle the item.
+    assert queue.ack(first[0]) is False
+    assert queue.extend(first[0], 30) is False
+    assert queue.ack(redelivered[0]) is True
+    assert queue.counts("job") == {ITEM_DONE: 1, "leased": 1}
+
+
+@pytest.mark.unit
+def test_nack_retries_until_attempts_run_out() -> None:
+    clock = FakeClock()
+    queue = InMemoryWorkQueue(clock=clock)
+    queue.enqueue("job", [_document("a.txt")], max_attempts=2)
+
+    (item,) = queue.lease(worker_id="w", visibility_timeout_seconds=30)
+    assert queue.nack(item, error="boom", retry_delay_seconds=10) is True
+    assert queue.counts("job") == {ITEM_QUEUED: 1}
+    assert queue.lease(worker_id="w", visibility_timeout_seconds=30) == []
+
+    clock.now = 10.0
+    (retry,) = queue.lease(worker_id="w", visibility_timeout_seconds=30)
+    queue.nack(retry, error="boom again", retry_delay_seconds=10)
+    assert queue.pending("job") == 0
+    (failed,) = queue.failed_items("job")
+    assert (failed.attempts, failed.error) == (2, "boom again")
+
+
+@pytest.mark.unit
+def test_expired_final_lease_is_reaped() -> None:
+    clock = FakeClock()
+    queue = InMemoryWorkQueue(clock=clock)
+    queue.enqueue("job", [_document("a.txt")], max_attempts=1)
+    queue.lease(worker_id="dead-worker", visibility_timeout_seconds=30)
+
+    clock.now = 31.0
+    counts = wait_for_queue_job(queue, "job", sleeper=lambda _seconds: None)
+
+    assert counts == {ITEM_FAILED: 1}
+
+
+@pytest.mark.unit
+def test_enqueue_is_idempotent_per_job() -> None:
+    queue = InMemoryWorkQueue()
+    queue.enqueue("job", [_document("a.txt")], max_attempts=3)
+    queue.enqueue("job", [_document("a.txt"), _document("b.txt")], max_attempts=3)
+    queue.enqueue("other", [_document("a.txt")], max_attempts=3)
+
+    assert queue.pending("job") == 2
+    assert queue.pending() == 3
+
+
+@pytest.mark.unit
+def test_concurrent_workers_ingest_every_document_once(tmp_path: Path) -> None:
+    for index in range(12):
+        (tmp_path / f"doc-{index:02d}.txt").write_text(f"document {index}", encoding="utf-8")
+    config = get_rag_ingestion_config()
+    queue = InMemoryWorkQueue()
+    job_id, discovered = enqueue_ingestion_job(
+        queue,
+        IngestionRequest(source_directories=[str(tmp_path)], pipeline_id="distributed"),
+        config=config,
+    )
+    client = FakeEmbeddingClient()
+    services = _services(client)
+    results = []
+
+    def work(name: str) -> None:
+        results.append(
+            run_queue_worker(
+                queue,
+                services=services,
+                worker_id=name,
+                config=config,
+                job_id=job_id,
+                poll_interval_seconds=0.01,
+                exit_when_idle=True,
+            ),
+        )
+
+    threads = [threading.Thread(target=work, args=(f"w{index}",)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert discovered == 12
+    assert sorted(client.embedded) == sorted(f"doc-{index:02d}.txt" for index in range(12))
+    assert sum(stats.ingested for stats in results) == 12
+    assert queue.counts(job_id) == {ITEM_DONE: 12}
+
+
+@pytest.mark.unit
+def test_process_work_item_skips_unchanged_documents_only_on_first_attempt() -> None:
+    config = get_rag_ingestion_config()
+    queue = InMemoryWorkQueue()
+    store = InMemoryStore()
+    document = _document("a.txt")
+    store.upsert_source(document, status=SourceIngestionStatus.INGESTED, embedding_model="demo")
+    client = FakeEmbeddingClient()
+    services = _services(client, store)
+    queue.enqueue("job", [document], max_attempts=3)
+
+    (item,) = queue.lease(worker_id="w", visibility_timeout_seconds=30)
+    assert process_work_item(item, queue, config=config, services=services, visibility_timeout_seconds=30) == "skipped"
+    assert client.embedded == []
+
+    queue.enqueue("retry-job", [document], max_attempts=3)
+    (first,) = queue.lease(worker_id="w", visibility_timeout_seconds=30, job_id="retry-job")
+    queue.nack(first, error="boom", retry_delay_seconds=0)
+    (second,) = queue.lease(worker_id="w", visibility_timeout_seconds=30, job_id="retry-job")
+    assert process_work_item(second, queue, config=config, services=services, visibility_timeout_seconds=30) == "ingested"
+    assert client.embedded == ["a.txt"]
+
+
+@pytest.mark.unit
+def test_process_work_item_requeues_failures_with_the_job_options() -> None:
+    config = get_rag_ingestion_config()
+    queue = InMemoryWorkQueue()
+    queue.enqueue("job", [_document("bad.txt")], max_attempts=2, options={"force_reingest": True, "pipeline_id": "p"})
+    services = _services(FakeEmbeddingClient(failing={"bad.txt"}))
+
+    (item,) = queue.lease(worker_id="w", visibility_timeout_seconds=30)
+    assert item.options == {"force_reingest": True, "pipeline_id": "p"}
+    assert process_work_item(item, queue, config=config, services=services, visibility_timeout_seconds=30) == "retried"
+    assert queue.counts("job") == {ITEM_QUEUED: 1}
+
+
+@pytest.mark.unit
+def test_document_payload_round_trip() -> None:
+    document = _document("a.txt", content_hash="abc")
+
+    assert document_from_payload(document_payload(document)) == document
+
+
+@pytest.mark.unit
+def test_postgres_lease_uses_skip_locked() -> None:
+    db = mock.Mock()
+    transaction = mock.MagicMock()
+    db.transaction.return_value = transaction
+    db.fetchall.side_effect = [
+        [],
+        [
+            {
+                "id": 7,
+                "job_id": "job",
+                "payload": {"document": document_payload(_document("a.txt")), "options": {"force_reingest": False}},
+                "attempts": 1,
+                "max_attempts": 3,
+                "lease_token": "token",
+            },
+        ],
+    ]
+    queue = PostgresWorkQueue(db, get_rag_ingestion_config())
+
+    (item,) = queue.lease(worker_id="w1", visibility_timeout_seconds=60, job_id="job")
+
+    lease_sql, params = db.fetchall.call_args.args
+    assert "for update skip locked" in lease_sql
+    assert "public.ingestion_queue" in lease_sql
+    assert params == ("job", "job", 1, "w1", 60)
+    assert (item.id, item.lease_token, item.document.display_name) == (7, "token", "a.txt")
+    transaction.__enter__.assert_called_once()
+
+
+@pytest.mark.unit
+def test_postgres_ack_requires_the_lease_token() -> None:
+    db = mock.Mock()
+    db.fetchval.return_value = None
+    queue = PostgresWorkQueue(db, get_rag_ingestion_config())
+    item = mock.Mock(id=7, lease_token="stale")
+
+    assert queue.ack(item) is False
+    sql, params = db.fetchval.call_args.args
+    assert "lease_token = %s" in sql
+    assert params == (None, 7, "stale")
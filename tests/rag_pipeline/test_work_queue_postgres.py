@@ -0,0 +1,72 @@
+"""Multi-process check of the Postgres work queue.
+
+Set ``RAG_TEST_DATABASE_URL`` to a scratch database to run it; each run
+creates and drops its own queue table.
+"""
+
+import multiprocessing
+import os
+from dataclasses import replace
+from uuid import uuid4
+
+import pytest
+
+from src.rag_pipeline.config import RagIngestionConfig, get_rag_ingestion_config
+from src.rag_pipeline.persistence import InMemoryStore, PostgresWorkQueue, PsycopgDatabaseClient
+from src.rag_pipeline.pipeline import PipelineServices, run_queue_worker
+from src.rag_pipeline.persistence.work_queue import ITEM_DONE
+from tests.rag_pipeline.test_work_queue import FakeEmbeddingClient, OneChunkChunker, _document
+
+DATABASE_URL = os.getenv("RAG_TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="Set RAG_TEST_DATABASE_URL to run Postgres queue tests.")
+
+
+def _worker_process(config: RagIngestionConfig, job_id: str, name: str, results) -> None:
+    db = PsycopgDatabaseClient(config.database_url, pool_size=2)
+    client = FakeEmbeddingClient()
+    try:
+        run_queue_worker(
+            PostgresWorkQueue(db, config),
+            services=PipelineServices(chunker=OneChunkChunker(), embedding_client=client, persistence=InMemoryStore()),
+            worker_id=name,
+            config=config,
+            job_id=job_id,
+            poll_interval_seconds=0.05,
+            exit_when_idle=True,
+        )
+    finally:
+        db.close()
+    results.put(client.embedded)
+
+
+@pytest.mark.integration
+def test_worker_processes_share_the_queue_without_duplicates() -> None:
+    config = replace(
+        get_rag_ingestion_config(),
+        database_url=DATABASE_URL or "",
+        supabase_schema="public",
+        work_queue_table=f"ingestion_queue_test_{uuid4().hex[:8]}",
+    )
+    db = PsycopgDatabaseClient(config.database_url)
+    queue = PostgresWorkQueue(db, config)
+    queue.ensure_table()
+    names = [f"doc-{index:03d}.txt" for index in range(40)]
+    try:
+        queue.enqueue("job", [_document(name) for name in names], max_attempts=3)
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        processes = [
+            context.Process(target=_worker_process, args=(config, "job", f"w{index}", results)) for index in range(4)
+        ]
+        for process in processes:
+            process.start()
+        embedded = [name for _ in processes for name in results.get(timeout=60)]
+        for process in processes:
+            process.join(timeout=10)
+
+        assert sorted(embedded) == names
+        assert queue.counts("job") == {ITEM_DONE: len(names)}
+    finally:
+        db.execute(f"drop table if exists public.{config.work_queue_table}")
+        db.close()
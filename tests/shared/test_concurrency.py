@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from src.shared.concurrency import AdaptiveConcurrencyLimiter, ConcurrencyLimitExceeded
+
+
+def _limiter(**overrides: float) -> AdaptiveConcurrencyLimiter:
+    params = {
+        "name": "test",
+        "initial_limit": 2,
+        "min_limit": 1,
+        "max_limit": 8,
+        "latency_target_seconds": 1.0,
+        "max_queue_size": 1,
+        "queue_timeout_seconds": 1.0,
+    }
+    params.update(overrides)
+    return AdaptiveConcurrencyLimiter(**params)  # type: ignore[arg-type]
+
+
+async def _hold(limiter: AdaptiveConcurrencyLimiter, release: asyncio.Event) -> None:
+    async with limiter.acquire():
+        await release.wait()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_queued_call_is_admitted_when_a_slot_frees() -> None:
+    limiter = _limiter()
+    release = asyncio.Event()
+    holders = [asyncio.create_task(_hold(limiter, release)) for _ in range(2)]
+    await asyncio.sleep(0)
+    queued = asyncio.create_task(_hold(limiter, asyncio.Event()))
+    await asyncio.sleep(0)
+
+    assert limiter.in_flight == 2
+    assert limiter.queue_depth == 1
+
+    release.set()
+    await asyncio.gather(*holders)
+    await asyncio.sleep(0)
+
+    assert limiter.in_flight == 1
+    assert limiter.queue_depth == 0
+    queued.cancel()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_full_queue_rejects_immediately() -> None:
+    limiter = _limiter(initial_limit=1, max_queue_size=0)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(limiter, release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(ConcurrencyLimitExceeded) as excinfo:
+        async with limiter.acquire():
+            pass
+
+    assert excinfo.value.reason == "queue_full"
+    assert excinfo.value.retry_after_seconds >= 1
+    release.set()
+    await holder
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_queue_timeout_rejects_and_cleans_up() -> None:
+    limiter = _limiter(initial_limit=1, queue_timeout_seconds=0.01)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(limiter, release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(ConcurrencyLimitExceeded) as excinfo:
+        async with limiter.acquire():
+            pass
+
+    assert excinfo.value.reason == "queue_timeout"
+    assert limiter.queue_depth == 0
+    release.set()
+    await holder
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_limit_grows_when_fast_and_backs_off_when_slow() -> None:
+    limiter = _limiter(latency_target_seconds=0.05)
+    for _ in range(4):
+        async with limiter.acquire():
+            async with limiter.acquire():
+                pass
+    grown = limiter.limit
+    assert grown > 2
+
+    async with limiter.acquire():
+        await asyncio.sleep(0.06)
+
+    assert limiter.limit < grown
+
+
+@pytest.mark.unit
+def test_invalid_bounds_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        _limiter(initial_limit=10, max_limit=4)
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from src.shared.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    bounded_timeout,
+    check_deadline,
+    current_deadline,
+    deadline_scope,
+    retry_allowed,
+)
+
+
+@pytest.mark.unit
+def test_bounded_timeout_is_unchanged_without_a_deadline() -> None:
+    assert current_deadline() is None
+    assert bounded_timeout(30.0, stage="embedding") == 30.0
+    assert retry_allowed(100.0)
+    check_deadline("embedding")
+
+
+@pytest.mark.unit
+def test_bounded_timeout_clamps_to_remaining_budget() -> None:
+    with deadline_scope(Deadline.after(2.0)):
+        assert 0.0 < bounded_timeout(30.0, stage="embedding") <= 2.0
+        assert bounded_timeout(0.5, stage="embedding") == 0.5
+        assert retry_allowed(1.0)
+        assert not retry_allowed(5.0)
+    assert current_deadline() is None
+
+
+@pytest.mark.unit
+def test_expired_deadline_raises_with_stage() -> None:
+    with deadline_scope(Deadline.after(0.0)):
+        with pytest.raises(DeadlineExceeded) as excinfo:
+            bounded_timeout(30.0, stage="database")
+        assert excinfo.value.stage == "database"
+        assert isinstance(excinfo.value, TimeoutError)
+        with pytest.raises(DeadlineExceeded):
+            check_deadline("generation")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_deadline_follows_work_onto_threads() -> None:
+    deadline = Deadline.after(5.0)
+    with deadline_scope(deadline):
+        seen = await asyncio.to_thread(current_deadline)
+    assert seen is deadline
@@ -1,8 +1,11 @@
+import json
 import logging
+import queue
 
 import pytest
 
-from src.shared.logging import LoggerProtocol, StructuredLogger, get_logger
+from src.shared import logging as shared_logging
+from src.shared.logging import LoggerProtocol, StructuredLogger, get_logger, set_sample_rates
 
 
 @pytest.mark.unit
@@ -24,5 +27,89 @@ def test_structured_logger_emits_json(caplog: pytest.LogCaptureFixture) -> None:
 
     assert len(caplog.records) == 1
     record = caplog.records[0]
-    assert '{"event": "test_event", "key": "value"}' in record.getMessage()
+    assert json.loads(record.getMessage()) == {"event": "test_event", "key": "value"}
 
+
+@pytest.mark.unit
+def test_filtered_levels_skip_serialization(caplog: pytest.LogCaptureFixture) -> None:
+    """Disabled levels should never stringify their fields."""
+
+    class Exploding:
+        def __str__(self) -> str:
+            raise AssertionError("serialized a filtered event")
+
+    structured_logger = StructuredLogger(logging.getLogger("structured_level_test"))
+    with caplog.at_level(logging.INFO):
+        structured_logger.debug("noisy_event", payload=Exploding())
+
+    assert caplog.records == []
+
+
+@pytest.mark.unit
+def test_sampled_events_are_dropped_or_tagged(
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Sampled events honour the configured keep probability."""
+    structured_logger = StructuredLogger(logging.getLogger("structured_sampling_test"))
+    monkeypatch.setattr(shared_logging, "_SAMPLE_RATES", {})
+    set_sample_rates({"db_query_started": 0.25})
+    draws = iter([0.9, 0.1])
+    monkeypatch.setattr(shared_logging.random, "random", lambda: next(draws))
+
+    with caplog.at_level(logging.INFO):
+        structured_logger.info("db_query_started", operation="dropped")
+        structured_logger.info("db_query_started", operation="kept")
+        structured_logger.info("db_query_completed", operation="unsampled")
+
+    messages = [json.loads(record.getMessage()) for record in caplog.records]
+    assert messages == [
+        {"event": "db_query_started", "operation": "kept", "sample_rate": 0.25},
+        {"event": "db_query_completed", "operation": "unsampled"},
+    ]
+
+
+@pytest.mark.unit
+def test_parse_sample_rates_ignores_malformed_pairs() -> None:
+    assert shared_logging._parse_sample_rates("a=0.1, b = 0.5,bad,c=x,=1") == {"a": 0.1, "b": 0.5}
+
+
+@pytest.mark.unit
+def test_deferred_queue_handler_snapshots_the_payload() -> None:
+    """Records carry the values at call time even if the caller mutates them later."""
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    base_logger = logging.getLogger("structured_queue_test")
+    base_logger.propagate = False
+    base_logger.addHandler(shared_logging._DeferredQueueHandler(log_queue))
+    base_logger.setLevel(logging.INFO)
+    ids = ["a"]
+    try:
+        StructuredLogger(base_logger).info("queued_event", count=3, ids=ids)
+        ids.append("b")
+    finally:
+        base_logger.handlers.clear()
+        base_logger.propagate = True
+
+    record = log_queue.get_nowait()
+    assert isinstance(record.msg, str)
+    assert json.loads(record.getMessage()) == {"event": "queued_event", "count": 3, "ids": ["a"]}
+
+
+@pytest.mark.unit
+def test_deferred_queue_handler_renders_tracebacks_on_the_caller() -> None:
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    base_logger = logging.getLogger("structured_queue_exc_test")
+    base_logger.propagate = False
+    base_logger.addHandler(shared_logging._DeferredQueueHandler(log_queue))
+    try:
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            StructuredLogger(base_logger).exception("failed_event")
+    finally:
+        base_logger.handlers.clear()
+        base_logger.propagate = True
+
+    record = log_queue.get_nowait()
+    assert record.exc_info is None
+    assert "ValueError: boom" in logging.Formatter().format(record)
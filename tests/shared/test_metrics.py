@@ -0,0 +1,65 @@
+import pytest
+
+from src.shared import metrics as metrics_module
+from src.shared.metrics import MetricsRegistry, get_metrics
+
+
+@pytest.mark.unit
+def test_registry_renders_recorded_observations() -> None:
+    registry = MetricsRegistry()
+    registry.observe_embedding_batch(backend="qwen", duration_seconds=0.12, item_count=8)
+    registry.observe_db_operation(operation="match_chunks", duration_seconds=0.03, outcome="error")
+    registry.observe_retrieval(duration_seconds=0.2, results=5)
+    registry.observe_llm_call(duration_seconds=1.5, retries=2)
+    registry.record_cache(cache="content_hash", hit=True)
+    registry.observe_ingested_document(status="ingested", stage_seconds={"chunk": 0.4})
+    registry.record_single_flight(operation="chat", role="coalesced")
+
+    payload, content_type = registry.render()
+    text = payload.decode()
+
+    assert content_type.startswith("text/plain")
+    assert 'rag_embedding_batch_duration_seconds_count{backend="qwen",outcome="success"} 1.0' in text
+    assert 'rag_embedding_batch_items_sum{backend="qwen"} 8.0' in text
+    assert 'rag_db_operation_duration_seconds_count{operation="match_chunks",outcome="error"} 1.0' in text
+    assert "rag_retrieval_results_sum 5.0" in text
+    assert "rag_llm_retries_total 2.0" in text
+    assert 'rag_cache_requests_total{cache="content_hash",result="hit"} 1.0' in text
+    assert 'rag_ingestion_stage_duration_seconds_count{stage="chunk"} 1.0' in text
+    assert 'rag_ingestion_documents_total{status="ingested"} 1.0' in text
+    assert 'rag_singleflight_requests_total{operation="chat",role="coalesced"} 1.0' in text
+
+
+@pytest.mark.unit
+def test_metric_accessors_are_idempotent() -> None:
+    registry = MetricsRegistry()
+    first = registry.counter("custom_events_total", "Custom events.", ("kind",))
+    assert registry.counter("custom_events_total", "Custom events.", ("kind",)) is first
+    assert get_metrics() is get_metrics()
+
+
+@pytest.mark.unit
+def test_push_failure_is_logged_not_raised(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[dict[str, object]] = []
+
+    def failing_push(gateway: str, **kwargs: object) -> None:
+        calls.append({"gateway": gateway, **kwargs})
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(metrics_module, "push_to_gateway", failing_push)
+    registry = MetricsRegistry()
+
+    assert registry.push("localhost:9091", job="rag_ingestion", grouping_key={"pipeline_id": "nightly"}) is False
+    assert calls[0]["job"] == "rag_ingestion"
+    assert calls[0]["grouping_key"] == {"pipeline_id": "nightly"}
+
+
+@pytest.mark.unit
+def test_registry_is_noop_without_prometheus_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(metrics_module, "CollectorRegistry", None)
+    registry = MetricsRegistry()
+    registry.observe_embedding_batch(backend="local", duration_seconds=0.1, item_count=1)
+
+    assert registry.enabled is False
+    assert registry.render()[0] == b""
+    assert registry.push("localhost:9091", job="rag_ingestion") is False
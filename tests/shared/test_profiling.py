@@ -0,0 +1,25 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.shared.profiling import profile_session
+
+
+@pytest.mark.unit
+def test_profile_session_writes_profile_and_chrome_trace(tmp_path: Path) -> None:
+    with profile_session(tmp_path, name="run") as (tracer, artifacts):
+        with tracer.span(name="ingest_document", correlation_id="nightly", attributes={"file": "a.md"}):
+            with tracer.span(name="chunk", correlation_id="nightly") as span:
+                span.set_attribute("chunks", 3)
+                sum(range(1000))
+
+    assert artifacts.profile_path.stat().st_size > 0
+    assert "function calls" in artifacts.summary_path.read_text()
+    trace = json.loads(artifacts.trace_path.read_text())
+    events = {event["name"]: event for event in trace["traceEvents"]}
+    assert set(events) == {"ingest_document", "chunk"}
+    assert events["chunk"]["ph"] == "X"
+    assert events["chunk"]["args"] == {"chunks": 3}
+    assert events["ingest_document"]["ts"] <= events["chunk"]["ts"]
+    assert events["ingest_document"]["dur"] >= events["chunk"]["dur"]
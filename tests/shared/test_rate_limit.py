@@ -0,0 +1,110 @@
+import threading
+
+import pytest
+
+from src.shared.deadline import Deadline, DeadlineExceeded, deadline_scope
+from src.shared.rate_limit import RateLimiter, TokenBucket, shared_rate_limiter
+
+
+class _Clock:
+    """Fake monotonic clock advanced by the limiter's sleeps."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.mark.unit
+def test_token_bucket_goes_into_debt_and_reports_wait() -> None:
+    clock = _Clock()
+    bucket = TokenBucket(rate=10.0, capacity=10.0, clock=clock)
+
+    assert bucket.reserve(10) == 0.0
+    assert bucket.reserve(5) == pytest.approx(0.5)
+    clock.now += 1.0
+    assert bucket.reserve(5) == 0.0
+
+
+@pytest.mark.unit
+def test_limiter_paces_requests_and_tokens() -> None:
+    clock = _Clock()
+    limiter = RateLimiter(
+        name="test",
+        requests_per_second=2.0,
+        tokens_per_minute=600.0,
+        clock=clock,
+        sleeper=clock.sleep,
+    )
+
+    for _ in range(4):
+        limiter.acquire()
+    assert clock.now == pytest.approx(101.0)
+
+    limiter.acquire(tokens=30)
+    assert clock.sleeps[-1] == pytest.approx(2.0)
+
+
+@pytest.mark.unit
+def test_throttle_pauses_for_retry_after_and_backs_off_from_observed_rate() -> None:
+    clock = _Clock()
+    limiter = RateLimiter(name="test", window_seconds=10.0, clock=clock, sleeper=clock.sleep)
+    for _ in range(40):
+        limiter.acquire()
+    assert limiter.requests_per_second is None
+
+    limiter.on_throttled(3.0)
+    limiter.on_throttled(3.0)
+    assert limiter.requests_per_second == pytest.approx(2.0)
+
+    limiter.acquire()
+    assert clock.sleeps[-1] == pytest.approx(3.0)
+
+    limiter.on_success()
+    assert limiter.requests_per_second == pytest.approx(2.05)
+
+
+@pytest.mark.unit
+def test_send_history_only_keeps_the_observation_window() -> None:
+    clock = _Clock()
+    limiter = RateLimiter(name="test", window_seconds=10.0, clock=clock, sleeper=clock.sleep)
+
+    for _ in range(1000):
+        limiter.acquire()
+        clock.now += 1.0
+
+    assert len(limiter._recent) <= 11
+
+
+@pytest.mark.unit
+def test_acquire_refuses_to_wait_past_request_deadline() -> None:
+    clock = _Clock()
+    limiter = RateLimiter(name="test", clock=clock, sleeper=clock.sleep)
+    limiter.on_throttled(60.0)
+
+    with deadline_scope(Deadline.after(1.0)), pytest.raises(DeadlineExceeded):
+        limiter.acquire()
+    assert clock.sleeps == []
+
+
+@pytest.mark.unit
+def test_shared_limiter_is_one_instance_per_name() -> None:
+    limiters: list[RateLimiter] = []
+
+    def fetch() -> None:
+        limiters.append(shared_rate_limiter("test-shared", requests_per_second=5.0))
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(limiter) for limiter in limiters}) == 1
+    assert limiters[0].requests_per_second == 5.0
@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+
+from src.shared.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, Hedger
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.unit
+def test_breaker_opens_once_failure_rate_crosses_threshold() -> None:
+    breaker = CircuitBreaker(name="test", failure_rate_threshold=0.5, window_size=4, minimum_calls=4)
+
+    for outcome in (True, False, True):
+        breaker.allow()
+        breaker.record_success() if outcome else breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+
+@pytest.mark.unit
+def test_half_open_probe_closes_or_reopens_the_circuit() -> None:
+    clock = _Clock()
+    breaker = CircuitBreaker(name="test", window_size=2, minimum_calls=1, open_seconds=10.0, clock=clock)
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 10.0
+    assert breaker.state == HALF_OPEN
+    breaker.allow()
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 20.0
+    breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.unit
+def test_hedger_fires_duplicate_after_observed_tail_latency() -> None:
+    hedger = Hedger(name="test", min_samples=3, min_delay_seconds=0.01)
+    for _ in range(3):
+        hedger.call(lambda: time.sleep(0.01))
+    assert hedger.hedge_delay() is not None
+
+    calls = 0
+    lock = threading.Lock()
+
+    def slow_first() -> str:
+        nonlocal calls
+        with lock:
+            calls += 1
+            attempt = calls
+        if attempt == 1:
+            time.sleep(1.0)
+            return "primary"
+        return "hedge"
+
+    start = time.perf_counter()
+    assert hedger.call(slow_first) == "hedge"
+    assert time.perf_counter() - start < 0.5
+    assert calls == 2
+    hedger.close()
+
+
+@pytest.mark.unit
+def test_hedger_raises_when_every_attempt_fails() -> None:
+    hedger = Hedger(name="test", min_samples=1, min_delay_seconds=0.01)
+    hedger.call(lambda: None)
+
+    def failing() -> None:
+        time.sleep(0.05)
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        hedger.call(failing)
+    hedger.close()
+
+
+@pytest.mark.unit
+def test_hedger_does_not_hedge_queued_or_saturated_calls() -> None:
+    hedger = Hedger(name="test", min_samples=1, min_delay_seconds=0.01, max_workers=1)
+    hedger.call(lambda: None)
+    calls: list[str] = []
+    lock = threading.Lock()
+
+    def attempt(label: str, seconds: float) -> str:
+        with lock:
+            calls.append(label)
+        time.sleep(seconds)
+        return label
+
+    slow = threading.Thread(target=hedger.call, args=(lambda: attempt("slow", 0.2),))
+    slow.start()
+    time.sleep(0.05)
+    # Queued behind the slow call for far longer than the hedge delay.
+    assert hedger.call(lambda: attempt("fast", 0.0)) == "fast"
+    slow.join()
+
+    assert calls == ["slow", "fast"]
+    hedger.close()
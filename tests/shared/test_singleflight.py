@@ -0,0 +1,167 @@
+import asyncio
+
+import pytest
+
+from src.shared.deadline import Deadline, DeadlineExceeded, current_deadline
+from src.shared.singleflight import COALESCED, DEADLINE_SKEW, LEADER, OVERFLOW, SingleFlight
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_computation() -> None:
+    flight: SingleFlight[str] = SingleFlight(name="test", max_waiters=10)
+    release = asyncio.Event()
+    calls = 0
+
+    async def compute() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "answer"
+
+    tasks = [asyncio.create_task(flight.do("key", compute)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls == 1
+    assert [value for value, _role in results] == ["answer"] * 5
+    assert sorted(role for _value, role in results) == [COALESCED] * 4 + [LEADER]
+    assert flight.in_flight == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_waiters_beyond_bound_run_their_own_call() -> None:
+    flight: SingleFlight[int] = SingleFlight(name="test", max_waiters=2)
+    release = asyncio.Event()
+    calls = 0
+
+    async def compute() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    tasks = [asyncio.create_task(flight.do("key", compute)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    roles = [role for _value, role in await asyncio.gather(*tasks)]
+
+    assert calls == 2
+    assert roles == [LEADER, COALESCED, OVERFLOW]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter_and_release_the_key() -> None:
+    flight: SingleFlight[str] = SingleFlight(name="test", max_waiters=10)
+    release = asyncio.Event()
+
+    async def fail() -> str:
+        await release.wait()
+        raise RuntimeError("backend down")
+
+    tasks = [asyncio.create_task(flight.do("key", fail)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.in_flight == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_leader_cancellation_does_not_cancel_followers() -> None:
+    flight: SingleFlight[str] = SingleFlight(name="test", max_waiters=10)
+    release = asyncio.Event()
+
+    async def compute() -> str:
+        await release.wait()
+        return "answer"
+
+    leader = asyncio.create_task(flight.do("key", compute))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", compute))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await follower == ("answer", COALESCED)
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_shared_call_is_cancelled_when_every_waiter_leaves() -> None:
+    flight: SingleFlight[str] = SingleFlight(name="test", max_waiters=10)
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def compute() -> str:
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "unreachable"
+
+    caller = asyncio.create_task(flight.do("key", compute))
+    await started.wait()
+    caller.cancel()
+    await asyncio.wait_for(cancelled.wait(), timeout=1.0)
+
+    assert flight.in_flight == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_follower_with_a_later_deadline_outlives_the_leader() -> None:
+    flight: SingleFlight[str] = SingleFlight(name="test", max_waiters=10, deadline_tolerance_seconds=1.0)
+    seen: list[Deadline | None] = []
+
+    async def compute() -> str:
+        seen.append(current_deadline())
+        await asyncio.sleep(0.2)
+        return "answer"
+
+    leader_deadline = Deadline.after(0.05)
+    follower_deadline = Deadline.after(0.5)
+    leader = asyncio.create_task(flight.do("key", compute, deadline=leader_deadline))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", compute, deadline=follower_deadline))
+
+    with pytest.raises(DeadlineExceeded):
+        await leader
+    assert await follower == ("answer", COALESCED)
+    (shared,) = seen
+    assert shared is not None and shared.expires_at >= follower_deadline.expires_at
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_callers_with_materially_different_deadlines_do_not_coalesce() -> None:
+    flight: SingleFlight[str] = SingleFlight(name="test", max_waiters=10, deadline_tolerance_seconds=0.1)
+    release = asyncio.Event()
+    calls = 0
+
+    async def compute() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "answer"
+
+    leader = asyncio.create_task(flight.do("key", compute, deadline=Deadline.after(1.0)))
+    await asyncio.sleep(0)
+    patient = asyncio.create_task(flight.do("key", compute, deadline=Deadline.after(30.0)))
+    undeadlined = asyncio.create_task(flight.do("key", compute))
+    await asyncio.sleep(0)
+    release.set()
+
+    roles = [role for _value, role in await asyncio.gather(leader, patient, undeadlined)]
+    assert roles == [LEADER, DEADLINE_SKEW, DEADLINE_SKEW]
+    assert calls == 3
@@ -1,6 +1,11 @@
+import threading
+import time
+from dataclasses import replace
+from typing import Sequence
+
 import pytest
 
-from src.shared.tracing import build_tracer, noop_tracer
+from src.shared.tracing import FinishedSpan, Tracer, TracerConfig, build_tracer, noop_tracer
 
 
 @pytest.mark.unit
@@ -22,3 +27,104 @@ def test_disabled_langfuse_config_falls_back_to_noop() -> None:
     with tracer.span(name="disabled") as span:
         span.end()
     assert tracer.enabled is False
+
+
+class RecordingExporter:
+    def __init__(self, *, block: threading.Event | None = None) -> None:
+        self.batches: list[list[FinishedSpan]] = []
+        self._block = block
+        self.shut_down = False
+
+    def export(self, spans: Sequence[FinishedSpan]) -> None:
+        if self._block is not None:
+            self._block.wait(5.0)
+        self.batches.append(list(spans))
+
+    def shutdown(self) -> None:
+        self.shut_down = True
+
+    @property
+    def spans(self) -> list[FinishedSpan]:
+        return [span for batch in self.batches for span in batch]
+
+
+def _tracer(exporter: RecordingExporter, **overrides: object) -> Tracer:
+    config = TracerConfig(enabled=True, host=None, public_key=None, secret_key=None, export_interval_seconds=60.0)
+    return Tracer(replace(config, **overrides), exporter=exporter)
+
+
+@pytest.mark.unit
+def test_spans_are_exported_in_batches_off_thread() -> None:
+    exporter = RecordingExporter()
+    tracer = _tracer(exporter, export_batch_size=2)
+
+    with tracer.span(name="chat", correlation_id="req-1", attributes={"top_k": 5}) as parent:
+        with tracer.span(name="retrieval", correlation_id="req-1") as child:
+            child.set_attribute("results", 3)
+        parent.end(answer_length=42)
+    assert tracer.flush()
+
+    assert [len(batch) for batch in exporter.batches] == [2]
+    retrieval, chat = exporter.spans
+    assert retrieval.parent_id == chat.span_id
+    assert retrieval.attributes == {"results": 3}
+    assert chat.attributes == {"top_k": 5, "answer_length": 42}
+    assert chat.duration_ms >= retrieval.duration_ms
+    tracer.shutdown()
+    assert exporter.shut_down is True
+
+
+@pytest.mark.unit
+def test_span_records_errors() -> None:
+    exporter = RecordingExporter()
+    tracer = _tracer(exporter)
+
+    with pytest.raises(ValueError):
+        with tracer.span(name="llm_call", correlation_id="req-2"):
+            raise ValueError("upstream timeout")
+    tracer.flush()
+
+    assert exporter.spans[0].error == "upstream timeout"
+    tracer.shutdown()
+
+
+@pytest.mark.unit
+def test_full_buffer_drops_oldest_spans_and_counts_them() -> None:
+    release = threading.Event()
+    exporter = RecordingExporter(block=release)
+    tracer = _tracer(exporter, max_queue_size=3, export_batch_size=1)
+
+    with tracer.span(name="in-flight"):
+        pass
+    deadline = time.monotonic() + 2.0
+    while tracer._processor._queue and time.monotonic() < deadline:  # type: ignore[union-attr]
+        time.sleep(0.001)
+    for index in range(5):
+        with tracer.span(name=f"queued-{index}"):
+            pass
+    release.set()
+    tracer.flush()
+
+    assert tracer.dropped_spans == 2
+    assert [span.name for span in exporter.spans] == ["in-flight", "queued-2", "queued-3", "queued-4"]
+    tracer.shutdown()
+
+
+@pytest.mark.unit
+def test_head_sampling_is_consistent_per_correlation_id() -> None:
+    exporter = RecordingExporter()
+    tracer = _tracer(exporter, sample_ratio=0.5)
+
+    for index in range(200):
+        correlation_id = f"req-{index}"
+        with tracer.span(name="chat", correlation_id=correlation_id):
+            with tracer.span(name="retrieval", correlation_id=correlation_id):
+                pass
+    tracer.flush()
+
+    by_request: dict[str | None, list[str]] = {}
+    for span in exporter.spans:
+        by_request.setdefault(span.correlation_id, []).append(span.name)
+    assert 60 < len(by_request) < 140
+    assert all(sorted(names) == ["chat", "retrieval"] for names in by_request.values())
+    tracer.shutdown()
@@ -0,0 +1,53 @@
+"""Import-time regression guard for the CLI and API entry points.
+
+Each entry point is imported in a fresh interpreter with ``-X importtime``;
+heavy ML stacks must only load once their backend is actually selected.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ("torch", "sentence_transformers", "transformers", "onnxruntime", "onnx", "docling")
+
+
+def _import_times(module: str) -> dict[str, int]:
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(REPO_ROOT),
+        "RAG_DATABASE_URL": "",
+        "DATABASE_URL": "",
+        "LANGFUSE_ENABLED": "false",
+        "USE_FINE_TUNED_EMBEDDINGS": "false",
+        "RAG_USE_FINE_TUNED_EMBEDDINGS": "false",
+    }
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("module", ["src.rag_pipeline.cli", "src.main", "src.rag_pipeline.embeddings"])
+def test_entry_points_do_not_import_heavy_backends(module: str) -> None:
+    times = _import_times(module)
+
+    assert module in times
+    loaded = sorted(name for name in times if name.split(".")[0] in HEAVY_MODULES)
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:10]
+    assert loaded == [], f"{module} eagerly imports {loaded[:10]}; slowest imports: {slowest}"
@@ -1,8 +1,14 @@
+import time
+from dataclasses import replace
+
 from fastapi.testclient import TestClient
 import pytest
 
-from src.agent.agent import ChatRequest, ChatResponse, Citation
+import src.main as main_module
+from src.agent.agent import ChatRequest, ChatResponse, Citation, WarmupReport
 from src.main import app
+from src.shared.concurrency import ConcurrencyLimitExceeded
+from src.shared.deadline import Deadline, DeadlineExceeded
 
 
 client: TestClient = TestClient(app)
@@ -21,7 +27,13 @@ def test_chat_endpoint_responds(monkeypatch: pytest.MonkeyPatch) -> None:
     """Chat endpoint should return a grounded answer shape."""
 
     class FakeAgent:
-        async def chat(self, request: ChatRequest, *, correlation_id: str | None = None) -> ChatResponse:
+        async def chat(
+            self,
+            request: ChatRequest,
+            *,
+            correlation_id: str | None = None,
+            deadline: Deadline | None = None,
+        ) -> ChatResponse:
             return ChatResponse(
                 answer=f"Echo: {request.query}",
                 citations=[Citation(source="doc-one", chunk_id="1", score=0.9)],
@@ -34,3 +46,128 @@ def test_chat_endpoint_responds(monkeypatch: pytest.MonkeyPatch) -> None:
     data = response.json()
     assert data["answer"].startswith("Echo")
     assert data["citations"] == [{"source": "doc-one", "chunk_id": "1", "score": 0.9}]
+
+
+@pytest.mark.unit
+def test_metrics_endpoint_exposes_prometheus_text() -> None:
+    """Metrics endpoint should serve the shared registry."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "rag_embedding_batch_duration_seconds" in response.text
+
+
+@pytest.mark.unit
+def test_ready_reports_503_until_warm_up_succeeds(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Readiness should flip to 200 only after a successful warm-up."""
+
+    class FakeAgent:
+        def __init__(self) -> None:
+            self.attempts = 0
+            self.closed = False
+
+        def close(self) -> None:
+            self.closed = True
+
+        async def warm_up(self) -> WarmupReport:
+            self.attempts += 1
+            if self.attempts == 1:
+                return WarmupReport(ready=False, checks={"retriever": "error: db down"}, durations_ms={})
+            return WarmupReport(ready=True, checks={"retriever": "ok"}, durations_ms={"database": 1.0})
+
+    agent = FakeAgent()
+    monkeypatch.setattr("src.main._agent", agent)
+    monkeypatch.setattr("src.main._settings", replace(main_module._settings, warmup_retry_seconds=0.05))
+    with TestClient(app) as lifespan_client:
+        first = lifespan_client.get("/ready")
+        assert first.status_code == 503
+        assert lifespan_client.get("/health").status_code == 200
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline:
+            response = lifespan_client.get("/ready")
+            if response.status_code == 200:
+                break
+            time.sleep(0.02)
+    assert response.status_code == 200
+    assert response.json()["checks"] == {"retriever": "ok"}
+    assert agent.attempts == 2
+    assert agent.closed
+
+
+@pytest.mark.unit
+def test_warm_up_retries_after_an_exception(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A warm-up that raises is logged and retried instead of ending start-up."""
+
+    class FlakyAgent:
+        def __init__(self) -> None:
+            self.attempts = 0
+
+        def close(self) -> None:
+            pass
+
+        async def warm_up(self) -> WarmupReport:
+            self.attempts += 1
+            if self.attempts == 1:
+                raise RuntimeError("gateway exploded")
+            return WarmupReport(ready=True, checks={"retriever": "ok"}, durations_ms={})
+
+    agent = FlakyAgent()
+    monkeypatch.setattr("src.main._agent", agent)
+    monkeypatch.setattr("src.main._settings", replace(main_module._settings, warmup_retry_seconds=0.05))
+    with TestClient(app) as lifespan_client:
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline:
+            response = lifespan_client.get("/ready")
+            if response.status_code == 200:
+                break
+            time.sleep(0.02)
+    assert response.status_code == 200
+    assert agent.attempts == 2
+
+
+@pytest.mark.unit
+def test_chat_returns_503_until_the_agent_is_built(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Importing the app builds nothing; chat waits for start-up."""
+    monkeypatch.setattr("src.main._agent", None)
+    response = client.post("/chat", json={"query": "too early?"})
+    assert response.status_code == 503
+    assert response.json()["reason"] == "starting"
+    assert "retry-after" in response.headers
+
+
+@pytest.mark.unit
+def test_chat_sheds_load_with_retry_after(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Saturated chat limiter should answer 503 with Retry-After."""
+
+    class FakeLimiter:
+        def acquire(self) -> object:
+            raise ConcurrencyLimitExceeded(reason="queue_full", retry_after_seconds=3)
+
+    monkeypatch.setattr("src.main._agent", object())
+    monkeypatch.setattr("src.main._chat_limiter", FakeLimiter())
+    response = client.post("/chat", json={"query": "busy?"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "3"
+    assert response.json()["reason"] == "queue_full"
+
+
+@pytest.mark.unit
+def test_chat_returns_504_when_deadline_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An agent that runs out of time should yield 504 naming the stage."""
+
+    class FakeAgent:
+        async def chat(
+            self,
+            request: ChatRequest,
+            *,
+            correlation_id: str | None = None,
+            deadline: Deadline | None = None,
+        ) -> ChatResponse:
+            assert deadline is not None and deadline.remaining() <= 1.0
+            raise DeadlineExceeded("generation")
+
+    monkeypatch.setattr("src.main._agent", FakeAgent())
+    monkeypatch.setattr("src.main._settings", replace(main_module._settings, chat_deadline_seconds=1.0))
+    response = client.post("/chat", json={"query": "slow?"})
+    assert response.status_code == 504
+    assert response.json()["stage"] == "generation"